@@ -9,6 +9,7 @@ type JsonValue =
 type ExtractRequest = {
   schema_name?: string;
   schema?: Record<string, JsonValue>;
+  schema_hash?: string;
   source_label?: string;
   filename?: string;
   subject?: string;
@@ -20,12 +21,18 @@ type ExtractRequest = {
 
 const corsHeaders = {
   "Access-Control-Allow-Origin": "*",
-  "Access-Control-Allow-Headers": "authorization, x-client-info, apikey, content-type, x-acta-extraction-secret",
+  "Access-Control-Allow-Headers": "authorization, x-client-info, apikey, content-type, content-encoding, x-acta-extraction-secret",
 };
 
 const OPENAI_MODEL = Deno.env.get("OPENAI_ACTA_EXTRACTION_MODEL") || "gpt-5-mini";
 const CLAUDE_MODEL = Deno.env.get("CLAUDE_ACTA_EXTRACTION_MODEL") || "claude-sonnet-4-6";
 
+// Schemas recibidos por schema_hash; viven mientras la instancia siga activa.
+// Si el cliente solo envia el hash y no esta aqui, responde 409 schema_not_cached
+// y el cliente reintenta con el schema completo.
+const schemaCache = new Map<string, Record<string, JsonValue>>();
+const SCHEMA_CACHE_MAX_ENTRIES = 20;
+
 function jsonResponse(payload: unknown, status = 200): Response {
   return new Response(JSON.stringify(payload), {
     status,
@@ -36,6 +43,32 @@ function jsonResponse(payload: unknown, status = 200): Response {
   });
 }
 
+async function readRequestBody(request: Request): Promise<ExtractRequest> {
+  const encoding = String(request.headers.get("content-encoding") || "").trim().toLowerCase();
+  if (encoding === "gzip" && request.body) {
+    const decompressed = request.body.pipeThrough(new DecompressionStream("gzip"));
+    return JSON.parse(await new Response(decompressed).text()) as ExtractRequest;
+  }
+  return (await request.json()) as ExtractRequest;
+}
+
+function resolveSchema(
+  schema: Record<string, JsonValue> | undefined,
+  schemaHash: string,
+): Record<string, JsonValue> | null {
+  if (schema && typeof schema === "object" && !Array.isArray(schema)) {
+    if (schemaHash) {
+      if (!schemaCache.has(schemaHash) && schemaCache.size >= SCHEMA_CACHE_MAX_ENTRIES) {
+        const oldest = schemaCache.keys().next().value;
+        if (oldest !== undefined) schemaCache.delete(oldest);
+      }
+      schemaCache.set(schemaHash, schema);
+    }
+    return schema;
+  }
+  return schemaHash ? schemaCache.get(schemaHash) ?? null : null;
+}
+
 function extractResponseJson(payload: Record<string, unknown>): Record<string, unknown> {
   const outputParsed = payload.output_parsed;
   if (outputParsed && typeof outputParsed === "object" && !Array.isArray(outputParsed)) {
@@ -301,9 +334,10 @@ Deno.serve(async (request) => {
     const apiKey = Deno.env.get("OPENAI_API_KEY");
     const claudeApiKey = Deno.env.get("CLAUDE_API_KEY");
 
-    const body = (await request.json()) as ExtractRequest;
+    const body = await readRequestBody(request);
     const schemaName = String(body.schema_name || "").trim() || "acta_ods_extraction";
-    const schema = body.schema;
+    const schemaHash = String(body.schema_hash || "").trim();
+    const schema = resolveSchema(body.schema, schemaHash);
     const sourceLabel = String(body.source_label || "").trim();
     const filename = String(body.filename || "").trim();
     const subject = String(body.subject || "").trim();
@@ -314,7 +348,10 @@ Deno.serve(async (request) => {
     const model = modelOverride || (providerOverride.toLowerCase() === "anthropic" ? CLAUDE_MODEL : OPENAI_MODEL);
     const provider = inferProvider(model, providerOverride);
 
-    if (!schema || typeof schema !== "object" || Array.isArray(schema)) {
+    if (!schema) {
+      if (schemaHash && !body.schema) {
+        return jsonResponse({ error: "schema_not_cached", schema_hash: schemaHash }, 409);
+      }
       return jsonResponse({ error: "schema is required and must be an object." }, 400);
     }
     if (!text && !pdfBase64) {
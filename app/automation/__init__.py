@@ -48,6 +48,16 @@ def run_batch_eod_scan(*args, **kwargs):
     return _impl(*args, **kwargs)
 
 
+def start_batch_eod_scan_job(*args, **kwargs):
+    from app.automation.orchestrator import start_batch_eod_scan_job as _impl
+    return _impl(*args, **kwargs)
+
+
+def get_batch_eod_scan_job(*args, **kwargs):
+    from app.automation.orchestrator import get_batch_eod_scan_job as _impl
+    return _impl(*args, **kwargs)
+
+
 def confirm_batch_eod_upload(*args, **kwargs):
     from app.automation.orchestrator import confirm_batch_eod_upload as _impl
     return _impl(*args, **kwargs)
@@ -64,5 +74,7 @@ __all__ = [
     "save_automation_staging_case",
     "update_automation_staging_case",
     "run_batch_eod_scan",
+    "start_batch_eod_scan_job",
+    "get_batch_eod_scan_job",
     "confirm_batch_eod_upload",
 ]
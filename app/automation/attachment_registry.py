@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import hashlib
+import json
+from pathlib import Path
+import sqlite3
+
+from app.paths import app_data_dir
+from app.services.excel_acta_import import PARSE_CACHE_VERSION
+from app.sqlite_store import sqlite_connection
+
+_DB_FILENAME = "automation_attachment_registry.sqlite3"
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def content_sha256(content: bytes) -> str:
+    return hashlib.sha256(content or b"").hexdigest()
+
+
+def _ensure_schema(connection: sqlite3.Connection) -> None:
+    connection.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS attachment_registry (
+            sha256 TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            message_id TEXT NOT NULL,
+            subject TEXT NOT NULL DEFAULT '',
+            filename TEXT NOT NULL DEFAULT '',
+            parse_version INTEGER NOT NULL,
+            parsed_json TEXT NOT NULL,
+            first_seen_at TEXT NOT NULL,
+            PRIMARY KEY (sha256, size_bytes)
+        );
+        """
+    )
+
+
+class AttachmentRegistry:
+    """Registro direccionado por contenido de los PDF ya analizados.
+
+    La llave es tamaño + SHA-256 del archivo descargado, asi que un mismo PDF
+    reenviado en otro correo se reconoce aunque cambie el nombre o el
+    ``attachmentId`` de Gmail.  Guarda el correo duenio del PDF y el
+    resultado del parser para no volver a parsearlo.  El duenio es el primer
+    correo que lo trajo hasta que otro correo lo reclame con ``claim`` (por
+    ejemplo si el primero nunca se confirmo).
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path or (app_data_dir() / _DB_FILENAME)
+
+    def _connection(self):
+        return sqlite_connection(
+            self._path,
+            _ensure_schema,
+            corrupt_message="El registro de adjuntos esta corrupto y no puede leerse",
+        )
+
+    def lookup(self, sha256: str, size_bytes: int) -> dict | None:
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT * FROM attachment_registry WHERE sha256 = ? AND size_bytes = ?",
+                (sha256, int(size_bytes)),
+            ).fetchone()
+        if row is None:
+            return None
+        current = int(row["parse_version"]) == PARSE_CACHE_VERSION
+        return {
+            "sha256": str(row["sha256"]),
+            "size_bytes": int(row["size_bytes"]),
+            "message_id": str(row["message_id"]),
+            "subject": str(row["subject"]),
+            "filename": str(row["filename"]),
+            "first_seen_at": str(row["first_seen_at"]),
+            "parsed": json.loads(row["parsed_json"]) if current else None,
+        }
+
+    def register(
+        self,
+        *,
+        sha256: str,
+        size_bytes: int,
+        message_id: str,
+        subject: str,
+        filename: str,
+        parsed: dict,
+    ) -> None:
+        """Guarda el parseo; el primer correo que trajo el PDF se conserva."""
+        with self._connection() as connection:
+            with connection:
+                connection.execute(
+                    """
+                    INSERT INTO attachment_registry(
+                        sha256, size_bytes, message_id, subject, filename, parse_version, parsed_json, first_seen_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(sha256, size_bytes) DO UPDATE SET
+                        parse_version = excluded.parse_version,
+                        parsed_json = excluded.parsed_json
+                    """,
+                    (
+                        sha256,
+                        int(size_bytes),
+                        str(message_id or "").strip(),
+                        str(subject or "").strip(),
+                        str(filename or "").strip(),
+                        PARSE_CACHE_VERSION,
+                        json.dumps(parsed, ensure_ascii=True, default=str),
+                        _utc_now_iso(),
+                    ),
+                )
+
+    def claim(self, sha256: str, size_bytes: int, *, message_id: str, subject: str, filename: str) -> None:
+        """Pasa el PDF al correo ``message_id`` conservando el parseo guardado."""
+        with self._connection() as connection:
+            with connection:
+                connection.execute(
+                    """
+                    UPDATE attachment_registry
+                    SET message_id = ?, subject = ?, filename = ?
+                    WHERE sha256 = ? AND size_bytes = ?
+                    """,
+                    (
+                        str(message_id or "").strip(),
+                        str(subject or "").strip(),
+                        str(filename or "").strip(),
+                        sha256,
+                        int(size_bytes),
+                    ),
+                )
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import sqlite3
+import uuid
+
+from app.paths import app_data_dir
+from app.sqlite_store import sqlite_connection
+
+_DB_FILENAME = "automation_batch_jobs.sqlite3"
+
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_INTERRUPTED = "interrupted"
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _ensure_schema(connection: sqlite3.Connection) -> None:
+    connection.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS batch_scan_jobs (
+            job_id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            scan_limit INTEGER,
+            full_rescan INTEGER NOT NULL DEFAULT 0,
+            stats_json TEXT NOT NULL DEFAULT '{}',
+            error TEXT NOT NULL DEFAULT '',
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS batch_scan_results (
+            job_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            message_id TEXT NOT NULL,
+            status TEXT NOT NULL,
+            result_json TEXT NOT NULL,
+            PRIMARY KEY (job_id, message_id)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_batch_scan_jobs_created_at
+        ON batch_scan_jobs(created_at);
+
+        CREATE INDEX IF NOT EXISTS idx_batch_scan_results_position
+        ON batch_scan_results(job_id, position);
+        """
+    )
+
+
+class BatchScanJobStore:
+    """Checkpoints of end-of-day batch scans: one row per job and one per
+    finished message, so an interrupted scan can be polled and resumed.
+    Stored in SQLite in AppData."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path or (app_data_dir() / _DB_FILENAME)
+
+    def _connection(self):
+        return sqlite_connection(
+            self._path,
+            _ensure_schema,
+            corrupt_message="El registro de escaneos batch esta corrupto y no puede leerse",
+        )
+
+    @staticmethod
+    def _job_from_row(row: sqlite3.Row) -> dict:
+        return {
+            "job_id": str(row["job_id"]),
+            "status": str(row["status"]),
+            "limit": row["scan_limit"],
+            "full_rescan": bool(row["full_rescan"]),
+            "stats": json.loads(row["stats_json"] or "{}"),
+            "error": str(row["error"] or ""),
+            "created_at": str(row["created_at"]),
+            "updated_at": str(row["updated_at"]),
+        }
+
+    def create_job(self, *, limit: int | None, full_rescan: bool, stats: dict) -> dict:
+        job_id = f"scan-{uuid.uuid4().hex[:12]}"
+        now = _utc_now_iso()
+        with self._connection() as connection:
+            with connection:
+                connection.execute(
+                    """
+                    INSERT INTO batch_scan_jobs(job_id, status, scan_limit, full_rescan, stats_json, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (job_id, JOB_RUNNING, limit, int(bool(full_rescan)), json.dumps(stats), now, now),
+                )
+            row = connection.execute("SELECT * FROM batch_scan_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._job_from_row(row)
+
+    def get_job(self, job_id: str) -> dict | None:
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT * FROM batch_scan_jobs WHERE job_id = ?", (str(job_id or "").strip(),)
+            ).fetchone()
+        return self._job_from_row(row) if row else None
+
+    def latest_job(self) -> dict | None:
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT * FROM batch_scan_jobs ORDER BY created_at DESC LIMIT 1"
+            ).fetchone()
+        return self._job_from_row(row) if row else None
+
+    def update_job(self, job_id: str, *, status: str | None = None, stats: dict | None = None, error: str | None = None) -> None:
+        assignments = ["updated_at = ?"]
+        values: list[object] = [_utc_now_iso()]
+        if status is not None:
+            assignments.append("status = ?")
+            values.append(status)
+        if stats is not None:
+            assignments.append("stats_json = ?")
+            values.append(json.dumps(stats))
+        if error is not None:
+            assignments.append("error = ?")
+            values.append(error)
+        values.append(job_id)
+        with self._connection() as connection:
+            with connection:
+                connection.execute(
+                    f"UPDATE batch_scan_jobs SET {', '.join(assignments)} WHERE job_id = ?",
+                    values,
+                )
+
+    def save_result(self, job_id: str, result: dict, *, stats: dict) -> None:
+        """Guarda el resultado de un correo y las estadisticas del job en una sola transaccion."""
+        message_id = str(result.get("message_id") or "").strip()
+        with self._connection() as connection:
+            with connection:
+                position = connection.execute(
+                    "SELECT COUNT(*) AS total FROM batch_scan_results WHERE job_id = ?", (job_id,)
+                ).fetchone()["total"]
+                connection.execute(
+                    """
+                    INSERT OR REPLACE INTO batch_scan_results(job_id, position, message_id, status, result_json)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (
+                        job_id,
+                        int(position),
+                        message_id,
+                        str(result.get("status") or ""),
+                        json.dumps(result, ensure_ascii=True, default=str),
+                    ),
+                )
+                connection.execute(
+                    "UPDATE batch_scan_jobs SET stats_json = ?, updated_at = ? WHERE job_id = ?",
+                    (json.dumps(stats), _utc_now_iso(), job_id),
+                )
+
+    def list_results(self, job_id: str, *, since: int = 0) -> list[dict]:
+        with self._connection() as connection:
+            rows = connection.execute(
+                "SELECT result_json FROM batch_scan_results WHERE job_id = ? AND position >= ? ORDER BY position",
+                (job_id, max(0, int(since or 0))),
+            ).fetchall()
+        return [json.loads(row["result_json"]) for row in rows]
+
+    def result_ids(self, job_id: str) -> set[str]:
+        with self._connection() as connection:
+            rows = connection.execute(
+                "SELECT message_id FROM batch_scan_results WHERE job_id = ?", (job_id,)
+            ).fetchall()
+        return {str(row["message_id"]) for row in rows}
+
+    def result_count(self, job_id: str) -> int:
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT COUNT(*) AS total FROM batch_scan_results WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return int(row["total"] or 0)
@@ -1,15 +1,33 @@
 from __future__ import annotations
 
 import base64
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
+from collections.abc import Callable, Collection, Iterator
 from email.utils import parseaddr
 from typing import Any
 
 from app.automation.document_classifier import classify_document
 from app.automation.models import AttachmentRef, GmailMessageRef
 from app.automation.process_catalog import guess_process_from_filename, list_process_template_names
-from app.google_sheets_client import get_google_gmail_service
+from app.google_sheets_client import get_google_gmail_service, new_google_gmail_service
 
 _PDF_MIME_TYPES = {"application/pdf"}
+# Gmail acepta hasta 100 llamadas por lote; las que fallan por cuota o error
+# transitorio se reintentan en un lote nuevo con espera exponencial.
+_BATCH_MAX_REQUESTS = 100
+_BATCH_MAX_ATTEMPTS = 3
+_BATCH_RETRY_DELAY_SECONDS = 1.0
+_RETRYABLE_HTTP_STATUS = {429, 500, 502, 503, 504}
+_LIST_PAGE_SIZE = 100
+_HISTORY_PAGE_SIZE = 500
+# Gmail responde 404 cuando el historyId guardado ya expiro (aprox. una semana).
+_HISTORY_EXPIRED_HTTP_STATUS = 404
+_EXCLUDED_LABEL_IDS = {"TRASH", "SPAM", "DRAFT"}
+_RECIPIENT_HEADERS = ("to", "cc", "bcc", "delivered-to")
+# Descargas de adjuntos en paralelo por correo; cada hilo usa su propio servicio.
+_DOWNLOAD_MAX_WORKERS = 4
 
 
 def _header_map(payload: dict[str, Any]) -> dict[str, str]:
@@ -43,19 +61,86 @@ def _collect_pdf_parts(payload: dict[str, Any]) -> list[dict[str, Any]]:
     return collected
 
 
+def _http_status(exc: BaseException) -> int:
+    resp = getattr(exc, "resp", None)
+    try:
+        return int(getattr(resp, "status", 0) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _message_ref_from_full(full: dict[str, Any], message_id: str) -> GmailMessageRef:
+    payload = full.get("payload") or {}
+    headers = _header_map(payload)
+    sender = headers.get("from", "")
+    _sender_name, sender_email = parseaddr(sender)
+    return GmailMessageRef(
+        message_id=str(full.get("id") or message_id).strip(),
+        thread_id=str(full.get("threadId") or "").strip(),
+        subject=headers.get("subject", ""),
+        sender=sender or sender_email,
+        sender_email=sender_email.strip().lower(),
+        to_address=headers.get("to", ""),
+        received_at=headers.get("date", ""),
+    )
+
+
+def _matches_candidate_filters(full: dict[str, Any], to_filter: str) -> bool:
+    """Replica localmente la consulta ``has:attachment filename:pdf -in:trash to:...``
+    para los correos que llegan por ``history.list``, que no acepta filtros."""
+    labels = {str(item or "").strip().upper() for item in list(full.get("labelIds") or [])}
+    if labels & _EXCLUDED_LABEL_IDS:
+        return False
+    payload = full.get("payload") or {}
+    if not _collect_pdf_parts(payload):
+        return False
+    to_filter_clean = str(to_filter or "").strip().lower()
+    if not to_filter_clean:
+        return True
+    headers = _header_map(payload)
+    return any(to_filter_clean in headers.get(name, "").lower() for name in _RECIPIENT_HEADERS)
+
+
 class GmailInboxGateway:
     """Read-only Gmail gateway for Aaron TEST."""
 
-    def __init__(self, *, delegated_user: str, to_filter: str, max_results: int = 20) -> None:
+    def __init__(
+        self,
+        *,
+        delegated_user: str,
+        to_filter: str,
+        max_results: int = 20,
+        download_workers: int = _DOWNLOAD_MAX_WORKERS,
+    ) -> None:
         self.delegated_user = str(delegated_user or "").strip()
         self.to_filter = str(to_filter or "").strip()
         self.max_results = max(1, int(max_results or 20))
+        self.download_workers = max(1, int(download_workers or 1))
         self._template_names = list_process_template_names()
+        self._full_messages: dict[str, dict[str, Any]] = {}
+        self._download_pool: ThreadPoolExecutor | None = None
+        self._download_local = threading.local()
 
     def _service(self):
         return get_google_gmail_service(delegated_subject=self.delegated_user)
 
-    def get_message_ref(self, message_id: str) -> GmailMessageRef:
+    def _download_service(self):
+        service = getattr(self._download_local, "service", None)
+        if service is None:
+            service = new_google_gmail_service(delegated_subject=self.delegated_user)
+            self._download_local.service = service
+        return service
+
+    def close(self) -> None:
+        """Libera los hilos de descarga; el gateway puede seguir usandose despues."""
+        pool, self._download_pool = self._download_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def _get_full_message(self, message_id: str) -> dict[str, Any]:
+        cached = self._full_messages.get(message_id)
+        if cached is not None:
+            return cached
         service = self._service()
         full = (
             service.users()
@@ -63,19 +148,74 @@ class GmailInboxGateway:
             .get(userId="me", id=message_id, format="full")
             .execute()
         )
-        payload = full.get("payload") or {}
-        headers = _header_map(payload)
-        sender = headers.get("from", "")
-        _sender_name, sender_email = parseaddr(sender)
-        return GmailMessageRef(
-            message_id=str(full.get("id") or message_id).strip(),
-            thread_id=str(full.get("threadId") or "").strip(),
-            subject=headers.get("subject", ""),
-            sender=sender or sender_email,
-            sender_email=sender_email.strip().lower(),
-            to_address=headers.get("to", ""),
-            received_at=headers.get("date", ""),
-        )
+        self._full_messages[message_id] = full
+        return full
+
+    def _fetch_full_messages(self, message_ids: list[str], *, ignore_missing: bool = False) -> None:
+        """Trae en lotes de hasta 100 los ``messages.get`` que aun no estan en cache.
+
+        Con ``ignore_missing`` los correos borrados (404) se omiten en vez de fallar.
+        """
+        pending = [item for item in dict.fromkeys(message_ids) if item and item not in self._full_messages]
+        if not pending:
+            return
+        service = self._service()
+        for start in range(0, len(pending), _BATCH_MAX_REQUESTS):
+            self._execute_get_batch(
+                service,
+                pending[start : start + _BATCH_MAX_REQUESTS],
+                ignore_missing=ignore_missing,
+            )
+
+    def _execute_get_batch(self, service, message_ids: list[str], *, ignore_missing: bool = False) -> None:
+        pending = list(message_ids)
+        last_error: BaseException | None = None
+        for attempt in range(_BATCH_MAX_ATTEMPTS):
+            if attempt:
+                time.sleep(_BATCH_RETRY_DELAY_SECONDS * (2 ** (attempt - 1)))
+            failed: dict[str, BaseException] = {}
+
+            def _on_response(request_id: str, response: dict[str, Any] | None, exception: BaseException | None) -> None:
+                if exception is not None:
+                    if ignore_missing and _http_status(exception) == 404:
+                        return
+                    failed[request_id] = exception
+                    return
+                self._full_messages[request_id] = response or {}
+
+            batch = service.new_batch_http_request(callback=_on_response)
+            for message_id in pending:
+                batch.add(
+                    service.users().messages().get(userId="me", id=message_id, format="full"),
+                    request_id=message_id,
+                )
+            try:
+                batch.execute()
+            except Exception as exc:
+                if _http_status(exc) not in _RETRYABLE_HTTP_STATUS:
+                    raise
+                failed = {message_id: exc for message_id in pending if message_id not in self._full_messages}
+
+            for exception in failed.values():
+                if _http_status(exception) not in _RETRYABLE_HTTP_STATUS:
+                    raise exception
+            if not failed:
+                return
+            pending = list(failed)
+            last_error = next(iter(failed.values()))
+        raise RuntimeError(
+            f"Gmail no devolvio {len(pending)} correo(s) despues de {_BATCH_MAX_ATTEMPTS} intentos en lote."
+        ) from last_error
+
+    def get_message_ref(self, message_id: str) -> GmailMessageRef:
+        return _message_ref_from_full(self._get_full_message(message_id), message_id)
+
+    def get_message_refs(self, message_ids: list[str]) -> list[GmailMessageRef]:
+        """Resuelve varios correos con llamadas en lote, conservando el orden recibido."""
+        clean_ids = [str(item or "").strip() for item in message_ids]
+        clean_ids = [item for item in clean_ids if item]
+        self._fetch_full_messages(clean_ids)
+        return [_message_ref_from_full(self._get_full_message(item), item) for item in clean_ids]
 
     def _query(self) -> str:
         filters = ["has:attachment", "filename:pdf", "-in:trash"]
@@ -83,35 +223,171 @@ class GmailInboxGateway:
             filters.append(f'to:"{self.to_filter}"')
         return " ".join(filters)
 
-    def list_candidate_messages(self) -> list[GmailMessageRef]:
+    def iter_candidate_messages(
+        self,
+        *,
+        skip_ids: Collection[str] | None = None,
+        on_skip: Callable[[str], None] | None = None,
+    ) -> Iterator[GmailMessageRef]:
+        """Recorre el buzon pagina por pagina y entrega cada correo apenas llega su pagina.
+
+        Los IDs en ``skip_ids`` se descartan antes de pedir detalles y no cuentan
+        para ``max_results``, que limita solo los correos nuevos entregados.
+        """
+        skip = skip_ids or ()
         service = self._service()
-        response = (
-            service.users()
-            .messages()
-            .list(
-                userId="me",
-                q=self._query(),
-                maxResults=self.max_results,
-                includeSpamTrash=False,
+        page_token: str | None = None
+        yielded = 0
+        while yielded < self.max_results:
+            request: dict[str, Any] = {
+                "userId": "me",
+                "q": self._query(),
+                "maxResults": _LIST_PAGE_SIZE,
+                "includeSpamTrash": False,
+            }
+            if page_token:
+                request["pageToken"] = page_token
+            response = service.users().messages().list(**request).execute()
+            page_ids: list[str] = []
+            for item in list(response.get("messages") or []):
+                message_id = str(item.get("id") or "").strip()
+                if not message_id:
+                    continue
+                if message_id in skip:
+                    if on_skip is not None:
+                        on_skip(message_id)
+                    continue
+                page_ids.append(message_id)
+            for message in self.get_message_refs(page_ids[: self.max_results - yielded]):
+                yielded += 1
+                yield message
+            page_token = str(response.get("nextPageToken") or "").strip() or None
+            if not page_token:
+                break
+
+    @property
+    def sync_key(self) -> str:
+        return f"{self.delegated_user.lower()}|{self.to_filter.lower()}"
+
+    def _current_history_id(self, service) -> str:
+        profile = service.users().getProfile(userId="me").execute()
+        return str(profile.get("historyId") or "").strip()
+
+    def _history_added_ids(self, service, start_history_id: str) -> list[str]:
+        """IDs agregados al buzon desde ``start_history_id``, en orden de llegada."""
+        page_token: str | None = None
+        added: list[str] = []
+        while True:
+            request: dict[str, Any] = {
+                "userId": "me",
+                "startHistoryId": start_history_id,
+                "historyTypes": ["messageAdded"],
+                "maxResults": _HISTORY_PAGE_SIZE,
+            }
+            if page_token:
+                request["pageToken"] = page_token
+            response = service.users().history().list(**request).execute()
+            for record in list(response.get("history") or []):
+                for item in list(record.get("messagesAdded") or []):
+                    message_id = str((item.get("message") or {}).get("id") or "").strip()
+                    if message_id:
+                        added.append(message_id)
+            page_token = str(response.get("nextPageToken") or "").strip() or None
+            if not page_token:
+                return list(dict.fromkeys(added))
+
+    def iter_incremental_messages(
+        self,
+        *,
+        state,
+        skip_ids: Collection[str] | None = None,
+        on_skip: Callable[[str], None] | None = None,
+        defer_ids: Collection[str] | None = None,
+    ) -> Iterator[GmailMessageRef]:
+        """Entrega solo los correos llegados desde el ultimo escaneo segun ``history.list``.
+
+        ``state`` es un ``GmailSyncState``.  Sin checkpoint, o si Gmail ya expiro el
+        ``historyId`` guardado, se recorre la consulta completa.  Los correos entregados
+        que aun no se procesan quedan pendientes en el checkpoint y se vuelven a ofrecer.
+        Los ``defer_ids`` (p. ej. ya resueltos por un job reanudado) no se entregan ni
+        cuentan para ``max_results``, pero tambien quedan pendientes.
+        El checkpoint solo avanza cuando el consumidor agota el iterador.
+        """
+        skip = skip_ids or ()
+        defer = defer_ids or ()
+        key = self.sync_key
+        checkpoint = state.load(key)
+        service = self._service()
+        # Se lee antes de listar para que lo que llegue durante el escaneo entre en el siguiente.
+        current_history_id = self._current_history_id(service)
+
+        added_ids: list[str] | None = None
+        if checkpoint["history_id"]:
+            try:
+                added_ids = self._history_added_ids(service, checkpoint["history_id"])
+            except Exception as exc:
+                if _http_status(exc) != _HISTORY_EXPIRED_HTTP_STATUS:
+                    raise
+
+        yielded_ids: list[str] = []
+        deferred_ids: list[str] = []
+        if added_ids is None:
+
+            def _skip_or_defer(message_id: str) -> None:
+                if message_id in skip:
+                    if on_skip is not None:
+                        on_skip(message_id)
+                    return
+                deferred_ids.append(message_id)
+
+            messages = self.iter_candidate_messages(
+                skip_ids=(set(skip) | set(defer)) if defer else skip,
+                on_skip=_skip_or_defer,
             )
-            .execute()
-        )
-        messages: list[GmailMessageRef] = []
-        for item in list(response.get("messages") or []):
-            message_id = str(item.get("id") or "").strip()
-            if not message_id:
+            for message in messages:
+                yielded_ids.append(message.message_id)
+                yield message
+            if len(yielded_ids) >= self.max_results:
+                # Pudo quedar buzon sin revisar: se conserva el checkpoint anterior.
+                return
+            state.save(key, history_id=current_history_id, pending_ids=[*deferred_ids, *yielded_ids])
+            return
+
+        candidate_ids: list[str] = []
+        for message_id in dict.fromkeys([*checkpoint["pending_ids"], *added_ids]):
+            if message_id in skip:
+                if on_skip is not None:
+                    on_skip(message_id)
                 continue
-            messages.append(self.get_message_ref(message_id))
-        return messages
+            if message_id in defer:
+                deferred_ids.append(message_id)
+                continue
+            candidate_ids.append(message_id)
 
-    def list_pdf_attachments(self, message: GmailMessageRef) -> list[AttachmentRef]:
-        service = self._service()
-        full = (
-            service.users()
-            .messages()
-            .get(userId="me", id=message.message_id, format="full")
-            .execute()
+        position = 0
+        while position < len(candidate_ids) and len(yielded_ids) < self.max_results:
+            chunk = candidate_ids[position : position + _LIST_PAGE_SIZE]
+            self._fetch_full_messages(chunk, ignore_missing=True)
+            for message_id in chunk:
+                position += 1
+                full = self._full_messages.get(message_id)
+                if full is None or not _matches_candidate_filters(full, self.to_filter):
+                    continue
+                yielded_ids.append(message_id)
+                yield _message_ref_from_full(full, message_id)
+                if len(yielded_ids) >= self.max_results:
+                    break
+        state.save(
+            key,
+            history_id=current_history_id,
+            pending_ids=[*deferred_ids, *yielded_ids, *candidate_ids[position:]],
         )
+
+    def list_candidate_messages(self) -> list[GmailMessageRef]:
+        return list(self.iter_candidate_messages())
+
+    def list_pdf_attachments(self, message: GmailMessageRef) -> list[AttachmentRef]:
+        full = self._get_full_message(message.message_id)
         payload = full.get("payload") or {}
         attachments: list[AttachmentRef] = []
         for part in _collect_pdf_parts(payload):
@@ -143,7 +419,47 @@ class GmailInboxGateway:
         return attachments
 
     def download_attachment_bytes(self, message: GmailMessageRef, attachment: AttachmentRef) -> bytes:
-        service = self._service()
+        return self._download_attachment_with(self._service(), message, attachment)
+
+    def iter_attachment_downloads(
+        self,
+        message: GmailMessageRef,
+        attachments: list[AttachmentRef],
+    ) -> Iterator[tuple[int, bytes | None, Exception | None]]:
+        """Descarga varios adjuntos en un pool acotado y entrega ``(indice, bytes, error)``
+        a medida que terminan, para que el parseo avance mientras llegan los demas.
+
+        El pool se conserva entre correos hasta ``close()``; cada hilo mantiene su
+        propio servicio Gmail porque httplib2 no es seguro entre hilos.
+        """
+        if len(attachments) <= 1 or self.download_workers <= 1:
+            for index, attachment in enumerate(attachments):
+                try:
+                    yield index, self.download_attachment_bytes(message, attachment), None
+                except Exception as exc:
+                    yield index, None, exc
+            return
+
+        if self._download_pool is None:
+            self._download_pool = ThreadPoolExecutor(
+                max_workers=self.download_workers,
+                thread_name_prefix="gmail-download",
+            )
+        futures = {
+            self._download_pool.submit(self._download_in_worker, message, attachment): index
+            for index, attachment in enumerate(attachments)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                yield index, future.result(), None
+            except Exception as exc:
+                yield index, None, exc
+
+    def _download_in_worker(self, message: GmailMessageRef, attachment: AttachmentRef) -> bytes:
+        return self._download_attachment_with(self._download_service(), message, attachment)
+
+    def _download_attachment_with(self, service, message: GmailMessageRef, attachment: AttachmentRef) -> bytes:
         response = (
             service.users()
             .messages()
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from collections.abc import Callable, Collection, Iterator
 from datetime import datetime, timezone
 from difflib import SequenceMatcher
 import hashlib
 import os
 from pathlib import Path
 import re
-import tempfile
-
+import threading
+
+from app.automation.attachment_registry import AttachmentRegistry, content_sha256
+from app.automation.batch_jobs import (
+    JOB_COMPLETED,
+    JOB_FAILED,
+    JOB_INTERRUPTED,
+    JOB_RUNNING,
+    BatchScanJobStore,
+)
 from app.automation.gmail_inbox import GmailInboxGateway
 from app.automation.models import (
     AttachmentRef,
@@ -19,7 +28,7 @@ from app.automation.models import (
     GmailMessageRef,
 )
 from app.google_sheet_layouts import ODS_INPUT_HEADERS, ods_input_row_from_record
-from app.google_sheets_client import read_sheet_values, write_sheet_values
+from app.google_sheets_client import append_sheet_values, read_sheet_values, write_sheet_values
 from app.automation.process_catalog import list_process_template_names
 from app.catalog_index import (
     get_company_detail_by_nit,
@@ -28,13 +37,16 @@ from app.catalog_index import (
     get_user_details_by_cedulas,
 )
 from app.automation.rules_engine import suggest_service_from_analysis
-from app.services.acta_import_pipeline import build_import_result_from_parsed
+from app.services.acta_import_pipeline import ImportSession, build_import_result_from_parsed
+from app.services.audit_log import AuditLogSink, get_audit_sink
 from app.services.excel_acta_import import parse_acta_pdf
 from app.automation.staging import AutomationStagingRepository
 from app.config import get_settings
+from app.paths import app_data_dir
 from app.services.sections.seccion4 import DISCAPACIDADES, GENEROS
 from app.utils.text import normalize_text
 
+_STAGING_PAGE_SIZE = 100
 _NO_PARTICIPANT_ROW_KINDS = {
     "program_presentation",
     "program_reactivation",
@@ -268,16 +280,26 @@ def _company_by_nit_details(nit: str) -> dict[str, str] | None:
     return get_company_detail_by_nit(str(nit or "").strip())
 
 
-def _company_by_name_strong(name: str) -> dict[str, str] | None:
+def _company_name_index() -> tuple[tuple[str, dict[str, str]], ...]:
+    index: list[tuple[str, dict[str, str]]] = []
+    for row in _companies():
+        candidate_name = normalize_text(row.get("nombre_empresa") or "")
+        if candidate_name:
+            index.append((candidate_name, row))
+    return tuple(index)
+
+
+def _company_by_name_strong(
+    name: str,
+    *,
+    company_index: tuple[tuple[str, dict[str, str]], ...] | None = None,
+) -> dict[str, str] | None:
     name_normalized = normalize_text(name or "")
     if not name_normalized:
         return None
     best_match: dict[str, str] | None = None
     best_score = 0.0
-    for row in _companies():
-        candidate_name = normalize_text(row.get("nombre_empresa") or "")
-        if not candidate_name:
-            continue
+    for candidate_name, row in company_index if company_index is not None else _company_name_index():
         score = SequenceMatcher(None, name_normalized, candidate_name).ratio()
         if name_normalized == candidate_name:
             score = 1.0
@@ -291,12 +313,16 @@ def _company_by_name_strong(name: str) -> dict[str, str] | None:
     return None
 
 
-def _canonicalize_company_in_analysis(analysis: dict) -> dict[str, str] | None:
+def _canonicalize_company_in_analysis(
+    analysis: dict,
+    *,
+    company_index: tuple[tuple[str, dict[str, str]], ...] | None = None,
+) -> dict[str, str] | None:
     warnings = list(analysis.get("warnings") or [])
     nit = str(analysis.get("nit_empresa") or "").strip()
     name = str(analysis.get("nombre_empresa") or "").strip()
     company_by_nit = _company_by_nit_details(nit)
-    company_by_name = _company_by_name_strong(name) if name else None
+    company_by_name = _company_by_name_strong(name, company_index=company_index) if name else None
     company: dict[str, str] | None = None
 
     if company_by_nit:
@@ -340,6 +366,10 @@ def _desktop_dir() -> Path:
     return Path.home()
 
 
+_DECISION_LOG_FIELD_RE = re.compile(r"(?:^|\s)(estado|message_id)=(\S+)")
+_DECISIONS_AUDIT_DIRNAME = "auditoria_decisiones"
+
+
 def _decisions_log_path() -> Path:
     settings = get_settings()
     configured = str(settings.automation_decisions_log_path or "").strip()
@@ -425,12 +455,30 @@ def _build_decision_log_entry(*, kind: str, message: dict, attachment: dict | No
     return " ".join(values)
 
 
+def _decisions_log_sink() -> AuditLogSink:
+    # La copia JSONL indexada es interna: vive en AppData, no junto al log del operador.
+    return get_audit_sink(app_data_dir() / _DECISIONS_AUDIT_DIRNAME, "decisiones")
+
+
+def _decision_log_record(entry: str) -> dict:
+    fields = dict(_DECISION_LOG_FIELD_RE.findall(entry))
+    return {
+        "estado": fields.get("estado", ""),
+        "message_id": "" if fields.get("message_id") in (None, "-") else fields["message_id"],
+        "entry": entry,
+    }
+
+
 def _append_decision_log(entries: list[str]) -> Path:
+    """Encola las entradas para el log de texto configurado y su copia JSONL
+    indexada por ``message_id``; el hilo del sink escribe ambos sin bloquear.
+    Devuelve la ruta del log de texto."""
     path = _decisions_log_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as handle:
-        for entry in entries:
-            handle.write(entry.rstrip() + "\n")
+    sink = _decisions_log_sink()
+    for entry in entries:
+        text = str(entry or "").rstrip()
+        if text:
+            sink.write(_decision_log_record(text), text_path=path, text_line=text)
     return path
 
 
@@ -476,6 +524,24 @@ def _write_rows_to_sheet(*, spreadsheet_id: str, sheet_name: str, rows: list[dic
     return len(values)
 
 
+def _append_rows_to_sheet(*, spreadsheet_id: str, sheet_name: str, rows: list[dict]) -> int:
+    """Agrega las filas con un solo ``values.append``, sin releer la hoja para ubicar el final."""
+    if not rows:
+        return 0
+    if len(_AUTOMATION_HEADERS) > 26:
+        raise RuntimeError(
+            f"Las columnas de automatizacion tienen {len(_AUTOMATION_HEADERS)} columnas; "
+            f"el maximo soportado es 26 (A-Z)."
+        )
+    values = [
+        ods_input_row_from_record(row) + [str(row.get("revisar_flag") or "")]
+        for row in rows
+    ]
+    end_column = chr(64 + len(_AUTOMATION_HEADERS))
+    append_sheet_values(spreadsheet_id, f"'{sheet_name}'!A:{end_column}", values)
+    return len(values)
+
+
 def _gmail_gateway(*, limit: int | None = None) -> GmailInboxGateway:
     settings = get_settings()
     delegated_user = str(settings.google_gmail_delegated_user or "").strip()
@@ -489,8 +555,80 @@ def _gmail_gateway(*, limit: int | None = None) -> GmailInboxGateway:
     )
 
 
-def _download_and_parse_attachment(*, gateway: GmailInboxGateway, message_ref: GmailMessageRef, attachment: dict) -> dict:
-    attachment_ref = AttachmentRef(
+class ScanContext:
+    """Recursos compartidos por todos los correos de un mismo escaneo en lote.
+
+    Se crea una vez por lote para no repetir por correo el gateway Gmail (con
+    su lista de plantillas y los payloads ya descargados), el mapa de correos
+    de profesionales, las referencias de mensajes del listado, el registro de
+    adjuntos ya vistos, el indice de empresas por nombre ni los catalogos y
+    consultas de la importacion (``import_session``).
+    """
+
+    def __init__(self, *, limit: int | None = None, processed_ids: Collection[str] | None = None) -> None:
+        self.gateway = _gmail_gateway(limit=limit)
+        self.allowed_senders = _professional_email_map()
+        self.attachment_registry = AttachmentRegistry()
+        self.import_session = ImportSession()
+        self._message_refs: dict[str, GmailMessageRef] = {}
+        self._company_index: tuple[tuple[str, dict[str, str]], ...] | None = None
+        self._processed_ids = processed_ids
+
+    def iter_candidate_messages(
+        self,
+        *,
+        skip_ids: Collection[str] | None = None,
+        on_skip: Callable[[str], None] | None = None,
+        sync_state=None,
+        defer_ids: Collection[str] = frozenset(),
+    ) -> Iterator[GmailMessageRef]:
+        """Con ``sync_state`` (un ``GmailSyncState``) solo recorre lo llegado desde el ultimo escaneo.
+
+        Los ``defer_ids`` no se entregan ni cuentan para el limite; en modo
+        incremental siguen pendientes en el checkpoint.
+        """
+        if sync_state is not None:
+            messages = self.gateway.iter_incremental_messages(
+                state=sync_state,
+                skip_ids=skip_ids,
+                on_skip=on_skip,
+                defer_ids=defer_ids,
+            )
+        else:
+            skip = (set(skip_ids or ()) | set(defer_ids)) if defer_ids else skip_ids
+            messages = self.gateway.iter_candidate_messages(skip_ids=skip, on_skip=on_skip)
+        for message in messages:
+            self._message_refs[message.message_id] = message
+            yield message
+
+    def close(self) -> None:
+        self.gateway.close()
+
+    def message_ref(self, message_id: str) -> GmailMessageRef:
+        message = self._message_refs.get(message_id)
+        if message is None:
+            message = self.gateway.get_message_ref(message_id)
+            self._message_refs[message_id] = message
+        return message
+
+    @property
+    def processed_ids(self) -> Collection[str]:
+        """Correos ya confirmados; se leen del registro una sola vez por lote."""
+        if self._processed_ids is None:
+            from app.automation.processed_log import ProcessedEmailLog
+
+            self._processed_ids = ProcessedEmailLog().get_processed_ids()
+        return self._processed_ids
+
+    @property
+    def company_index(self) -> tuple[tuple[str, dict[str, str]], ...]:
+        if self._company_index is None:
+            self._company_index = _company_name_index()
+        return self._company_index
+
+
+def _attachment_ref_from_dict(attachment: dict) -> AttachmentRef:
+    return AttachmentRef(
         attachment_id=str(attachment.get("attachment_id") or "").strip(),
         filename=str(attachment.get("filename") or "").strip(),
         mime_type=str(attachment.get("mime_type") or "application/pdf").strip(),
@@ -503,26 +641,78 @@ def _download_and_parse_attachment(*, gateway: GmailInboxGateway, message_ref: G
         classification_score=float(attachment.get("classification_score") or 0),
         classification_reason=str(attachment.get("classification_reason") or "").strip(),
     )
-    temp_path: Path | None = None
-    try:
-        suffix = Path(attachment_ref.filename).suffix or ".pdf"
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-            temp_path = Path(tmp.name)
-            tmp.write(gateway.download_attachment_bytes(message_ref, attachment_ref))
-
-        parsed = parse_acta_pdf(str(temp_path))
-    finally:
-        if temp_path and temp_path.exists():
-            try:
-                temp_path.unlink()
-            except OSError:
-                pass
-
-    parsed["file_path"] = attachment_ref.filename
-    return parsed
 
 
-def _match_sender_and_prepare_analysis(*, parsed: dict, attachment: dict, message: dict, allowed_senders: dict[str, str]) -> dict:
+def _download_and_parse_attachments(
+    *,
+    gateway: GmailInboxGateway,
+    message_ref: GmailMessageRef,
+    attachments: list[dict],
+    registry: AttachmentRegistry | None = None,
+    processed_ids: Collection[str] = frozenset(),
+) -> Iterator[tuple[int, dict | None, Exception | None]]:
+    """Descarga los adjuntos en paralelo y parsea cada PDF en este hilo apenas
+    llega su contenido.  Entrega ``(indice, parsed, error)`` en orden de llegada.
+
+    Con ``registry`` cada PDF se identifica por tamaño + SHA-256.  Si el mismo
+    contenido esta repetido en este correo, o ya llego en otro correo que esta
+    en ``processed_ids`` (confirmado), ``parsed`` solo trae
+    ``_attachment_duplicate_of``.  Si el otro correo no se confirmo, este
+    correo pasa a ser el duenio del PDF; en ambos casos se reutiliza el
+    parseo guardado sin volver a parsear.
+    """
+    attachment_refs = [_attachment_ref_from_dict(item) for item in attachments]
+    seen_in_message: set[tuple[str, int]] = set()
+    for index, content, error in gateway.iter_attachment_downloads(message_ref, attachment_refs):
+        if error is not None:
+            yield index, None, error
+            continue
+        attachment_ref = attachment_refs[index]
+        try:
+            if registry is None:
+                parsed = parse_acta_pdf(content, source_name=attachment_ref.filename)
+            else:
+                key = (content_sha256(content), len(content or b""))
+                known = registry.lookup(*key)
+                other_owner = known is not None and known["message_id"] != message_ref.message_id
+                if key in seen_in_message or (other_owner and known["message_id"] in processed_ids):
+                    original = known or {"message_id": message_ref.message_id, "subject": message_ref.subject}
+                    yield index, {"_attachment_duplicate_of": original}, None
+                    continue
+                seen_in_message.add(key)
+                if other_owner:
+                    registry.claim(
+                        *key,
+                        message_id=message_ref.message_id,
+                        subject=message_ref.subject,
+                        filename=attachment_ref.filename,
+                    )
+                parsed = dict(known["parsed"]) if known is not None and known["parsed"] is not None else None
+                if parsed is None:
+                    parsed = parse_acta_pdf(content, source_name=attachment_ref.filename)
+                    registry.register(
+                        sha256=key[0],
+                        size_bytes=key[1],
+                        message_id=message_ref.message_id,
+                        subject=message_ref.subject,
+                        filename=attachment_ref.filename,
+                        parsed=parsed,
+                    )
+        except Exception as exc:
+            yield index, None, exc
+            continue
+        parsed["file_path"] = attachment_ref.filename
+        yield index, parsed, None
+
+
+def _match_sender_and_prepare_analysis(
+    *,
+    parsed: dict,
+    attachment: dict,
+    message: dict,
+    allowed_senders: dict[str, str],
+    session: ImportSession | None = None,
+) -> dict:
     _ = allowed_senders
     import_result = build_import_result_from_parsed(
         parsed,
@@ -530,6 +720,7 @@ def _match_sender_and_prepare_analysis(*, parsed: dict, attachment: dict, messag
         message=message,
         attachment=attachment,
         create_missing_interpreter=True,
+        session=session,
     )
     analysis = dict(import_result.get("analysis") or {})
     discarded_ids = list(analysis.get("_cedulas_descartadas") or [])
@@ -537,7 +728,11 @@ def _match_sender_and_prepare_analysis(*, parsed: dict, attachment: dict, messag
     return analysis
 
 
-def _resolve_interpreter_context(documents: list[dict]) -> None:
+def _resolve_interpreter_context(
+    documents: list[dict],
+    *,
+    company_index: tuple[tuple[str, dict[str, str]], ...] | None = None,
+) -> None:
     non_interpreters = [
         item for item in documents if str(dict(item.get("attachment") or {}).get("document_kind") or "") != "interpreter_service"
     ]
@@ -566,7 +761,10 @@ def _resolve_interpreter_context(documents: list[dict]) -> None:
                 break
 
         if not analysis.get("nit_empresa"):
-            company_match = _company_by_name_strong(str(analysis.get("nombre_empresa") or ""))
+            company_match = _company_by_name_strong(
+                str(analysis.get("nombre_empresa") or ""),
+                company_index=company_index,
+            )
             if company_match:
                 analysis["nit_empresa"] = str(company_match.get("nit_empresa") or "").strip()
                 if not analysis.get("nombre_empresa"):
@@ -633,7 +831,14 @@ def _should_flag_revisar(row: dict) -> bool:
     return False
 
 
-def _rows_for_document(*, message: dict, attachment: dict, analysis: dict, suggestion: dict) -> tuple[list[dict], list[dict], list[str]]:
+def _rows_for_document(
+    *,
+    message: dict,
+    attachment: dict,
+    analysis: dict,
+    suggestion: dict,
+    company_index: tuple[tuple[str, dict[str, str]], ...] | None = None,
+) -> tuple[list[dict], list[dict], list[str]]:
     upload_rows: list[dict] = []
     preview_rows: list[dict] = []
     decision_entries: list[str] = []
@@ -660,7 +865,7 @@ def _rows_for_document(*, message: dict, attachment: dict, analysis: dict, sugge
         )
         return upload_rows, preview_rows, decision_entries
 
-    company = _canonicalize_company_in_analysis(analysis)
+    company = _canonicalize_company_in_analysis(analysis, company_index=company_index)
     if not company:
         decision_entries.append(
             _build_decision_log_entry(
@@ -760,61 +965,92 @@ def _rows_for_document(*, message: dict, attachment: dict, analysis: dict, sugge
     return upload_rows, preview_rows, decision_entries
 
 
-def _process_email_preview_internal(message_id: str) -> dict:
+def _process_email_preview_internal(message_id: str, *, context: ScanContext | None = None) -> dict:
     if not message_id:
         raise RuntimeError("Debe indicar message_id para procesar el correo.")
 
-    gateway = _gmail_gateway()
-    allowed_senders = _professional_email_map()
-    message_ref = gateway.get_message_ref(message_id)
+    if context is None:
+        context = ScanContext()
+        try:
+            return _process_email_preview_internal(message_id, context=context)
+        finally:
+            context.close()
+
+    gateway = context.gateway
+    allowed_senders = context.allowed_senders
+    message_ref = context.message_ref(message_id)
     message = message_ref.to_dict()
     attachments = [item.to_dict() for item in gateway.list_pdf_attachments(message_ref)]
     if not attachments:
         raise RuntimeError("El correo seleccionado no trae adjuntos PDF procesables.")
 
-    document_results: list[dict] = []
-    skipped_entries: list[str] = []
-    for attachment in attachments:
+    # Las entradas se guardan por indice para conservar el orden de los adjuntos
+    # aunque las descargas terminen en otro orden.
+    skipped_by_index: dict[int, str] = {}
+    documents_by_index: dict[int, dict] = {}
+    candidates: list[tuple[int, dict]] = []
+    for index, attachment in enumerate(attachments):
         if not bool(attachment.get("is_ods_candidate")):
-            skipped_entries.append(
-                _build_decision_log_entry(
-                    kind="omitido",
-                    message=message,
-                    attachment=attachment,
-                    details=[str(attachment.get("classification_reason") or "Documento clasificado como soporte o anexo.")],
-                )
-            )
-            continue
-        try:
-            parsed = _download_and_parse_attachment(
-                gateway=gateway,
-                message_ref=message_ref,
+            skipped_by_index[index] = _build_decision_log_entry(
+                kind="omitido",
+                message=message,
                 attachment=attachment,
+                details=[str(attachment.get("classification_reason") or "Documento clasificado como soporte o anexo.")],
             )
-        except Exception as exc:
-            skipped_entries.append(
-                _build_decision_log_entry(
+            continue
+        candidates.append((index, attachment))
+
+    if candidates:
+        parsed_documents = _download_and_parse_attachments(
+            gateway=gateway,
+            message_ref=message_ref,
+            attachments=[attachment for _index, attachment in candidates],
+            registry=context.attachment_registry,
+            processed_ids=context.processed_ids,
+        )
+        ready: list[tuple[int, dict, dict]] = []
+        for position, parsed, error in parsed_documents:
+            index, attachment = candidates[position]
+            if error is not None:
+                skipped_by_index[index] = _build_decision_log_entry(
                     kind="error_parse",
                     message=message,
                     attachment=attachment,
-                    details=[f"Error al descargar o parsear el PDF: {exc}"],
+                    details=[f"Error al descargar o parsear el PDF: {error}"],
                 )
-            )
-            continue
-        parsed = _match_sender_and_prepare_analysis(
-            parsed=parsed,
-            attachment=attachment,
-            message=message,
-            allowed_senders=allowed_senders,
-        )
-        document_results.append(
-            {
+                continue
+            duplicate_of = parsed.get("_attachment_duplicate_of")
+            if duplicate_of:
+                skipped_by_index[index] = _build_decision_log_entry(
+                    kind="duplicado_adjunto",
+                    message=message,
+                    attachment=attachment,
+                    details=[
+                        "El mismo PDF ya llego en el correo "
+                        f"{duplicate_of.get('message_id') or '-'} ({duplicate_of.get('subject') or 'sin asunto'}); "
+                        "no se vuelve a analizar ni se generan filas."
+                    ],
+                )
+                continue
+            ready.append((index, attachment, parsed))
+        # Cedulas y NIT de todos los adjuntos del correo en una consulta por tabla.
+        context.import_session.prefetch(parsed for _index, _attachment, parsed in ready)
+        for index, attachment, parsed in ready:
+            documents_by_index[index] = {
                 "attachment": attachment,
-                "analysis": parsed,
+                "analysis": _match_sender_and_prepare_analysis(
+                    parsed=parsed,
+                    attachment=attachment,
+                    message=message,
+                    allowed_senders=allowed_senders,
+                    session=context.import_session,
+                ),
             }
-        )
 
-    _resolve_interpreter_context(document_results)
+    skipped_entries = [skipped_by_index[index] for index in sorted(skipped_by_index)]
+    document_results = [documents_by_index[index] for index in sorted(documents_by_index)]
+
+    _resolve_interpreter_context(document_results, company_index=context.company_index)
 
     upload_rows: list[dict] = []
     preview_rows: list[dict] = []
@@ -829,6 +1065,7 @@ def _process_email_preview_internal(message_id: str) -> dict:
             attachment=attachment,
             analysis=analysis,
             suggestion=suggestion,
+            company_index=context.company_index,
         )
         upload_rows.extend(rows)
         preview_rows.extend(preview)
@@ -1045,17 +1282,52 @@ def publish_automation_email_preview(payload: dict) -> dict:
     return {"data": _publish_email_preview_internal(payload)}
 
 
-def run_batch_eod_scan(*, limit: int | None = None) -> dict:
-    """Fetch all unprocessed Gmail candidate emails and parse each one.
-    Does NOT write anything to Sheets.  Returns a summary for the confirmation step."""
+def _empty_scan_stats() -> dict[str, int]:
+    return {
+        "total_fetched": 0,
+        "already_processed": 0,
+        "ignored": 0,
+        "errors": 0,
+        "ready": 0,
+        "warnings": 0,
+    }
+
+
+def _scan_batch(
+    *,
+    limit: int | None,
+    full_rescan: bool,
+    stats: dict,
+    on_result: Callable[[dict], None],
+    resumed_ids: Collection[str] = frozenset(),
+) -> None:
+    """Recorre los correos candidatos y entrega cada resultado a ``on_result``
+    apenas termina.  ``resumed_ids`` son correos ya resueltos por un job anterior:
+    se saltan sin volver a contarlos ni gastar el limite.  Se difieren en vez de
+    saltarse para que el checkpoint incremental los conserve pendientes hasta
+    que se confirmen y queden en el registro de procesados."""
     from app.automation.processed_log import ProcessedEmailLog
+    from app.automation.sync_state import GmailSyncState
 
     log = ProcessedEmailLog()
     already_processed_ids = log.get_processed_ids()
-    gateway = _gmail_gateway(limit=limit)
-
+    context = ScanContext(limit=limit, processed_ids=already_processed_ids)
+
+    def _count_skipped(message_id: str) -> None:
+        if message_id in resumed_ids:
+            return
+        stats["total_fetched"] += 1
+        stats["already_processed"] += 1
+
+    messages = context.iter_candidate_messages(
+        skip_ids=already_processed_ids,
+        on_skip=_count_skipped,
+        sync_state=None if full_rescan else GmailSyncState(),
+        defer_ids=resumed_ids,
+    )
     try:
-        messages = gateway.list_candidate_messages()
+        for message_ref in messages:
+            _scan_one_message(message_ref, context=context, stats=stats, on_result=on_result)
     except Exception as exc:
         error_text = str(exc or "").lower()
         if "unauthorized_client" in error_text:
@@ -1063,59 +1335,167 @@ def run_batch_eod_scan(*, limit: int | None = None) -> dict:
                 "Google rechazo la impersonacion Gmail. Revisa Domain-Wide Delegation y el scope gmail.readonly."
             ) from exc
         raise
+    finally:
+        context.close()
 
+
+def run_batch_eod_scan(*, limit: int | None = None, full_rescan: bool = False) -> dict:
+    """Fetch all unprocessed Gmail candidate emails and parse each one.
+    Does NOT write anything to Sheets.  Returns a summary for the confirmation step.
+    Messages are parsed as each Gmail page arrives; already processed IDs are
+    skipped before their details are fetched.  By default only mail added since
+    the previous scan (Gmail historyId checkpoint) is listed; ``full_rescan``
+    walks the whole query instead."""
     results: list[dict] = []
-    stats = {
-        "total_fetched": len(messages),
-        "already_processed": 0,
-        "ignored": 0,
-        "errors": 0,
-        "ready": 0,
-        "warnings": 0,
-    }
+    stats = _empty_scan_stats()
+    _scan_batch(limit=limit, full_rescan=full_rescan, stats=stats, on_result=results.append)
+    return {"data": {"stats": stats, "results": results}}
 
-    for message_ref in messages:
-        message_id = str(message_ref.message_id or "").strip()
-        subject = str(message_ref.subject or "").strip()
 
-        if message_id in already_processed_ids:
-            stats["already_processed"] += 1
-            continue
+# Jobs que corren en este proceso; un job "running" en disco que no esta aqui
+# quedo interrumpido (app cerrada o caida) y puede reanudarse.
+_ACTIVE_SCAN_JOBS: set[str] = set()
+_SCAN_JOBS_LOCK = threading.Lock()
 
-        try:
-            result = _process_email_preview_internal(message_id)
-        except Exception as exc:
-            stats["errors"] += 1
-            results.append({
-                "status": "error",
-                "message_id": message_id,
-                "subject": subject,
-                "error": str(exc),
-                "upload_rows": [],
-                "preview_rows": [],
-                "decision_log_entries": [],
-            })
-            continue
 
-        upload_rows = list(result.get("upload_rows") or [])
-        if not upload_rows:
-            stats["ignored"] += 1
-            result["status"] = "ignored"
-        else:
-            stats["ready"] += 1
-            result["status"] = "ready"
-            if any(str(row.get("revisar_flag") or "") == "REVISAR" for row in upload_rows):
-                stats["warnings"] += 1
+def _scan_job_view(job: dict) -> dict:
+    view = dict(job)
+    if view["status"] == JOB_RUNNING:
+        with _SCAN_JOBS_LOCK:
+            if view["job_id"] not in _ACTIVE_SCAN_JOBS:
+                view["status"] = JOB_INTERRUPTED
+    return view
 
-        result.setdefault("message_id", message_id)
-        result.setdefault("subject", subject)
-        results.append(result)
 
-    return {"data": {"stats": stats, "results": results}}
+def _run_batch_scan_job(job_id: str) -> None:
+    store = BatchScanJobStore()
+    job = store.get_job(job_id)
+    if job is None:
+        return
+    stats = dict(_empty_scan_stats(), **dict(job.get("stats") or {}))
+    resumed_ids = store.result_ids(job_id)
+    limit = job.get("limit")
+    try:
+        if limit is not None and len(resumed_ids) >= int(limit):
+            store.update_job(job_id, status=JOB_COMPLETED, stats=stats, error="")
+            return
+        _scan_batch(
+            limit=None if limit is None else int(limit) - len(resumed_ids),
+            full_rescan=bool(job.get("full_rescan")),
+            stats=stats,
+            on_result=lambda result: store.save_result(job_id, result, stats=stats),
+            resumed_ids=resumed_ids,
+        )
+    except Exception as exc:
+        store.update_job(job_id, status=JOB_FAILED, stats=stats, error=str(exc))
+    else:
+        store.update_job(job_id, status=JOB_COMPLETED, stats=stats, error="")
+    finally:
+        with _SCAN_JOBS_LOCK:
+            _ACTIVE_SCAN_JOBS.discard(job_id)
+
+
+def start_batch_eod_scan_job(
+    *,
+    limit: int | None = None,
+    full_rescan: bool = False,
+    resume_job_id: str | None = None,
+    background: bool = True,
+) -> dict:
+    """Inicia (o reanuda) un escaneo batch persistente y devuelve su ``job_id``.
+
+    Cada correo terminado queda guardado en disco; al reanudar un job
+    interrumpido o fallido solo se procesan los correos que faltaban.
+    """
+    store = BatchScanJobStore()
+    if resume_job_id:
+        job = store.get_job(resume_job_id)
+        if job is None:
+            raise RuntimeError(f"No existe el escaneo batch {resume_job_id}.")
+        job = _scan_job_view(job)
+        if job["status"] == JOB_RUNNING:
+            return {"data": job}
+        if job["status"] == JOB_COMPLETED:
+            raise RuntimeError(f"El escaneo batch {resume_job_id} ya termino.")
+    else:
+        job = store.create_job(limit=limit, full_rescan=full_rescan, stats=_empty_scan_stats())
+
+    job_id = job["job_id"]
+    with _SCAN_JOBS_LOCK:
+        _ACTIVE_SCAN_JOBS.add(job_id)
+    store.update_job(job_id, status=JOB_RUNNING, error="")
+    if background:
+        threading.Thread(target=_run_batch_scan_job, args=(job_id,), daemon=True).start()
+    else:
+        _run_batch_scan_job(job_id)
+    return get_batch_eod_scan_job(job_id, since=0, include_results=False)
+
+
+def get_batch_eod_scan_job(job_id: str | None = None, *, since: int = 0, include_results: bool = True) -> dict:
+    """Estado de un escaneo batch (o del ultimo, sin ``job_id``) y sus resultados
+    desde la posicion ``since``, para consultar el avance de forma incremental."""
+    store = BatchScanJobStore()
+    job = store.get_job(job_id) if job_id else store.latest_job()
+    if job is None:
+        if job_id:
+            raise RuntimeError(f"No existe el escaneo batch {job_id}.")
+        return {"data": None}
+    view = _scan_job_view(job)
+    results = store.list_results(view["job_id"], since=since) if include_results else []
+    view["result_count"] = store.result_count(view["job_id"])
+    view["since"] = max(0, int(since or 0))
+    view["results"] = results
+    view["resumable"] = view["status"] in {JOB_FAILED, JOB_INTERRUPTED}
+    return {"data": view}
+
+
+def _scan_one_message(
+    message_ref: GmailMessageRef,
+    *,
+    context: ScanContext,
+    stats: dict,
+    on_result: Callable[[dict], None],
+) -> None:
+    message_id = str(message_ref.message_id or "").strip()
+    subject = str(message_ref.subject or "").strip()
+    stats["total_fetched"] += 1
+
+    try:
+        result = _process_email_preview_internal(message_id, context=context)
+    except Exception as exc:
+        stats["errors"] += 1
+        on_result({
+            "status": "error",
+            "message_id": message_id,
+            "subject": subject,
+            "error": str(exc),
+            "upload_rows": [],
+            "preview_rows": [],
+            "decision_log_entries": [],
+        })
+        return
+
+    upload_rows = list(result.get("upload_rows") or [])
+    if not upload_rows:
+        stats["ignored"] += 1
+        result["status"] = "ignored"
+    else:
+        stats["ready"] += 1
+        result["status"] = "ready"
+        if any(str(row.get("revisar_flag") or "") == "REVISAR" for row in upload_rows):
+            stats["warnings"] += 1
+
+    result.setdefault("message_id", message_id)
+    result.setdefault("subject", subject)
+    on_result(result)
 
 
 def confirm_batch_eod_upload(payload: dict) -> dict:
-    """Write all ready scan results to Sheets and mark each email as processed."""
+    """Write all ready scan results to Sheets and mark each email as processed.
+
+    Rows of every message are deduplicated once against ODS_INPUT and written
+    with a single append; emails are marked as processed only after that write
+    succeeds, so a failed upload can simply be confirmed again."""
     from app.automation.processed_log import ProcessedEmailLog
 
     log = ProcessedEmailLog()
@@ -1129,7 +1509,8 @@ def confirm_batch_eod_upload(payload: dict) -> dict:
 
     totals: dict[str, int] = {"uploaded": 0, "duplicates": 0, "ignored": 0, "errors": 0, "warnings": 0}
     all_decision_entries: list[str] = []
-
+    processed: list[tuple[str, str]] = []
+    to_write: list[tuple[dict, dict]] = []
     for result in results:
         status = str(result.get("status") or "")
         message = dict(result.get("message") or {})
@@ -1144,12 +1525,10 @@ def confirm_batch_eod_upload(payload: dict) -> dict:
 
         if status == "ignored":
             totals["ignored"] += 1
-            log.mark_processed(message_id, subject)
+            processed.append((message_id, subject))
             continue
 
-        upload_rows = [dict(r) for r in list(result.get("upload_rows") or [])]
-        to_write: list[dict] = []
-        for row in upload_rows:
+        for row in [dict(r) for r in list(result.get("upload_rows") or [])]:
             row_id = str(row.get("id") or "").strip()
             if row_id in existing_ids:
                 totals["duplicates"] += 1
@@ -1161,28 +1540,29 @@ def confirm_batch_eod_upload(payload: dict) -> dict:
                         details=["La fila ya existia en ODS_INPUT y no se volvio a escribir."],
                     )
                 )
-            else:
-                to_write.append(row)
-
-        _write_rows_to_sheet(
-            spreadsheet_id=spreadsheet_id, sheet_name=sheet_name, rows=to_write,
-        )
-        for row in to_write:
-            row_id = str(row.get("id") or "").strip()
+                continue
             existing_ids.add(row_id)
-            totals["uploaded"] += 1
-            if str(row.get("revisar_flag") or "") == "REVISAR":
-                totals["warnings"] += 1
-            all_decision_entries.append(
-                _build_decision_log_entry(
-                    kind="subido",
-                    message=message,
-                    row=row,
-                    details=["Fila escrita en Google Sheets ODS_INPUT (batch fin de dia)."],
-                )
-            )
+            to_write.append((message, row))
+        processed.append((message_id, subject))
 
-        log.mark_processed(message_id, subject)
+    _append_rows_to_sheet(
+        spreadsheet_id=spreadsheet_id,
+        sheet_name=sheet_name,
+        rows=[row for _message, row in to_write],
+    )
+    for message, row in to_write:
+        totals["uploaded"] += 1
+        if str(row.get("revisar_flag") or "") == "REVISAR":
+            totals["warnings"] += 1
+        all_decision_entries.append(
+            _build_decision_log_entry(
+                kind="subido",
+                message=message,
+                row=row,
+                details=["Fila escrita en Google Sheets ODS_INPUT (batch fin de dia)."],
+            )
+        )
+    log.mark_processed_many(processed)
 
     try:
         log_path = _append_decision_log(all_decision_entries)
@@ -1228,21 +1608,9 @@ def get_automation_attachment_analysis(payload: dict) -> dict:
     if attachment is None:
         raise RuntimeError("No se encontro el adjunto PDF seleccionado en Gmail.")
 
-    temp_path: Path | None = None
-    try:
-        suffix = Path(filename).suffix or ".pdf"
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-            temp_path = Path(tmp.name)
-            tmp.write(gateway.download_attachment_bytes(message, attachment))
-
-        parsed = parse_acta_pdf(str(temp_path))
-        parsed["file_path"] = attachment.filename
-    finally:
-        if temp_path and temp_path.exists():
-            try:
-                temp_path.unlink()
-            except OSError:
-                pass
+    content = gateway.download_attachment_bytes(message, attachment)
+    parsed = parse_acta_pdf(content, source_name=attachment.filename or filename)
+    parsed["file_path"] = attachment.filename
 
     import_result = build_import_result_from_parsed(
         parsed,
@@ -1266,12 +1634,20 @@ def get_automation_attachment_analysis(payload: dict) -> dict:
     }
 
 
-def get_automation_staging_cases() -> dict:
+def get_automation_staging_cases(*, limit: int | None = None, offset: int = 0) -> dict:
+    """Pagina de casos de staging, sin el analisis completo (ver ``get_automation_staging_case``)."""
     repo = AutomationStagingRepository()
-    cases = repo.list_cases()
+    page_size = _STAGING_PAGE_SIZE if limit is None else max(1, int(limit))
+    page_offset = max(0, int(offset or 0))
+    cases = repo.list_cases(limit=page_size, offset=page_offset, include_analysis=False)
+    total = repo.count_cases()
     return {
         "data": {
             "count": len(cases),
+            "total": total,
+            "limit": page_size,
+            "offset": page_offset,
+            "has_more": page_offset + len(cases) < total,
             "cases": [item.to_dict() for item in cases],
         }
     }
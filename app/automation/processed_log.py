@@ -1,33 +1,71 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
+from contextlib import contextmanager
 from datetime import datetime, timezone
 import json
 from pathlib import Path
+import sqlite3
 import threading
 
 from app.paths import app_data_dir
+from app.sqlite_store import sqlite_connection
+
+_DB_FILENAME = "automation_processed_emails.sqlite3"
+_LEGACY_JSON_FILENAME = "automation_processed_emails.json"
+_MIGRATION_KEY = "legacy_json_migrated"
 
 
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _ensure_schema(connection: sqlite3.Connection) -> None:
+    connection.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS processed_emails (
+            message_id TEXT PRIMARY KEY,
+            subject TEXT NOT NULL DEFAULT '',
+            processed_at TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS processed_log_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_processed_emails_processed_at
+        ON processed_emails(processed_at);
+        """
+    )
+
+
 class ProcessedEmailLog:
     """Persistent log of Gmail message IDs that have already been processed
-    by the batch end-of-day automation.  Stored as a JSON list in AppData."""
+    by the batch end-of-day automation.  Stored in an indexed SQLite table in
+    AppData; the previous JSON list is imported once on first use."""
 
     _global_lock: threading.Lock = threading.Lock()
 
-    def __init__(self, path: Path | None = None) -> None:
-        self._path = path or (app_data_dir() / "automation_processed_emails.json")
+    def __init__(self, path: Path | None = None, *, legacy_json_path: Path | None = None) -> None:
+        self._path = path or (app_data_dir() / _DB_FILENAME)
+        self._legacy_json_path = legacy_json_path or (self._path.parent / _LEGACY_JSON_FILENAME)
+        self._ready = False
 
-    def _ensure_parent(self) -> None:
-        self._path.parent.mkdir(parents=True, exist_ok=True)
+    @contextmanager
+    def _connection(self):
+        with sqlite_connection(
+            self._path,
+            _ensure_schema,
+            corrupt_message="El log de correos procesados esta corrupto y no puede leerse",
+        ) as connection:
+            if not self._ready:
+                self._migrate_legacy_json(connection)
+                self._ready = True
+            yield connection
 
-    def _load_raw(self) -> list[dict]:
-        if not self._path.exists():
-            return []
-        text = self._path.read_text(encoding="utf-8").strip()
+    def _load_legacy_rows(self) -> list[dict]:
+        text = self._legacy_json_path.read_text(encoding="utf-8").strip()
         if not text:
             return []
         try:
@@ -38,58 +76,91 @@ class ProcessedEmailLog:
             ) from exc
         if not isinstance(payload, list):
             raise RuntimeError("El log de correos procesados tiene un formato invalido.")
-        return [dict(item) for item in payload]
+        return [dict(item) for item in payload if isinstance(item, dict)]
 
-    def _save_raw(self, rows: list[dict]) -> None:
-        self._ensure_parent()
-        content = json.dumps(rows, ensure_ascii=True, indent=2)
-        tmp_path = self._path.with_suffix(".tmp")
-        try:
-            tmp_path.write_text(content, encoding="utf-8")
-            tmp_path.replace(self._path)
-        except Exception:
-            try:
-                tmp_path.unlink()
-            except OSError:
-                pass
-            raise
+    def _migrate_legacy_json(self, connection: sqlite3.Connection) -> None:
+        """Importa una sola vez el JSON anterior y lo deja renombrado como respaldo."""
+        with ProcessedEmailLog._global_lock:
+            done = connection.execute(
+                "SELECT value FROM processed_log_meta WHERE key = ?", (_MIGRATION_KEY,)
+            ).fetchone()
+            if done is not None:
+                return
+            rows = self._load_legacy_rows() if self._legacy_json_path.exists() else []
+            with connection:
+                self._insert_rows(
+                    connection,
+                    (
+                        (row.get("message_id"), row.get("subject"), row.get("processed_at"))
+                        for row in rows
+                    ),
+                )
+                connection.execute(
+                    "INSERT OR REPLACE INTO processed_log_meta(key, value) VALUES (?, ?)",
+                    (_MIGRATION_KEY, _utc_now_iso()),
+                )
+            if self._legacy_json_path.exists():
+                try:
+                    self._legacy_json_path.replace(self._legacy_json_path.with_suffix(".json.migrated"))
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _insert_rows(connection: sqlite3.Connection, rows: Iterable[tuple[object, object, object]]) -> int:
+        now = _utc_now_iso()
+        clean_rows = []
+        for message_id, subject, processed_at in rows:
+            message_id_clean = str(message_id or "").strip()
+            if not message_id_clean:
+                continue
+            clean_rows.append((message_id_clean, str(subject or "").strip(), str(processed_at or "").strip() or now))
+        before = connection.total_changes
+        connection.executemany(
+            "INSERT OR IGNORE INTO processed_emails(message_id, subject, processed_at) VALUES (?, ?, ?)",
+            clean_rows,
+        )
+        return connection.total_changes - before
 
     def is_processed(self, message_id: str) -> bool:
         message_id_clean = str(message_id or "").strip()
         if not message_id_clean:
             return False
-        with ProcessedEmailLog._global_lock:
-            rows = self._load_raw()
-        return any(str(row.get("message_id") or "") == message_id_clean for row in rows)
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT 1 FROM processed_emails WHERE message_id = ?", (message_id_clean,)
+            ).fetchone()
+        return row is not None
 
     def get_processed_ids(self) -> set[str]:
         """Load all processed message IDs at once for efficient batch lookups."""
-        with ProcessedEmailLog._global_lock:
-            rows = self._load_raw()
-        return {
-            str(row.get("message_id") or "").strip()
-            for row in rows
-            if str(row.get("message_id") or "").strip()
-        }
+        with self._connection() as connection:
+            rows = connection.execute("SELECT message_id FROM processed_emails").fetchall()
+        return {str(row["message_id"]) for row in rows}
 
     def mark_processed(self, message_id: str, subject: str, processed_at: str | None = None) -> None:
-        message_id_clean = str(message_id or "").strip()
-        if not message_id_clean:
-            return
+        self.mark_processed_many([(message_id, subject)], processed_at=processed_at)
+
+    def mark_processed_many(
+        self,
+        items: Iterable[tuple[str, str]],
+        *,
+        processed_at: str | None = None,
+    ) -> int:
+        """Marca varios ``(message_id, subject)`` en una sola transaccion.
+
+        Los IDs ya registrados conservan su fecha original.  Devuelve cuantos eran nuevos.
+        """
         now = processed_at or _utc_now_iso()
-        with ProcessedEmailLog._global_lock:
-            rows = self._load_raw()
-            if any(str(row.get("message_id") or "") == message_id_clean for row in rows):
-                return
-            rows.append({
-                "message_id": message_id_clean,
-                "subject": str(subject or "").strip(),
-                "processed_at": now,
-            })
-            self._save_raw(rows)
+        rows = [(message_id, subject, now) for message_id, subject in items]
+        if not rows:
+            return 0
+        with self._connection() as connection:
+            with connection:
+                return self._insert_rows(connection, rows)
 
     def list_processed(self) -> list[dict]:
-        with ProcessedEmailLog._global_lock:
-            rows = self._load_raw()
-        rows.sort(key=lambda item: str(item.get("processed_at") or ""), reverse=True)
-        return rows
+        with self._connection() as connection:
+            rows = connection.execute(
+                "SELECT message_id, subject, processed_at FROM processed_emails ORDER BY processed_at DESC"
+            ).fetchall()
+        return [dict(row) for row in rows]
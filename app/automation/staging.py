@@ -1,32 +1,93 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from datetime import datetime, timezone
 import hashlib
 import json
 from pathlib import Path
+import sqlite3
 import threading
 
 from app.automation.models import AutomationStagedCase
 from app.paths import app_data_dir
+from app.sqlite_store import sqlite_connection
+
+_DB_FILENAME = "automation_staging.sqlite3"
+_LEGACY_JSON_FILENAME = "automation_staging.json"
+_MIGRATION_KEY = "legacy_json_migrated"
 
 
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _ensure_schema(connection: sqlite3.Connection) -> None:
+    # El analisis completo (texto, participantes, advertencias) va en su propia
+    # tabla para que el listado no lo lea ni lo deserialice.
+    connection.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS staging_cases (
+            case_id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            message_json TEXT NOT NULL,
+            attachment_json TEXT NOT NULL,
+            suggestion_json TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS staging_case_analysis (
+            case_id TEXT PRIMARY KEY,
+            analysis_json TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS staging_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_staging_cases_updated_at
+        ON staging_cases(updated_at);
+        """
+    )
+
+
+def _dumps(value: dict) -> str:
+    return json.dumps(dict(value or {}), ensure_ascii=True)
+
+
+def _loads(text: str | None) -> dict:
+    if not text:
+        return {}
+    payload = json.loads(text)
+    return dict(payload) if isinstance(payload, dict) else {}
+
+
 class AutomationStagingRepository:
+    """Casos de staging de automatizacion en SQLite, indexados por ``case_id`` y
+    ``updated_at``.  El staging JSON anterior se importa una sola vez."""
+
     _global_lock: threading.Lock = threading.Lock()
 
-    def __init__(self, path: Path | None = None) -> None:
-        self._path = path or (app_data_dir() / "automation_staging.json")
+    def __init__(self, path: Path | None = None, *, legacy_json_path: Path | None = None) -> None:
+        self._path = path or (app_data_dir() / _DB_FILENAME)
+        self._legacy_json_path = legacy_json_path or (self._path.parent / _LEGACY_JSON_FILENAME)
+        self._ready = False
 
-    def _ensure_parent(self) -> None:
-        self._path.parent.mkdir(parents=True, exist_ok=True)
+    @contextmanager
+    def _connection(self):
+        with sqlite_connection(
+            self._path,
+            _ensure_schema,
+            corrupt_message="El archivo de staging local está corrupto y no puede leerse",
+        ) as connection:
+            if not self._ready:
+                self._migrate_legacy_json(connection)
+                self._ready = True
+            yield connection
 
-    def _load_raw(self) -> list[dict]:
-        if not self._path.exists():
-            return []
-        text = self._path.read_text(encoding="utf-8").strip()
+    def _load_legacy_rows(self) -> list[dict]:
+        text = self._legacy_json_path.read_text(encoding="utf-8").strip()
         if not text:
             return []
         try:
@@ -35,21 +96,92 @@ class AutomationStagingRepository:
             raise RuntimeError(f"El archivo de staging local está corrupto y no puede leerse: {exc}") from exc
         if not isinstance(payload, list):
             raise RuntimeError("El staging local de automatizacion tiene un formato invalido.")
-        return [dict(item) for item in payload]
+        return [dict(item) for item in payload if isinstance(item, dict)]
 
-    def _save_raw(self, rows: list[dict]) -> None:
-        self._ensure_parent()
-        content = json.dumps(rows, ensure_ascii=True, indent=2)
-        tmp_path = self._path.with_suffix(".tmp")
-        try:
-            tmp_path.write_text(content, encoding="utf-8")
-            tmp_path.replace(self._path)
-        except Exception:
-            try:
-                tmp_path.unlink()
-            except OSError:
-                pass
-            raise
+    def _migrate_legacy_json(self, connection: sqlite3.Connection) -> None:
+        with AutomationStagingRepository._global_lock:
+            done = connection.execute("SELECT value FROM staging_meta WHERE key = ?", (_MIGRATION_KEY,)).fetchone()
+            if done is not None:
+                return
+            rows = self._load_legacy_rows() if self._legacy_json_path.exists() else []
+            with connection:
+                for row in rows:
+                    case_id = str(row.get("case_id") or "").strip()
+                    if not case_id:
+                        continue
+                    now = _utc_now_iso()
+                    self._write_case(
+                        connection,
+                        {
+                            "case_id": case_id,
+                            "status": str(row.get("status") or "pending_review"),
+                            "created_at": str(row.get("created_at") or now),
+                            "updated_at": str(row.get("updated_at") or row.get("created_at") or now),
+                            "message": dict(row.get("message") or {}),
+                            "attachment": dict(row.get("attachment") or {}),
+                            "analysis": dict(row.get("analysis") or {}),
+                            "suggestion": dict(row.get("suggestion") or {}),
+                        },
+                    )
+                connection.execute(
+                    "INSERT OR REPLACE INTO staging_meta(key, value) VALUES (?, ?)",
+                    (_MIGRATION_KEY, _utc_now_iso()),
+                )
+            if self._legacy_json_path.exists():
+                try:
+                    self._legacy_json_path.replace(self._legacy_json_path.with_suffix(".json.migrated"))
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _write_case(connection: sqlite3.Connection, record: dict) -> None:
+        connection.execute(
+            """
+            INSERT OR REPLACE INTO staging_cases(
+                case_id, status, created_at, updated_at, message_json, attachment_json, suggestion_json
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                record["case_id"],
+                record["status"],
+                record["created_at"],
+                record["updated_at"],
+                _dumps(record["message"]),
+                _dumps(record["attachment"]),
+                _dumps(record["suggestion"]),
+            ),
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO staging_case_analysis(case_id, analysis_json) VALUES (?, ?)",
+            (record["case_id"], _dumps(record["analysis"])),
+        )
+
+    @staticmethod
+    def _case_from_row(row: sqlite3.Row, *, analysis: dict | None = None) -> AutomationStagedCase:
+        return AutomationStagedCase(
+            case_id=str(row["case_id"]),
+            status=str(row["status"]),
+            created_at=str(row["created_at"]),
+            updated_at=str(row["updated_at"]),
+            message=_loads(row["message_json"]),
+            attachment=_loads(row["attachment_json"]),
+            analysis=dict(analysis or {}),
+            suggestion=_loads(row["suggestion_json"]),
+        )
+
+    def _fetch_case(self, connection: sqlite3.Connection, case_id: str) -> AutomationStagedCase | None:
+        row = connection.execute(
+            """
+            SELECT c.*, a.analysis_json
+            FROM staging_cases c
+            LEFT JOIN staging_case_analysis a ON a.case_id = c.case_id
+            WHERE c.case_id = ?
+            """,
+            (case_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        return self._case_from_row(row, analysis=_loads(row["analysis_json"]))
 
     def _build_case_id(self, *, message: dict, attachment: dict) -> str:
         raw = "|".join(
@@ -71,41 +203,69 @@ class AutomationStagingRepository:
         suggestion: dict,
         status: str = "pending_review",
     ) -> AutomationStagedCase:
-        with AutomationStagingRepository._global_lock:
-            rows = self._load_raw()
-            case_id = self._build_case_id(message=message, attachment=attachment)
-            now = _utc_now_iso()
-            record = {
-                "case_id": case_id,
-                "status": status,
-                "created_at": now,
-                "updated_at": now,
-                "message": dict(message),
-                "attachment": dict(attachment),
-                "analysis": dict(analysis),
-                "suggestion": dict(suggestion),
-            }
-            existing_index = next((idx for idx, item in enumerate(rows) if str(item.get("case_id") or "") == case_id), None)
-            if existing_index is not None:
-                record["created_at"] = str(rows[existing_index].get("created_at") or now)
-                rows[existing_index] = record
-            else:
-                rows.append(record)
-            self._save_raw(rows)
+        case_id = self._build_case_id(message=message, attachment=attachment)
+        now = _utc_now_iso()
+        record = {
+            "case_id": case_id,
+            "status": status,
+            "created_at": now,
+            "updated_at": now,
+            "message": dict(message),
+            "attachment": dict(attachment),
+            "analysis": dict(analysis),
+            "suggestion": dict(suggestion),
+        }
+        with self._connection() as connection:
+            with connection:
+                existing = connection.execute(
+                    "SELECT created_at FROM staging_cases WHERE case_id = ?", (case_id,)
+                ).fetchone()
+                if existing is not None:
+                    record["created_at"] = str(existing["created_at"] or now)
+                self._write_case(connection, record)
         return AutomationStagedCase(**record)
 
-    def list_cases(self) -> list[AutomationStagedCase]:
-        rows = self._load_raw()
-        rows.sort(key=lambda item: str(item.get("updated_at") or ""), reverse=True)
-        return [AutomationStagedCase(**row) for row in rows]
+    def count_cases(self) -> int:
+        with self._connection() as connection:
+            row = connection.execute("SELECT COUNT(*) AS total FROM staging_cases").fetchone()
+        return int(row["total"] or 0)
+
+    def list_cases(
+        self,
+        *,
+        limit: int | None = None,
+        offset: int = 0,
+        include_analysis: bool = True,
+    ) -> list[AutomationStagedCase]:
+        """Casos del mas reciente al mas antiguo, por paginas.
+
+        Con ``include_analysis=False`` el analisis no se lee (queda ``{}``) y se
+        carga despues con ``get_case``.  ``limit=None`` devuelve todos desde ``offset``.
+        """
+        query = """
+            SELECT c.*{analysis_column}
+            FROM staging_cases c
+            {analysis_join}
+            ORDER BY c.updated_at DESC, c.case_id
+            LIMIT ? OFFSET ?
+        """.format(
+            analysis_column=", a.analysis_json" if include_analysis else "",
+            analysis_join="LEFT JOIN staging_case_analysis a ON a.case_id = c.case_id" if include_analysis else "",
+        )
+        page_limit = -1 if limit is None else max(0, int(limit))
+        with self._connection() as connection:
+            rows = connection.execute(query, (page_limit, max(0, int(offset or 0)))).fetchall()
+        return [
+            self._case_from_row(row, analysis=_loads(row["analysis_json"]) if include_analysis else None)
+            for row in rows
+        ]
 
     def get_case(self, case_id: str) -> AutomationStagedCase | None:
         case_id_clean = str(case_id or "").strip()
         if not case_id_clean:
             return None
-        rows = self._load_raw()
-        row = next((item for item in rows if str(item.get("case_id") or "") == case_id_clean), None)
-        return AutomationStagedCase(**row) if row else None
+        with self._connection() as connection:
+            return self._fetch_case(connection, case_id_clean)
 
     def update_case(
         self,
@@ -118,23 +278,31 @@ class AutomationStagingRepository:
         if not case_id_clean:
             raise RuntimeError("Debe indicar case_id para actualizar staging.")
 
-        with AutomationStagingRepository._global_lock:
-            rows = self._load_raw()
-            existing_index = next((idx for idx, item in enumerate(rows) if str(item.get("case_id") or "") == case_id_clean), None)
-            if existing_index is None:
-                raise RuntimeError(f"No existe el caso de staging {case_id_clean}.")
-
-            current = dict(rows[existing_index])
-            suggestion = dict(current.get("suggestion") or {})
-            if suggestion_updates:
-                for key, value in dict(suggestion_updates).items():
-                    if value is None:
-                        continue
-                    suggestion[str(key)] = value
-            current["suggestion"] = suggestion
-            if status:
-                current["status"] = str(status).strip()
-            current["updated_at"] = _utc_now_iso()
-            rows[existing_index] = current
-            self._save_raw(rows)
-        return AutomationStagedCase(**current)
+        with self._connection() as connection:
+            with connection:
+                row = connection.execute(
+                    "SELECT status, suggestion_json FROM staging_cases WHERE case_id = ?",
+                    (case_id_clean,),
+                ).fetchone()
+                if row is None:
+                    raise RuntimeError(f"No existe el caso de staging {case_id_clean}.")
+
+                suggestion = _loads(row["suggestion_json"])
+                if suggestion_updates:
+                    for key, value in dict(suggestion_updates).items():
+                        if value is None:
+                            continue
+                        suggestion[str(key)] = value
+                connection.execute(
+                    "UPDATE staging_cases SET suggestion_json = ?, status = ?, updated_at = ? WHERE case_id = ?",
+                    (
+                        _dumps(suggestion),
+                        str(status).strip() if status else str(row["status"]),
+                        _utc_now_iso(),
+                        case_id_clean,
+                    ),
+                )
+            case = self._fetch_case(connection, case_id_clean)
+        if case is None:
+            raise RuntimeError(f"No existe el caso de staging {case_id_clean}.")
+        return case
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import threading
+
+from app.paths import app_data_dir
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class GmailSyncState:
+    """Checkpoint de sincronizacion incremental de Gmail, por buzon y filtro.
+
+    Guarda el ultimo ``historyId`` visto y los correos ya entregados al escaneo
+    que aun no estan marcados como procesados, para volver a ofrecerlos aunque
+    el ``historyId`` haya avanzado.  Se guarda como un objeto JSON en AppData.
+    """
+
+    _global_lock: threading.Lock = threading.Lock()
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path or (app_data_dir() / "automation_gmail_sync_state.json")
+
+    def _ensure_parent(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _load_raw(self) -> dict[str, dict]:
+        if not self._path.exists():
+            return {}
+        text = self._path.read_text(encoding="utf-8").strip()
+        if not text:
+            return {}
+        try:
+            payload = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise RuntimeError(
+                f"El estado de sincronizacion de Gmail esta corrupto y no puede leerse: {exc}"
+            ) from exc
+        if not isinstance(payload, dict):
+            raise RuntimeError("El estado de sincronizacion de Gmail tiene un formato invalido.")
+        return {str(key): dict(value) for key, value in payload.items() if isinstance(value, dict)}
+
+    def _save_raw(self, data: dict[str, dict]) -> None:
+        self._ensure_parent()
+        content = json.dumps(data, ensure_ascii=True, indent=2)
+        tmp_path = self._path.with_suffix(".tmp")
+        try:
+            tmp_path.write_text(content, encoding="utf-8")
+            tmp_path.replace(self._path)
+        except Exception:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+
+    def load(self, key: str) -> dict:
+        with GmailSyncState._global_lock:
+            data = self._load_raw()
+        entry = data.get(str(key or ""), {})
+        return {
+            "history_id": str(entry.get("history_id") or "").strip(),
+            "pending_ids": [
+                str(item).strip() for item in list(entry.get("pending_ids") or []) if str(item).strip()
+            ],
+            "updated_at": str(entry.get("updated_at") or ""),
+        }
+
+    def save(self, key: str, *, history_id: str, pending_ids: list[str]) -> None:
+        history_id_clean = str(history_id or "").strip()
+        if not history_id_clean:
+            return
+        with GmailSyncState._global_lock:
+            data = self._load_raw()
+            data[str(key or "")] = {
+                "history_id": history_id_clean,
+                "pending_ids": list(dict.fromkeys(str(item).strip() for item in pending_ids if str(item).strip())),
+                "updated_at": _utc_now_iso(),
+            }
+            self._save_raw(data)
+
+    def clear(self, key: str) -> None:
+        with GmailSyncState._global_lock:
+            data = self._load_raw()
+            if data.pop(str(key or ""), None) is not None:
+                self._save_raw(data)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from functools import lru_cache
 import sqlite3
 from pathlib import Path
-from typing import Any, Iterable
+import threading
+from typing import Any, Callable, Iterable
 
 from app.logging_utils import LOGGER_BACKEND, get_logger
 from app.paths import app_data_dir
@@ -17,6 +19,15 @@ _LOGGER = get_logger(LOGGER_BACKEND)
 _DB_FILENAME = "catalog_indexes.sqlite3"
 _REMOTE_PAGE_SIZE = 1000
 _DETAIL_CACHE_TTL_SECONDS = 300
+# Cedulas por consulta ``in.(...)``: mantiene la URL de PostgREST muy por debajo
+# del limite aun con actas de seleccion grupales.
+_USER_DETAIL_CHUNK_SIZE = 100
+_USER_DETAIL_MAX_WORKERS = 4
+_DETAIL_CACHE_MAX_ENTRIES = 20000
+_USER_DETAIL_FIELDS = (
+    "nombre_usuario,cedula_usuario,discapacidad_usuario,genero_usuario,"
+    "tipo_contrato,fecha_firma_contrato,cargo_oferente"
+)
 _FULL_REBUILD_INTERVAL = timedelta(days=7)
 _INCREMENTAL_MARGIN = timedelta(minutes=5)
 _SUPPORTED_CATALOGS = ("empresas", "profesionales", "usuarios", "tarifas")
@@ -841,65 +852,164 @@ def get_company_detail_by_nit(nit: str) -> dict[str, Any] | None:
     return _get_company_detail_cached(str(nit or "").strip(), ttl_bucket(_DETAIL_CACHE_TTL_SECONDS))
 
 
-@lru_cache
-def _get_user_detail_cached(cedula: str, _ttl_bucket: int) -> dict[str, Any] | None:
-    cedula_clean = str(cedula or "").strip()
-    if not cedula_clean:
-        return None
+def get_company_details_by_nits(nits: Iterable[str]) -> dict[str, dict[str, Any]]:
+    nits_clean = sorted({str(item or "").strip() for item in nits if str(item or "").strip()})
+    if not nits_clean:
+        return {}
+    if len(nits_clean) == 1:
+        detail = get_company_detail_by_nit(nits_clean[0])
+        if not detail:
+            return {}
+        return {nits_clean[0]: detail}
+
     response = execute_with_reauth(
         lambda client: (
-            client.table("usuarios_reca")
-            .select(
-                "nombre_usuario,cedula_usuario,discapacidad_usuario,genero_usuario,"
-                "tipo_contrato,fecha_firma_contrato,cargo_oferente"
-            )
-            .eq("cedula_usuario", cedula_clean)
-            .limit(1)
+            client.table("empresas")
+            .select("nit_empresa,nombre_empresa,caja_compensacion,asesor,zona_empresa,sede_empresa,ciudad_empresa")
+            .in_("nit_empresa", nits_clean)
             .execute()
         ),
-        context="catalog_index.user_detail",
+        context="catalog_index.company_detail_batch",
     )
-    rows = list(response.data or [])
-    if not rows:
-        return None
-    return dict(rows[0])
-
-
-def get_user_detail_by_cedula(cedula: str) -> dict[str, Any] | None:
-    return _get_user_detail_cached(str(cedula or "").strip(), ttl_bucket(_DETAIL_CACHE_TTL_SECONDS))
+    result: dict[str, dict[str, Any]] = {}
+    for row in list(response.data or []):
+        nit = str(dict(row).get("nit_empresa") or "").strip()
+        if nit and nit not in result:
+            result[nit] = dict(row)
+    return result
 
 
-def get_user_details_by_cedulas(cedulas: Iterable[str]) -> dict[str, dict[str, Any]]:
-    cedulas_clean = sorted({str(item or "").strip() for item in cedulas if str(item or "").strip()})
-    if not cedulas_clean:
-        return {}
-    if len(cedulas_clean) == 1:
-        detail = get_user_detail_by_cedula(cedulas_clean[0])
-        if not detail:
+class _BulkDetailResolver:
+    """Resuelve detalles remotos por llave con cache, en bloques y en paralelo.
+
+    Los aciertos del cache (incluidas las llaves que no existen) se sirven sin
+    consultar; las llaves faltantes se piden en bloques de ``chunk_size``, con
+    varios bloques en paralelo.  Si otro hilo ya esta consultando una llave se
+    espera su resultado en vez de repetir la consulta.  Las entradas vencen
+    con el ``ttl_bucket`` en que se guardaron.
+    """
+
+    def __init__(
+        self,
+        fetch_chunk: Callable[[list[str]], dict[str, dict[str, Any]]],
+        *,
+        ttl_seconds: int,
+        chunk_size: int,
+        max_workers: int,
+        max_entries: int = _DETAIL_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self._fetch_chunk = fetch_chunk
+        self._ttl_seconds = ttl_seconds
+        self._chunk_size = max(1, int(chunk_size))
+        self._max_workers = max(1, int(max_workers))
+        self._max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._cache: dict[str, tuple[int, dict[str, Any] | None]] = {}
+        self._in_flight: dict[str, Future] = {}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def resolve(self, keys: Iterable[str]) -> dict[str, dict[str, Any]]:
+        wanted = sorted({str(item or "").strip() for item in keys if str(item or "").strip()})
+        if not wanted:
             return {}
-        return {cedulas_clean[0]: detail}
-
+        bucket = ttl_bucket(self._ttl_seconds)
+        result: dict[str, dict[str, Any]] = {}
+        pending: dict[str, Future] = {}
+        owned: dict[str, Future] = {}
+        with self._lock:
+            for key in wanted:
+                cached = self._cache.get(key)
+                if cached is not None and cached[0] == bucket:
+                    if cached[1] is not None:
+                        result[key] = dict(cached[1])
+                    continue
+                future = self._in_flight.get(key)
+                if future is None:
+                    future = Future()
+                    self._in_flight[key] = future
+                    owned[key] = future
+                pending[key] = future
+
+        if owned:
+            keys_owned = list(owned)
+            chunks = [keys_owned[i : i + self._chunk_size] for i in range(0, len(keys_owned), self._chunk_size)]
+            if len(chunks) == 1:
+                self._fetch_and_settle(chunks[0], owned, bucket)
+            else:
+                with ThreadPoolExecutor(
+                    max_workers=min(self._max_workers, len(chunks)),
+                    thread_name_prefix="catalog-detail",
+                ) as pool:
+                    list(pool.map(lambda chunk: self._fetch_and_settle(chunk, owned, bucket), chunks))
+
+        for key, future in pending.items():
+            detail = future.result()
+            if detail is not None:
+                result[key] = dict(detail)
+        return result
+
+    def _fetch_and_settle(self, chunk: list[str], futures: dict[str, Future], bucket: int) -> None:
+        try:
+            found = self._fetch_chunk(chunk)
+        except Exception as exc:
+            with self._lock:
+                for key in chunk:
+                    self._in_flight.pop(key, None)
+            for key in chunk:
+                futures[key].set_exception(exc)
+            return
+        with self._lock:
+            if len(self._cache) + len(chunk) > self._max_entries:
+                self._cache = {key: entry for key, entry in self._cache.items() if entry[0] == bucket}
+            for key in chunk:
+                self._cache[key] = (bucket, found.get(key))
+                self._in_flight.pop(key, None)
+        for key in chunk:
+            futures[key].set_result(found.get(key))
+
+
+def _fetch_user_details_chunk(cedulas: list[str]) -> dict[str, dict[str, Any]]:
     response = execute_with_reauth(
         lambda client: (
             client.table("usuarios_reca")
-            .select(
-                "nombre_usuario,cedula_usuario,discapacidad_usuario,genero_usuario,"
-                "tipo_contrato,fecha_firma_contrato,cargo_oferente"
-            )
-            .in_("cedula_usuario", cedulas_clean)
+            .select(_USER_DETAIL_FIELDS)
+            .in_("cedula_usuario", cedulas)
             .execute()
         ),
         context="catalog_index.user_detail_batch",
     )
-    rows = [dict(item) for item in list(response.data or [])]
     result: dict[str, dict[str, Any]] = {}
-    for row in rows:
+    for item in list(response.data or []):
+        row = dict(item)
         cedula = str(row.get("cedula_usuario") or "").strip()
-        if cedula:
+        if cedula and cedula not in result:
             result[cedula] = row
     return result
 
 
+_USER_DETAILS = _BulkDetailResolver(
+    lambda cedulas: _fetch_user_details_chunk(cedulas),
+    ttl_seconds=_DETAIL_CACHE_TTL_SECONDS,
+    chunk_size=_USER_DETAIL_CHUNK_SIZE,
+    max_workers=_USER_DETAIL_MAX_WORKERS,
+)
+
+
+def get_user_detail_by_cedula(cedula: str) -> dict[str, Any] | None:
+    cedula_clean = str(cedula or "").strip()
+    if not cedula_clean:
+        return None
+    return _USER_DETAILS.resolve([cedula_clean]).get(cedula_clean)
+
+
+def get_user_details_by_cedulas(cedulas: Iterable[str]) -> dict[str, dict[str, Any]]:
+    """Detalle de ``usuarios_reca`` por cedula; solo se consultan las que no estan en cache."""
+    return _USER_DETAILS.resolve(cedulas)
+
+
 def clear_runtime_caches() -> None:
     _get_company_detail_cached.cache_clear()
-    _get_user_detail_cached.cache_clear()
+    _USER_DETAILS.clear()
@@ -178,6 +178,10 @@ class Settings:
         self.google_drive_template_spreadsheet_name = _clean_env(
             os.getenv("GOOGLE_DRIVE_TEMPLATE_SPREADSHEET_NAME", "")
         )
+        try:
+            self.google_drive_cache_max_mb = int(_clean_env(os.getenv("GOOGLE_DRIVE_CACHE_MAX_MB", "200")) or "200")
+        except ValueError:
+            self.google_drive_cache_max_mb = 200
         self.google_gmail_delegated_user = _clean_env(
             os.getenv("GOOGLE_GMAIL_DELEGATED_USER", "")
         )
@@ -202,6 +206,22 @@ class Settings:
         self.automation_llm_extraction_enabled = _env_bool(
             "AUTOMATION_LLM_EXTRACTION_ENABLED", False
         )
+        self.automation_llm_cache_enabled = _env_bool(
+            "AUTOMATION_LLM_CACHE_ENABLED", True
+        )
+        self.automation_llm_local_first_enabled = _env_bool(
+            "AUTOMATION_LLM_LOCAL_FIRST_ENABLED", True
+        )
+        try:
+            self.automation_llm_max_concurrency = int(_clean_env(os.getenv("AUTOMATION_LLM_MAX_CONCURRENCY", "3")) or "3")
+        except ValueError:
+            self.automation_llm_max_concurrency = 3
+        try:
+            self.automation_llm_requests_per_minute = float(
+                _clean_env(os.getenv("AUTOMATION_LLM_REQUESTS_PER_MINUTE", "20")) or "20"
+            )
+        except ValueError:
+            self.automation_llm_requests_per_minute = 20.0
         self.supabase_edge_acta_extraction_function = _env_or_default(
             "SUPABASE_EDGE_ACTA_EXTRACTION_FUNCTION",
             "extract-acta-ods",
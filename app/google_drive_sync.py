@@ -14,6 +14,7 @@ from app.google_sheet_layouts import (
 )
 from app.google_sheets_client import (
     clear_sheet_values,
+    column_letter,
     copy_drive_file,
     get_spreadsheet,
     list_drive_files,
@@ -72,15 +73,6 @@ def _log_event(level: str, context: str, op_id: str, message: str, *args, **kwar
     log_fn(f"[ctx={context} op={op_id}] {message}", *args, **kwargs)
 
 
-def _column_letter(index: int) -> str:
-    letters: list[str] = []
-    current = index
-    while current > 0:
-        current, remainder = divmod(current - 1, 26)
-        letters.append(chr(65 + remainder))
-    return "".join(reversed(letters))
-
-
 def resolve_monthly_spreadsheet_name(month: int, year: int) -> str:
     month_int = int(month)
     year_int = int(year)
@@ -199,7 +191,7 @@ def _find_input_sheet(spreadsheet_id: str) -> tuple[str, int]:
 
 
 def _clear_input_data(spreadsheet_id: str, sheet_title: str, header_width: int) -> None:
-    end_column = _column_letter(header_width)
+    end_column = column_letter(header_width)
     clear_sheet_values(spreadsheet_id, f"'{sheet_title}'!A2:{end_column}")
 
 
@@ -241,7 +233,7 @@ def _ensure_monthly_spreadsheet(
 
 
 def _next_available_row(spreadsheet_id: str, sheet_title: str, header_width: int) -> tuple[int, set[str]]:
-    end_column = _column_letter(header_width)
+    end_column = column_letter(header_width)
     rows = read_sheet_values(spreadsheet_id, f"'{sheet_title}'!A2:{end_column}")
     existing_ids: set[str] = set()
     last_nonempty_index = -1
@@ -284,7 +276,7 @@ def _sync_new_ods_record_once(ods_data: dict[str, Any], *, meta: dict[str, Any]
         }
 
     row_values = ods_input_row_from_record(ods_data)
-    end_column = _column_letter(len(ODS_INPUT_HEADERS))
+    end_column = column_letter(len(ODS_INPUT_HEADERS))
     write_sheet_values(
         spreadsheet_id,
         f"'{sheet_title}'!A{target_row}:{end_column}{target_row}",
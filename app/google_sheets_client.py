@@ -25,6 +25,15 @@ _GOOGLE_FILE_FIELDS = "files(id,name,mimeType,parents,driveId),nextPageToken"
 _GOOGLE_SPREADSHEET_MIME = "application/vnd.google-apps.spreadsheet"
 
 
+def column_letter(index: int) -> str:
+    letters: list[str] = []
+    current = index
+    while current > 0:
+        current, remainder = divmod(current - 1, 26)
+        letters.append(chr(65 + remainder))
+    return "".join(reversed(letters))
+
+
 def extract_spreadsheet_id(value: str) -> str:
     text = str(value or "").strip()
     if not text:
@@ -142,6 +151,29 @@ def get_google_gmail_service(*, delegated_subject: str | None = None):
     return _get_google_service("gmail", "v1", scopes=_GMAIL_READONLY_SCOPES, delegated_subject=subject)
 
 
+def new_google_gmail_service(*, delegated_subject: str | None = None):
+    """Construye un servicio Gmail propio, fuera de la cache compartida.
+
+    httplib2 no es seguro entre hilos: cada hilo que descarga en paralelo
+    necesita su propio objeto de servicio.  Las credenciales si se reutilizan.
+    """
+    settings = get_settings()
+    subject = str(delegated_subject or settings.google_gmail_delegated_user or "").strip()
+    if not subject:
+        raise RuntimeError("Falta GOOGLE_GMAIL_DELEGATED_USER para acceder a Gmail con service account.")
+    try:
+        from googleapiclient.discovery import build
+    except ImportError as exc:
+        raise RuntimeError(
+            "Faltan dependencias de Google Sheets/Drive. Instala requirements.txt."
+        ) from exc
+
+    path = _credentials_path()
+    bucket = ttl_bucket(_CLIENT_CACHE_TTL_SECONDS)
+    credentials = _get_google_credentials_cached(str(path), tuple(_GMAIL_READONLY_SCOPES), subject, bucket)
+    return build("gmail", "v1", credentials=credentials, cache_discovery=False)
+
+
 def get_default_spreadsheet_id() -> str:
     settings = get_settings()
     spreadsheet_id = settings.google_sheets_default_spreadsheet_id
@@ -174,6 +206,43 @@ def read_sheet_values(spreadsheet_id_or_url: str, range_name: str) -> list[list[
     return list(response.get("values", []))
 
 
+def batch_read_sheet_values(spreadsheet_id_or_url: str, ranges: list[str]) -> list[list[list[Any]]]:
+    if not ranges:
+        return []
+    spreadsheet_id = extract_spreadsheet_id(spreadsheet_id_or_url)
+    service = get_google_sheets_service()
+    response = (
+        service.spreadsheets()
+        .values()
+        .batchGet(spreadsheetId=spreadsheet_id, ranges=ranges)
+        .execute()
+    )
+    return [list(item.get("values", [])) for item in response.get("valueRanges", [])]
+
+
+def read_spreadsheet_matrices(
+    spreadsheet_id_or_url: str,
+    *,
+    max_rows: int,
+    max_cols: int,
+) -> list[dict[str, Any]]:
+    """Lee todas las hojas en un solo ``values.batchGet`` acotado a ``max_rows`` x ``max_cols``."""
+    spreadsheet = get_spreadsheet(spreadsheet_id_or_url, include_grid_data=False)
+    sheets: list[dict[str, Any]] = []
+    for sheet in spreadsheet.get("sheets", []):
+        props = sheet.get("properties", {})
+        sheets.append({"title": str(props.get("title") or "Sheet"), "hidden": bool(props.get("hidden"))})
+    end_column = column_letter(max_cols)
+    ranges: list[str] = []
+    for item in sheets:
+        safe_title = item["title"].replace("'", "''")
+        ranges.append(f"'{safe_title}'!A1:{end_column}{max_rows}")
+    values = batch_read_sheet_values(spreadsheet["spreadsheetId"], ranges)
+    for idx, item in enumerate(sheets):
+        item["values"] = values[idx] if idx < len(values) else []
+    return sheets
+
+
 def write_sheet_values(
     spreadsheet_id_or_url: str,
     range_name: str,
@@ -197,6 +266,31 @@ def write_sheet_values(
     )
 
 
+def append_sheet_values(
+    spreadsheet_id_or_url: str,
+    range_name: str,
+    values: list[list[Any]],
+    *,
+    value_input_option: str = "USER_ENTERED",
+) -> dict[str, Any]:
+    """Agrega filas al final de la tabla de ``range_name`` con un solo ``values.append``."""
+    spreadsheet_id = extract_spreadsheet_id(spreadsheet_id_or_url)
+    service = get_google_sheets_service()
+    body = {"values": values}
+    return (
+        service.spreadsheets()
+        .values()
+        .append(
+            spreadsheetId=spreadsheet_id,
+            range=range_name,
+            valueInputOption=value_input_option,
+            insertDataOption="INSERT_ROWS",
+            body=body,
+        )
+        .execute()
+    )
+
+
 def clear_sheet_values(spreadsheet_id_or_url: str, range_name: str) -> dict[str, Any]:
     spreadsheet_id = extract_spreadsheet_id(spreadsheet_id_or_url)
     service = get_google_sheets_service()
@@ -276,17 +370,15 @@ def get_drive_file_metadata(file_id_or_url: str) -> dict[str, Any]:
         .get(
             fileId=file_id,
             supportsAllDrives=True,
-            fields="id,name,mimeType,parents,driveId,webViewLink",
+            fields="id,name,mimeType,parents,driveId,webViewLink,md5Checksum,modifiedTime,size",
         )
         .execute()
     )
 
 
-def download_drive_file(file_id_or_url: str, destination: str | Path) -> Path:
+def download_drive_file_bytes(file_id_or_url: str) -> bytes:
     file_id = extract_drive_file_id(file_id_or_url)
     drive = get_google_drive_service()
-    destination_path = Path(destination).expanduser()
-    destination_path.parent.mkdir(parents=True, exist_ok=True)
 
     try:
         from googleapiclient.http import MediaIoBaseDownload
@@ -301,38 +393,4 @@ def download_drive_file(file_id_or_url: str, destination: str | Path) -> Path:
     done = False
     while not done:
         _status, done = downloader.next_chunk()
-    destination_path.write_bytes(buffer.getvalue())
-    return destination_path
-
-
-def export_spreadsheet_to_excel(spreadsheet_id_or_url: str, destination: str | Path) -> Path:
-    spreadsheet = get_spreadsheet(spreadsheet_id_or_url, include_grid_data=False)
-    destination_path = Path(destination).expanduser()
-    destination_path.parent.mkdir(parents=True, exist_ok=True)
-
-    try:
-        from openpyxl import Workbook
-    except ImportError as exc:
-        raise RuntimeError("openpyxl no esta instalado.") from exc
-
-    wb = Workbook()
-    default_ws = wb.active
-    wb.remove(default_ws)
-
-    for sheet in spreadsheet.get("sheets", []):
-        props = sheet.get("properties", {})
-        title = str(props.get("title") or "Sheet")
-        ws = wb.create_sheet(title=title[:31] or "Sheet")
-        rows = read_sheet_values(spreadsheet["spreadsheetId"], f"'{title}'")
-        for row_idx, row in enumerate(rows, start=1):
-            for col_idx, value in enumerate(row, start=1):
-                ws.cell(row=row_idx, column=col_idx, value=value)
-        frozen_rows = int(props.get("gridProperties", {}).get("frozenRowCount", 0) or 0)
-        frozen_cols = int(props.get("gridProperties", {}).get("frozenColumnCount", 0) or 0)
-        if frozen_rows > 0 or frozen_cols > 0:
-            ws.freeze_panes = ws.cell(row=frozen_rows + 1, column=frozen_cols + 1)
-
-    if not wb.worksheets:
-        wb.create_sheet("Sheet")
-    wb.save(destination_path)
-    return destination_path
+    return buffer.getvalue()
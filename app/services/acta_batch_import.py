@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+import re
+import threading
+import time
+
+from app.logging_utils import LOGGER_BACKEND, get_logger
+from app.services.acta_import_pipeline import ImportSession, build_import_result_from_parsed_source
+from app.services.excel_acta_import import parse_acta_source
+
+_logger = get_logger(LOGGER_BACKEND)
+
+_DEFAULT_MAX_WORKERS = 4
+_ACTA_EXTENSIONS = {".xlsx", ".xlsm", ".pdf"}
+_REMOTE_SOURCE_RE = re.compile(r"^https?://", re.IGNORECASE)
+
+BATCH_IMPORT_OK = "ok"
+BATCH_IMPORT_ERROR = "error"
+
+
+@dataclass(frozen=True)
+class ActaBatchSource:
+    index: int
+    source: str
+    source_label: str
+
+
+@dataclass(frozen=True)
+class ActaBatchImportItem:
+    source: ActaBatchSource
+    status: str
+    result: dict = field(default_factory=dict)
+    error: str = ""
+    elapsed_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == BATCH_IMPORT_OK
+
+
+def _source_label(source: str) -> str:
+    # Las URLs de Drive no traen el nombre del archivo hasta parsearlas.
+    if _REMOTE_SOURCE_RE.match(source):
+        return source
+    return Path(source).name or source
+
+
+def collect_acta_sources(entries: Iterable[str]) -> list[ActaBatchSource]:
+    """Expande carpetas a sus actas Excel/PDF y conserva archivos y URLs de Drive en orden.
+
+    Las carpetas se recorren sin subcarpetas, ordenadas por nombre; los
+    archivos temporales de Office (``~$``) se omiten y las fuentes repetidas
+    se cuentan una sola vez.
+    """
+    sources: list[str] = []
+    for raw_entry in entries:
+        entry = str(raw_entry or "").strip()
+        if not entry:
+            continue
+        if _REMOTE_SOURCE_RE.match(entry):
+            sources.append(entry)
+            continue
+        path = Path(entry).expanduser()
+        if path.is_dir():
+            sources.extend(
+                str(candidate)
+                for candidate in sorted(path.iterdir(), key=lambda item: item.name.lower())
+                if candidate.is_file()
+                and candidate.suffix.lower() in _ACTA_EXTENSIONS
+                and not candidate.name.startswith("~$")
+            )
+            continue
+        sources.append(str(path))
+    unique = list(dict.fromkeys(sources))
+    return [ActaBatchSource(index=index, source=source, source_label=_source_label(source)) for index, source in enumerate(unique)]
+
+
+def iter_batch_import_results(
+    sources: Iterable[ActaBatchSource],
+    *,
+    max_workers: int = _DEFAULT_MAX_WORKERS,
+    session: ImportSession | None = None,
+    cancel_event: threading.Event | None = None,
+    create_missing_interpreter: bool = True,
+) -> Iterator[ActaBatchImportItem]:
+    """Prepara varias actas en paralelo y entrega cada resultado apenas esta listo.
+
+    Cada archivo pasa por dos etapas en el mismo pool: parseo y luego
+    conciliacion (ACTA ID, profesional, oferentes, empresa) con sugerencia de
+    servicio.  Las actas que terminan de parsearse juntas se prefetchean en
+    una sola consulta de cedulas y NIT de la ``ImportSession`` compartida, y
+    los catalogos se leen una vez para todo el lote.  Los resultados llegan
+    en orden de terminacion; ``item.source.index`` da la posicion original.
+    Con ``cancel_event`` activo no se inician archivos nuevos.
+    """
+    pending_sources = list(sources)
+    if not pending_sources:
+        return
+    shared_session = session or ImportSession()
+    started_at: dict[int, float] = {}
+
+    def _parse(item: ActaBatchSource) -> dict:
+        started_at[item.index] = time.monotonic()
+        return parse_acta_source(item.source)
+
+    def _resolve(item: ActaBatchSource, parsed: dict) -> dict:
+        return build_import_result_from_parsed_source(
+            parsed,
+            source_label=item.source_label,
+            create_missing_interpreter=create_missing_interpreter,
+            session=shared_session,
+        )
+
+    def _finished(item: ActaBatchSource, *, result: dict | None = None, error: BaseException | None = None) -> ActaBatchImportItem:
+        elapsed = time.monotonic() - started_at.get(item.index, time.monotonic())
+        if error is not None:
+            return ActaBatchImportItem(source=item, status=BATCH_IMPORT_ERROR, error=str(error), elapsed_seconds=elapsed)
+        return ActaBatchImportItem(source=item, status=BATCH_IMPORT_OK, result=dict(result or {}), elapsed_seconds=elapsed)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="acta-batch-import")
+    parsing: dict[Future, ActaBatchSource] = {}
+    resolving: dict[Future, ActaBatchSource] = {}
+    try:
+        for item in pending_sources:
+            parsing[pool.submit(_parse, item)] = item
+        while parsing or resolving:
+            if cancel_event is not None and cancel_event.is_set():
+                for future in list(parsing) + list(resolving):
+                    future.cancel()
+                return
+            done, _not_done = wait(list(parsing) + list(resolving), timeout=0.5, return_when=FIRST_COMPLETED)
+            parsed_ready: list[tuple[ActaBatchSource, dict]] = []
+            for future in done:
+                if future in resolving:
+                    item = resolving.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        _logger.warning("No se pudo preparar el acta %s: %s", item.source_label, error)
+                    yield _finished(item, result=None if error else future.result(), error=error)
+                    continue
+                item = parsing.pop(future)
+                error = future.exception()
+                if error is not None:
+                    _logger.warning("No se pudo leer el acta %s: %s", item.source_label, error)
+                    yield _finished(item, error=error)
+                    continue
+                parsed_ready.append((item, dict(future.result() or {})))
+            if not parsed_ready:
+                continue
+            try:
+                shared_session.prefetch(parsed for _item, parsed in parsed_ready)
+            except Exception as exc:
+                # Sin prefetch cada acta consulta lo suyo al conciliarse.
+                _logger.warning("No se pudo precargar cedulas/NIT del lote: %s", exc)
+            for item, parsed in parsed_ready:
+                resolving[pool.submit(_resolve, item, parsed)] = item
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 import difflib
 import logging
+import threading
 from typing import Any
 
 from app.automation.document_classifier import classify_document
 from app.catalog_index import (
     get_company_detail_by_nit,
+    get_company_details_by_nits,
     get_indexed_empresas,
     get_indexed_profesionales,
     get_user_details_by_cedulas,
@@ -132,9 +135,13 @@ def _company_by_nit(nit: str) -> dict[str, Any] | None:
     return get_company_detail_by_nit(str(nit or "").strip())
 
 
-def _professional_email_map() -> dict[str, str]:
+def _companies_by_nit(nits: list[str]) -> dict[str, dict[str, Any]]:
+    return get_company_details_by_nits(nits)
+
+
+def _professional_email_map(professionals: Iterable[dict[str, Any]] | None = None) -> dict[str, str]:
     allowed: dict[str, str] = {}
-    for row in _professionals():
+    for row in _professionals() if professionals is None else professionals:
         email = str(row.get("correo_profesional") or "").strip().lower()
         name = str(row.get("nombre_profesional") or "").strip()
         if email and name:
@@ -142,7 +149,137 @@ def _professional_email_map() -> dict[str, str]:
     return allowed
 
 
-def _resolve_non_interpreter_professional(analysis: dict, *, sender_match: str = "") -> str:
+class ImportSession:
+    """Catalogos y consultas compartidos por los documentos de una misma importacion.
+
+    Los catalogos indexados (profesionales, interpretes, empresas y el mapa de
+    correos de profesionales) se leen una sola vez por sesion.  ``prefetch``
+    trae en una consulta por tabla las cedulas y NIT de varios documentos, asi
+    que cada documento solo consulta Supabase por lo que no quedo en la sesion
+    (tambien se recuerdan las cedulas y NIT que no existen).  Se puede compartir
+    entre hilos; se crea una por importacion desde la GUI o por escaneo en lote.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._professionals: tuple[dict[str, Any], ...] | None = None
+        self._interpreters: tuple[dict[str, Any], ...] | None = None
+        self._companies: tuple[dict[str, Any], ...] | None = None
+        self._email_map: dict[str, str] | None = None
+        self._users: dict[str, dict[str, Any]] = {}
+        self._unknown_cedulas: set[str] = set()
+        self._companies_by_nit: dict[str, dict[str, Any] | None] = {}
+        self._interpreter_creation_lock = threading.Lock()
+
+    def professionals(self) -> tuple[dict[str, Any], ...]:
+        with self._lock:
+            if self._professionals is None:
+                self._professionals = tuple(_professionals())
+            return self._professionals
+
+    def interpreters(self) -> tuple[dict[str, Any], ...]:
+        with self._lock:
+            if self._interpreters is None:
+                self._interpreters = tuple(_interpreters())
+            return self._interpreters
+
+    def companies(self) -> tuple[dict[str, Any], ...]:
+        with self._lock:
+            if self._companies is None:
+                self._companies = tuple(_companies())
+            return self._companies
+
+    def professional_email_map(self) -> dict[str, str]:
+        with self._lock:
+            if self._email_map is None:
+                self._email_map = _professional_email_map(self.professionals())
+            return self._email_map
+
+    def clear_catalogs(self) -> None:
+        """Descarta los catalogos leidos (p. ej. tras crear un interprete nuevo)."""
+        with self._lock:
+            self._professionals = None
+            self._interpreters = None
+            self._companies = None
+            self._email_map = None
+
+    def create_interpreter(self, name: str, *, candidates: list[str]) -> str:
+        """Crea el interprete ``name`` salvo que algun candidato ya este en el catalogo.
+
+        La revision y la creacion van bajo un mismo candado y sobre el catalogo
+        recien leido: si otro hilo de la sesion lo creo primero, se reutiliza.
+        """
+        with self._interpreter_creation_lock:
+            clear_import_pipeline_caches()
+            self.clear_catalogs()
+            existing = _match_interpreter(candidates, self.interpreters())
+            if existing:
+                return existing
+            seccion1.crear_profesional(
+                seccion1.CrearProfesionalRequest(
+                    nombre_profesional=name,
+                    programa="Interprete",
+                )
+            )
+            clear_import_pipeline_caches()
+            self.clear_catalogs()
+            return name
+
+    def users_by_cedula(self, cedulas: Iterable[str]) -> dict[str, dict[str, Any]]:
+        wanted = list(dict.fromkeys(str(item or "").strip() for item in cedulas))
+        wanted = [cedula for cedula in wanted if cedula]
+        with self._lock:
+            missing = [item for item in wanted if item not in self._users and item not in self._unknown_cedulas]
+        if missing:
+            found = _users_by_cedula(missing)
+            with self._lock:
+                for cedula in missing:
+                    detail = found.get(cedula)
+                    if detail:
+                        self._users[cedula] = dict(detail)
+                    else:
+                        self._unknown_cedulas.add(cedula)
+        with self._lock:
+            return {cedula: self._users[cedula] for cedula in wanted if cedula in self._users}
+
+    def company_by_nit(self, nit: str) -> dict[str, Any] | None:
+        nit_clean = str(nit or "").strip()
+        if not nit_clean:
+            return None
+        with self._lock:
+            if nit_clean in self._companies_by_nit:
+                return self._companies_by_nit[nit_clean]
+        detail = _company_by_nit(nit_clean)
+        with self._lock:
+            self._companies_by_nit[nit_clean] = dict(detail) if detail else None
+            return self._companies_by_nit[nit_clean]
+
+    def prefetch(self, parsed_documents: Iterable[dict]) -> None:
+        """Consulta de una vez las cedulas de participantes y los NIT de todos los documentos."""
+        cedulas: list[str] = []
+        nits: list[str] = []
+        for parsed in parsed_documents:
+            data = dict(parsed or {})
+            cedulas.extend(str(item.get("cedula_usuario") or "").strip() for item in list(data.get("participantes") or []))
+            nits.append(str(data.get("nit_empresa") or "").strip())
+        self.users_by_cedula(cedulas)
+        with self._lock:
+            missing_nits = [nit for nit in dict.fromkeys(nits) if nit and nit not in self._companies_by_nit]
+        if not missing_nits:
+            return
+        found = _companies_by_nit(missing_nits)
+        with self._lock:
+            for nit in missing_nits:
+                detail = found.get(nit)
+                self._companies_by_nit[nit] = dict(detail) if detail else None
+
+
+def _resolve_non_interpreter_professional(
+    analysis: dict,
+    *,
+    sender_match: str = "",
+    session: ImportSession,
+) -> str:
     candidates: list[str] = []
     for raw_candidate in list(analysis.get("asistentes") or []):
         candidate = str(raw_candidate or "").strip()
@@ -159,8 +296,9 @@ def _resolve_non_interpreter_professional(analysis: dict, *, sender_match: str =
 
     best_name = ""
     best_score = 0.0
+    professionals = session.professionals()
     for candidate in candidates:
-        for row in _professionals():
+        for row in professionals:
             professional_name = str(row.get("nombre_profesional") or "").strip()
             score = _professional_name_matches(candidate, professional_name)
             if score > best_score:
@@ -176,7 +314,20 @@ def _normalize_interpreter_storage_name(value: str) -> str:
     return " ".join(part.capitalize() for part in clean.split(" "))
 
 
-def _resolve_or_create_interpreter(analysis: dict, *, create_missing: bool) -> str:
+def _match_interpreter(candidates: list[str], interpreters: Iterable[dict[str, Any]]) -> str:
+    best_name = ""
+    best_score = 0.0
+    interpreter_names = [str(item.get("nombre") or "").strip() for item in interpreters]
+    for candidate in candidates:
+        for interpreter_name in interpreter_names:
+            score = _professional_name_matches(candidate, interpreter_name)
+            if score > best_score:
+                best_score = score
+                best_name = interpreter_name
+    return best_name if best_name and best_score >= 0.85 else ""
+
+
+def _resolve_or_create_interpreter(analysis: dict, *, create_missing: bool, session: ImportSession) -> str:
     candidates: list[str] = []
     for raw_candidate in list(analysis.get("interpretes") or []):
         candidate = str(raw_candidate or "").strip()
@@ -194,29 +345,15 @@ def _resolve_or_create_interpreter(analysis: dict, *, create_missing: bool) -> s
     if not candidates:
         return ""
 
-    best_name = ""
-    best_score = 0.0
-    interpreter_names = [str(item.get("nombre") or "").strip() for item in _interpreters()]
-    for candidate in candidates:
-        for interpreter_name in interpreter_names:
-            score = _professional_name_matches(candidate, interpreter_name)
-            if score > best_score:
-                best_score = score
-                best_name = interpreter_name
-    if best_name and best_score >= 0.85:
-        return best_name
+    existing = _match_interpreter(candidates, session.interpreters())
+    if existing:
+        return existing
 
     candidate = _normalize_interpreter_storage_name(candidates[0])
     if not candidate:
         return ""
     if create_missing:
-        seccion1.crear_profesional(
-            seccion1.CrearProfesionalRequest(
-                nombre_profesional=candidate,
-                programa="Interprete",
-            )
-        )
-        clear_import_pipeline_caches()
+        return session.create_interpreter(candidate, candidates=candidates)
     return candidate
 
 
@@ -236,9 +373,9 @@ def _build_minimum_user(persona: dict) -> dict | None:
     }
 
 
-def _prepare_participants(parsed: dict) -> tuple[list[dict], list[str], list[str]]:
+def _prepare_participants(parsed: dict, *, session: ImportSession) -> tuple[list[dict], list[str], list[str]]:
     participantes_raw = list(parsed.get("participantes") or [])
-    usuarios_by_cedula = _users_by_cedula(
+    usuarios_by_cedula = session.users_by_cedula(
         [str(item.get("cedula_usuario") or "").strip() for item in participantes_raw]
     )
     participantes: list[dict] = []
@@ -291,13 +428,13 @@ def _prepare_participants(parsed: dict) -> tuple[list[dict], list[str], list[str
     return participantes, descartados, warnings
 
 
-def _resolve_company(parsed: dict) -> tuple[dict[str, Any] | None, list[str]]:
+def _resolve_company(parsed: dict, *, session: ImportSession) -> tuple[dict[str, Any] | None, list[str]]:
     nit = str(parsed.get("nit_empresa") or "").strip()
     name = str(parsed.get("nombre_empresa") or "").strip()
     warnings: list[str] = []
 
     if nit:
-        company_by_nit = _company_by_nit(nit)
+        company_by_nit = session.company_by_nit(nit)
         if not company_by_nit:
             return None, [f"El NIT {nit} no existe en Supabase."]
         canonical_name = str(company_by_nit.get("nombre_empresa") or "").strip()
@@ -308,7 +445,7 @@ def _resolve_company(parsed: dict) -> tuple[dict[str, Any] | None, list[str]]:
     if name:
         best_match: dict[str, Any] | None = None
         best_score = 0.0
-        for row in _companies():
+        for row in session.companies():
             company_name = str(row.get("nombre_empresa") or "").strip()
             if not company_name:
                 continue
@@ -318,7 +455,7 @@ def _resolve_company(parsed: dict) -> tuple[dict[str, Any] | None, list[str]]:
                 best_match = dict(row)
         if best_match:
             nit_match = str(best_match.get("nit_empresa") or "").strip()
-            company_detail = _company_by_nit(nit_match) if nit_match else None
+            company_detail = session.company_by_nit(nit_match) if nit_match else None
             warnings.append("NIT completado desde Supabase por coincidencia de nombre de empresa.")
             return dict(company_detail or best_match), warnings
 
@@ -353,13 +490,15 @@ def build_import_result_from_parsed(
     message: dict | None = None,
     attachment: dict | None = None,
     create_missing_interpreter: bool = True,
+    session: ImportSession | None = None,
 ) -> dict:
+    session = session or ImportSession()
     analysis = dict(parsed or {})
     message_data = dict(message or {})
     attachment_data = _attachment_context(source_label=source_label, message=message_data, attachment=attachment)
 
     sender_email = str(message_data.get("sender_email") or "").strip().lower()
-    sender_match = _professional_email_map().get(sender_email, "")
+    sender_match = session.professional_email_map().get(sender_email, "")
     warnings = list(analysis.get("warnings") or [])
     if sender_email and not sender_match:
         warnings.append("El remitente del correo no coincide con la tabla de profesionales.")
@@ -379,9 +518,9 @@ def build_import_result_from_parsed(
 
     is_interpreter = str(attachment_data.get("document_kind") or "") == "interpreter_service"
     professional_resolved = (
-        _resolve_or_create_interpreter(analysis, create_missing=create_missing_interpreter)
+        _resolve_or_create_interpreter(analysis, create_missing=create_missing_interpreter, session=session)
         if is_interpreter
-        else _resolve_non_interpreter_professional(analysis, sender_match=sender_match)
+        else _resolve_non_interpreter_professional(analysis, sender_match=sender_match, session=session)
     )
     if professional_resolved:
         analysis["nombre_profesional"] = professional_resolved
@@ -391,13 +530,13 @@ def build_import_result_from_parsed(
     elif not is_interpreter:
         analysis["nombre_profesional"] = ""
 
-    participants, discarded_ids, participant_warnings = _prepare_participants(analysis)
+    participants, discarded_ids, participant_warnings = _prepare_participants(analysis, session=session)
     analysis["participantes"] = participants
     if discarded_ids:
         analysis["_cedulas_descartadas"] = discarded_ids
     warnings.extend(participant_warnings)
 
-    company, company_warnings = _resolve_company(analysis)
+    company, company_warnings = _resolve_company(analysis, session=session)
     warnings.extend(company_warnings)
     blocking_errors = list(company_warnings if company is None else [])
     if company:
@@ -434,6 +573,7 @@ def build_import_result_from_completion_payload(
     source_label: str,
     row_context: dict | None = None,
     create_missing_interpreter: bool = True,
+    session: ImportSession | None = None,
 ) -> dict:
     payload = dict(payload_normalized or {})
     row_data = dict(row_context or {})
@@ -466,6 +606,7 @@ def build_import_result_from_completion_payload(
         source_label=source_label_clean,
         attachment=attachment,
         create_missing_interpreter=create_missing_interpreter,
+        session=session,
     )
 
 
@@ -477,8 +618,31 @@ def build_import_result_from_source(
     attachment: dict | None = None,
     create_missing_interpreter: bool = True,
     allow_acta_ref_lookup: bool = True,
+    session: ImportSession | None = None,
+) -> dict:
+    return build_import_result_from_parsed_source(
+        parse_acta_source(source),
+        source_label=source_label,
+        message=message,
+        attachment=attachment,
+        create_missing_interpreter=create_missing_interpreter,
+        allow_acta_ref_lookup=allow_acta_ref_lookup,
+        session=session,
+    )
+
+
+def build_import_result_from_parsed_source(
+    parsed: dict,
+    *,
+    source_label: str,
+    message: dict | None = None,
+    attachment: dict | None = None,
+    create_missing_interpreter: bool = True,
+    allow_acta_ref_lookup: bool = True,
+    session: ImportSession | None = None,
 ) -> dict:
-    parsed = parse_acta_source(source)
+    """Igual que ``build_import_result_from_source`` con el archivo ya parseado por ``parse_acta_source``."""
+    parsed = dict(parsed or {})
     warnings = list(parsed.get("warnings") or [])
     acta_ref = str(parsed.get("acta_ref") or "").strip().upper()
     parser_reason = "no_acta_ref"
@@ -504,6 +668,7 @@ def build_import_result_from_source(
                         finalized_row,
                         create_missing_interpreter=create_missing_interpreter,
                         allow_source_fallback=False,
+                        session=session,
                     ),
                     strategy="finalized_record",
                     reason="acta_ref_lookup",
@@ -538,6 +703,7 @@ def build_import_result_from_source(
             message=message,
             attachment=attachment,
             create_missing_interpreter=create_missing_interpreter,
+            session=session,
         ),
         strategy="parser",
         reason=parser_reason,
@@ -550,6 +716,7 @@ def build_import_result_from_finalized_record(
     *,
     create_missing_interpreter: bool = True,
     allow_source_fallback: bool = True,
+    session: ImportSession | None = None,
 ) -> dict:
     row_data = dict(row or {})
     source_label = str(row_data.get("nombre_formato") or "").strip() or "Acta revisada"
@@ -564,6 +731,7 @@ def build_import_result_from_finalized_record(
                     source_label=source_label,
                     row_context=row_data,
                     create_missing_interpreter=create_missing_interpreter,
+                    session=session,
                 ),
                 strategy="finalized_record",
                 reason="payload_normalized",
@@ -584,6 +752,7 @@ def build_import_result_from_finalized_record(
             source_label=source_label,
             create_missing_interpreter=create_missing_interpreter,
             allow_acta_ref_lookup=False,
+            session=session,
         )
 
     if payload_error is not None:
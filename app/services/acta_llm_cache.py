@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import hashlib
+import json
+from pathlib import Path
+import sqlite3
+from typing import Any
+
+from app.paths import app_data_dir
+from app.sqlite_store import sqlite_connection
+
+_DB_FILENAME = "acta_llm_extraction_cache.sqlite3"
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _ensure_schema(connection: sqlite3.Connection) -> None:
+    connection.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS llm_extraction_cache (
+            cache_key TEXT PRIMARY KEY,
+            pdf_sha256 TEXT NOT NULL,
+            document_kind TEXT NOT NULL,
+            prompt_version TEXT NOT NULL,
+            model TEXT NOT NULL,
+            provider TEXT NOT NULL,
+            result_json TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_llm_extraction_cache_pdf
+        ON llm_extraction_cache(pdf_sha256);
+        """
+    )
+
+
+def build_llm_cache_key(*, pdf_sha256: str, document_kind: str, prompt_version: str, model: str, provider: str) -> str:
+    raw = "|".join([pdf_sha256, document_kind, prompt_version, model, provider])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LlmExtractionCache:
+    """Resultados normalizados de la extraccion LLM de actas, persistidos en SQLite.
+
+    La llave combina SHA-256 del PDF, ``document_kind``, version del prompt y
+    perfil, modelo y proveedor: cualquier cambio en esas entradas vuelve a
+    llamar a la Edge Function.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path or (app_data_dir() / _DB_FILENAME)
+
+    def _connection(self):
+        return sqlite_connection(
+            self._path,
+            _ensure_schema,
+            corrupt_message="La cache de extraccion LLM esta corrupta y no puede leerse",
+        )
+
+    def get(self, cache_key: str) -> dict[str, Any] | None:
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT result_json FROM llm_extraction_cache WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        payload = json.loads(row["result_json"])
+        return dict(payload) if isinstance(payload, dict) else None
+
+    def put(
+        self,
+        cache_key: str,
+        result: dict[str, Any],
+        *,
+        pdf_sha256: str,
+        document_kind: str,
+        prompt_version: str,
+        model: str,
+        provider: str,
+    ) -> None:
+        with self._connection() as connection:
+            with connection:
+                connection.execute(
+                    """
+                    INSERT OR REPLACE INTO llm_extraction_cache(
+                        cache_key, pdf_sha256, document_kind, prompt_version, model, provider, result_json, created_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        cache_key,
+                        pdf_sha256,
+                        document_kind,
+                        prompt_version,
+                        model,
+                        provider,
+                        json.dumps(result, ensure_ascii=True, default=str),
+                        _utc_now_iso(),
+                    ),
+                )
+
+    def invalidate_pdf(self, pdf_sha256: str) -> int:
+        """Borra todas las extracciones de un PDF; devuelve cuantas habia."""
+        with self._connection() as connection:
+            with connection:
+                cursor = connection.execute(
+                    "DELETE FROM llm_extraction_cache WHERE pdf_sha256 = ?", (pdf_sha256,)
+                )
+        return int(cursor.rowcount or 0)
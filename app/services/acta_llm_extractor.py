@@ -1,13 +1,21 @@
 ﻿from __future__ import annotations
 
 import base64
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from copy import deepcopy
-from datetime import datetime, timezone
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+import gzip
+import hashlib
+import io
 import json
 import os
 import re
 from pathlib import Path
-from typing import Any
+import threading
+import time
+from typing import Any, Iterable, Iterator
 import urllib.error
 import urllib.request
 
@@ -19,12 +27,23 @@ from app.automation.process_profiles import (
 )
 from app.config import get_settings
 from app.paths import app_data_dir
+from app.services.acta_llm_cache import LlmExtractionCache, build_llm_cache_key
+from app.services.audit_log import get_audit_sink
 from app.services.excel_acta_import import _extract_pdf_text_pages, parse_acta_pdf
 from app.utils.text import normalize_search_text
 
 _EDGE_TIMEOUT_SECONDS = 240
 _LLM_LONG_SECTION_MAX_CHARS = 300
 _PDF_BASE64_MAX_BYTES = 10 * 1024 * 1024  # 10 MB limit before base64 encoding
+# Paginas con menos texto extraible que esto (escaneadas, firmas) siempre van en el PDF recortado.
+_SCANNED_PAGE_MAX_CHARS = 20
+_LLM_DEFAULT_MAX_CONCURRENCY = 3
+_LLM_DEFAULT_REQUESTS_PER_MINUTE = 20
+# Subir cuando cambie la normalizacion o el postproceso de la respuesta LLM.
+_LLM_CACHE_VERSION = 2
+# (function_name, schema_hash) que la Edge Function ya recibio en esta sesion.
+_EDGE_SCHEMAS_SENT: set[tuple[str, str]] = set()
+_EDGE_SCHEMA_LOCK = threading.Lock()
 
 _LONG_TEXT_SECTION_PATTERNS = (
     "descripcion",
@@ -38,6 +57,40 @@ _LONG_TEXT_SECTION_PATTERNS = (
     "resumen",
 )
 
+# Campos de los perfiles (claves del formato Excel) -> campo del schema de extraccion.
+_PROFILE_FIELD_TARGETS: dict[str, str] = {
+    "fecha_visita": "fecha_servicio",
+    "modalidad": "modalidad_servicio",
+    "nombre_empresa": "nombre_empresa",
+    "nit_empresa": "nit_empresa",
+    "nombre_asistente": "nombre_profesional",
+    "nombre_interprete": "nombre_profesional",
+    "nombre_oferente": "participantes",
+    "cedula_oferente": "participantes",
+    "tipo_discapacidad": "participantes",
+    "nombre_vinculado": "participantes",
+    "cedula_vinculado": "participantes",
+    "cargo": "cargo_objetivo",
+    "nombre_vacante": "cargo_objetivo",
+    "cargo_ocupado": "cargo_objetivo",
+    "numero_vacantes": "total_vacantes",
+    "numero_seguimiento": "numero_seguimiento",
+    "sumatoria_horas_interpretes": "sumatoria_horas_interpretes",
+    "total_tiempo": "total_horas_interprete",
+}
+# Campos que viajan junto al campo pedido cuando se usa un schema reducido.
+_SCHEMA_COMPANION_FIELDS: dict[str, tuple[str, ...]] = {
+    "nit_empresa": ("nits_empresas",),
+    "nombre_profesional": ("asistentes", "interpretes"),
+    "sumatoria_horas_interpretes": ("total_horas_interprete",),
+    "total_horas_interprete": ("sumatoria_horas_interpretes",),
+}
+_SCHEMA_META_FIELDS = ("schema_version", "extraction_status", "document_type_hint", "process_name_hint", "warnings")
+_LOCAL_FIELD_MIN_CONFIDENCE = 0.8
+_MODALIDAD_VALUES = {"virtual", "presencial", "mixta"}
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_NIT_RE = re.compile(r"^\d{6,12}(?:-\d)?$")
+
 _HEADING_LINE_RE = re.compile(r"^\s*(?:\d+(?:\.\d+)*[.):-]?\s*)?[A-Za-z0-9][^:]{0,120}:?\s*$")
 
 _STRUCTURED_ACTA_SCHEMA: dict[str, Any] = {
@@ -219,17 +272,35 @@ def _is_long_text_heading(line: str) -> bool:
     return any(token in normalized for token in _LONG_TEXT_SECTION_PATTERNS)
 
 
-def _match_profile_section(line: str, profile: dict[str, Any] | None) -> str:
+@lru_cache(maxsize=64)
+def _compiled_section_patterns(aliases: tuple[tuple[str, str], ...]) -> tuple[tuple[str, re.Pattern[str]], ...]:
+    return tuple(
+        (section_key, re.compile(r"(?<![a-z0-9])" + re.escape(alias) + r"(?![a-z0-9])"))
+        for section_key, alias in aliases
+        if alias
+    )
+
+
+def _profile_section_patterns(profile: dict[str, Any] | None) -> tuple[tuple[str, re.Pattern[str]], ...]:
     if not profile:
-        return ""
-    normalized_line = normalize_search_text(line)
+        return ()
     aliases = dict(profile.get("normalized_section_aliases") or {})
-    for section_key, alias in aliases.items():
-        if alias and re.search(r"(?<![a-z0-9])" + re.escape(alias) + r"(?![a-z0-9])", normalized_line):
+    return _compiled_section_patterns(tuple(aliases.items()))
+
+
+def _match_normalized_section(normalized_line: str, patterns: tuple[tuple[str, re.Pattern[str]], ...]) -> str:
+    for section_key, pattern in patterns:
+        if pattern.search(normalized_line):
             return section_key
     return ""
 
 
+def _match_profile_section(line: str, profile: dict[str, Any] | None) -> str:
+    if not profile:
+        return ""
+    return _match_normalized_section(normalize_search_text(line), _profile_section_patterns(profile))
+
+
 def _trim_long_inline_line(line: str) -> str:
     text = str(line or "").strip()
     if not text or ":" not in text:
@@ -243,144 +314,238 @@ def _trim_long_inline_line(line: str) -> str:
     return f"{prefix.strip()}: {suffix}".strip() if suffix else f"{prefix.strip()}:"
 
 
-def _apply_line_mode(lines: list[str], profile: dict[str, Any] | None) -> list[str]:
-    if not profile or str(profile.get("line_mode") or "") != "labeled_only":
-        return lines
-    filtered: list[str] = []
-    for line in lines:
-        text = str(line or "").strip()
-        if not text:
-            continue
-        normalized = normalize_search_text(text)
-        if _match_profile_section(text, profile):
-            filtered.append(text)
-            continue
-        if ":" in text:
-            filtered.append(text)
-            continue
-        if normalized.startswith("nombre completo"):
-            filtered.append(text)
-            continue
-    return filtered
-
-
-def _collect_priority_snippets(pages: list[str], labels: list[str]) -> list[str]:
-    normalized_labels = [normalize_search_text(label) for label in labels if str(label or "").strip()]
-    if not normalized_labels:
-        return []
-    snippets: list[str] = []
-    seen: set[str] = set()
-    for page in pages:
-        page_lines = [str(item or "").strip() for item in str(page or "").splitlines()]
-        for line in page_lines:
-            if not line:
-                continue
-            normalized_line = normalize_search_text(line)
-            if not normalized_line:
-                continue
-            if any(label in normalized_line for label in normalized_labels):
-                compact = re.sub(r"\s+", " ", line).strip()
-                if compact and compact not in seen:
-                    seen.add(compact)
-                    snippets.append(compact)
-    return snippets
-
-
-def _filter_pages_by_profile(pages: list[str], profile: dict[str, Any] | None) -> list[str]:
-    if not profile:
-        return pages
-    keep_sections = set(profile.get("keep_sections") or [])
-    if not keep_sections:
-        return pages
-
-    filtered_pages: list[str] = []
-    for page in pages:
-        page_lines = [str(item or "").rstrip() for item in str(page or "").splitlines()]
+@dataclass(frozen=True)
+class _SourceLine:
+    text: str
+    normalized: str
+    is_heading: bool
+    is_long_heading: bool
+    section: str
+    is_priority: bool
+
+
+class _LineClassifier:
+    """Clasifica cada linea una sola vez contra los patrones precompilados del perfil."""
+
+    def __init__(self, profile: dict[str, Any] | None, priority_labels: list[str]) -> None:
+        self._section_patterns = _profile_section_patterns(profile)
+        self._priority_labels = [normalize_search_text(label) for label in priority_labels if str(label or "").strip()]
+        self._lines: dict[str, _SourceLine] = {}
+
+    def classify(self, text: str) -> _SourceLine:
+        line = self._lines.get(text)
+        if line is None:
+            normalized = normalize_search_text(text)
+            line = _SourceLine(
+                text=text,
+                normalized=normalized,
+                is_heading=_is_heading_line(text),
+                is_long_heading=any(token in normalized for token in _LONG_TEXT_SECTION_PATTERNS),
+                section=_match_normalized_section(normalized, self._section_patterns) if self._section_patterns else "",
+                is_priority=bool(normalized) and any(label in normalized for label in self._priority_labels),
+            )
+            self._lines[text] = line
+        return line
+
+
+class _SourceBodyWriter:
+    """Compacta el cuerpo linea a linea: recorta textos largos en linea y resume
+    las secciones largas hasta la siguiente linea vacia o encabezado."""
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self._section_heading: str | None = None
+        self._section_lines: list[str] = []
+
+    def feed(self, line: _SourceLine | None) -> None:
+        """``None`` representa una linea vacia."""
+        if self._section_heading is not None:
+            if line is None:
+                if self._section_lines:
+                    self._flush_section()
+                return
+            if line.is_heading and not line.is_long_heading:
+                self._flush_section()
+            else:
+                self._section_lines.append(line.text)
+                return
+        if line is None:
+            return
+        if ":" in line.text:
+            inline_trimmed = _trim_long_inline_line(line.text)
+            if inline_trimmed != line.text:
+                self.lines.append(inline_trimmed)
+                return
+        if line.is_long_heading:
+            self._section_heading = line.text
+            self._section_lines = []
+            return
+        self.lines.append(line.text)
+
+    def end_page(self) -> None:
+        if self._section_heading is not None:
+            self._flush_section()
+
+    def _flush_section(self) -> None:
+        section_text = re.sub(r"\s+", " ", " ".join(self._section_lines)).strip()
+        if len(section_text) > _LLM_LONG_SECTION_MAX_CHARS:
+            section_text = section_text[:_LLM_LONG_SECTION_MAX_CHARS].rstrip() + "..."
+        self.lines.append(self._section_heading or "")
+        if section_text:
+            self.lines.append(section_text)
+        self._section_heading = None
+        self._section_lines = []
+
+
+@dataclass(frozen=True)
+class _PreparedSource:
+    text: str
+    relevant_page_indexes: list[int]
+
+
+def _scan_source_pages(pages: list[str], *, document_kind: str = "") -> _PreparedSource:
+    """Recorre las paginas una sola vez y arma el texto para el LLM.
+
+    En el mismo recorrido junta las lineas con etiquetas prioritarias, filtra
+    las secciones que conserva el perfil, compacta el cuerpo y anota que
+    paginas aportan contenido.  Si el perfil no conserva nada de ninguna pagina
+    se usa el cuerpo sin filtrar, igual que antes.
+    """
+    profile = get_process_profile(document_kind)
+    keep_sections = set((profile or {}).get("keep_sections") or [])
+    filter_sections = bool(profile) and bool(keep_sections)
+    classifier = _LineClassifier(profile, get_profile_priority_labels(document_kind))
+
+    priority_lines: list[str] = []
+    seen_priority: set[str] = set()
+    filtered_body = _SourceBodyWriter()
+    unfiltered_pages: list[list[_SourceLine | None]] = []
+    relevant_page_indexes: list[int] = []
+
+    for page_index, page in enumerate(pages):
+        page_lines: list[_SourceLine | None] = []
         current_section = ""
-        kept_lines: list[str] = []
-        for raw_line in page_lines:
-            line = raw_line.strip()
-            if not line:
-                if kept_lines and kept_lines[-1] != "":
-                    kept_lines.append("")
+        page_has_kept_line = False
+        page_has_priority_line = False
+        pending_blank = False
+        for raw_line in str(page or "").splitlines():
+            text = str(raw_line or "").strip()
+            if not text:
+                page_lines.append(None)
+                if page_has_kept_line:
+                    pending_blank = True
                 continue
-            matched_section = _match_profile_section(line, profile)
-            if matched_section:
-                current_section = matched_section if matched_section in keep_sections else ""
-                if matched_section in keep_sections:
-                    kept_lines.append(line)
-                continue
-            if _is_heading_line(line) and not _is_long_text_heading(line):
-                current_section = ""
-                continue
-            if current_section in keep_sections:
-                kept_lines.append(line)
-        filtered_page = "\n".join(kept_lines).strip()
-        if filtered_page:
-            filtered_pages.append(filtered_page)
-    return filtered_pages or pages
+            line = classifier.classify(text)
+            page_lines.append(line)
 
+            if line.is_priority:
+                page_has_priority_line = True
+                compact = re.sub(r"\s+", " ", text).strip()
+                if compact and compact not in seen_priority:
+                    seen_priority.add(compact)
+                    priority_lines.append(compact)
 
-def _prepare_llm_source_text(pages: list[str], *, document_kind: str = "") -> str:
-    profile = get_process_profile(document_kind)
-    filtered_pages = _filter_pages_by_profile(pages, profile)
-    priority_lines = _collect_priority_snippets(pages, get_profile_priority_labels(document_kind))
-    lines: list[str] = []
-    for page in filtered_pages:
-        page_lines = [str(item or "").rstrip() for item in str(page or "").splitlines()]
-        i = 0
-        while i < len(page_lines):
-            line = page_lines[i].strip()
-            if not line:
-                i += 1
+            if not filter_sections:
                 continue
-            inline_trimmed = _trim_long_inline_line(line)
-            if inline_trimmed != line:
-                lines.append(inline_trimmed)
-                i += 1
-                continue
-            if _is_long_text_heading(line):
-                section_lines: list[str] = []
-                j = i + 1
-                while j < len(page_lines):
-                    candidate_raw = page_lines[j]
-                    candidate = candidate_raw.strip()
-                    if not candidate:
-                        if section_lines:
-                            break
-                        j += 1
-                        continue
-                    if _is_heading_line(candidate) and not _is_long_text_heading(candidate):
-                        break
-                    section_lines.append(candidate)
-                    j += 1
-                section_text = re.sub(r"\s+", " ", " ".join(section_lines)).strip()
-                if len(section_text) > _LLM_LONG_SECTION_MAX_CHARS:
-                    section_text = section_text[:_LLM_LONG_SECTION_MAX_CHARS].rstrip() + "..."
-                lines.append(line)
-                if section_text:
-                    lines.append(section_text)
-                i = j
-                continue
-            lines.append(line)
-            i += 1
+            keep_line = False
+            if line.section:
+                current_section = line.section if line.section in keep_sections else ""
+                keep_line = line.section in keep_sections
+            elif line.is_heading and not line.is_long_heading:
+                current_section = ""
+            else:
+                keep_line = current_section in keep_sections
+            if keep_line:
+                if pending_blank:
+                    filtered_body.feed(None)
+                    pending_blank = False
+                filtered_body.feed(line)
+                page_has_kept_line = True
+        filtered_body.end_page()
+        unfiltered_pages.append(page_lines)
+
+        # pypdf no saca texto de una pagina escaneada (p. ej. la lista de asistencia
+        # firmada): sin texto no se puede juzgar, asi que se envia al LLM.
+        looks_scanned = len(re.sub(r"\s+", "", str(page or ""))) < _SCANNED_PAGE_MAX_CHARS
+        if not filter_sections or looks_scanned or page_has_kept_line or page_has_priority_line:
+            relevant_page_indexes.append(page_index)
+
+    if filter_sections and filtered_body.lines:
+        body_lines = filtered_body.lines
+    else:
+        # Sin filtro de perfil (o sin nada que conservar) va el texto completo.
+        unfiltered_body = _SourceBodyWriter()
+        for page_lines in unfiltered_pages:
+            for line in page_lines:
+                unfiltered_body.feed(line)
+            unfiltered_body.end_page()
+        body_lines = unfiltered_body.lines
+
+    labeled_only = bool(profile) and str(profile.get("line_mode") or "") == "labeled_only"
     combined: list[str] = []
     seen_headers: set[str] = set()
-    for item in [*priority_lines, *lines]:
+    for item in [*priority_lines, *body_lines]:
         text_line = str(item or "").strip()
         if not text_line:
             continue
+        line = classifier.classify(text_line)
         # Only deduplicate pure section headers (heading pattern, no colon separating label from value).
         # Data lines (field labels like "Nombre completo:" or value lines) are always kept so that
         # multi-page documents with repeated section structures preserve all participant/company data.
-        is_pure_header = ":" not in text_line and _is_heading_line(text_line) and not _is_long_text_heading(text_line)
+        is_pure_header = ":" not in text_line and line.is_heading and not line.is_long_heading
         if is_pure_header:
             if text_line in seen_headers:
                 continue
             seen_headers.add(text_line)
+        if labeled_only and not (
+            line.section or ":" in text_line or line.normalized.startswith("nombre completo")
+        ):
+            continue
         combined.append(text_line)
-    combined = _apply_line_mode(combined, profile)
-    return "\n".join(combined).strip()
+
+    all_indexes = list(range(len(pages)))
+    if not filter_sections:
+        relevant_page_indexes = all_indexes
+    return _PreparedSource(
+        text="\n".join(combined).strip(),
+        relevant_page_indexes=relevant_page_indexes or all_indexes,
+    )
+
+
+def _relevant_page_indexes(pages: list[str], *, document_kind: str = "") -> list[int]:
+    """Indices (base 0) de las paginas con secciones del perfil o etiquetas prioritarias.
+
+    Sin perfil con ``keep_sections`` todas las paginas son relevantes.  Las
+    paginas casi sin texto extraible (escaneadas) siempre se incluyen.
+    """
+    return _scan_source_pages(pages, document_kind=document_kind).relevant_page_indexes
+
+
+def _build_trimmed_pdf(pdf_bytes: bytes, page_indexes: list[int]) -> bytes | None:
+    """PDF solo con ``page_indexes``; ``None`` si no reduce nada o no se puede recortar."""
+    try:
+        from pypdf import PdfReader, PdfWriter
+    except ImportError:  # pragma: no cover - runtime dependency
+        return None
+    try:
+        reader = PdfReader(io.BytesIO(pdf_bytes))
+        total_pages = len(reader.pages)
+        selected = [index for index in page_indexes if 0 <= index < total_pages]
+        if not selected or len(selected) >= total_pages:
+            return None
+        writer = PdfWriter()
+        for index in selected:
+            writer.add_page(reader.pages[index])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+    except Exception:
+        return None
+    trimmed = buffer.getvalue()
+    return trimmed if len(trimmed) < len(pdf_bytes) else None
+
+
+def _prepare_llm_source_text(pages: list[str], *, document_kind: str = "") -> str:
+    return _scan_source_pages(pages, document_kind=document_kind).text
 
 
 def _desktop_dir() -> Path:
@@ -401,33 +566,34 @@ def _json_output_dir() -> Path:
     settings = get_settings()
     configured = str(getattr(settings, "automation_decisions_log_path", "") or "").strip()
     if configured:
-        path = Path(configured).expanduser().resolve().parent / "JSONs"
-    else:
-        path = app_data_dir() / "logs" / "JSONs"
-    path.mkdir(parents=True, exist_ok=True)
-    return path
-
-
-def _safe_json_stem(value: str) -> str:
-    clean = "".join(ch if ch.isalnum() or ch in ("-", "_", ".") else "_" for ch in str(value or "acta"))
-    clean = clean.strip("._") or "acta"
-    return clean[:80]
+        return Path(configured).expanduser().resolve().parent / "JSONs"
+    return app_data_dir() / "logs" / "JSONs"
 
 
-def _save_llm_json(*, source_name: str, filename: str, subject: str, function_name: str, raw_data: dict[str, Any], normalized: dict[str, Any]) -> str:
-    now = datetime.now(timezone.utc)
-    stamp = now.strftime("%Y%m%d_%H%M%S")
-    path = _json_output_dir() / f"{stamp}_{_safe_json_stem(filename or source_name)}.json"
-    payload = {
-        "saved_at": now.isoformat(),
-        "source_label": source_name,
-        "filename": filename,
-        "subject": subject,
-        "function_name": function_name,
-        "raw": raw_data,
-        "normalized": normalized,
-    }
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+def _save_llm_json(
+    *,
+    source_name: str,
+    filename: str,
+    subject: str,
+    function_name: str,
+    raw_data: dict[str, Any],
+    normalized: dict[str, Any],
+    acta_ref: str = "",
+) -> str:
+    """Encola la respuesta LLM en el log JSONL ``llm`` de la carpeta JSONs y
+    devuelve el segmento donde quedara; la escritura ocurre en segundo plano."""
+    sink = get_audit_sink(_json_output_dir(), "llm")
+    path = sink.write(
+        {
+            "source_label": source_name,
+            "filename": filename,
+            "subject": subject,
+            "function_name": function_name,
+            "acta_ref": acta_ref,
+            "raw": raw_data,
+            "normalized": normalized,
+        }
+    )
     return str(path)
 
 
@@ -524,7 +690,16 @@ def _extract_json_payload(response: Any) -> dict[str, Any]:
     raise RuntimeError("La Edge Function no devolvio JSON util para la extraccion del acta.")
 
 
-def _invoke_edge_function_http(function_name: str, request_payload: dict[str, Any]) -> dict[str, Any]:
+class _EdgeSchemaNotCachedError(RuntimeError):
+    pass
+
+
+def _invoke_edge_function_http(
+    function_name: str,
+    request_payload: dict[str, Any],
+    *,
+    timeout: float | None = None,
+) -> dict[str, Any]:
     settings = get_settings()
     supabase_url = str(settings.supabase_url or "").strip().rstrip("/")
     supabase_anon_key = str(settings.supabase_anon_key or "").strip()
@@ -532,7 +707,7 @@ def _invoke_edge_function_http(function_name: str, request_payload: dict[str, An
         raise RuntimeError("Falta SUPABASE_URL o SUPABASE_ANON_KEY para invocar la Edge Function.")
 
     url = f"{supabase_url}/functions/v1/{function_name}"
-    body = json.dumps(request_payload).encode("utf-8")
+    body = gzip.compress(json.dumps(request_payload).encode("utf-8"), compresslevel=6)
     request = urllib.request.Request(
         url,
         data=body,
@@ -540,6 +715,7 @@ def _invoke_edge_function_http(function_name: str, request_payload: dict[str, An
             "apikey": supabase_anon_key,
             "Authorization": f"Bearer {supabase_anon_key}",
             "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
             **(
                 {"x-acta-extraction-secret": str(getattr(settings, "supabase_edge_acta_extraction_secret", "") or "").strip()}
                 if str(getattr(settings, "supabase_edge_acta_extraction_secret", "") or "").strip()
@@ -550,7 +726,7 @@ def _invoke_edge_function_http(function_name: str, request_payload: dict[str, An
     )
 
     try:
-        with urllib.request.urlopen(request, timeout=_EDGE_TIMEOUT_SECONDS) as response:
+        with urllib.request.urlopen(request, timeout=timeout or _EDGE_TIMEOUT_SECONDS) as response:
             raw = response.read().decode("utf-8", errors="replace")
     except urllib.error.HTTPError as exc:
         raw = exc.read().decode("utf-8", errors="replace")
@@ -558,6 +734,8 @@ def _invoke_edge_function_http(function_name: str, request_payload: dict[str, An
             payload = json.loads(raw) if raw else {}
         except json.JSONDecodeError:
             payload = {"error": raw or f"HTTP {exc.code}"}
+        if exc.code == 409 and isinstance(payload, dict) and payload.get("error") == "schema_not_cached":
+            raise _EdgeSchemaNotCachedError("La Edge Function no tiene el schema en cache.") from exc
         raise RuntimeError(f"Edge Function HTTP {exc.code}: {payload}") from exc
     except TimeoutError as exc:
         raise RuntimeError("Edge Function timeout excedido.") from exc
@@ -570,6 +748,189 @@ def _invoke_edge_function_http(function_name: str, request_payload: dict[str, An
         raise RuntimeError("La Edge Function devolvio una respuesta no JSON.") from exc
 
 
+def _schema_hash(schema: dict[str, Any]) -> str:
+    material = json.dumps(schema, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+
+def _invoke_edge_extraction(
+    function_name: str,
+    request_payload: dict[str, Any],
+    *,
+    timeout: float | None = None,
+) -> dict[str, Any]:
+    """Invoca la extraccion sin reenviar el schema si la Edge Function ya lo tiene.
+
+    La funcion guarda los schemas por ``schema_hash`` mientras su instancia
+    sigue viva; si responde ``schema_not_cached`` se reintenta con el schema.
+    """
+    schema_key = (function_name, str(request_payload.get("schema_hash") or ""))
+    with _EDGE_SCHEMA_LOCK:
+        schema_known = bool(schema_key[1]) and schema_key in _EDGE_SCHEMAS_SENT
+    if schema_known:
+        compact_payload = {key: value for key, value in request_payload.items() if key != "schema"}
+        try:
+            return _invoke_edge_function_http(function_name, compact_payload, timeout=timeout)
+        except _EdgeSchemaNotCachedError:
+            with _EDGE_SCHEMA_LOCK:
+                _EDGE_SCHEMAS_SENT.discard(schema_key)
+    response = _invoke_edge_function_http(function_name, request_payload, timeout=timeout)
+    if schema_key[1]:
+        with _EDGE_SCHEMA_LOCK:
+            _EDGE_SCHEMAS_SENT.add(schema_key)
+    return response
+
+
+@dataclass(frozen=True)
+class LocalExtractionScore:
+    """Confianza del parser local frente a los campos que exige el perfil."""
+
+    document_kind: str
+    field_confidence: dict[str, float]
+    fields_for_llm: tuple[str, ...]
+
+    @property
+    def confidence(self) -> float:
+        if not self.field_confidence:
+            return 0.0
+        return round(sum(self.field_confidence.values()) / len(self.field_confidence), 3)
+
+    @property
+    def complete(self) -> bool:
+        return bool(self.field_confidence) and not self.fields_for_llm
+
+
+def _profile_target_fields(profile: dict[str, Any]) -> list[str]:
+    schema_fields = set(_STRUCTURED_ACTA_SCHEMA["schema"]["properties"])
+    forbidden = set(profile.get("forbid_fields") or [])
+    targets: list[str] = []
+    for field in list(profile.get("required_fields") or []):
+        if not isinstance(field, dict):
+            continue
+        target = _PROFILE_FIELD_TARGETS.get(str(field.get("field_key") or "").strip(), "")
+        if target and target not in targets:
+            targets.append(target)
+    for field_name in dict(profile.get("field_priority") or {}):
+        if field_name in schema_fields and field_name not in targets:
+            targets.append(field_name)
+    return [field for field in targets if field not in forbidden]
+
+
+def _local_field_confidence(field_name: str, value: Any) -> float:
+    if value in ("", None, [], 0):
+        return 0.0
+    text = _clean_text_value(value) if not isinstance(value, list) else ""
+    if field_name == "fecha_servicio":
+        return 1.0 if _ISO_DATE_RE.match(text) else 0.4
+    if field_name == "nit_empresa":
+        return 1.0 if _NIT_RE.match(text.replace(".", "").replace(" ", "")) else 0.5
+    if field_name == "modalidad_servicio":
+        return 1.0 if normalize_search_text(text) in _MODALIDAD_VALUES else 0.5
+    if field_name == "nombre_profesional":
+        return 1.0 if len(text.split()) >= 2 and not any(ch.isdigit() for ch in text) else 0.5
+    if field_name == "cargo_objetivo":
+        return 1.0 if len(text) <= 80 else 0.3
+    if field_name == "participantes":
+        rows = [row for row in list(value or []) if isinstance(row, dict)]
+        if not rows:
+            return 0.0
+        complete = [
+            row
+            for row in rows
+            if _clean_text_value(row.get("nombre_usuario")) and re.sub(r"\D", "", str(row.get("cedula_usuario") or ""))
+        ]
+        return round(len(complete) / len(rows), 3)
+    return 1.0
+
+
+def _score_local_extraction(local: dict[str, Any], document_kind: str) -> LocalExtractionScore:
+    """Puntua el resultado de ``parse_acta_pdf`` campo a campo segun el perfil.
+
+    Sin perfil no hay campos exigidos y el resultado nunca se considera completo.
+    """
+    profile = get_process_profile(document_kind)
+    if not profile:
+        return LocalExtractionScore(document_kind=document_kind, field_confidence={}, fields_for_llm=())
+    field_confidence = {
+        field_name: _local_field_confidence(field_name, local.get(field_name))
+        for field_name in _profile_target_fields(profile)
+    }
+    fields_for_llm = tuple(
+        field_name for field_name, confidence in field_confidence.items() if confidence < _LOCAL_FIELD_MIN_CONFIDENCE
+    )
+    return LocalExtractionScore(
+        document_kind=document_kind,
+        field_confidence=field_confidence,
+        fields_for_llm=fields_for_llm,
+    )
+
+
+def _reduced_acta_schema(fields: Iterable[str]) -> dict[str, Any]:
+    """Schema con solo ``fields`` (y sus campos acompanantes) mas los campos de control."""
+    full_schema = _STRUCTURED_ACTA_SCHEMA["schema"]
+    wanted = set(_SCHEMA_META_FIELDS)
+    for field_name in fields:
+        wanted.add(field_name)
+        wanted.update(_SCHEMA_COMPANION_FIELDS.get(field_name, ()))
+    properties = {key: value for key, value in full_schema["properties"].items() if key in wanted}
+    return {
+        **full_schema,
+        "properties": properties,
+        "required": [key for key in full_schema["required"] if key in properties],
+    }
+
+
+def _merge_local_fields(normalized: dict[str, Any], local: dict[str, Any], *, schema: dict[str, Any]) -> dict[str, Any]:
+    """Completa un resultado de schema reducido con los campos del parser local.
+
+    Los campos pedidos al LLM solo conservan el valor local si el LLM los dejo vacios.
+    """
+    requested = set(schema.get("properties") or {})
+    for field_name in _STRUCTURED_ACTA_SCHEMA["schema"]["properties"]:
+        if field_name in _SCHEMA_META_FIELDS or field_name not in local:
+            continue
+        if field_name in requested and normalized.get(field_name) not in ("", None, [], 0):
+            continue
+        normalized[field_name] = deepcopy(local[field_name])
+    if "candidatos_profesional" in local and "asistentes" not in requested:
+        normalized["candidatos_profesional"] = deepcopy(local["candidatos_profesional"])
+    normalized["llm_requested_fields"] = sorted(requested - set(_SCHEMA_META_FIELDS))
+    return normalized
+
+
+def _llm_cache() -> LlmExtractionCache:
+    return LlmExtractionCache()
+
+
+def _llm_cache_fields(
+    *,
+    pdf_bytes: bytes,
+    document_kind: str,
+    request_payload: dict[str, Any],
+    use_full_pdf: bool,
+) -> dict[str, str]:
+    """Partes de la llave de cache: el prompt se versiona por hash del schema,
+    las instrucciones de perfil y si se envia el PDF completo o recortado."""
+    prompt_material = json.dumps(
+        {
+            "cache_version": _LLM_CACHE_VERSION,
+            "schema_hash": request_payload.get("schema_hash"),
+            "text": request_payload.get("text"),
+            "pdf_mode": "full" if use_full_pdf else "relevant_pages",
+        },
+        sort_keys=True,
+        ensure_ascii=True,
+    )
+    provider = str(request_payload.get("provider_override") or "openai")
+    return {
+        "pdf_sha256": hashlib.sha256(pdf_bytes).hexdigest(),
+        "document_kind": document_kind,
+        "prompt_version": hashlib.sha256(prompt_material.encode("utf-8")).hexdigest()[:16],
+        "model": str(request_payload.get("model_override") or f"default:{provider}"),
+        "provider": provider,
+    }
+
+
 def extract_structured_acta_pdf(
     file_path: str,
     *,
@@ -578,8 +939,24 @@ def extract_structured_acta_pdf(
     source_label: str = "",
     model_override: str = "",
     provider_override: str = "",
-    use_full_pdf: bool = True,
+    use_full_pdf: bool = False,
+    bypass_cache: bool = False,
+    edge_timeout_seconds: float | None = None,
+    force_llm: bool = False,
 ) -> dict[str, Any]:
+    """Extrae un acta con la Edge Function LLM, con el parser local como respaldo.
+
+    Por defecto el PDF viaja recortado a las paginas relevantes para el perfil
+    del documento; ``use_full_pdf`` envia el archivo completo.  Los resultados
+    LLM se guardan en una cache local por PDF, perfil, prompt, modelo y
+    proveedor; ``bypass_cache`` fuerza una nueva extraccion y la reemplaza en
+    cache.  ``edge_timeout_seconds`` acorta la espera de la Edge
+    Function (por defecto ``_EDGE_TIMEOUT_SECONDS``).
+
+    Primero se puntua el parser local contra el perfil del documento: si cubre
+    todos los campos exigidos no se llama al LLM, y si faltan algunos solo se
+    piden esos con un schema reducido.  ``force_llm`` omite esa etapa.
+    """
     path = Path(file_path)
     settings = get_settings()
     source_name = source_label or filename or path.name or str(file_path)
@@ -600,15 +977,18 @@ def extract_structured_acta_pdf(
 
     from app.automation.document_classifier import classify_document
 
-    pages = _extract_pdf_text_pages(file_path)
-    non_empty_pages = [page for page in pages if str(page or "").strip()]
     classified = classify_document(filename=filename or path.name, subject=subject)
     document_kind_hint = str(classified.document_kind or "").strip()
-    source_text = _prepare_llm_source_text(
-        non_empty_pages,
-        document_kind=document_kind_hint,
-    )
-    full_page_text = "\n".join(non_empty_pages)
+
+    local_score = _score_local_extraction(fallback, document_kind_hint)
+    fallback["local_extraction_confidence"] = local_score.confidence
+    local_first = bool(getattr(settings, "automation_llm_local_first_enabled", True)) and not force_llm
+    if local_first and local_score.complete:
+        fallback["llm_extraction_status"] = "skipped_local_complete"
+        return fallback
+    requested_fields: tuple[str, ...] = ()
+    if local_first and local_score.fields_for_llm and len(local_score.fields_for_llm) < len(local_score.field_confidence):
+        requested_fields = local_score.fields_for_llm
 
     priority_labels = get_profile_priority_labels(document_kind_hint)
     profile_prompt = build_profile_prompt_context(document_kind_hint)
@@ -622,11 +1002,18 @@ def extract_structured_acta_pdf(
         text_parts.append("perfil_documento:\n" + profile_prompt)
     if detailed_prompt:
         text_parts.append(detailed_prompt)
+    if requested_fields:
+        text_parts.append(
+            "campos_solicitados: " + ", ".join(requested_fields)
+            + " (el resto ya se extrajo localmente; devuelve solo los campos del schema)"
+        )
     llm_instruction_text = "\n".join(part for part in text_parts if str(part or "").strip())
 
+    schema = _reduced_acta_schema(requested_fields) if requested_fields else get_acta_llm_schema()["schema"]
     request_payload = {
         "schema_name": _STRUCTURED_ACTA_SCHEMA["name"],
-        "schema": get_acta_llm_schema()["schema"],
+        "schema": schema,
+        "schema_hash": _schema_hash(schema),
         "source_label": source_name,
         "filename": filename or path.name,
         "subject": subject,
@@ -635,26 +1022,55 @@ def extract_structured_acta_pdf(
     if model_override.strip():
         request_payload["model_override"] = model_override.strip()
     request_payload["provider_override"] = provider_override.strip() or "openai"
-    if use_full_pdf:
-        pdf_size = path.stat().st_size
-        if pdf_size > _PDF_BASE64_MAX_BYTES:
-            fallback["warnings"] = list(
-                dict.fromkeys(
-                    list(fallback.get("warnings") or [])
-                    + [f"PDF demasiado grande para enviar completo ({pdf_size // (1024 * 1024)} MB); se usara solo el texto extraido."]
-                )
+    pdf_bytes = path.read_bytes()
+
+    cache = _llm_cache() if settings.automation_llm_cache_enabled else None
+    cache_fields = _llm_cache_fields(
+        pdf_bytes=pdf_bytes,
+        document_kind=document_kind_hint,
+        request_payload=request_payload,
+        use_full_pdf=use_full_pdf,
+    )
+    cache_key = build_llm_cache_key(**cache_fields)
+    if cache is not None and not bypass_cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            # El mismo PDF puede llegar con otro nombre: el origen es el de esta llamada.
+            cached["file_path"] = source_name
+            cached.pop("llm_json_path", None)
+            cached["llm_cache_hit"] = True
+            return cached
+
+    pages = _extract_pdf_text_pages(file_path)
+    non_empty_pages = [page for page in pages if str(page or "").strip()]
+    prepared_source = _scan_source_pages(pages, document_kind=document_kind_hint)
+    source_text = prepared_source.text
+    full_page_text = "\n".join(non_empty_pages)
+
+    pdf_to_send = pdf_bytes
+    if not use_full_pdf:
+        pdf_to_send = _build_trimmed_pdf(pdf_bytes, prepared_source.relevant_page_indexes) or pdf_bytes
+    pdf_size = len(pdf_to_send)
+    if pdf_size > _PDF_BASE64_MAX_BYTES:
+        fallback["warnings"] = list(
+            dict.fromkeys(
+                list(fallback.get("warnings") or [])
+                + [f"PDF demasiado grande para enviar completo ({pdf_size // (1024 * 1024)} MB); se usara solo el texto extraido."]
             )
-        else:
-            request_payload["pdf_base64"] = base64.b64encode(path.read_bytes()).decode("ascii")
+        )
+    else:
+        request_payload["pdf_base64"] = base64.b64encode(pdf_to_send).decode("ascii")
 
     try:
-        response = _invoke_edge_function_http(function_name, request_payload)
+        response = _invoke_edge_extraction(function_name, request_payload, timeout=edge_timeout_seconds)
         raw_payload = _extract_json_payload(response)
         normalized = _normalize_llm_result(
             raw_payload,
             source_label=source_name,
             source_text=source_text,
         )
+        if requested_fields:
+            normalized = _merge_local_fields(normalized, fallback, schema=schema)
         profile_document_kind = document_kind_hint
         llm_document_kind_hint = _clean_text_value(raw_payload.get("document_type_hint"))
         if not get_process_profile(profile_document_kind) and get_process_profile(llm_document_kind_hint):
@@ -673,7 +1089,11 @@ def extract_structured_acta_pdf(
             function_name=function_name,
             raw_data=raw_payload,
             normalized=normalized,
+            acta_ref=str(fallback.get("acta_ref") or ""),
         )
+        if cache is not None:
+            cache.put(cache_key, normalized, **cache_fields)
+        normalized["llm_cache_hit"] = False
         return normalized
     except Exception as exc:
         fallback["warnings"] = list(
@@ -687,3 +1107,172 @@ def extract_structured_acta_pdf(
         fallback["llm_review_required"] = False
         return fallback
 
+
+@dataclass(frozen=True)
+class LlmExtractionJob:
+    """Un PDF por extraer; ``key`` identifica el resultado al entregarlo."""
+
+    key: str
+    file_path: str
+    filename: str = ""
+    subject: str = ""
+    source_label: str = ""
+    bypass_cache: bool = False
+    deadline_seconds: float | None = None
+
+
+@dataclass(frozen=True)
+class LlmExtractionOutcome:
+    job: LlmExtractionJob
+    status: str  # "ok", "error", "timeout" o "cancelled"
+    result: dict[str, Any] | None = None
+    error: str = ""
+    elapsed_seconds: float = 0.0
+
+
+class _TokenBucket:
+    """Limita las llamadas a la Edge Function a ``rate_per_minute`` con rafagas de ``capacity``."""
+
+    def __init__(self, rate_per_minute: float, capacity: int) -> None:
+        self._rate_per_second = max(0.0, float(rate_per_minute)) / 60.0
+        self._capacity = max(1, int(capacity))
+        self._tokens = float(self._capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, *, deadline: float | None, cancel_event: threading.Event) -> bool:
+        """Espera un turno; devuelve False si se cancela o vence ``deadline`` antes."""
+        if self._rate_per_second <= 0:
+            return not cancel_event.is_set()
+        while not cancel_event.is_set():
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate_per_second)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self._rate_per_second
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            cancel_event.wait(wait)
+        return False
+
+
+class LlmExtractionScheduler:
+    """Ejecuta extracciones LLM en paralelo y entrega cada resultado al terminar.
+
+    Respeta un maximo de llamadas simultaneas y un limite por minuto hacia la
+    Edge Function.  Cada trabajo puede tener un plazo propio: si vence antes de
+    obtener turno no se llama al LLM, y si ya arranco la llamada HTTP se corta
+    con el tiempo restante (el extractor cae al parser local).  ``cancel()``
+    descarta lo que aun no empezo.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int | None = None,
+        requests_per_minute: float | None = None,
+    ) -> None:
+        settings = get_settings()
+        workers = max_workers or getattr(settings, "automation_llm_max_concurrency", 0) or _LLM_DEFAULT_MAX_CONCURRENCY
+        rate = requests_per_minute
+        if rate is None:
+            rate = getattr(settings, "automation_llm_requests_per_minute", _LLM_DEFAULT_REQUESTS_PER_MINUTE)
+        self._max_workers = max(1, int(workers))
+        self._bucket = _TokenBucket(float(rate or 0), capacity=self._max_workers)
+        self._cancel_event = threading.Event()
+        self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="acta-llm")
+        self._futures: dict[Future, LlmExtractionJob] = {}
+
+    def __enter__(self) -> LlmExtractionScheduler:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def submit(self, job: LlmExtractionJob) -> None:
+        if self._cancel_event.is_set():
+            raise RuntimeError("La cola de extraccion LLM fue cancelada.")
+        deadline = time.monotonic() + job.deadline_seconds if job.deadline_seconds else None
+        future = self._pool.submit(self._run_job, job, deadline)
+        self._futures[future] = job
+
+    def cancel(self) -> None:
+        """Cancela los trabajos pendientes; las llamadas HTTP en curso terminan solas."""
+        self._cancel_event.set()
+        for future in self._futures:
+            future.cancel()
+
+    def close(self) -> None:
+        self.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def iter_results(self) -> Iterator[LlmExtractionOutcome]:
+        """Entrega los resultados en orden de finalizacion, no de envio."""
+        pending = dict(self._futures)
+        self._futures = {}
+        for future in as_completed(pending):
+            job = pending[future]
+            if future.cancelled():
+                yield LlmExtractionOutcome(job=job, status="cancelled", error="Extraccion cancelada.")
+                continue
+            yield future.result()
+
+    def _run_job(self, job: LlmExtractionJob, deadline: float | None) -> LlmExtractionOutcome:
+        started = time.monotonic()
+        if not self._bucket.acquire(deadline=deadline, cancel_event=self._cancel_event):
+            if self._cancel_event.is_set():
+                return LlmExtractionOutcome(job=job, status="cancelled", error="Extraccion cancelada.")
+            return LlmExtractionOutcome(
+                job=job,
+                status="timeout",
+                error="Se excedio el tiempo limite antes de iniciar la extraccion LLM.",
+                elapsed_seconds=time.monotonic() - started,
+            )
+        remaining = None
+        if deadline is not None:
+            remaining = max(1.0, deadline - time.monotonic())
+        try:
+            result = extract_structured_acta_pdf(
+                job.file_path,
+                filename=job.filename,
+                subject=job.subject,
+                source_label=job.source_label,
+                bypass_cache=job.bypass_cache,
+                edge_timeout_seconds=remaining,
+            )
+        except Exception as exc:
+            return LlmExtractionOutcome(
+                job=job,
+                status="error",
+                error=str(exc),
+                elapsed_seconds=time.monotonic() - started,
+            )
+        return LlmExtractionOutcome(
+            job=job,
+            status="ok",
+            result=result,
+            elapsed_seconds=time.monotonic() - started,
+        )
+
+
+def extract_structured_actas(
+    jobs: Iterable[LlmExtractionJob],
+    *,
+    max_workers: int | None = None,
+    requests_per_minute: float | None = None,
+) -> Iterator[LlmExtractionOutcome]:
+    """Atajo para extraer varios PDF con ``LlmExtractionScheduler`` y recibirlos al terminar."""
+    with LlmExtractionScheduler(max_workers=max_workers, requests_per_minute=requests_per_minute) as scheduler:
+        for job in jobs:
+            scheduler.submit(job)
+        yield from scheduler.iter_results()
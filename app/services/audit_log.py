@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+import atexit
+from datetime import datetime, timezone
+import gzip
+import json
+from pathlib import Path
+import queue
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from typing import Any, Callable
+
+from app.logging_utils import LOGGER_BACKEND, get_logger
+from app.sqlite_store import sqlite_connection
+
+_logger = get_logger(LOGGER_BACKEND)
+
+_INDEX_FILENAME = "audit_index.sqlite3"
+_DEFAULT_MAX_SEGMENT_BYTES = 5 * 1024 * 1024
+_WRITE_BATCH_SIZE = 200
+_FLUSH_AT_EXIT_SECONDS = 5.0
+# (linea JSONL, dia, message_id, acta_ref, recorded_at, ruta del espejo de texto, linea de texto)
+_QueuedRecord = tuple[str, str, str, str, str, str, str]
+_SEGMENT_RE = re.compile(r"^(?P<stream>.+)-(?P<day>\d{8})(?:-(?P<part>\d{3}))?\.jsonl(?:\.gz)?$")
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _ensure_schema(connection: sqlite3.Connection) -> None:
+    connection.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS audit_records (
+            segment TEXT NOT NULL,
+            line_no INTEGER NOT NULL,
+            stream TEXT NOT NULL,
+            message_id TEXT NOT NULL DEFAULT '',
+            acta_ref TEXT NOT NULL DEFAULT '',
+            recorded_at TEXT NOT NULL,
+            PRIMARY KEY (segment, line_no)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_audit_records_message_id
+        ON audit_records(message_id);
+
+        CREATE INDEX IF NOT EXISTS idx_audit_records_acta_ref
+        ON audit_records(acta_ref);
+        """
+    )
+
+
+class AuditLogSink:
+    """Registro JSONL por lineas con escritura en un hilo de fondo.
+
+    ``write`` serializa el registro y lo encola sin tocar disco.  El hilo
+    escritor agrega las lineas al segmento del dia (``<stream>-AAAAMMDD.jsonl``);
+    al cambiar de dia o superar ``max_segment_bytes`` el segmento se comprime
+    como ``<stream>-AAAAMMDD-NNN.jsonl.gz``.  Cada linea queda indexada por
+    ``message_id`` y ``acta_ref`` en ``audit_index.sqlite3`` para consultarla
+    con ``find``.  Opcionalmente cada registro lleva una linea de texto que el
+    mismo hilo agrega a un archivo plano (``text_path``), para logs que el
+    operador lee directamente.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        stream: str,
+        *,
+        max_segment_bytes: int = _DEFAULT_MAX_SEGMENT_BYTES,
+        clock: Callable[[], datetime] | None = None,
+    ) -> None:
+        self._directory = Path(directory)
+        self._stream = str(stream)
+        self._max_segment_bytes = max(1, int(max_segment_bytes))
+        self._clock = clock or _utc_now
+        self._queue: queue.Queue[_QueuedRecord | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+        self._active_segment: Path | None = None
+        self._active_lines = 0
+        self._active_bytes = 0
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def current_segment_path(self) -> Path:
+        return self._directory / f"{self._stream}-{self._clock().strftime('%Y%m%d')}.jsonl"
+
+    def write(self, record: dict[str, Any], *, text_path: Path | None = None, text_line: str = "") -> Path:
+        """Encola ``record`` y devuelve el segmento donde quedara escrito.
+
+        Con ``text_path`` el hilo escritor tambien agrega ``text_line`` a ese archivo.
+        """
+        now = self._clock()
+        payload = {"recorded_at": now.isoformat(), **dict(record)}
+        line = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str)
+        self._ensure_writer()
+        self._queue.put(
+            (
+                line,
+                now.strftime("%Y%m%d"),
+                str(payload.get("message_id") or "").strip(),
+                str(payload.get("acta_ref") or "").strip().upper(),
+                str(payload["recorded_at"]),
+                str(text_path or ""),
+                str(text_line or "").rstrip() if text_path else "",
+            )
+        )
+        return self._directory / f"{self._stream}-{now.strftime('%Y%m%d')}.jsonl"
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Espera a que todo lo encolado este en disco; False si vence ``timeout``."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: float | None = None) -> None:
+        with self._thread_lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(None)
+            self._thread = None
+        thread.join(timeout)
+
+    def find(self, *, message_id: str = "", acta_ref: str = "", limit: int = 100) -> list[dict[str, Any]]:
+        """Registros de este stream para ``message_id`` y/o ``acta_ref``, del mas antiguo al mas reciente."""
+        conditions = ["stream = ?"]
+        values: list[object] = [self._stream]
+        if str(message_id or "").strip():
+            conditions.append("message_id = ?")
+            values.append(str(message_id).strip())
+        if str(acta_ref or "").strip():
+            conditions.append("acta_ref = ?")
+            values.append(str(acta_ref).strip().upper())
+        if len(conditions) == 1:
+            return []
+        self.flush(timeout=_FLUSH_AT_EXIT_SECONDS)
+        values.append(max(1, int(limit)))
+        with self._index() as connection:
+            rows = connection.execute(
+                f"""
+                SELECT segment, line_no FROM audit_records
+                WHERE {' AND '.join(conditions)}
+                ORDER BY recorded_at, segment, line_no
+                LIMIT ?
+                """,
+                values,
+            ).fetchall()
+        wanted: dict[str, set[int]] = {}
+        for row in rows:
+            wanted.setdefault(str(row["segment"]), set()).add(int(row["line_no"]))
+        found: dict[tuple[str, int], dict[str, Any]] = {}
+        for segment, line_numbers in wanted.items():
+            for line_no, record in self._read_segment_lines(segment, line_numbers):
+                found[(segment, line_no)] = record
+        return [
+            found[(str(row["segment"]), int(row["line_no"]))]
+            for row in rows
+            if (str(row["segment"]), int(row["line_no"])) in found
+        ]
+
+    # --- hilo escritor -------------------------------------------------
+
+    def _ensure_writer(self) -> None:
+        with self._thread_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run_writer,
+                name=f"audit-log-{self._stream}",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run_writer(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            while item is not None and len(batch) < _WRITE_BATCH_SIZE:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+            records = [entry for entry in batch if entry is not None]
+            try:
+                if records:
+                    self._write_text_lines(records)
+                    self._write_batch(records)
+            except (OSError, RuntimeError, sqlite3.Error) as exc:
+                _logger.exception("No se pudo escribir el log de auditoria %s: %s", self._stream, exc)
+            finally:
+                for _entry in batch:
+                    self._queue.task_done()
+            if len(records) != len(batch):
+                return
+
+    def _write_text_lines(self, records: list[_QueuedRecord]) -> None:
+        by_path: dict[str, list[str]] = {}
+        for *_jsonl, text_path, text_line in records:
+            if text_path and text_line:
+                by_path.setdefault(text_path, []).append(text_line)
+        for text_path, lines in by_path.items():
+            # Un fallo en el log de texto no debe perder la copia JSONL.
+            try:
+                path = Path(text_path)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with path.open("a", encoding="utf-8") as handle:
+                    handle.write("".join(line + "\n" for line in lines))
+            except OSError as exc:
+                _logger.exception("No se pudo escribir el log de texto %s: %s", text_path, exc)
+
+    def _write_batch(self, records: list[_QueuedRecord]) -> None:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        index_rows: list[tuple[str, int, str, str, str, str]] = []
+        handle = None
+        try:
+            for line, day, message_id, acta_ref, recorded_at, _text_path, _text_line in records:
+                segment = self._directory / f"{self._stream}-{day}.jsonl"
+                line_bytes = len(line.encode("utf-8")) + 1
+                if self._active_segment != segment:
+                    if handle is not None:
+                        handle.close()
+                        handle = None
+                    self._activate_segment(segment)
+                if self._active_bytes and self._active_bytes + line_bytes > self._max_segment_bytes:
+                    if handle is not None:
+                        handle.close()
+                        handle = None
+                    self._flush_index(index_rows)
+                    index_rows = []
+                    self._rotate(segment)
+                    self._activate_segment(segment)
+                if handle is None:
+                    handle = segment.open("a", encoding="utf-8", newline="\n")
+                handle.write(line + "\n")
+                index_rows.append((segment.name, self._active_lines, self._stream, message_id, acta_ref, recorded_at))
+                self._active_lines += 1
+                self._active_bytes += line_bytes
+        finally:
+            if handle is not None:
+                handle.close()
+        self._flush_index(index_rows)
+
+    def _activate_segment(self, segment: Path) -> None:
+        self._compress_stale_segments(keep=segment)
+        self._active_segment = segment
+        self._active_lines = 0
+        self._active_bytes = 0
+        if segment.exists():
+            with segment.open("rb") as handle:
+                for raw in handle:
+                    self._active_lines += 1
+                    self._active_bytes += len(raw)
+
+    def _compress_stale_segments(self, *, keep: Path) -> None:
+        # Segmentos sin comprimir de otros dias (cambio de fecha o cierre previo).
+        for candidate in self._directory.glob(f"{self._stream}-*.jsonl"):
+            match = _SEGMENT_RE.match(candidate.name)
+            if candidate == keep or not match or match.group("stream") != self._stream or match.group("part"):
+                continue
+            self._rotate(candidate)
+
+    def _rotate(self, segment: Path) -> None:
+        match = _SEGMENT_RE.match(segment.name)
+        day = match.group("day") if match else self._clock().strftime("%Y%m%d")
+        part = 1
+        while True:
+            target = self._directory / f"{self._stream}-{day}-{part:03d}.jsonl.gz"
+            if not target.exists():
+                break
+            part += 1
+        with segment.open("rb") as source, gzip.open(target, "wb") as compressed:
+            shutil.copyfileobj(source, compressed)
+        with self._index() as connection:
+            with connection:
+                connection.execute(
+                    "UPDATE audit_records SET segment = ? WHERE segment = ?",
+                    (target.name, segment.name),
+                )
+        segment.unlink()
+        if self._active_segment == segment:
+            self._active_segment = None
+
+    def _flush_index(self, rows: list[tuple[str, int, str, str, str, str]]) -> None:
+        if not rows:
+            return
+        with self._index() as connection:
+            with connection:
+                connection.executemany(
+                    """
+                    INSERT OR REPLACE INTO audit_records(segment, line_no, stream, message_id, acta_ref, recorded_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    rows,
+                )
+
+    def _read_segment_lines(self, segment: str, line_numbers: set[int]):
+        path = self._directory / segment
+        if not path.exists():
+            return
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8") as handle:
+            for line_no, line in enumerate(handle):
+                if line_no in line_numbers:
+                    try:
+                        yield line_no, json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+
+    # --- indice --------------------------------------------------------
+
+    def _index(self):
+        return sqlite_connection(
+            self._directory / _INDEX_FILENAME,
+            _ensure_schema,
+            corrupt_message="El indice del log de auditoria esta corrupto y no puede leerse",
+        )
+
+
+_SINKS: dict[tuple[str, str], AuditLogSink] = {}
+_SINKS_LOCK = threading.Lock()
+
+
+def get_audit_sink(directory: Path, stream: str) -> AuditLogSink:
+    """Sink compartido por carpeta y stream, para que un solo hilo escriba cada archivo."""
+    key = (str(Path(directory).expanduser().resolve()), str(stream))
+    with _SINKS_LOCK:
+        sink = _SINKS.get(key)
+        if sink is None:
+            sink = AuditLogSink(Path(key[0]), stream)
+            _SINKS[key] = sink
+        return sink
+
+
+def flush_audit_sinks(timeout: float | None = _FLUSH_AT_EXIT_SECONDS) -> None:
+    with _SINKS_LOCK:
+        sinks = list(_SINKS.values())
+    for sink in sinks:
+        sink.flush(timeout=timeout)
+
+
+atexit.register(flush_audit_sinks)
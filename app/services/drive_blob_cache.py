@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import hashlib
+import json
+from pathlib import Path
+import sqlite3
+from typing import Any
+
+from app.paths import app_data_dir
+from app.services.excel_acta_import import PARSE_CACHE_VERSION
+from app.sqlite_store import sqlite_connection
+
+_DIR_NAME = "drive_blob_cache"
+_DB_FILENAME = "drive_blob_cache.sqlite3"
+_DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _ensure_schema(connection: sqlite3.Connection) -> None:
+    connection.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS drive_files (
+            file_id TEXT PRIMARY KEY,
+            version TEXT NOT NULL,
+            name TEXT NOT NULL DEFAULT '',
+            mime_type TEXT NOT NULL DEFAULT '',
+            sha256 TEXT NOT NULL DEFAULT '',
+            size_bytes INTEGER NOT NULL DEFAULT 0,
+            parse_version INTEGER NOT NULL DEFAULT 0,
+            parsed_json TEXT NOT NULL DEFAULT '',
+            created_at TEXT NOT NULL,
+            last_used_at TEXT NOT NULL
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_drive_files_last_used_at
+        ON drive_files(last_used_at);
+
+        CREATE INDEX IF NOT EXISTS idx_drive_files_sha256
+        ON drive_files(sha256);
+        """
+    )
+
+
+def drive_file_version(metadata: dict[str, Any]) -> str:
+    """Version del archivo segun Drive: ``md5Checksum`` si existe, si no ``modifiedTime``.
+
+    Los Google Sheets nativos no tienen md5; sin ninguno de los dos el archivo no se cachea.
+    """
+    md5 = str(metadata.get("md5Checksum") or "").strip()
+    if md5:
+        return f"md5:{md5}"
+    modified = str(metadata.get("modifiedTime") or "").strip()
+    return f"mtime:{modified}" if modified else ""
+
+
+@dataclass(frozen=True)
+class DriveCacheEntry:
+    file_id: str
+    version: str
+    name: str
+    mime_type: str
+    content: bytes | None
+    parsed: dict | None
+
+
+class DriveBlobCache:
+    """Copias locales de archivos de Drive ya descargados, direccionadas por contenido.
+
+    Cada ``file_id`` guarda la version vista (md5 o fecha de modificacion) y el
+    SHA-256 del contenido; los bytes viven una sola vez en ``blobs/<sha256>``
+    aunque varios ids apunten al mismo archivo.  Tambien se guarda el parseo
+    del acta para no repetirlo mientras no cambien el archivo ni
+    ``PARSE_CACHE_VERSION``.  Al superar ``max_bytes`` se descartan los
+    archivos usados hace mas tiempo.
+    """
+
+    def __init__(self, directory: Path | None = None, *, max_bytes: int = _DEFAULT_MAX_BYTES) -> None:
+        self._directory = directory or (app_data_dir() / _DIR_NAME)
+        self._path = self._directory / _DB_FILENAME
+        self._blobs_dir = self._directory / "blobs"
+        self._max_bytes = max(0, int(max_bytes))
+
+    def _connection(self):
+        return sqlite_connection(
+            self._path,
+            _ensure_schema,
+            corrupt_message="La cache local de Drive esta corrupta y no puede leerse",
+        )
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self._blobs_dir / sha256
+
+    def lookup(self, file_id: str, version: str) -> DriveCacheEntry | None:
+        """Entrada de ``file_id`` si sigue en ``version``; ``content`` es None si el blob ya no esta."""
+        if not file_id or not version:
+            return None
+        with self._connection() as connection:
+            with connection:
+                row = connection.execute(
+                    "SELECT * FROM drive_files WHERE file_id = ? AND version = ?",
+                    (file_id, version),
+                ).fetchone()
+                if row is None:
+                    return None
+                connection.execute(
+                    "UPDATE drive_files SET last_used_at = ? WHERE file_id = ?",
+                    (_utc_now_iso(), file_id),
+                )
+        content = None
+        sha256 = str(row["sha256"] or "")
+        if sha256:
+            try:
+                content = self._blob_path(sha256).read_bytes()
+            except OSError:
+                content = None
+            if content is not None and hashlib.sha256(content).hexdigest() != sha256:
+                content = None
+        parsed = None
+        if int(row["parse_version"]) == PARSE_CACHE_VERSION and row["parsed_json"]:
+            parsed = json.loads(row["parsed_json"])
+        return DriveCacheEntry(
+            file_id=str(row["file_id"]),
+            version=str(row["version"]),
+            name=str(row["name"]),
+            mime_type=str(row["mime_type"]),
+            content=content,
+            parsed=parsed if isinstance(parsed, dict) else None,
+        )
+
+    def store(
+        self,
+        file_id: str,
+        version: str,
+        *,
+        name: str = "",
+        mime_type: str = "",
+        content: bytes | None = None,
+        parsed: dict | None = None,
+    ) -> None:
+        """Guarda la version actual de ``file_id`` (reemplaza la anterior) y aplica el limite de tamano."""
+        if not file_id or not version:
+            return
+        sha256 = ""
+        size_bytes = 0
+        if content is not None:
+            if len(content) > self._max_bytes:
+                content = None
+            else:
+                sha256 = hashlib.sha256(content).hexdigest()
+                size_bytes = len(content)
+                blob_path = self._blob_path(sha256)
+                if not blob_path.exists():
+                    self._blobs_dir.mkdir(parents=True, exist_ok=True)
+                    partial = blob_path.with_suffix(".tmp")
+                    partial.write_bytes(content)
+                    partial.replace(blob_path)
+        now = _utc_now_iso()
+        with self._connection() as connection:
+            with connection:
+                connection.execute(
+                    """
+                    INSERT INTO drive_files(
+                        file_id, version, name, mime_type, sha256, size_bytes,
+                        parse_version, parsed_json, created_at, last_used_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(file_id) DO UPDATE SET
+                        version = excluded.version,
+                        name = excluded.name,
+                        mime_type = excluded.mime_type,
+                        sha256 = excluded.sha256,
+                        size_bytes = excluded.size_bytes,
+                        parse_version = excluded.parse_version,
+                        parsed_json = excluded.parsed_json,
+                        last_used_at = excluded.last_used_at
+                    """,
+                    (
+                        file_id,
+                        version,
+                        str(name or ""),
+                        str(mime_type or ""),
+                        sha256,
+                        size_bytes,
+                        PARSE_CACHE_VERSION if parsed is not None else 0,
+                        json.dumps(parsed, ensure_ascii=True, default=str) if parsed is not None else "",
+                        now,
+                        now,
+                    ),
+                )
+                self._evict(connection)
+            self._remove_orphan_blobs(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        rows = connection.execute(
+            """
+            SELECT file_id, sha256, size_bytes FROM drive_files
+            WHERE sha256 != ''
+            ORDER BY last_used_at DESC
+            """
+        ).fetchall()
+        seen: set[str] = set()
+        total = 0
+        evicted: list[str] = []
+        for row in rows:
+            sha256 = str(row["sha256"])
+            if sha256 not in seen:
+                seen.add(sha256)
+                total += int(row["size_bytes"] or 0)
+            if total > self._max_bytes:
+                evicted.append(str(row["file_id"]))
+        if evicted:
+            connection.executemany("DELETE FROM drive_files WHERE file_id = ?", [(item,) for item in evicted])
+
+    def _remove_orphan_blobs(self, connection: sqlite3.Connection) -> None:
+        if not self._blobs_dir.exists():
+            return
+        referenced = {
+            str(row["sha256"])
+            for row in connection.execute("SELECT DISTINCT sha256 FROM drive_files WHERE sha256 != ''").fetchall()
+        }
+        for blob in self._blobs_dir.iterdir():
+            if blob.name not in referenced:
+                try:
+                    blob.unlink()
+                except OSError:
+                    continue
@@ -2,55 +2,79 @@
 
 import json
 import re
-import tempfile
+from bisect import bisect_left
 from datetime import date, datetime
+from io import BytesIO
 from pathlib import Path
-from typing import Any
+import sqlite3
+from typing import TYPE_CHECKING, Any, BinaryIO, Iterable, Iterator
 
+from app.config import get_settings
 from app.google_sheets_client import (
-    download_drive_file,
-    export_spreadsheet_to_excel,
+    download_drive_file_bytes,
     extract_drive_file_id,
     get_drive_file_metadata,
+    read_spreadsheet_matrices,
 )
+from app.logging_utils import LOGGER_BACKEND, get_logger
 from app.utils.text import normalize_text
 
+if TYPE_CHECKING:
+    from app.services.drive_blob_cache import DriveBlobCache, DriveCacheEntry
+
+_logger = get_logger(LOGGER_BACKEND)
+
+# Subir este numero cuando cambie el parser de actas invalida los parseos guardados
+# (registro de adjuntos de Gmail y cache local de Drive).
+PARSE_CACHE_VERSION = 1
+
 MAX_SCAN_ROWS = 260
 MAX_SCAN_COLS = 70
 _GOOGLE_SPREADSHEET_MIME = "application/vnd.google-apps.spreadsheet"
 _EXCEL_EXTENSIONS = {".xlsx", ".xlsm"}
 _PDF_EXTENSIONS = {".pdf"}
+_SHEET_PRIORITY_TOKENS = ("acta", "formato", "registro", "seleccion", "seguimiento", "induccion", "sensibilizacion", "visita")
+_SHEET_HELPER_TOKENS = ("lista", "datos", "config", "param", "catalogo", "validacion", "aux", "base", "oculta", "tabla")
 _PDF_BLOCK_RE = re.compile(
     r"(?ms)(?:^|\n)\s*(?P<idx>[1-9])\s+(?P<body>.*?)(?=(?:\n\s*[1-9]\s+[A-ZÃÃ‰ÃÃ“ÃšÃ‘])|\Z)"
 )
 _PDF_ACTA_ID_RE = re.compile(r"(?is)ACTA\s*ID:\s*([A-Z0-9]{8})")
 
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
 def _clean_text(value: Any) -> str:
     text = "" if value is None else str(value).strip()
-    text = re.sub(r"\s+", " ", text)
+    text = _WHITESPACE_RE.sub(" ", text)
     return text
 
 
+_NON_DIGIT_RE = re.compile(r"\D")
+
+
 def _clean_cedula(value: Any) -> str:
     raw = _clean_text(value)
     if not raw:
         return ""
-    digits = re.sub(r"\D", "", raw)
+    digits = _NON_DIGIT_RE.sub("", raw)
     return digits
 
 
+_NIT_DIGITS_RE = re.compile(r"\d{6,12}(?:-\d)?")
+
+
 def _clean_nit(value: Any) -> str:
     raw = _clean_text(value)
     if not raw:
         return ""
-    match = re.search(r"\d{6,12}(?:-\d)?", raw)
+    match = _NIT_DIGITS_RE.search(raw)
     return match.group(0) if match else raw
 
 
 def _clean_name(value: Any) -> str:
     text = _clean_text(value)
-    text = re.sub(r"\s+", " ", text)
+    text = _WHITESPACE_RE.sub(" ", text)
     return text.strip(" .:-")
 
 
@@ -85,19 +109,22 @@ def _looks_like_person_name_for_company(value: Any) -> bool:
     )
     if any(marker in norm for marker in company_markers):
         return False
-    tokens = [token for token in re.split(r"\s+", text) if token]
+    tokens = [token for token in _WHITESPACE_RE.split(text) if token]
     return 2 <= len(tokens) <= 4 and all(any(ch.isalpha() for ch in token) for token in tokens)
 
 
+_EMAIL_DOMAIN_RE = re.compile(
+    r"(?i)[\w.+-]+@(?P<domain>[a-z0-9.-]+?\.(?:com\.co|edu\.co|org\.co|net\.co|com|org|net|co))",
+)
+_DOMAIN_SEPARATOR_RE = re.compile(r"[-_.]+")
+
+
 def _company_from_email_domain(text: str) -> str:
-    email_match = re.search(
-        r"(?i)[\w.+-]+@(?P<domain>[a-z0-9.-]+?\.(?:com\.co|edu\.co|org\.co|net\.co|com|org|net|co))",
-        normalize_text(text or ""),
-    )
+    email_match = _EMAIL_DOMAIN_RE.search(normalize_text(text or ""))
     if not email_match:
         return ""
     domain = email_match.group("domain").split(".", 1)[0]
-    pieces = re.split(r"[-_.]+", domain)
+    pieces = _DOMAIN_SEPARATOR_RE.split(domain)
     if len(pieces) == 1:
         collapsed = pieces[0]
         for marker in (
@@ -121,6 +148,22 @@ def _company_from_email_domain(text: str) -> str:
     return _clean_name(company)
 
 
+def _binary_stream(source: Any) -> BinaryIO | None:
+    """Devuelve un stream en memoria para ``bytes``/file-like o ``None`` si es una ruta."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return BytesIO(source)
+    if hasattr(source, "read"):
+        source.seek(0)
+        return source
+    return None
+
+
+def _rewind(source: Any) -> Any:
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
 def _to_iso_date(value: Any) -> str:
     if value is None:
         return ""
@@ -142,25 +185,62 @@ def _to_iso_date(value: Any) -> str:
     return ""
 
 
-def _sheet_matrix(path: str) -> list[tuple[str, list[list[Any]]]]:
+def _sheet_relevance(title: str, sheet_state: str = "visible") -> int:
+    norm = normalize_text(title)
+    score = 0
+    if any(token in norm for token in _SHEET_PRIORITY_TOKENS):
+        score += 2
+    if any(token in norm for token in _SHEET_HELPER_TOKENS):
+        score -= 2
+    if str(sheet_state or "visible") != "visible":
+        score -= 3
+    return score
+
+
+def _sheet_order(sheets: list[tuple[str, str]]) -> list[int]:
+    """Indices de las hojas ``(titulo, estado)`` de la mas a la menos relevante."""
+    return sorted(range(len(sheets)), key=lambda idx: (-_sheet_relevance(*sheets[idx]), idx))
+
+
+def _iter_sheet_rows(ws) -> Iterator[list[Any]]:
+    for row in ws.iter_rows(min_row=1, max_row=MAX_SCAN_ROWS, max_col=MAX_SCAN_COLS, values_only=True):
+        values = list(row)
+        # Las celdas vacias al final de la fila no aportan a ninguna busqueda.
+        while values and values[-1] is None:
+            values.pop()
+        yield values
+
+
+def _iter_workbook_sheets(source: Any) -> Iterator[tuple[str, int, Iterator[list[Any]]]]:
+    """Recorre las hojas del libro de la mas a la menos relevante como
+    ``(titulo, relevancia, filas)``.
+
+    Las filas de cada hoja se entregan en streaming; el libro se cierra cuando
+    el consumidor agota o cierra el generador.
+    """
     try:
         from openpyxl import load_workbook
     except ImportError as exc:  # pragma: no cover - runtime dependency
         raise RuntimeError("No se pudo importar openpyxl.") from exc
 
-    wb = load_workbook(path, data_only=True, read_only=True)
+    wb = load_workbook(source, data_only=True, read_only=True)
     try:
-        result: list[tuple[str, list[list[Any]]]] = []
-        for ws in wb.worksheets:
-            rows: list[list[Any]] = []
-            for row in ws.iter_rows(min_row=1, max_row=MAX_SCAN_ROWS, max_col=MAX_SCAN_COLS, values_only=True):
-                rows.append(list(row))
-            result.append((ws.title, rows))
-        return result
+        states = [(ws.title, getattr(ws, "sheet_state", "visible")) for ws in wb.worksheets]
+        for idx in _sheet_order(states):
+            ws = wb.worksheets[idx]
+            yield ws.title, _sheet_relevance(*states[idx]), _iter_sheet_rows(ws)
     finally:
         wb.close()
 
 
+def _iter_google_sheets(file_id: str) -> Iterator[tuple[str, int, Iterator[list[Any]]]]:
+    """Hojas de un Google Sheet leidas con un solo batchGet, en el mismo orden de relevancia."""
+    sheets = read_spreadsheet_matrices(file_id, max_rows=MAX_SCAN_ROWS, max_cols=MAX_SCAN_COLS)
+    states = [(item["title"], "hidden" if item.get("hidden") else "visible") for item in sheets]
+    for idx in _sheet_order(states):
+        yield sheets[idx]["title"], _sheet_relevance(*states[idx]), iter(list(sheets[idx].get("values") or []))
+
+
 def _is_likely_label(text: str) -> bool:
     if not text:
         return False
@@ -169,61 +249,136 @@ def _is_likely_label(text: str) -> bool:
     return text.endswith(":") or any(token in text for token in ("nit", "fecha", "modalidad", "profesional"))
 
 
-def _first_neighbor_value(rows: list[list[Any]], r: int, c: int) -> Any:
+class _SheetIndex:
+    """Indice de celdas de una hoja para las busquedas por etiqueta.
+
+    Cada celda no vacia se limpia y normaliza una sola vez. Las palabras del
+    texto normalizado alimentan un mapa palabra -> posiciones, de modo que una
+    consulta por fragmento solo revisa las celdas que pueden contenerlo.
+    """
+
+    def __init__(self, rows: Iterable[list[Any]]) -> None:
+        self.rows: list[list[Any]] = []
+        self._clean: dict[tuple[int, int], str] = {}
+        self._norm: dict[tuple[int, int], str] = {}
+        self._positions_by_token: dict[str, list[tuple[int, int]]] = {}
+        self._fragment_cache: dict[str, list[tuple[int, int]]] = {}
+        self._find_cache: dict[tuple[str, ...], list[tuple[int, int]]] = {}
+        for r, row in enumerate(rows):
+            self.rows.append(row)
+            for c, value in enumerate(row):
+                if value is None:
+                    continue
+                clean = _clean_text(value)
+                if not clean:
+                    continue
+                norm = normalize_text(value)
+                self._clean[(r, c)] = clean
+                self._norm[(r, c)] = norm
+                for token in set(norm.split(" ")):
+                    if token:
+                        self._positions_by_token.setdefault(token, []).append((r, c))
+
+    @property
+    def height(self) -> int:
+        return len(self.rows)
+
+    def width(self, r: int) -> int:
+        return len(self.rows[r]) if 0 <= r < len(self.rows) else 0
+
+    def value(self, r: int, c: int) -> Any:
+        return self.rows[r][c] if c < self.width(r) else None
+
+    def clean(self, r: int, c: int) -> str:
+        return self._clean.get((r, c), "")
+
+    def norm(self, r: int, c: int) -> str:
+        return self._norm.get((r, c), "")
+
+    def _fragment_positions(self, fragment: str) -> list[tuple[int, int]]:
+        cached = self._fragment_cache.get(fragment)
+        if cached is not None:
+            return cached
+        # Una coincidencia del fragmento implica que su primera palabra esta
+        # contenida en alguna palabra de la celda.
+        probe = fragment.split(" ", 1)[0]
+        hits: set[tuple[int, int]] = set()
+        for token, positions in self._positions_by_token.items():
+            if probe in token:
+                hits.update(positions)
+        cached = sorted(pos for pos in hits if fragment in self._norm[pos])
+        self._fragment_cache[fragment] = cached
+        return cached
+
+    def find(self, fragments: tuple[str, ...]) -> list[tuple[int, int]]:
+        """Posiciones, en orden de lectura, cuyo texto normalizado contiene algun fragmento."""
+        cached = self._find_cache.get(fragments)
+        if cached is not None:
+            return cached
+        hits: set[tuple[int, int]] = set()
+        for fragment in fragments:
+            hits.update(self._fragment_positions(fragment))
+        cached = sorted(hits)
+        self._find_cache[fragments] = cached
+        return cached
+
+    def first_column(self, r: int, fragments: tuple[str, ...]) -> int | None:
+        positions = self.find(fragments)
+        idx = bisect_left(positions, (r, -1))
+        if idx < len(positions) and positions[idx][0] == r:
+            return positions[idx][1]
+        return None
+
+
+def _first_neighbor_value(index: _SheetIndex, r: int, c: int) -> Any:
     # Right side first.
     for dc in range(1, 16):
         cc = c + dc
-        if cc >= len(rows[r]):
+        if cc >= index.width(r):
             break
-        value = rows[r][cc]
-        if _clean_text(value):
-            if len(_clean_text(value)) > 60:
+        clean = index.clean(r, cc)
+        if clean:
+            if len(clean) > 60:
                 continue
-            norm = normalize_text(value)
-            if not _is_likely_label(norm):
-                return value
+            if not _is_likely_label(index.norm(r, cc)):
+                return index.value(r, cc)
 
     # Next rows under same/adjacent columns
     for dr in range(1, 3):
         rr = r + dr
-        if rr >= len(rows):
+        if rr >= index.height:
             break
         for dc in (0, 1):
             cc = c + dc
-            if cc >= len(rows[rr]):
+            if cc >= index.width(rr):
                 continue
-            value = rows[rr][cc]
-            if _clean_text(value):
-                norm = normalize_text(value)
-                if not _is_likely_label(norm):
-                    return value
+            if index.clean(rr, cc) and not _is_likely_label(index.norm(rr, cc)):
+                return index.value(rr, cc)
     return None
 
 
-def _find_labeled_value(rows: list[list[Any]], label_tokens: tuple[str, ...], starts_with: bool = False) -> Any:
-    for r, row in enumerate(rows):
-        for c, value in enumerate(row):
-            norm = normalize_text(value)
-            if not norm:
-                continue
-            if len(norm) > 55:
-                continue
-            matched = any(norm.startswith(token) for token in label_tokens) if starts_with else any(
-                token in norm for token in label_tokens
-            )
-            if matched:
-                neighbor = _first_neighbor_value(rows, r, c)
-                if _clean_text(neighbor):
-                    return neighbor
+def _find_labeled_value(index: _SheetIndex, label_tokens: tuple[str, ...], starts_with: bool = False) -> Any:
+    for r, c in index.find(label_tokens):
+        norm = index.norm(r, c)
+        if len(norm) > 55:
+            continue
+        matched = any(norm.startswith(token) for token in label_tokens) if starts_with else True
+        if matched:
+            neighbor = _first_neighbor_value(index, r, c)
+            if _clean_text(neighbor):
+                return neighbor
     return None
 
 
+_URL_OR_EMAIL_RE = re.compile(r"(https?://|www\.|@[a-z0-9._-]+|\.com\b|\.org\b|\.net\b|\.co\b)")
+
+
 def _is_person_candidate(value: Any) -> bool:
     text = _clean_text(value)
     if not text or len(text) < 3:
         return False
     norm = normalize_text(text)
-    if re.search(r"(https?://|www\.|@[a-z0-9._-]+|\.com\b|\.org\b|\.net\b|\.co\b)", norm):
+    if _URL_OR_EMAIL_RE.search(norm):
         return False
     banned = (
         "codigo",
@@ -247,62 +402,57 @@ def _is_person_candidate(value: Any) -> bool:
     return any(ch.isalpha() for ch in text)
 
 
-def _extract_profesional(rows: list[list[Any]]) -> str:
+def _extract_profesional(index: _SheetIndex) -> str:
     labels = (
         "profesional asignado reca",
         "profesional asignado",
     )
-    for r, row in enumerate(rows):
-        for c, value in enumerate(row):
-            norm = normalize_text(value)
-            if not norm or len(norm) > 60:
-                continue
-            if not any(norm == token or norm.startswith(token + ":") for token in labels):
-                continue
-            candidate = _first_neighbor_value(rows, r, c)
-            if _is_person_candidate(candidate):
-                return _clean_text(candidate)
+    for r, c in index.find(labels):
+        norm = index.norm(r, c)
+        if len(norm) > 60:
+            continue
+        if not any(norm == token or norm.startswith(token + ":") for token in labels):
+            continue
+        candidate = _first_neighbor_value(index, r, c)
+        if _is_person_candidate(candidate):
+            return _clean_text(candidate)
     return ""
 
 
-def _extract_asistentes_candidates(rows: list[list[Any]]) -> list[str]:
-    asist_row = -1
-    for r, row in enumerate(rows):
-        for value in row:
-            norm = normalize_text(value)
-            if not norm:
-                continue
-            if re.search(r"\b\d+\s*\.\s*asistentes\b", norm) or norm == "asistentes" or norm.endswith(" asistentes"):
-                asist_row = r
-                break
-        if asist_row >= 0:
-            break
+_ASISTENTES_HEADING_RE = re.compile(r"\b\d+\s*\.\s*asistentes\b")
 
+
+def _is_asistentes_heading(norm: str) -> bool:
+    return bool(_ASISTENTES_HEADING_RE.search(norm)) or norm == "asistentes" or norm.endswith(" asistentes")
+
+
+def _extract_asistentes_candidates(index: _SheetIndex) -> list[str]:
+    asist_row = next(
+        (r for r, c in index.find(("asistentes",)) if _is_asistentes_heading(index.norm(r, c))),
+        -1,
+    )
     if asist_row < 0:
         return []
 
     candidates: list[str] = []
-    for rr in range(asist_row + 1, min(asist_row + 30, len(rows))):
-        row = rows[rr]
-        if not row:
+    for rr in range(asist_row + 1, min(asist_row + 30, index.height)):
+        width = index.width(rr)
+        if not width:
             continue
-        row_norm = [normalize_text(cell) for cell in row]
-        has_nombre_label = any("nombre completo" in cell for cell in row_norm if cell)
-        if not has_nombre_label:
+        if index.first_column(rr, ("nombre completo",)) is None:
             continue
 
-        for raw in row:
-            text = _clean_text(raw)
-            norm = normalize_text(raw)
-            if "nombre completo" in norm and ":" in text:
+        for cc in range(width):
+            text = index.clean(rr, cc)
+            if "nombre completo" in index.norm(rr, cc) and ":" in text:
                 inline = text.split(":", 1)[1].strip()
                 if _is_person_candidate(inline):
                     candidates.append(inline)
                     break
 
-        for raw in row:
-            value = _clean_text(raw)
-            norm = normalize_text(raw)
+        for cc in range(width):
+            value = index.clean(rr, cc)
+            norm = index.norm(rr, cc)
             if not value:
                 continue
             if "nombre completo" in norm:
@@ -316,44 +466,40 @@ def _extract_asistentes_candidates(rows: list[list[Any]]) -> list[str]:
     return candidates
 
 
-def _extract_profesional_from_asistentes(rows: list[list[Any]]) -> str:
-    candidates = _extract_asistentes_candidates(rows)
+def _extract_profesional_from_asistentes(index: _SheetIndex) -> str:
+    candidates = _extract_asistentes_candidates(index)
     return candidates[0] if candidates else ""
 
 
-def _extract_nit(rows: list[list[Any]]) -> str:
+_NIT_SEPARATOR_RE = re.compile(r"[.\s]")
+
+
+def _extract_nit(index: _SheetIndex) -> str:
     nit_labels = ("numero de nit", "nit empresa", "razon social / nit", "nit:")
-    for r, row in enumerate(rows):
-        for c, value in enumerate(row):
-            raw = _clean_text(value)
-            norm = normalize_text(value)
-            if not raw:
-                continue
-            if len(norm) > 55:
-                continue
-            if not any(token in norm for token in nit_labels):
-                continue
-            own = _clean_nit(raw)
-            if re.fullmatch(r"\d{6,12}(?:-\d)?", own):
-                return own
-            for dc in range(1, 9):
-                cc = c + dc
-                if cc >= len(row):
-                    break
-                candidate = re.sub(r"[.\s]", "", _clean_nit(row[cc]))
-                if re.fullmatch(r"\d{6,12}(?:-\d)?", candidate):
-                    return candidate
-            for dr in range(1, 4):
-                rr = r + dr
-                if rr >= len(rows):
-                    break
-                candidate = re.sub(r"[.\s]", "", _clean_nit(rows[rr][c] if c < len(rows[rr]) else ""))
-                if re.fullmatch(r"\d{6,12}(?:-\d)?", candidate):
-                    return candidate
+    for r, c in index.find(nit_labels):
+        if len(index.norm(r, c)) > 55:
+            continue
+        own = _clean_nit(index.clean(r, c))
+        if _NIT_DIGITS_RE.fullmatch(own):
+            return own
+        for dc in range(1, 9):
+            cc = c + dc
+            if cc >= index.width(r):
+                break
+            candidate = _NIT_SEPARATOR_RE.sub("", _clean_nit(index.clean(r, cc)))
+            if _NIT_DIGITS_RE.fullmatch(candidate):
+                return candidate
+        for dr in range(1, 4):
+            rr = r + dr
+            if rr >= index.height:
+                break
+            candidate = _NIT_SEPARATOR_RE.sub("", _clean_nit(index.clean(rr, c)))
+            if _NIT_DIGITS_RE.fullmatch(candidate):
+                return candidate
     return ""
 
 
-def _extract_participants(rows: list[list[Any]]) -> list[dict[str, str]]:
+def _extract_participants(index: _SheetIndex) -> list[dict[str, str]]:
     participants: list[dict[str, str]] = []
     name_headers = (
         "nombre vinculado",
@@ -366,22 +512,20 @@ def _extract_participants(rows: list[list[Any]]) -> list[dict[str, str]]:
     )
     ced_headers = ("cedula", "c.c", "cc", "documento")
 
-    for idx, row in enumerate(rows):
-        normalized = [normalize_text(cell) for cell in row]
-        name_col = next((i for i, cell in enumerate(normalized) if any(token in cell for token in name_headers)), None)
+    header_rows = sorted({r for r, _c in index.find(name_headers)})
+    for idx in header_rows:
+        name_col = index.first_column(idx, name_headers)
         if name_col is None:
             continue
-        ced_col = next((i for i, cell in enumerate(normalized) if any(token in cell for token in ced_headers)), None)
+        ced_col = index.first_column(idx, ced_headers)
         if ced_col is None:
             continue
-        discapacidad_col = next((i for i, cell in enumerate(normalized) if "discapacidad" in cell), None)
-        genero_col = next((i for i, cell in enumerate(normalized) if "genero" in cell or "sexo" in cell), None)
+        discapacidad_col = index.first_column(idx, ("discapacidad",))
+        genero_col = index.first_column(idx, ("genero", "sexo"))
 
         empty_streak = 0
-        for j in range(idx + 1, min(idx + 120, len(rows))):
-            current = rows[j]
-            ced_raw = current[ced_col] if ced_col is not None and ced_col < len(current) else ""
-            ced = _clean_cedula(ced_raw)
+        for j in range(idx + 1, min(idx + 120, index.height)):
+            ced = _clean_cedula(index.clean(j, ced_col))
 
             if not ced:
                 empty_streak += 1
@@ -393,9 +537,9 @@ def _extract_participants(rows: list[list[Any]]) -> list[dict[str, str]]:
             if len(ced) < 5:
                 continue
 
-            name_raw = current[name_col] if name_col < len(current) else ""
-            discapacidad_raw = current[discapacidad_col] if discapacidad_col is not None and discapacidad_col < len(current) else ""
-            genero_raw = current[genero_col] if genero_col is not None and genero_col < len(current) else ""
+            name_raw = index.value(j, name_col)
+            discapacidad_raw = index.value(j, discapacidad_col) if discapacidad_col is not None else ""
+            genero_raw = index.value(j, genero_col) if genero_col is not None else ""
             participants.append(
                 {
                     "nombre_usuario": _clean_name(name_raw),
@@ -429,13 +573,13 @@ def _dedupe_participants(participants: list[dict[str, str]]) -> list[dict[str, s
     return unique
 
 
-def _extract_pdf_text_pages(path: str) -> list[str]:
+def _extract_pdf_text_pages(source: str | BinaryIO) -> list[str]:
     try:
         from pypdf import PdfReader
     except ImportError as exc:  # pragma: no cover - runtime dependency
         raise RuntimeError("No se pudo importar pypdf.") from exc
 
-    reader = PdfReader(path)
+    reader = PdfReader(_rewind(source))
     pages: list[str] = []
     for page in reader.pages:
         raw_text = page.extract_text() or ""
@@ -445,18 +589,50 @@ def _extract_pdf_text_pages(path: str) -> list[str]:
     return pages
 
 
-def _extract_pdf_value(text: str, pattern: str) -> str:
-    match = re.search(pattern, text, re.IGNORECASE)
+def _extract_pdf_value(text: str, pattern: re.Pattern[str]) -> str:
+    match = pattern.search(text)
     if not match:
         return ""
     return _clean_text(match.group(1))
 
 
+class _PdfFieldGrammar:
+    """Campos ``etiqueta: valor`` de un PDF extraidos en una sola pasada.
+
+    Cada campo se declara como ``(etiqueta, resto)`` y su patron completo es la
+    concatenacion de ambos, con el valor en el grupo 1. Un unico ``finditer``
+    de lookaheads sobre las etiquetas ubica las posiciones candidatas y en cada
+    una se ancla el patron de los campos aun pendientes; el primer acierto de
+    cada campo es el mismo que daria ``re.search`` con su patron completo.
+    """
+
+    def __init__(self, fields: dict[str, tuple[str, str]], flags: int = re.IGNORECASE) -> None:
+        self._patterns = {name: re.compile(label + rest, flags) for name, (label, rest) in fields.items()}
+        labels = "|".join(f"(?:{label})" for label, _rest in fields.values())
+        self._labels = re.compile(f"(?=(?:{labels}))", flags)
+
+    def extract(self, text: str) -> dict[str, str]:
+        values = dict.fromkeys(self._patterns, "")
+        pending = dict(self._patterns)
+        for label_match in self._labels.finditer(text):
+            start = label_match.start()
+            for name, pattern in list(pending.items()):
+                match = pattern.match(text, start)
+                if match:
+                    values[name] = _clean_text(match.group(1))
+                    del pending[name]
+            if not pending:
+                break
+        return values
+
+
+_PDF_LABELED_NIT_RE = re.compile(
+    r"(?i)(?:numero de nit|n[uú]mero de nit|nit empresa|razon social / nit|nit)\s*:\s*([0-9.\- ]+)",
+)
+
+
 def _extract_pdf_nits(text: str) -> list[str]:
-    labeled_matches = re.findall(
-        r"(?i)(?:numero de nit|n[uú]mero de nit|nit empresa|razon social / nit|nit)\s*:\s*([0-9.\- ]+)",
-        str(text or ""),
-    )
+    labeled_matches = _PDF_LABELED_NIT_RE.findall(str(text or ""))
     seen: set[str] = set()
     result: list[str] = []
     for nit in labeled_matches:
@@ -468,8 +644,8 @@ def _extract_pdf_nits(text: str) -> list[str]:
     if result:
         return result
 
-    for nit in re.findall(r"\d{6,12}(?:-\d)?", str(text or "")):
-        digits = re.sub(r"\D", "", nit)
+    for nit in _NIT_DIGITS_RE.findall(str(text or "")):
+        digits = _NON_DIGIT_RE.sub("", nit)
         if len(digits) == 10 and digits.startswith("3"):
             continue
         clean = _clean_nit(nit)
@@ -487,11 +663,14 @@ def _extract_pdf_acta_ref(text: str) -> str:
     return _clean_text(match.group(1)).upper()
 
 
+_DURATION_AMOUNT_RE = re.compile(r"(\d+(?:[.,]\d+)?)")
+
+
 def _parse_duration_hours(raw_value: str) -> float | None:
     text = normalize_text(raw_value or "")
     if not text:
         return None
-    match = re.search(r"(\d+(?:[.,]\d+)?)", text)
+    match = _DURATION_AMOUNT_RE.search(text)
     if not match:
         return None
     try:
@@ -505,23 +684,36 @@ def _parse_duration_hours(raw_value: str) -> float | None:
     return round(amount, 2)
 
 
+_PDF_HEADER_LABEL_RE = re.compile(
+    r"(?i)(?<!\n)(fecha de la visita:|modalidad:|nombre de la empresa:|ciudad/municipio:|direcci[oó]n de la empresa:|n[uú]mero de nit:|correo electr[oó]nico:|tel[eé]fonos:|contacto de la empresa:|empresa afiliada a caja(?:de)? compensaci[oó]n:|sede compensar:|asesor:|profesional asignado\s*reca:)",
+)
+_PDF_DATE_BEFORE_MODALIDAD_RE = re.compile(
+    r"(?P<fecha>[0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{4})\s+modalidad:",
+    re.IGNORECASE,
+)
+_PDF_MODALIDAD_LINE_RE = re.compile(r"modalidad:\s*(?P<modalidad>.+)$", re.IGNORECASE)
+_PDF_CIUDAD_LABEL_RE = re.compile(r"(?i)ciudad/municipio:")
+_PDF_GENERAL_FIELDS = _PdfFieldGrammar(
+    {
+        "empresa": (
+            r"nombre de la empresa:",
+            r"\s*([^\n]+?)(?:\s*(?:ciudad/municipio:|direcci[oó]n de la empresa:|n[uú]mero de nit:|correo electr[oó]nico:|tel[eé]fonos:|contacto de la empresa:|empresa afiliada a caja(?:de)? compensaci[oó]n:|$))",
+        ),
+        "fecha_servicio": (r"fecha de la visita:", r"\s*([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{4})"),
+        "modalidad": (
+            r"modalidad:",
+            r"\s*([^\n]+?)(?:\s*(?:nombre de la empresa:|ciudad/municipio:|direcci[oó]n de la empresa:|n[uú]mero de nit:|correo electr[oó]nico:|tel[eé]fonos:|$))",
+        ),
+    }
+)
+
+
 def _extract_pdf_general_fields(first_page: str) -> tuple[str, str, str]:
-    header_text = re.sub(
-        r"(?i)(?<!\n)(fecha de la visita:|modalidad:|nombre de la empresa:|ciudad/municipio:|direcci[oó]n de la empresa:|n[uú]mero de nit:|correo electr[oó]nico:|tel[eé]fonos:|contacto de la empresa:|empresa afiliada a caja(?:de)? compensaci[oó]n:|sede compensar:|asesor:|profesional asignado\s*reca:)",
-        r"\n\1",
-        first_page,
-    )
-    empresa = _extract_pdf_value(
-        header_text,
-        r"nombre de la empresa:\s*([^\n]+?)(?:\s*(?:ciudad/municipio:|direcci[oó]n de la empresa:|n[uú]mero de nit:|correo electr[oó]nico:|tel[eé]fonos:|contacto de la empresa:|empresa afiliada a caja(?:de)? compensaci[oó]n:|$))",
-    )
-    fecha_servicio = _to_iso_date(
-        _extract_pdf_value(header_text, r"fecha de la visita:\s*([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{4})")
-    )
-    modalidad = _extract_pdf_value(
-        header_text,
-        r"modalidad:\s*([^\n]+?)(?:\s*(?:nombre de la empresa:|ciudad/municipio:|direcci[oó]n de la empresa:|n[uú]mero de nit:|correo electr[oó]nico:|tel[eé]fonos:|$))",
-    ).rstrip(".")
+    header_text = _PDF_HEADER_LABEL_RE.sub(r"\n\1", first_page)
+    fields = _PDF_GENERAL_FIELDS.extract(header_text)
+    empresa = fields["empresa"]
+    fecha_servicio = _to_iso_date(fields["fecha_servicio"])
+    modalidad = fields["modalidad"].rstrip(".")
 
     if normalize_text(empresa).startswith(("nombre de la empresa", "direccion de la empresa", "dirección de la empresa")):
         empresa = ""
@@ -536,23 +728,19 @@ def _extract_pdf_general_fields(first_page: str) -> tuple[str, str, str]:
             continue
 
         if not fecha_servicio:
-            date_match = re.search(
-                r"(?P<fecha>[0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{4})\s+modalidad:",
-                line,
-                re.IGNORECASE,
-            )
+            date_match = _PDF_DATE_BEFORE_MODALIDAD_RE.search(line)
             if date_match:
                 fecha_servicio = _to_iso_date(date_match.group("fecha"))
 
         if not modalidad:
-            modalidad_match = re.search(r"modalidad:\s*(?P<modalidad>.+)$", line, re.IGNORECASE)
+            modalidad_match = _PDF_MODALIDAD_LINE_RE.search(line)
             if modalidad_match:
                 modalidad = _clean_text(modalidad_match.group("modalidad")).rstrip(".")
 
         if not empresa and idx + 1 < len(lines):
             next_line = lines[idx + 1]
             if "ciudad/municipio:" in normalize_text(next_line):
-                empresa = _clean_text(re.split(r"(?i)ciudad/municipio:", next_line, maxsplit=1)[0])
+                empresa = _clean_text(_PDF_CIUDAD_LABEL_RE.split(next_line, maxsplit=1)[0])
 
     if not empresa or normalize_text(empresa).startswith(
         ("nombre de la empresa", "direccion de la empresa", "dirección de la empresa")
@@ -564,7 +752,7 @@ def _extract_pdf_general_fields(first_page: str) -> tuple[str, str, str]:
             if normalize_text(line).startswith("fecha de la visita:") and idx > 0:
                 previous_line = lines[idx - 1]
                 if "ciudad/municipio:" in normalize_text(previous_line):
-                    empresa = _clean_text(re.split(r"(?i)ciudad/municipio:", previous_line, maxsplit=1)[0])
+                    empresa = _clean_text(_PDF_CIUDAD_LABEL_RE.split(previous_line, maxsplit=1)[0])
                     break
 
     if not empresa or normalize_text(empresa).startswith(
@@ -575,22 +763,25 @@ def _extract_pdf_general_fields(first_page: str) -> tuple[str, str, str]:
     return empresa, fecha_servicio, modalidad
 
 
+_PDF_OFERENTES_SECTION_RE = re.compile(r"(?is)(?<!\d)2\.\s*datos del oferente(?P<section>.*?)(?=(?<!\d)3\.\s*\S)")
+
+
 def _extract_pdf_oferentes_section(text: str) -> str:
-    match = re.search(
-        r"(?is)(?<!\d)2\.\s*datos del oferente(?P<section>.*?)(?=(?<!\d)3\.\s*\S)",
-        text,
-    )
+    match = _PDF_OFERENTES_SECTION_RE.search(text)
     if not match:
         return text
     return _clean_text(match.group("section"))
 
 
+_CEDULA_PERCENTAGE_RE = re.compile(r"(?P<digits>\d+)(?:(?P<sep>[.,])(?P<dec>\d{1,2}))?%?")
+
+
 def _split_joined_cedula_percentage(raw_token: str) -> tuple[str, str]:
-    match = re.search(r"(?P<digits>\d+)(?:(?P<sep>[.,])(?P<dec>\d{1,2}))?%?", raw_token)
+    match = _CEDULA_PERCENTAGE_RE.search(raw_token)
     if not match:
         return "", ""
 
-    digits = re.sub(r"\D", "", match.group("digits"))
+    digits = _NON_DIGIT_RE.sub("", match.group("digits"))
     decimals = match.group("dec")
     separator = match.group("sep") or "."
     candidates: list[tuple[int, int, str, str]] = []
@@ -622,7 +813,7 @@ def _split_joined_cedula_percentage(raw_token: str) -> tuple[str, str]:
 
 
 def _split_joined_cedula_phone(raw_digits: str) -> tuple[str, str]:
-    digits = re.sub(r"\D", "", raw_digits or "")
+    digits = _NON_DIGIT_RE.sub("", raw_digits or "")
     if len(digits) < 17:
         return "", ""
     for cedula_len in (10, 9, 8, 7):
@@ -635,38 +826,44 @@ def _split_joined_cedula_phone(raw_digits: str) -> tuple[str, str]:
     return "", ""
 
 
+_CEDULA_DIGITS_RE = re.compile(r"\d{6,12}")
+_DECIMAL_NUMBER_RE = re.compile(r"\d+[.,]\d")
+
+
 def _extract_cedula_from_oferente_token(raw_token: str) -> str:
     token = _clean_text(raw_token)
     if not token:
         return ""
-    digits = re.sub(r"\D", "", token)
-    if "%" in token or re.search(r"\d+[.,]\d", token) or len(digits) > 10:
+    digits = _NON_DIGIT_RE.sub("", token)
+    if "%" in token or _DECIMAL_NUMBER_RE.search(token) or len(digits) > 10:
         cedula, _pct = _split_joined_cedula_percentage(token)
         if cedula:
             return cedula
-    match = re.search(r"\d{6,12}", token)
+    match = _CEDULA_DIGITS_RE.search(token)
     return _clean_cedula(match.group(0)) if match else ""
 
 
+_PDF_LOOSE_NAME_RE = re.compile(r"^(?P<nombre>[A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúüÜñ' .-]{6,}?)(?P<rest>\d.*)$")
+_PDF_LOOSE_TOKEN_STOP_RE = re.compile(
+    r"(?is)(?:Discapacidad|Cra\.\s*|CARGO\b|CONTACTO\b|PARENTESCO\b|TEL[EÉ]FONO\b|FECHA DE NACIMIENTO\b|EDAD\b|Pendiente|Aprobado|No aprobado|No aplica|[¿?]|4\.\s*CARACTERIZACI)",
+)
+_PDF_LOOSE_DISCAPACIDAD_RE = re.compile(
+    r"(?is)Discapacidad\s+(?P<value>.+?)(?=(?:\d{7,12}|Pendiente|Aprobado|No aprobado|No aplica|CARGO\b|CONTACTO\b|PARENTESCO\b|TEL[EÉ]FONO\b|FECHA DE NACIMIENTO\b|EDAD\b|OBSERVACIONES\b|[¿?]|OFERENTE\s+[1-9]|4\.\s*CARACTERIZACI|$))",
+)
+
+
 def _extract_pdf_loose_participant_from_block(body: str) -> dict[str, str] | None:
     compact = _clean_text(body)
     if not compact:
         return None
 
-    name_match = re.search(
-        r"^(?P<nombre>[A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúüÜñ' .-]{6,}?)(?P<rest>\d.*)$",
-        compact,
-    )
+    name_match = _PDF_LOOSE_NAME_RE.search(compact)
     if not name_match:
         return None
 
     nombre = _clean_name(name_match.group("nombre"))
     rest = str(name_match.group("rest") or "")
-    token_window = re.split(
-        r"(?is)(?:Discapacidad|Cra\.\s*|CARGO\b|CONTACTO\b|PARENTESCO\b|TEL[EÉ]FONO\b|FECHA DE NACIMIENTO\b|EDAD\b|Pendiente|Aprobado|No aprobado|No aplica|[¿?]|4\.\s*CARACTERIZACI)",
-        rest,
-        maxsplit=1,
-    )[0]
+    token_window = _PDF_LOOSE_TOKEN_STOP_RE.split(rest, maxsplit=1)[0]
     cedula = _extract_cedula_from_oferente_token(token_window[:40])
     if not nombre or not cedula or not _is_person_candidate(nombre):
         return None
@@ -677,10 +874,7 @@ def _extract_pdf_loose_participant_from_block(body: str) -> dict[str, str] | Non
         compact[:420],
     ]
     for window in search_windows:
-        disc_match = re.search(
-            r"(?is)Discapacidad\s+(?P<value>.+?)(?=(?:\d{7,12}|Pendiente|Aprobado|No aprobado|No aplica|CARGO\b|CONTACTO\b|PARENTESCO\b|TEL[EÉ]FONO\b|FECHA DE NACIMIENTO\b|EDAD\b|OBSERVACIONES\b|[¿?]|OFERENTE\s+[1-9]|4\.\s*CARACTERIZACI|$))",
-            window,
-        )
+        disc_match = _PDF_LOOSE_DISCAPACIDAD_RE.search(window)
         if disc_match:
             discapacidad = _clean_text(disc_match.group("value"))
             break
@@ -693,20 +887,22 @@ def _extract_pdf_loose_participant_from_block(body: str) -> dict[str, str] | Non
     }
 
 
+_PDF_GROUPAL_OFERENTE_RE = re.compile(
+    r"(?is)OFERENTE\s+(?P<label_idx>[1-9])\s*"
+    r"(?:CITADO\s+A\s+ENTREVISTA.*?DISCAPACIDAD)?\s*"
+    r"(?P<row_idx>[1-9])\s*"
+    r"(?P<nombre>.+?)"
+    r"(?P<token>\d[\d.,% ]*(?:No\s*aplica\.)?)\s*"
+    r"Discapacidad\s+"
+    r"(?P<discapacidad>[^0-9]+?)\s*"
+    r"(?P<telefonos>\d[\d\s-]{6,30})?\s*"
+    r"(?P<resultado>Pendiente|Aprobado|No aprobado)(?=\s*CARGO|4\.)",
+)
+
+
 def _extract_pdf_groupal_oferente_chunks(text: str) -> list[dict[str, str]]:
     participants: list[dict[str, str]] = []
-    pattern = re.compile(
-        r"(?is)OFERENTE\s+(?P<label_idx>[1-9])\s*"
-        r"(?:CITADO\s+A\s+ENTREVISTA.*?DISCAPACIDAD)?\s*"
-        r"(?P<row_idx>[1-9])\s*"
-        r"(?P<nombre>.+?)"
-        r"(?P<token>\d[\d.,% ]*(?:No\s*aplica\.)?)\s*"
-        r"Discapacidad\s+"
-        r"(?P<discapacidad>[^0-9]+?)\s*"
-        r"(?P<telefonos>\d[\d\s-]{6,30})?\s*"
-        r"(?P<resultado>Pendiente|Aprobado|No aprobado)(?=\s*CARGO|4\.)"
-    )
-    for match in pattern.finditer(str(text or "")):
+    for match in _PDF_GROUPAL_OFERENTE_RE.finditer(str(text or "")):
         nombre = _clean_name(match.group("nombre"))
         cedula = _extract_cedula_from_oferente_token(match.group("token"))
         if not nombre or not cedula or not _is_person_candidate(nombre):
@@ -722,6 +918,110 @@ def _extract_pdf_groupal_oferente_chunks(text: str) -> list[dict[str, str]]:
     return _dedupe_participants(participants)
 
 
+_PDF_STRICT_FIRST_LINE_RE = re.compile(
+    r"^(?P<nombre>.+?)(?P<token>\d{7,13}(?:[.,]\d{1,2})?%?)(?:\s*)Discapacidad\s+(?P<tail>.+)$",
+    re.IGNORECASE,
+)
+_PDF_STRICT_TAIL_RE = re.compile(
+    r"^(?P<discapacidad>[^0-9]+?)(?P<telefono>\d[\d ]{6,15})(?P<resultado>Pendiente|Aprobado|No aprobado|No aplica)",
+    re.IGNORECASE,
+)
+_PDF_INLINE_PARTICIPANT_RE = re.compile(
+    r"(?is)(?<!\d)(?P<idx>[1-9])\s+"
+    r"(?P<nombre>.+?)"
+    r"(?P<token>\d{7,13}(?:[.,]\d{1,2})?%?)"
+    r"(?:\s*)Discapacidad\s+"
+    r"(?P<tail>.*?)(?=(?:(?<!\d)[1-9]\s+\S)|(?:(?<!\d)[3-9]\.\s*\S)|\Z)",
+)
+_PDF_INLINE_TAIL_RE = re.compile(
+    r"^(?P<discapacidad>[^0-9]+?)(?P<telefono>\d[\d ]{6,15})(?P<resultado>Pendiente|Aprobado|No aprobado)",
+    re.IGNORECASE,
+)
+_PDF_CONTRACT_PARTICIPANT_RE = re.compile(
+    r"(?ims)(?:^|\n)\s*(?P<idx>[1-9])\s+"
+    r"(?P<nombre>.+?)"
+    r"(?P<token>\d{7,13}(?:[.,]\d{1,2})?%?)\s*"
+    r"Discapacidad\s+"
+    r"(?P<discapacidad>[^0-9]+?)"
+    r"(?P<telefono>\d[\d ]{6,15})"
+    r"(?=\s*(?:Masculino|Femenino|Otro)\b)",
+)
+_PDF_LINE_PARTICIPANT_RE = re.compile(
+    r"(?i)(?P<nombre>[A-ZÃÃ‰ÃÃ“ÃšÃ‘][A-ZÃÃ‰ÃÃ“ÃšÃ‘a-zÃ¡Ã©Ã­Ã³ÃºÃ¼ÃœÃ±' .-]{8,}?)\s+"
+    r"(?P<cedula>\d{6,12})\s+"
+    r"Discapacidad\s+"
+    r"(?P<discapacidad>.+?)\s+"
+    r"(?P<telefono>\d[\d ]{6,15})\s+"
+    r"(?P<resultado>Pendiente|Aprobado|No aprobado)\b",
+)
+_PDF_FOLLOW_UP_VISIT_LABEL_RE = re.compile(r"(?is)persona que atiende la\s*visita")
+_PDF_FOLLOW_UP_VISIT_RE = re.compile(
+    r"(?is)(?P<nombre>[A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúüÜñ' .-]{8,}?)"
+    r"(?P<cedula_phone>\d{17,22})"
+    r"(?P<email>[\w.+-]+@[\w.-]+)"
+    r"(?P<contacto>[A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúüÜñ' .-]{4,})"
+    r"(?:Hermana|Hermano|Madre|Padre|Esposa|Esposo|Pareja|Amiga|Amigo|Tia|Tio|Prima|Primo)"
+    r"\s+\d{7,12}\s+"
+    r"(?P<cargo>.+?)\s+"
+    r"Si\s+No aplica\.\s+Discapacidad\s+(?P<discapacidad>.+?)"
+    r"(?=\s+\d{1,2}/\d{1,2}/\d{4}\b)",
+)
+_PDF_FOLLOW_UP_ROW_RE = re.compile(
+    r"(?is)(?P<nombre>[A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúüÜñ' .-]{8,}?)"
+    r"(?P<cedula_phone>\d{17,22})"
+    r"(?P<email>[\w.+-]+@[\w.-]+)"
+    r"(?P<contacto>[A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúüÜñ' .-]{4,}?)"
+    r"(?:Hermana|Hermano|Madre|Padre|Esposa|Esposo|Pareja|Amiga|Amigo|Tia|Tio|Prima|Primo)"
+    r"\s+\d{7,12}\s+"
+    r"(?P<cargo>.+?)\s+"
+    r"Si\s+No aplica\.\s+Discapacidad\s+(?P<discapacidad>.+?)"
+    r"(?=\s+(?:Seguimiento\s*[1-9]:|\d{1,2}/\d{1,2}/\d{4}\b)|$)",
+)
+_PDF_FOLLOW_UP_PERCENT_RE = re.compile(
+    r"(?is)(?P<nombre>[A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúüÜñ' .-]{8,}?)"
+    r"(?P<cedula_phone>\d{17,22})"
+    r"(?P<email>[\w.+-]+@[\w.-]+)"
+    r"(?P<contacto>[A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúüÜñ' .-]{4,}?)"
+    r"(?:Hermana|Hermano|Madre|Padre|Esposa|Esposo|Pareja|Amiga|Amigo|Tia|Tio|Prima|Primo)"
+    r"\s+\d{7,12}\s+"
+    r"(?P<cargo>.+?)\s+"
+    r"Si\s+(?:(?P<porcentaje>\d{1,3}(?:[.,]\d{1,2})?)|No refiere|No aplica\.)\s+Discapacidad\s+(?P<discapacidad>.+?)"
+    r"(?=\s+(?:Contrato de trabajo|Seguimiento\s*[1-9]:|\d{1,2}/\d{1,2}/\d{4}\b)|$)",
+)
+_PDF_FOLLOW_UP_PATTERNS = (
+    (_PDF_FOLLOW_UP_VISIT_LABEL_RE, _PDF_FOLLOW_UP_VISIT_RE),
+    (None, _PDF_FOLLOW_UP_ROW_RE),
+    (None, _PDF_FOLLOW_UP_PERCENT_RE),
+)
+_PDF_CEDULA_PHONE_RUN_RE = re.compile(r"(?<!\d)\d{17,}")
+_PDF_NAME_CHAR_RE = re.compile(r"(?i)[A-Za-zÁÉÍÓÚÑáéíóúüÜñ' .-]")
+_PDF_NAME_START_RE = re.compile(r"(?i)[A-ZÁÉÍÓÚÑ]")
+_CEDULA_PHONE_RE = re.compile(r"(?P<cedula_phone>\d{17,22})", re.IGNORECASE)
+
+
+def _search_follow_up_row(pattern: re.Pattern[str], text: str, pos: int = 0) -> re.Match[str] | None:
+    """Equivale a ``pattern.search(text, pos)`` para las filas de seguimiento.
+
+    Esas filas empiezan con un nombre sin digitos pegado a la cedula y el
+    telefono (17 o mas digitos): el nombre siempre termina donde empieza una
+    corrida larga de digitos y el resto del patron no depende de donde empezo.
+    Por eso basta anclar una vez por corrida, en el primer inicio de nombre
+    valido del tramo de letras que la precede, en lugar de recorrer el texto.
+    """
+    for run in _PDF_CEDULA_PHONE_RUN_RE.finditer(text, pos):
+        digits_start = run.start()
+        name_start = digits_start
+        while name_start > pos and _PDF_NAME_CHAR_RE.match(text, name_start - 1):
+            name_start -= 1
+        for start in range(name_start, digits_start - 8):
+            if _PDF_NAME_START_RE.match(text, start):
+                match = pattern.match(text, start)
+                if match:
+                    return match
+                break
+    return None
+
+
 def _extract_pdf_participants(text: str) -> list[dict[str, str]]:
     chunk_participants = _extract_pdf_groupal_oferente_chunks(text)
     if chunk_participants:
@@ -735,22 +1035,14 @@ def _extract_pdf_participants(text: str) -> list[dict[str, str]]:
         strict_participant: dict[str, str] | None = None
         if "discapacidad" in normalize_text(body):
             first_line = body.split(" Agente de ", 1)[0]
-            first_match = re.search(
-                r"^(?P<nombre>.+?)(?P<token>\d{7,13}(?:[.,]\d{1,2})?%?)(?:\s*)Discapacidad\s+(?P<tail>.+)$",
-                first_line,
-                re.IGNORECASE,
-            )
+            first_match = _PDF_STRICT_FIRST_LINE_RE.search(first_line)
             if first_match:
                 nombre = _clean_name(first_match.group("nombre"))
                 if nombre and _is_person_candidate(nombre):
                     cedula = _extract_cedula_from_oferente_token(first_match.group("token"))
                     if cedula:
                         tail = _clean_text(first_match.group("tail"))
-                        tail_match = re.search(
-                            r"^(?P<discapacidad>[^0-9]+?)(?P<telefono>\d[\d ]{6,15})(?P<resultado>Pendiente|Aprobado|No aprobado|No aplica)",
-                            tail,
-                            re.IGNORECASE,
-                        )
+                        tail_match = _PDF_STRICT_TAIL_RE.search(tail)
                         if tail_match:
                             strict_participant = {
                                 "nombre_usuario": nombre,
@@ -770,14 +1062,7 @@ def _extract_pdf_participants(text: str) -> list[dict[str, str]]:
     if participants:
         return _dedupe_participants(participants)
 
-    inline_pattern = re.compile(
-        r"(?is)(?<!\d)(?P<idx>[1-9])\s+"
-        r"(?P<nombre>.+?)"
-        r"(?P<token>\d{7,13}(?:[.,]\d{1,2})?%?)"
-        r"(?:\s*)Discapacidad\s+"
-        r"(?P<tail>.*?)(?=(?:(?<!\d)[1-9]\s+\S)|(?:(?<!\d)[3-9]\.\s*\S)|\Z)"
-    )
-    for match in inline_pattern.finditer(search_text):
+    for match in _PDF_INLINE_PARTICIPANT_RE.finditer(search_text):
         nombre = _clean_name(match.group("nombre"))
         if not nombre or not _is_person_candidate(nombre):
             continue
@@ -786,11 +1071,7 @@ def _extract_pdf_participants(text: str) -> list[dict[str, str]]:
             continue
 
         tail = _clean_text(match.group("tail"))
-        tail_match = re.search(
-            r"^(?P<discapacidad>[^0-9]+?)(?P<telefono>\d[\d ]{6,15})(?P<resultado>Pendiente|Aprobado|No aprobado)",
-            tail,
-            re.IGNORECASE,
-        )
+        tail_match = _PDF_INLINE_TAIL_RE.search(tail)
         if not tail_match:
             continue
         discapacidad = _clean_text(tail_match.group("discapacidad")) if tail_match else ""
@@ -805,16 +1086,7 @@ def _extract_pdf_participants(text: str) -> list[dict[str, str]]:
     if participants:
         return _dedupe_participants(participants)
 
-    contract_pattern = re.compile(
-        r"(?ims)(?:^|\n)\s*(?P<idx>[1-9])\s+"
-        r"(?P<nombre>.+?)"
-        r"(?P<token>\d{7,13}(?:[.,]\d{1,2})?%?)\s*"
-        r"Discapacidad\s+"
-        r"(?P<discapacidad>[^0-9]+?)"
-        r"(?P<telefono>\d[\d ]{6,15})"
-        r"(?=\s*(?:Masculino|Femenino|Otro)\b)"
-    )
-    for match in contract_pattern.finditer(search_text):
+    for match in _PDF_CONTRACT_PARTICIPANT_RE.finditer(search_text):
         nombre = _clean_name(match.group("nombre"))
         if not nombre or not _is_person_candidate(nombre):
             continue
@@ -835,19 +1107,11 @@ def _extract_pdf_participants(text: str) -> list[dict[str, str]]:
     # Fallback for PDFs where the participant row is extracted outside the
     # expected section but still preserves name, cÃ©dula, discapacidad, phone,
     # and result on the same line.
-    line_pattern = re.compile(
-        r"(?i)(?P<nombre>[A-ZÃÃ‰ÃÃ“ÃšÃ‘][A-ZÃÃ‰ÃÃ“ÃšÃ‘a-zÃ¡Ã©Ã­Ã³ÃºÃ¼ÃœÃ±' .-]{8,}?)\s+"
-        r"(?P<cedula>\d{6,12})\s+"
-        r"Discapacidad\s+"
-        r"(?P<discapacidad>.+?)\s+"
-        r"(?P<telefono>\d[\d ]{6,15})\s+"
-        r"(?P<resultado>Pendiente|Aprobado|No aprobado)\b"
-    )
     for raw_line in str(text or "").splitlines():
         line = _clean_text(raw_line)
         if "discapacidad" not in normalize_text(line):
             continue
-        match = line_pattern.search(line)
+        match = _PDF_LINE_PARTICIPANT_RE.search(line)
         if not match:
             continue
         nombre = _clean_name(match.group("nombre"))
@@ -865,45 +1129,12 @@ def _extract_pdf_participants(text: str) -> list[dict[str, str]]:
     if participants:
         return _dedupe_participants(participants)
 
-    follow_up_pattern = re.compile(
-        r"(?is)persona que atiende la\s*visita.*?"
-        r"(?P<nombre>[A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúüÜñ' .-]{8,}?)"
-        r"(?P<cedula_phone>\d{17,22})"
-        r"(?P<email>[\w.+-]+@[\w.-]+)"
-        r"(?P<contacto>[A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúüÜñ' .-]{4,})"
-        r"(?:Hermana|Hermano|Madre|Padre|Esposa|Esposo|Pareja|Amiga|Amigo|Tia|Tio|Prima|Primo)"
-        r"\s+\d{7,12}\s+"
-        r"(?P<cargo>.+?)\s+"
-        r"Si\s+No aplica\.\s+Discapacidad\s+(?P<discapacidad>.+?)"
-        r"(?=\s+\d{1,2}/\d{1,2}/\d{4}\b)",
-    )
-    follow_up_patterns = [
-        follow_up_pattern,
-        re.compile(
-            r"(?is)(?P<nombre>[A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúüÜñ' .-]{8,}?)"
-            r"(?P<cedula_phone>\d{17,22})"
-            r"(?P<email>[\w.+-]+@[\w.-]+)"
-            r"(?P<contacto>[A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúüÜñ' .-]{4,}?)"
-            r"(?:Hermana|Hermano|Madre|Padre|Esposa|Esposo|Pareja|Amiga|Amigo|Tia|Tio|Prima|Primo)"
-            r"\s+\d{7,12}\s+"
-            r"(?P<cargo>.+?)\s+"
-            r"Si\s+No aplica\.\s+Discapacidad\s+(?P<discapacidad>.+?)"
-            r"(?=\s+(?:Seguimiento\s*[1-9]:|\d{1,2}/\d{1,2}/\d{4}\b)|$)",
-        ),
-        re.compile(
-            r"(?is)(?P<nombre>[A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúüÜñ' .-]{8,}?)"
-            r"(?P<cedula_phone>\d{17,22})"
-            r"(?P<email>[\w.+-]+@[\w.-]+)"
-            r"(?P<contacto>[A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúüÜñ' .-]{4,}?)"
-            r"(?:Hermana|Hermano|Madre|Padre|Esposa|Esposo|Pareja|Amiga|Amigo|Tia|Tio|Prima|Primo)"
-            r"\s+\d{7,12}\s+"
-            r"(?P<cargo>.+?)\s+"
-            r"Si\s+(?:(?P<porcentaje>\d{1,3}(?:[.,]\d{1,2})?)|No refiere|No aplica\.)\s+Discapacidad\s+(?P<discapacidad>.+?)"
-            r"(?=\s+(?:Contrato de trabajo|Seguimiento\s*[1-9]:|\d{1,2}/\d{1,2}/\d{4}\b)|$)",
-        ),
-    ]
-    for follow_up_pattern in follow_up_patterns:
-        follow_up_match = follow_up_pattern.search(str(text or ""))
+    follow_up_text = str(text or "")
+    for label_pattern, follow_up_pattern in _PDF_FOLLOW_UP_PATTERNS:
+        label_match = label_pattern.search(follow_up_text) if label_pattern else None
+        if label_pattern and not label_match:
+            continue
+        follow_up_match = _search_follow_up_row(follow_up_pattern, follow_up_text, label_match.end() if label_match else 0)
         if not follow_up_match:
             continue
         nombre = _clean_name(follow_up_match.group("nombre"))
@@ -922,87 +1153,109 @@ def _extract_pdf_participants(text: str) -> list[dict[str, str]]:
     return _dedupe_participants(participants)
 
 
+_PDF_FOLLOW_UP_NUMBER_RE = re.compile(
+    r"(?i)seguimiento\s*(?P<number>[1-9])\s*:\s*(?P<date>[0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{4})",
+)
+
+
 def _extract_pdf_follow_up_number(text: str) -> str:
     last_number = ""
-    for match in re.finditer(
-        r"(?i)seguimiento\s*(?P<number>[1-9])\s*:\s*(?P<date>[0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{4})",
-        str(text or ""),
-    ):
+    for match in _PDF_FOLLOW_UP_NUMBER_RE.finditer(str(text or "")):
         if _to_iso_date(match.group("date")):
             last_number = match.group("number")
     return last_number
 
 
+_FIRST_NUMBER_RE = re.compile(r"\d+")
+_PDF_VACANCY_FIELDS = _PdfFieldGrammar(
+    {
+        "cargo": (
+            r"nombre de la vacante:",
+            r"\s*(.+?)(?:n[uú]mero de vacantes:|nivel del cargo:|g[eé]nero:|edad:|modalidad de trabajo:|lugar de trabajo:|$)",
+        ),
+        "vacantes": (
+            r"n[uú]mero de vacantes:",
+            r"\s*(.+?)(?:nivel del cargo:|g[eé]nero:|edad:|modalidad de trabajo:|lugar de trabajo:|salario asignado:|$)",
+        ),
+    },
+    re.IGNORECASE | re.DOTALL,
+)
+
+
 def _extract_pdf_vacancy_fields(text: str) -> tuple[str, int]:
-    cargo = _extract_pdf_value(
-        text,
-        r"(?is)nombre de la vacante:\s*(.+?)(?:n[uú]mero de vacantes:|nivel del cargo:|g[eé]nero:|edad:|modalidad de trabajo:|lugar de trabajo:|$)",
-    )
+    fields = _PDF_VACANCY_FIELDS.extract(text)
+    cargo = fields["cargo"]
     total_vacantes = 0
-    vacantes_raw = _extract_pdf_value(
-        text,
-        r"(?is)n[uú]mero de vacantes:\s*(.+?)(?:nivel del cargo:|g[eé]nero:|edad:|modalidad de trabajo:|lugar de trabajo:|salario asignado:|$)",
-    )
-    vacantes_match = re.search(r"\d+", vacantes_raw)
+    vacantes_raw = fields["vacantes"]
+    vacantes_match = _FIRST_NUMBER_RE.search(vacantes_raw)
     if vacantes_match:
         total_vacantes = int(vacantes_match.group(0))
     return _clean_text(cargo), total_vacantes
 
 
+_PDF_SELECTION_SECTION_RE = re.compile(
+    r"(?is)2\.\s*datos del oferente(?P<section>.*?)(?:(?<!\d)3\.\s*\S|4\.\s*caracterizaci[oó]n del oferente|$)",
+)
+_PDF_SELECTION_HEADER_RE = re.compile(
+    r"(?is)cargo\s*contacto de emergencia\s*parentesco\s*tel[eé]fono(?:\s*fecha de nacimiento\s*edad)?\s*(?P<tail>.+?)(?:(?:[¿?]pendiente otros oferentes|lugar firma de contrato|fecha firma de contrato|3\.)|$)",
+)
+_CAMEL_BOUNDARY_RE = re.compile(r"(?<=[a-záéíóúüñ])(?=[A-ZÁÉÍÓÚÑ])")
+_PDF_SELECTION_CONTACT_RE = re.compile(
+    r"(?s)^(?P<cargo>.+?)\s+"
+    r"(?P<contacto>[A-ZÁÉÍÓÚÑ][a-záéíóúüñ]+(?:\s+[A-Za-zÁÉÍÓÚÑáéíóúüñ]+){0,4})\s+"
+    r"(?P<parentesco>Madre|Padre|Hermana|Hermano|Pareja|Esposa|Esposo|Amiga|Amigo|Mamá|Papa|Papá|Tia|Tío|Tio|Abuela|Abuelo)\b",
+)
+_PDF_SELECTION_CARGO_RE = re.compile(
+    r"(?is)cargo\s+(?P<value>.+?)(?:contacto de emergencia|parentesco|tel[eé]fono|fecha de nacimiento|edad|[¿?]pendiente otros oferentes|lugar firma de contrato|fecha firma de contrato|$)",
+)
+
+
 def _extract_pdf_selection_cargo(text: str) -> str:
-    section_match = re.search(
-        r"(?is)2\.\s*datos del oferente(?P<section>.*?)(?:(?<!\d)3\.\s*\S|4\.\s*caracterizaci[oó]n del oferente|$)",
-        str(text or ""),
-    )
+    section_match = _PDF_SELECTION_SECTION_RE.search(str(text or ""))
     section = section_match.group("section") if section_match else str(text or "")
-    compact = re.sub(r"\s+", " ", section)
-    header_match = re.search(
-        r"(?is)cargo\s*contacto de emergencia\s*parentesco\s*tel[eé]fono(?:\s*fecha de nacimiento\s*edad)?\s*(?P<tail>.+?)(?:(?:[¿?]pendiente otros oferentes|lugar firma de contrato|fecha firma de contrato|3\.)|$)",
-        compact,
-    )
+    compact = _WHITESPACE_RE.sub(" ", section)
+    header_match = _PDF_SELECTION_HEADER_RE.search(compact)
     if header_match:
         tail = _clean_text(header_match.group("tail"))
-        tail = re.sub(r"(?<=[a-záéíóúüñ])(?=[A-ZÁÉÍÓÚÑ])", " ", tail)
-        contact_match = re.search(
-            r"(?s)^(?P<cargo>.+?)\s+"
-            r"(?P<contacto>[A-ZÁÉÍÓÚÑ][a-záéíóúüñ]+(?:\s+[A-Za-zÁÉÍÓÚÑáéíóúüñ]+){0,4})\s+"
-            r"(?P<parentesco>Madre|Padre|Hermana|Hermano|Pareja|Esposa|Esposo|Amiga|Amigo|Mamá|Papa|Papá|Tia|Tío|Tio|Abuela|Abuelo)\b",
-            tail,
-        )
+        tail = _CAMEL_BOUNDARY_RE.sub(" ", tail)
+        contact_match = _PDF_SELECTION_CONTACT_RE.search(tail)
         cargo = _clean_text(contact_match.group("cargo") if contact_match else tail)
         if cargo:
             return cargo
-    cargo = _extract_pdf_value(
-        section,
-        r"(?is)cargo\s+(?P<value>.+?)(?:contacto de emergencia|parentesco|tel[eé]fono|fecha de nacimiento|edad|[¿?]pendiente otros oferentes|lugar firma de contrato|fecha firma de contrato|$)",
-    )
+    cargo = _extract_pdf_value(section, _PDF_SELECTION_CARGO_RE)
     if normalize_text(cargo).startswith("contacto de emergencia"):
         return ""
     return _clean_text(cargo)
 
 
+_FOLLOW_UP_FILENAME_SUFFIX_RE = re.compile(r"\s*-\s*\d{2}_[A-Za-z]{3,4}_\d{4}$")
+_FILENAME_COUNTER_PREFIX_RE = re.compile(r"^\(\d+\)\s*")
+
+
 def _extract_name_from_follow_up_filename(path: Path) -> str:
     stem = path.stem
-    suffix_match = re.search(r"\s*-\s*\d{2}_[A-Za-z]{3,4}_\d{4}$", stem)
+    suffix_match = _FOLLOW_UP_FILENAME_SUFFIX_RE.search(stem)
     if not suffix_match:
         return ""
     prefix = stem[: suffix_match.start()]
     if " - " not in prefix:
         return ""
     name = prefix.rsplit(" - ", 1)[-1]
-    name = re.sub(r"^\(\d+\)\s*", "", name).strip()
+    name = _FILENAME_COUNTER_PREFIX_RE.sub("", name).strip()
     return _clean_name(name)
 
 
+_PDF_FOLLOW_UP_DISCAPACIDAD_RE = re.compile(
+    r"(?is)Si\s+(?:\d{1,3}(?:[.,]\d{1,2})?%?|No refiere|No aplica\.)\s+Discapacidad\s+(?P<discapacidad>.+?)"
+    r"(?=\s+(?:Contrato de trabajo|Seguimiento\s*[1-9]:|\d{1,2}/\d{1,2}/\d{4}\b)|$)",
+)
+
+
 def _extract_follow_up_participant_from_filename(text: str, path: Path) -> list[dict[str, str]]:
     if "seguimiento al proceso de inclusion laboral" not in normalize_text(text):
         return []
-    cedula_match = re.search(r"(?P<cedula_phone>\d{17,22})", str(text or ""), re.IGNORECASE)
-    discapacidad_match = re.search(
-        r"(?is)Si\s+(?:\d{1,3}(?:[.,]\d{1,2})?%?|No refiere|No aplica\.)\s+Discapacidad\s+(?P<discapacidad>.+?)"
-        r"(?=\s+(?:Contrato de trabajo|Seguimiento\s*[1-9]:|\d{1,2}/\d{1,2}/\d{4}\b)|$)",
-        str(text or ""),
-    )
+    cedula_match = _CEDULA_PHONE_RE.search(str(text or ""))
+    discapacidad_match = _PDF_FOLLOW_UP_DISCAPACIDAD_RE.search(str(text or ""))
     if not cedula_match or not discapacidad_match:
         return []
     nombre = _extract_name_from_follow_up_filename(path)
@@ -1020,32 +1273,38 @@ def _extract_follow_up_participant_from_filename(text: str, path: Path) -> list[
     ]
 
 
+_PDF_ASISTENTES_HEADING_RE = re.compile(r"\b\d+\.\s*asistentes\b", re.IGNORECASE)
+_PDF_NOMBRE_COMPLETO_LABEL_RE = re.compile(r"(?i)(?<!\n)(nombre completo:)")
+_PDF_NOMBRE_COMPLETO_RE = re.compile(
+    r"(?i)nombre completo:\s*(?P<nombre>[A-ZÃÃ‰ÃÃ“ÃšÃ‘][A-Za-zÃÃ‰ÃÃ“ÃšÃ‘Ã¡Ã©Ã­Ã³ÃºÃ¼ÃœÃ±' -]+?)"
+    r"(?=(?:\s*cargo:|\s+profesional\b|\s+lider\b|\s+coordinacion\b|\s+psicolog[aÃ¡]\b|$))",
+)
+_PDF_NOMBRE_COMPLETO_SPLIT_RE = re.compile(r"(?i)nombre completo:\s*")
+_PDF_CARGO_SPLIT_RE = re.compile(r"(?i)cargo:\s*")
+
+
 def _extract_pdf_asistentes_candidates(text: str) -> list[str]:
     def _collect(source_text: str) -> list[str]:
         found: list[str] = []
-        normalized = re.sub(r"(?i)(?<!\n)(nombre completo:)", r"\n\1", source_text)
+        normalized = _PDF_NOMBRE_COMPLETO_LABEL_RE.sub(r"\n\1", source_text)
         for raw_line in normalized.splitlines():
             line = raw_line.strip()
             if not line or "nombre completo:" not in line.lower():
                 continue
-            explicit_name = re.search(
-                r"(?i)nombre completo:\s*(?P<nombre>[A-ZÃÃ‰ÃÃ“ÃšÃ‘][A-Za-zÃÃ‰ÃÃ“ÃšÃ‘Ã¡Ã©Ã­Ã³ÃºÃ¼ÃœÃ±' -]+?)"
-                r"(?=(?:\s*cargo:|\s+profesional\b|\s+lider\b|\s+coordinacion\b|\s+psicolog[aÃ¡]\b|$))",
-                line,
-            )
+            explicit_name = _PDF_NOMBRE_COMPLETO_RE.search(line)
             if explicit_name:
                 candidate = _clean_name(explicit_name.group("nombre"))
                 if candidate and _is_person_candidate(candidate) and candidate not in found:
                     found.append(candidate)
                 continue
-            for chunk in re.split(r"(?i)nombre completo:\s*", line):
-                candidate = re.split(r"(?i)cargo:\s*", chunk, maxsplit=1)[0]
+            for chunk in _PDF_NOMBRE_COMPLETO_SPLIT_RE.split(line):
+                candidate = _PDF_CARGO_SPLIT_RE.split(chunk, maxsplit=1)[0]
                 candidate = _clean_name(candidate)
                 if candidate and _is_person_candidate(candidate) and candidate not in found:
                     found.append(candidate)
         return found
 
-    start_match = re.search(r"\b\d+\.\s*asistentes\b", text, re.IGNORECASE)
+    start_match = _PDF_ASISTENTES_HEADING_RE.search(text)
     asistentes_text = text[start_match.start() :] if start_match else text
     candidates = _collect(asistentes_text)
     if candidates or not start_match:
@@ -1053,32 +1312,36 @@ def _extract_pdf_asistentes_candidates(text: str) -> list[str]:
     return _collect(text)
 
 
+_PDF_INTERPRETER_NAME_RE = re.compile(
+    r"(?is)nombre\s+int\S?rprete\s*(?:no\s*\d+)?\s*:\s*(?P<nombre>.+?)(?:hora\s+inicial:|hora\s+final:|total\s+tiempo:|\n|$)",
+)
+
+
 def _extract_interpreter_names(text: str) -> list[str]:
     names: list[str] = []
-    pattern = re.compile(
-        r"(?is)nombre\s+int\S?rprete\s*(?:no\s*\d+)?\s*:\s*(?P<nombre>.+?)(?:hora\s+inicial:|hora\s+final:|total\s+tiempo:|\n|$)"
-    )
-    for match in pattern.finditer(str(text or "")):
+    for match in _PDF_INTERPRETER_NAME_RE.finditer(str(text or "")):
         candidate = _clean_name(match.group("nombre"))
         if candidate and _is_person_candidate(candidate) and candidate not in names:
             names.append(candidate)
     return names
 
 
+_PDF_INTERPRETER_SECTION_RE = re.compile(
+    r"(?is)2\.\s*datos de los oferentes/ vinculados(?P<section>.*?)(?:nombre\s+int\S?rprete|3\.)",
+)
+_PDF_INTERPRETER_ROW_RE = re.compile(
+    r"(?P<idx>\d+)\s+(?P<nombre>.+?)\s+(?P<cedula>\d{6,12})\s+(?P<proceso>.+?)(?=(?:\s+\d+\s+[A-Z????????????])|$)",
+    re.IGNORECASE,
+)
+
+
 def _extract_interpreter_participants(text: str) -> tuple[list[dict[str, str]], str]:
     normalized_text = str(text or "")
-    section_match = re.search(
-        r"(?is)2\.\s*datos de los oferentes/ vinculados(?P<section>.*?)(?:nombre\s+int\S?rprete|3\.)",
-        normalized_text,
-    )
+    section_match = _PDF_INTERPRETER_SECTION_RE.search(normalized_text)
     section = _clean_text(section_match.group("section")) if section_match else _clean_text(normalized_text)
     process_name = ""
     participants: list[dict[str, str]] = []
-    pattern = re.compile(
-        r"(?P<idx>\d+)\s+(?P<nombre>.+?)\s+(?P<cedula>\d{6,12})\s+(?P<proceso>.+?)(?=(?:\s+\d+\s+[A-Z????????????])|$)",
-        re.IGNORECASE,
-    )
-    for match in pattern.finditer(section):
+    for match in _PDF_INTERPRETER_ROW_RE.finditer(section):
         nombre = _clean_name(match.group("nombre"))
         cedula = _clean_cedula(match.group("cedula"))
         proceso = _clean_text(match.group("proceso"))
@@ -1097,42 +1360,53 @@ def _extract_interpreter_participants(text: str) -> tuple[list[dict[str, str]],
     return _dedupe_participants(participants), process_name
 
 
+_PDF_INTERPRETER_MODALIDAD_RE = re.compile(
+    r"(?is)modalidad servicio:\s*(?:(?:int\S?rprete|nombre int\S?rprete)\s*:\s*.+?\s+)?"
+    r"(?P<modalidad>virtual|presencial|h[ií]brida?)\b",
+)
+_PDF_INTERPRETER_FIELDS = _PdfFieldGrammar(
+    {
+        "fecha_servicio": (
+            r"1\.\s*datos de la empresa\s*fecha:",
+            r"\s*([0-9]{1,2}/[0-9]{1,2}/[0-9]{4})",
+        ),
+        "empresa": (
+            r"nombre de la empresa:",
+            r"\s*(.+?)(?:direcci[oó]n:|contacto en la empresa:|modalidad servicio:|2\.)",
+        ),
+        "profesional_reca": (
+            r"profesional reca:",
+            r"\s*(.+?)(?:\bvirtual\b|\bpresencial\b|\bh[ií]brida?\b|2\.|3\.)",
+        ),
+        "sumatoria": (
+            r"sumatoria horas int\S?rpretes:",
+            r"(?s:\s*(.+?)(?:observaciones:|3\.))",
+        ),
+        "total_time": (
+            r"total tiempo:",
+            r"(?s:\s*(.+?)(?:si el servicio fue realizado en sabana|sumatoria horas int\S?rpretes:))",
+        ),
+    }
+)
+_PDF_INTERPRETER_NIT_RE = re.compile(r"n\S?mero de nit:\s*([0-9.\- ]+)", re.IGNORECASE)
+
+
 def _parse_interpreter_pdf(first_page: str, full_text: str, path: Path) -> dict:
     asistentes_candidates = _extract_pdf_asistentes_candidates(full_text)
-    fecha_servicio = _to_iso_date(
-        _extract_pdf_value(
-            full_text,
-            r"1\.\s*datos de la empresa\s*fecha:\s*([0-9]{1,2}/[0-9]{1,2}/[0-9]{4})",
-        )
-    )
-    empresa = _extract_pdf_value(
-        full_text,
-        r"nombre de la empresa:\s*(.+?)(?:direcci[oó]n:|contacto en la empresa:|modalidad servicio:|2\.)",
-    )
-    modalidad_match = re.search(
-        r"(?is)modalidad servicio:\s*(?:(?:int\S?rprete|nombre int\S?rprete)\s*:\s*.+?\s+)?"
-        r"(?P<modalidad>virtual|presencial|h[ií]brida?)\b",
-        full_text,
-    )
+    fields = _PDF_INTERPRETER_FIELDS.extract(full_text)
+    fecha_servicio = _to_iso_date(fields["fecha_servicio"])
+    empresa = fields["empresa"]
+    modalidad_match = _PDF_INTERPRETER_MODALIDAD_RE.search(full_text)
     modalidad = _clean_text(modalidad_match.group("modalidad")) if modalidad_match else ""
-    profesional_reca = _extract_pdf_value(
-        full_text,
-        r"profesional reca:\s*(.+?)(?:\bvirtual\b|\bpresencial\b|\bh[ií]brida?\b|2\.|3\.)",
-    )
+    profesional_reca = fields["profesional_reca"]
     interpreter_names = _extract_interpreter_names(full_text)
     participants, process_name = _extract_interpreter_participants(full_text)
-    sumatoria_raw = _extract_pdf_value(
-        full_text,
-        r"(?is)sumatoria horas int\S?rpretes:\s*(.+?)(?:observaciones:|3\.)",
-    )
-    total_time_raw = _extract_pdf_value(
-        full_text,
-        r"(?is)total tiempo:\s*(.+?)(?:si el servicio fue realizado en sabana|sumatoria horas int\S?rpretes:)",
-    )
+    sumatoria_raw = fields["sumatoria"]
+    total_time_raw = fields["total_time"]
     total_time_hours = _parse_duration_hours(total_time_raw)
     sumatoria_hours = _parse_duration_hours(sumatoria_raw)
     horas = sumatoria_hours if sumatoria_hours is not None else total_time_hours
-    nit = _clean_nit(_extract_pdf_value(first_page, r"n\S?mero de nit:\s*([0-9.\- ]+)"))
+    nit = _clean_nit(_extract_pdf_value(first_page, _PDF_INTERPRETER_NIT_RE))
     nits = [nit] if nit else []
 
     warnings: list[str] = []
@@ -1169,13 +1443,7 @@ def _parse_interpreter_pdf(first_page: str, full_text: str, path: Path) -> dict:
         "warnings": warnings,
     }
 
-def parse_acta_excel(file_path: str) -> dict:
-    path = Path(file_path)
-    if not path.exists():
-        raise RuntimeError(f"No existe el archivo: {file_path}")
-
-    sheets = _sheet_matrix(str(path))
-
+def _parse_excel_sheets(sheets: Iterable[tuple[str, int, Iterable[list[Any]]]], file_path: str) -> dict:
     nit = ""
     empresa = ""
     fecha_servicio = ""
@@ -1184,38 +1452,44 @@ def parse_acta_excel(file_path: str) -> dict:
     participants: list[dict[str, str]] = []
     candidatos_profesional: list[str] = []
 
-    for _, rows in sheets:
+    for _, relevance, rows in sheets:
+        # Las hojas llegan de la mas a la menos relevante: con los datos del acta
+        # completos solo se omiten las auxiliares u ocultas, no un posible anexo
+        # con mas oferentes.
+        if relevance < 0 and nit and empresa and fecha_servicio and profesional and modalidad and participants:
+            break
+        index = _SheetIndex(rows)
         if not nit:
-            nit = _extract_nit(rows)
+            nit = _extract_nit(index)
         if not empresa:
             empresa_value = _find_labeled_value(
-                rows,
+                index,
                 ("nombre de la empresa", "razon social"),
                 starts_with=True,
             )
             empresa = _clean_text(empresa_value)
         if not fecha_servicio:
             fecha_value = _find_labeled_value(
-                rows,
+                index,
                 ("fecha de la visita", "fecha servicio", "fecha de firma de contrato", "fecha firma de contrato"),
                 starts_with=True,
             )
             fecha_servicio = _to_iso_date(fecha_value)
-        sheet_candidates = _extract_asistentes_candidates(rows)
+        sheet_candidates = _extract_asistentes_candidates(index)
         for candidate in sheet_candidates:
             if candidate not in candidatos_profesional:
                 candidatos_profesional.append(candidate)
         if not profesional:
-            profesional = sheet_candidates[0] if sheet_candidates else _extract_profesional(rows)
+            profesional = sheet_candidates[0] if sheet_candidates else _extract_profesional(index)
         if not modalidad:
             modalidad_value = _find_labeled_value(
-                rows,
+                index,
                 ("modalidad:", "modalidad"),
                 starts_with=True,
             )
             modalidad = _clean_text(modalidad_value)
 
-        participants.extend(_extract_participants(rows))
+        participants.extend(_extract_participants(index))
 
     participants = _dedupe_participants(participants)
 
@@ -1226,7 +1500,7 @@ def parse_acta_excel(file_path: str) -> dict:
         warnings.append("No se detecto fecha de servicio en formato valido.")
 
     return {
-        "file_path": str(path),
+        "file_path": file_path,
         "nit_empresa": nit,
         "nombre_empresa": empresa,
         "fecha_servicio": fecha_servicio,
@@ -1238,7 +1512,27 @@ def parse_acta_excel(file_path: str) -> dict:
     }
 
 
-def _try_read_reca_metadata(file_path: str) -> dict | None:
+def parse_acta_excel(source: str | Path | bytes | BinaryIO, *, source_name: str = "") -> dict:
+    """Parsea un acta Excel desde una ruta local o desde bytes/file-like en memoria."""
+    stream = _binary_stream(source)
+    if stream is None:
+        path = Path(source)
+        if not path.exists():
+            raise RuntimeError(f"No existe el archivo: {source}")
+        workbook_source: str | BinaryIO = str(path)
+        label = str(path)
+    else:
+        workbook_source = stream
+        label = source_name
+
+    sheets = _iter_workbook_sheets(workbook_source)
+    try:
+        return _parse_excel_sheets(sheets, label)
+    finally:
+        sheets.close()
+
+
+def _try_read_reca_metadata(source: str | BinaryIO) -> dict | None:
     """Intenta leer la metadata estructurada /RECA_Data del PDF.
 
     Los PDFs generados por RECA INCLUSION LABORAL embeben un JSON con todos los
@@ -1251,7 +1545,7 @@ def _try_read_reca_metadata(file_path: str) -> dict | None:
     try:
         from pypdf import PdfReader
 
-        reader = PdfReader(file_path)
+        reader = PdfReader(_rewind(source))
         raw = (reader.metadata or {}).get("/RECA_Data")
         if raw:
             return json.loads(raw)
@@ -1260,38 +1554,59 @@ def _try_read_reca_metadata(file_path: str) -> dict | None:
     return None
 
 
-def parse_acta_pdf(file_path: str) -> dict:
-    path = Path(file_path)
-    if not path.exists():
-        raise RuntimeError(f"No existe el archivo: {file_path}")
+def parse_acta_pdf(source: str | Path | bytes | BinaryIO, *, source_name: str = "") -> dict:
+    """Parsea un acta PDF desde una ruta local o desde bytes/file-like en memoria.
+
+    ``source_name`` es el nombre original del archivo cuando ``source`` es binario;
+    se usa como ``file_path`` del resultado y para leer el vinculado del nombre.
+    """
+    stream = _binary_stream(source)
+    if stream is None:
+        path = Path(source)
+        if not path.exists():
+            raise RuntimeError(f"No existe el archivo: {source}")
+        pdf_source: str | BinaryIO = str(path)
+    else:
+        path = Path(source_name or "acta.pdf")
+        pdf_source = stream
 
     # Intentar leer metadata estructurada primero (PDFs generados por RECA INCLUSION LABORAL)
-    reca_metadata = _try_read_reca_metadata(str(path))
+    reca_metadata = _try_read_reca_metadata(pdf_source)
     if reca_metadata:
         # Garantizar que file_path esté en el resultado y que tenga warnings vacío si no existe
         reca_metadata.setdefault("file_path", str(path))
         reca_metadata.setdefault("warnings", [])
         return reca_metadata
 
-    pages = _extract_pdf_text_pages(str(path))
+    pages = _extract_pdf_text_pages(pdf_source)
     if not pages:
         raise RuntimeError("El PDF no contiene paginas legibles.")
+    return _parse_pdf_pages(pages, path)
+
+
+_PDF_FIRST_PAGE_FIELDS = _PdfFieldGrammar(
+    {
+        "nit": (r"n(?:u|ú|Ãº)mero de nit:", r"\s*([0-9.\- ]+)"),
+        "profesional_reca": (r"profesional asignado\s*reca:", r"\s*(.*?)(?:modalidad:|\n|se informa|$)"),
+        "asesor": (r"asesor:", r"\s*(.+?)(?:sede compensar:|correo electr[oÃ³]nico:|$)"),
+    }
+)
 
+
+def _parse_pdf_pages(pages: list[str], path: Path) -> dict:
     full_text = "\n".join(page for page in pages if page)
     first_page = pages[0] if pages else ""
     acta_ref = _extract_pdf_acta_ref(full_text)
     normalized_first_page = normalize_text(first_page)
-    if "interprete" in normalize_text(first_page) and "sumatoria horas interpretes" in normalize_text(full_text):
+    if "interprete" in normalized_first_page and "sumatoria horas interpretes" in normalize_text(full_text):
         return _parse_interpreter_pdf(first_page, full_text, path)
 
-    nit = _clean_nit(_extract_pdf_value(first_page, r"n(?:u|ú|Ãº)mero de nit:\s*([0-9.\- ]+)"))
+    fields = _PDF_FIRST_PAGE_FIELDS.extract(first_page)
+    nit = _clean_nit(fields["nit"])
     empresa, fecha_servicio, modalidad = _extract_pdf_general_fields(first_page)
     asistentes_candidates = _extract_pdf_asistentes_candidates(full_text)
-    profesional_reca = _extract_pdf_value(
-        first_page,
-        r"profesional asignado\s*reca:\s*(.*?)(?:modalidad:|\n|se informa|$)",
-    )
-    asesor = _extract_pdf_value(first_page, r"asesor:\s*(.+?)(?:sede compensar:|correo electr[oÃ³]nico:|$)")
+    profesional_reca = fields["profesional_reca"]
+    asesor = fields["asesor"]
     if normalize_text(profesional_reca).startswith("modalidad"):
         profesional_reca = ""
     profesional = asistentes_candidates[0] if asistentes_candidates else (profesional_reca or asesor)
@@ -1363,38 +1678,71 @@ def _normalize_source_type_label(source_type: str, parsed: dict, source_text: st
     return parsed
 
 
+def _drive_blob_cache() -> DriveBlobCache | None:
+    # drive_blob_cache importa PARSE_CACHE_VERSION de este modulo.
+    from app.services.drive_blob_cache import DriveBlobCache
+
+    max_mb = get_settings().google_drive_cache_max_mb
+    if max_mb <= 0:
+        return None
+    return DriveBlobCache(max_bytes=max_mb * 1024 * 1024)
+
+
+def _drive_cache_lookup(cache: DriveBlobCache | None, file_id: str, version: str) -> DriveCacheEntry | None:
+    if cache is None or not version:
+        return None
+    try:
+        return cache.lookup(file_id, version)
+    except (OSError, RuntimeError, ValueError, sqlite3.Error) as exc:
+        _logger.warning("No se pudo leer la cache local de Drive para %s: %s", file_id, exc)
+        return None
+
+
+def _drive_cache_store(cache: DriveBlobCache | None, file_id: str, version: str, **entry: Any) -> None:
+    if cache is None or not version:
+        return
+    try:
+        cache.store(file_id, version, **entry)
+    except (OSError, RuntimeError, sqlite3.Error) as exc:
+        _logger.warning("No se pudo guardar %s en la cache local de Drive: %s", file_id, exc)
+
+
 def _parse_google_remote_source(source_text: str) -> dict:
     file_id = extract_drive_file_id(source_text)
     metadata = get_drive_file_metadata(file_id)
     mime_type = str(metadata.get("mimeType") or "").strip().lower()
     name = str(metadata.get("name") or "acta").strip()
     suffix = Path(name).suffix.lower()
-    temp_path: Path | None = None
-    try:
-        if mime_type == _GOOGLE_SPREADSHEET_MIME:
-            with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as tmp:
-                temp_path = Path(tmp.name)
-            export_spreadsheet_to_excel(file_id, temp_path)
-            parsed = parse_acta_excel(str(temp_path))
-            return _normalize_source_type_label("google_sheets", parsed, source_text)
-
-        if suffix not in (_EXCEL_EXTENSIONS | _PDF_EXTENSIONS):
-            raise RuntimeError(
-                "El archivo de Drive no es un Google Sheet, un Excel compatible (.xlsx/.xlsm) ni un PDF compatible."
-            )
+    # Mismo id y misma version (md5/modifiedTime) que la ultima vez: se reutiliza
+    # el parseo o, si cambio el parser, al menos el archivo descargado.
+    from app.services.drive_blob_cache import drive_file_version
+
+    version = drive_file_version(metadata)
+    cache = _drive_blob_cache() if version else None
+    cached = _drive_cache_lookup(cache, file_id, version)
+    if mime_type == _GOOGLE_SPREADSHEET_MIME:
+        if cached is not None and cached.parsed is not None:
+            return _normalize_source_type_label("google_sheets", dict(cached.parsed), source_text)
+        sheets = _iter_google_sheets(file_id)
+        try:
+            parsed = _parse_excel_sheets(sheets, name)
+        finally:
+            sheets.close()
+        _drive_cache_store(cache, file_id, version, name=name, mime_type=mime_type, parsed=parsed)
+        return _normalize_source_type_label("google_sheets", parsed, source_text)
+
+    if suffix not in (_EXCEL_EXTENSIONS | _PDF_EXTENSIONS):
+        raise RuntimeError(
+            "El archivo de Drive no es un Google Sheet, un Excel compatible (.xlsx/.xlsm) ni un PDF compatible."
+        )
 
-        with tempfile.NamedTemporaryFile(suffix=suffix or ".xlsx", delete=False) as tmp:
-            temp_path = Path(tmp.name)
-        download_drive_file(file_id, temp_path)
-        parser = parse_acta_pdf if suffix in _PDF_EXTENSIONS or mime_type == "application/pdf" else parse_acta_excel
-        parsed = parser(str(temp_path))
-        return _normalize_source_type_label("google_drive_file", parsed, source_text)
-    finally:
-        if temp_path and temp_path.exists():
-            try:
-                temp_path.unlink()
-            except OSError:
-                pass
+    if cached is not None and cached.parsed is not None and cached.content is not None:
+        return _normalize_source_type_label("google_drive_file", dict(cached.parsed), source_text)
+    content = cached.content if cached is not None and cached.content is not None else download_drive_file_bytes(file_id)
+    parser = parse_acta_pdf if suffix in _PDF_EXTENSIONS or mime_type == "application/pdf" else parse_acta_excel
+    parsed = parser(content, source_name=name)
+    _drive_cache_store(cache, file_id, version, name=name, mime_type=mime_type, content=content, parsed=parsed)
+    return _normalize_source_type_label("google_drive_file", parsed, source_text)
 
 
 def parse_acta_source(source: str) -> dict:
@@ -9,6 +9,8 @@ from app.automation import (
     save_automation_staging_case as _save_automation_staging_case,
     update_automation_staging_case as _update_automation_staging_case,
     run_batch_eod_scan as _run_batch_eod_scan,
+    start_batch_eod_scan_job as _start_batch_eod_scan_job,
+    get_batch_eod_scan_job as _get_batch_eod_scan_job,
     confirm_batch_eod_upload as _confirm_batch_eod_upload,
 )
 from app.catalog_index import (
@@ -185,8 +187,8 @@ def publish_automation_email_preview(payload: dict) -> dict:
     return _publish_automation_email_preview(payload)
 
 
-def get_automation_staging_cases() -> dict:
-    return _get_automation_staging_cases()
+def get_automation_staging_cases(limit: int | None = None, offset: int = 0) -> dict:
+    return _get_automation_staging_cases(limit=limit, offset=offset)
 
 
 def save_automation_staging_case(payload: dict) -> dict:
@@ -201,8 +203,20 @@ def update_automation_staging_case(payload: dict) -> dict:
     return _update_automation_staging_case(payload)
 
 
-def run_batch_eod_scan(limit: int | None = None) -> dict:
-    return _run_batch_eod_scan(limit=limit)
+def run_batch_eod_scan(limit: int | None = None, full_rescan: bool = False) -> dict:
+    return _run_batch_eod_scan(limit=limit, full_rescan=full_rescan)
+
+
+def start_batch_eod_scan_job(
+    limit: int | None = None,
+    full_rescan: bool = False,
+    resume_job_id: str | None = None,
+) -> dict:
+    return _start_batch_eod_scan_job(limit=limit, full_rescan=full_rescan, resume_job_id=resume_job_id)
+
+
+def get_batch_eod_scan_job(job_id: str | None = None, since: int = 0) -> dict:
+    return _get_batch_eod_scan_job(job_id, since=since)
 
 
 def confirm_batch_eod_upload(payload: dict) -> dict:
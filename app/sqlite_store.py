@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+import sqlite3
+
+
+def open_sqlite_connection(path: Path, ensure_schema: Callable[[sqlite3.Connection], None]) -> sqlite3.Connection:
+    """Abre ``path`` en modo WAL con filas ``sqlite3.Row`` y crea el schema si falta."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=30)
+    connection.row_factory = sqlite3.Row
+    try:
+        connection.execute("PRAGMA journal_mode=WAL")
+        ensure_schema(connection)
+    except sqlite3.DatabaseError:
+        connection.close()
+        raise
+    return connection
+
+
+@contextmanager
+def sqlite_connection(
+    path: Path,
+    ensure_schema: Callable[[sqlite3.Connection], None],
+    *,
+    corrupt_message: str,
+) -> Iterator[sqlite3.Connection]:
+    """Conexion de corta vida a un almacen local; si el archivo esta corrupto
+    lanza ``RuntimeError`` con ``corrupt_message`` seguido del error de SQLite."""
+    try:
+        connection = open_sqlite_connection(path, ensure_schema)
+    except sqlite3.DatabaseError as exc:
+        raise RuntimeError(f"{corrupt_message}: {exc}") from exc
+    try:
+        yield connection
+    finally:
+        connection.close()
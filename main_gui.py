@@ -295,10 +295,21 @@ class ApiClient:
         if path == "/wizard/automation-test/staging/case":
             return self._svc.get_automation_staging_case(params.get("case_id", ""))
         if path == "/wizard/automation-test/staging":
-            return self._svc.get_automation_staging_cases()
+            limit = params.get("limit")
+            offset = params.get("offset")
+            return self._svc.get_automation_staging_cases(
+                limit=int(limit) if limit else None,
+                offset=int(offset) if offset else 0,
+            )
         if path == "/wizard/automation-batch/scan":
             limit = params.get("limit")
             return self._svc.run_batch_eod_scan(limit=int(limit) if limit else None)
+        if path == "/wizard/automation-batch/job":
+            since = params.get("since")
+            return self._svc.get_batch_eod_scan_job(
+                params.get("job_id") or None,
+                since=int(since) if since else 0,
+            )
         if path == "/wizard/google-drive/status":
             return self._svc.google_drive_status()
         raise RuntimeError(f"Endpoint no soportado: GET {path}")
@@ -340,6 +351,13 @@ class ApiClient:
             return self._svc.update_automation_staging_case(payload)
         if path == "/wizard/automation-test/staging":
             return self._svc.save_automation_staging_case(payload)
+        if path == "/wizard/automation-batch/jobs":
+            limit = payload.get("limit")
+            return self._svc.start_batch_eod_scan_job(
+                limit=int(limit) if limit else None,
+                full_rescan=bool(payload.get("full_rescan")),
+                resume_job_id=str(payload.get("resume_job_id") or "").strip() or None,
+            )
         if path == "/wizard/automation-batch/confirm":
             return self._svc.confirm_batch_eod_upload(payload)
         raise RuntimeError(f"Endpoint no soportado: POST {path}")
@@ -3806,6 +3824,15 @@ class WizardApp:
                 padx=12,
                 pady=4,
             ).pack(side="left", padx=(8, 0))
+            tk.Button(
+                nav,
+                text="Importar lote de actas",
+                command=self._open_batch_import_panel,
+                bg="#1A5276",
+                fg="white",
+                padx=12,
+                pady=4,
+            ).pack(side="left", padx=(8, 0))
 
             self.seccion1 = Seccion1Frame(main_col, self.api, self.state)
             self.seccion1.grid(row=1, column=0, sticky="ew", pady=8)
@@ -4108,29 +4135,86 @@ class WizardApp:
             for iid in issues_tree.get_children():
                 issues_tree.delete(iid)
 
+            # Un escaneo anterior interrumpido (app cerrada, token vencido) se puede
+            # reanudar sin repetir los correos que ya quedaron guardados.
+            resume_job_id = None
+            try:
+                latest = dict(self.api.get("/wizard/automation-batch/job").get("data") or {})
+            except RuntimeError:
+                latest = {}
+            if latest.get("resumable") and messagebox.askyesno(
+                "Reanudar escaneo",
+                f"El escaneo anterior quedo incompleto ({int(latest.get('result_count') or 0)} correo(s) ya revisados).\n\n"
+                "¿Reanudarlo sin repetir esos correos?",
+                parent=dialog,
+            ):
+                resume_job_id = str(latest.get("job_id") or "")
+
             loading = LoadingDialog(dialog, "Escaneando correos nuevos...")
             dialog.update_idletasks()
+            progress: queue.Queue[int] = queue.Queue()
+            scan_done = {"value": False}
+
+            def _pump_progress() -> None:
+                reviewed = None
+                while True:
+                    try:
+                        reviewed = progress.get_nowait()
+                    except queue.Empty:
+                        break
+                if scan_done["value"]:
+                    return
+                if reviewed is not None:
+                    status_var.set(f"Escaneando correos... {reviewed} revisado(s).")
+                dialog.after(500, _pump_progress)
 
             def _worker() -> dict:
-                return self.api.get("/wizard/automation-batch/scan")
+                started = self.api.post(
+                    "/wizard/automation-batch/jobs",
+                    {"resume_job_id": resume_job_id} if resume_job_id else {},
+                )
+                job_id = str(dict(started.get("data") or {}).get("job_id") or "")
+                results: list[dict] = []
+                while True:
+                    job = dict(
+                        self.api.get(
+                            "/wizard/automation-batch/job",
+                            {"job_id": job_id, "since": str(len(results))},
+                        ).get("data")
+                        or {}
+                    )
+                    results.extend(list(job.get("results") or []))
+                    progress.put(len(results))
+                    status = str(job.get("status") or "")
+                    if status == "completed":
+                        return {"data": {"job_id": job_id, "stats": job.get("stats") or {}, "results": results}}
+                    if status != "running":
+                        raise RuntimeError(
+                            str(job.get("error") or "El escaneo batch se interrumpio.")
+                            + " Puedes reanudarlo con 'Escanear correos nuevos'."
+                        )
+                    time.sleep(1.0)
 
             def _on_success(result: dict) -> None:
+                scan_done["value"] = True
                 loading.close()
                 _set_scan_enabled(True)
                 _render_scan_result(result)
 
             def _on_error(exc: Exception) -> None:
+                scan_done["value"] = True
                 loading.close()
                 _set_scan_enabled(True)
                 status_var.set("Error al escanear correos.")
                 self._report_error("Error en batch scan", exc, title="Batch Fin de Dia")
 
+            _pump_progress()
             self._run_background_task(
                 _worker,
                 _on_success,
                 _on_error,
-                timeout_sec=600,
-                timeout_message="El escaneo batch excedio el tiempo esperado.",
+                timeout_sec=1800,
+                timeout_message="El escaneo batch excedio el tiempo esperado; el avance quedo guardado para reanudarlo.",
                 poll_ms=500,
                 operation_name="batch_eod_scan",
                 disable_main_actions=False,
@@ -4319,6 +4403,255 @@ class WizardApp:
             operation_name="importar_acta_fuente",
         )
 
+    def _open_batch_import_panel(self) -> None:
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Importar lote de actas")
+        dialog.resizable(True, True)
+        dialog.transient(self.root)
+        self._center_dialog(dialog, 1150, 640)
+
+        container = ttk.Frame(dialog, padding=16)
+        container.pack(fill=tk.BOTH, expand=True)
+        container.columnconfigure(0, weight=1)
+        container.rowconfigure(4, weight=1)
+
+        ttk.Label(
+            container,
+            text="Importar lote de actas",
+            font=("Arial", 12, "bold"),
+            foreground=COLOR_PURPLE,
+        ).grid(row=0, column=0, sticky="w")
+        ttk.Label(
+            container,
+            text="Agrega una carpeta, archivos Excel/PDF o URLs de Drive; las actas se preparan en paralelo "
+            "y cada una aparece en la tabla apenas esta lista. Doble clic para cargarla en el formulario.",
+            foreground="#555555",
+            wraplength=1050,
+            justify="left",
+        ).grid(row=1, column=0, sticky="w", pady=(2, 10))
+
+        sources: list[str] = []
+        state: dict = {"cancel": None, "results": {}, "running": False}
+        status_var = tk.StringVar(value="Sin actas seleccionadas.")
+        url_var = tk.StringVar(value="")
+
+        # ── Toolbar ──────────────────────────────────────────────────────────
+        toolbar = ttk.Frame(container)
+        toolbar.grid(row=2, column=0, sticky="ew")
+        button_font = ("Arial", self._scaled_font(9, 8), "bold")
+
+        def _add_sources(entries: list[str]) -> None:
+            for entry in entries:
+                clean = str(entry or "").strip()
+                if clean and clean not in sources:
+                    sources.append(clean)
+            status_var.set(f"{len(sources)} fuente(s) seleccionada(s).")
+            prepare_btn.configure(state="normal" if sources and not state["running"] else "disabled")
+
+        def _add_folder() -> None:
+            folder = filedialog.askdirectory(title="Seleccionar carpeta de actas", parent=dialog)
+            if folder:
+                _add_sources([folder])
+
+        def _add_files() -> None:
+            files = filedialog.askopenfilenames(
+                title="Seleccionar actas",
+                parent=dialog,
+                filetypes=[
+                    ("Actas compatibles", "*.xlsx *.xlsm *.pdf"),
+                    ("Todos los archivos", "*.*"),
+                ],
+            )
+            _add_sources(list(files or []))
+
+        def _add_urls() -> None:
+            _add_sources(re.split(r"[\s,;]+", url_var.get()))
+            url_var.set("")
+
+        tk.Button(toolbar, text="Agregar carpeta", command=_add_folder, bg=COLOR_TEAL, fg="white",
+                  font=button_font, padx=8, pady=3).pack(side=tk.LEFT)
+        tk.Button(toolbar, text="Agregar archivos", command=_add_files, bg=COLOR_TEAL, fg="white",
+                  font=button_font, padx=8, pady=3).pack(side=tk.LEFT, padx=(8, 0))
+        ttk.Entry(toolbar, textvariable=url_var, width=44).pack(side=tk.LEFT, padx=(14, 0))
+        tk.Button(toolbar, text="Agregar URL", command=_add_urls, bg="#5D6D7E", fg="white",
+                  font=button_font, padx=8, pady=3).pack(side=tk.LEFT, padx=(6, 0))
+        prepare_btn = tk.Button(toolbar, text="Preparar actas", bg="#1A5276", fg="white",
+                                font=button_font, padx=8, pady=3, state="disabled")
+        prepare_btn.pack(side=tk.LEFT, padx=(14, 0))
+
+        progress_frame = ttk.Frame(container)
+        progress_frame.grid(row=3, column=0, sticky="ew", pady=(8, 0))
+        progress_frame.columnconfigure(1, weight=1)
+        ttk.Label(progress_frame, textvariable=status_var, foreground="#1F618D",
+                  font=("Arial", 9, "bold")).grid(row=0, column=0, sticky="w")
+        progress_bar = ttk.Progressbar(progress_frame, mode="determinate", maximum=1)
+        progress_bar.grid(row=0, column=1, sticky="ew", padx=(14, 0))
+
+        # ── Review grid ──────────────────────────────────────────────────────
+        tree_frame = ttk.LabelFrame(container, text="Actas preparadas", padding=(8, 6))
+        tree_frame.grid(row=4, column=0, sticky="nsew", pady=(8, 0))
+        tree_frame.columnconfigure(0, weight=1)
+        tree_frame.rowconfigure(0, weight=1)
+        columns = ("archivo", "estado", "codigo", "empresa", "fecha", "profesional", "oferentes", "detalle")
+        review_tree = ttk.Treeview(tree_frame, columns=columns, show="headings", height=16)
+        for column, heading, width, anchor in (
+            ("archivo", "Archivo", 220, "w"),
+            ("estado", "Estado", 80, "center"),
+            ("codigo", "Codigo", 65, "center"),
+            ("empresa", "Empresa", 200, "w"),
+            ("fecha", "Fecha", 90, "center"),
+            ("profesional", "Profesional", 180, "w"),
+            ("oferentes", "Oferentes", 75, "center"),
+            ("detalle", "Detalle", 320, "w"),
+        ):
+            review_tree.heading(column, text=heading)
+            review_tree.column(column, width=width, anchor=anchor)
+        review_tree.tag_configure("warn", background="#FFF3CD")
+        review_tree.tag_configure("error", foreground="#C0392B")
+        rt_scroll_y = ttk.Scrollbar(tree_frame, orient="vertical", command=review_tree.yview)
+        review_tree.configure(yscrollcommand=rt_scroll_y.set)
+        review_tree.grid(row=0, column=0, sticky="nsew")
+        rt_scroll_y.grid(row=0, column=1, sticky="ns")
+
+        def _insert_item(item) -> None:
+            label = item.source.source_label
+            if not item.ok:
+                review_tree.insert("", "end", iid=str(item.source.index), tags=("error",), values=(
+                    label, "ERROR", "-", "-", "-", "-", "-", item.error or "Error desconocido",
+                ))
+                return
+            result = dict(item.result)
+            state["results"][str(item.source.index)] = item
+            analysis = dict(result.get("analysis") or {})
+            suggestion = dict(result.get("service_suggestion") or {})
+            blocking = list(result.get("blocking_errors") or [])
+            warnings = list(result.get("warnings") or [])
+            review_tree.insert(
+                "",
+                "end",
+                iid=str(item.source.index),
+                tags=("warn",) if blocking or warnings else (),
+                values=(
+                    label,
+                    "Bloqueada" if blocking else "Lista",
+                    str(suggestion.get("codigo_servicio") or "-"),
+                    str(analysis.get("nombre_empresa") or "-"),
+                    str(analysis.get("fecha_servicio") or "-"),
+                    str(result.get("professional_resolved") or analysis.get("nombre_profesional") or "-"),
+                    str(len(list(result.get("participants_prepared") or []))),
+                    str((blocking or warnings or [""])[0]),
+                ),
+            )
+
+        def _use_selected(_event=None) -> None:
+            selection = review_tree.selection()
+            item = state["results"].get(selection[0]) if selection else None
+            if item is None:
+                return
+            try:
+                self._procesar_importacion_acta(dict(item.result), source_label=item.source.source_label)
+            except (RuntimeError, ValueError, TypeError, OSError, tk.TclError) as exc:
+                self._report_error("No se pudo aplicar la importacion del acta", exc, title="Importar lote de actas")
+
+        review_tree.bind("<Double-1>", _use_selected)
+
+        btns = ttk.Frame(container)
+        btns.grid(row=5, column=0, sticky="ew", pady=(10, 0))
+        tk.Button(btns, text="Cargar en formulario", command=_use_selected, bg="#2E86C1", fg="white",
+                  padx=12, pady=4).pack(side=tk.LEFT)
+
+        def _close() -> None:
+            cancel_event = state.get("cancel")
+            if cancel_event is not None:
+                cancel_event.set()
+            dialog.destroy()
+
+        tk.Button(btns, text="Cerrar", command=_close, bg=COLOR_PURPLE, fg="white",
+                  padx=12, pady=4).pack(side=tk.RIGHT)
+        dialog.protocol("WM_DELETE_WINDOW", _close)
+
+        def _prepare() -> None:
+            from app.services.acta_batch_import import collect_acta_sources
+
+            try:
+                batch_sources = collect_acta_sources(sources)
+            except OSError as exc:
+                self._report_error("No se pudo leer la carpeta de actas", exc, title="Importar lote de actas")
+                return
+            if not batch_sources:
+                messagebox.showinfo("Importar lote de actas", "No se encontraron actas Excel/PDF.", parent=dialog)
+                return
+            for iid in review_tree.get_children():
+                review_tree.delete(iid)
+            state["results"] = {}
+            state["running"] = True
+            cancel_event = threading.Event()
+            state["cancel"] = cancel_event
+            prepare_btn.configure(state="disabled")
+            progress_bar.configure(maximum=len(batch_sources), value=0)
+            status_var.set(f"Preparando 0 de {len(batch_sources)} acta(s)...")
+            finished: queue.Queue = queue.Queue()
+            done_count = {"value": 0, "errors": 0}
+
+            def _pump() -> None:
+                if cancel_event.is_set():
+                    return
+                while True:
+                    try:
+                        item = finished.get_nowait()
+                    except queue.Empty:
+                        break
+                    done_count["value"] += 1
+                    done_count["errors"] += 0 if item.ok else 1
+                    _insert_item(item)
+                progress_bar.configure(value=done_count["value"])
+                status_var.set(f"Preparando {done_count['value']} de {len(batch_sources)} acta(s)...")
+                if state["running"]:
+                    dialog.after(200, _pump)
+
+            def _worker() -> int:
+                from app.services.acta_batch_import import iter_batch_import_results
+
+                count = 0
+                for item in iter_batch_import_results(batch_sources, cancel_event=cancel_event):
+                    finished.put(item)
+                    count += 1
+                return count
+
+            def _on_success(_count: int) -> None:
+                state["running"] = False
+                if cancel_event.is_set():
+                    return
+                _pump()
+                prepare_btn.configure(state="normal")
+                status_var.set(
+                    f"Listo: {done_count['value'] - done_count['errors']} acta(s) preparadas, "
+                    f"{done_count['errors']} con error."
+                )
+
+            def _on_error(exc: Exception) -> None:
+                state["running"] = False
+                cancel_event.set()
+                if not dialog.winfo_exists():
+                    return
+                prepare_btn.configure(state="normal")
+                status_var.set("Error al preparar el lote.")
+                self._report_error("Error al preparar el lote de actas", exc, title="Importar lote de actas")
+
+            _pump()
+            self._run_background_task(
+                _worker,
+                _on_success,
+                _on_error,
+                timeout_sec=3600,
+                timeout_message="La preparacion del lote de actas excedio el tiempo esperado.",
+                poll_ms=300,
+                operation_name="importar_lote_actas",
+                disable_main_actions=False,
+            )
+
+        prepare_btn.configure(command=_prepare)
+
     def _buscar_empresas_por_nit_import(self, nit: str) -> list[dict]:
         nit_clean = str(nit or "").strip()
         if not nit_clean:
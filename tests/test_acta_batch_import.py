@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from app.services.acta_batch_import import (
+    BATCH_IMPORT_ERROR,
+    BATCH_IMPORT_OK,
+    collect_acta_sources,
+    iter_batch_import_results,
+)
+
+
+class ActaBatchImportTests(unittest.TestCase):
+    def test_collect_acta_sources_expands_folders_and_keeps_urls(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folder = Path(tmpdir)
+            for name in ("b.pdf", "A.xlsx", "notas.txt", "~$A.xlsx"):
+                (folder / name).write_bytes(b"")
+            (folder / "sub").mkdir()
+            (folder / "sub" / "c.pdf").write_bytes(b"")
+
+            sources = collect_acta_sources(
+                [
+                    str(folder),
+                    "https://drive.google.com/file/d/abc123/view",
+                    str(folder / "b.pdf"),
+                    "",
+                ]
+            )
+
+        self.assertEqual(
+            [item.source_label for item in sources],
+            ["A.xlsx", "b.pdf", "https://drive.google.com/file/d/abc123/view"],
+        )
+        self.assertEqual([item.index for item in sources], [0, 1, 2])
+
+    @patch("app.services.acta_batch_import.build_import_result_from_parsed_source")
+    @patch("app.services.acta_batch_import.parse_acta_source")
+    def test_iter_batch_import_results_prefetches_with_shared_session(
+        self,
+        mock_parse_source,
+        mock_from_parsed_source,
+    ) -> None:
+        def parse(source: str) -> dict:
+            if source.endswith("roto.pdf"):
+                raise RuntimeError("PDF ilegible")
+            return {"nit_empresa": "9001", "participantes": [{"cedula_usuario": source[-5]}]}
+
+        mock_parse_source.side_effect = parse
+        mock_from_parsed_source.side_effect = lambda parsed, **kwargs: {"analysis": parsed, "source_label": kwargs["source_label"]}
+        session = MagicMock()
+
+        items = list(
+            iter_batch_import_results(
+                collect_acta_sources(["C:/actas/a1.pdf", "C:/actas/roto.pdf", "C:/actas/a2.pdf"]),
+                max_workers=2,
+                session=session,
+            )
+        )
+
+        by_label = {item.source.source_label: item for item in items}
+        self.assertEqual(len(items), 3)
+        self.assertEqual(by_label["roto.pdf"].status, BATCH_IMPORT_ERROR)
+        self.assertIn("PDF ilegible", by_label["roto.pdf"].error)
+        self.assertEqual(by_label["a1.pdf"].status, BATCH_IMPORT_OK)
+        self.assertEqual(by_label["a2.pdf"].result["source_label"], "a2.pdf")
+        prefetched = [parsed for call in session.prefetch.call_args_list for parsed in call.args[0]]
+        self.assertEqual(sorted(item["participantes"][0]["cedula_usuario"] for item in prefetched), ["1", "2"])
+        for call in mock_from_parsed_source.call_args_list:
+            self.assertIs(call.kwargs["session"], session)
+
+    @patch("app.services.acta_batch_import.build_import_result_from_parsed_source")
+    @patch("app.services.acta_batch_import.parse_acta_source")
+    def test_iter_batch_import_results_stops_when_cancelled(
+        self,
+        mock_parse_source,
+        mock_from_parsed_source,
+    ) -> None:
+        cancel_event = threading.Event()
+        release = threading.Event()
+
+        def parse(source: str) -> dict:
+            release.wait(5)
+            return {}
+
+        mock_parse_source.side_effect = parse
+        results = iter_batch_import_results(
+            collect_acta_sources([f"C:/actas/{index}.pdf" for index in range(4)]),
+            max_workers=1,
+            session=MagicMock(),
+            cancel_event=cancel_event,
+        )
+        cancel_event.set()
+        release.set()
+
+        self.assertEqual(list(results), [])
+        mock_from_parsed_source.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
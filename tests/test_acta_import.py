@@ -2,12 +2,17 @@ from __future__ import annotations
 
 import tempfile
 import unittest
+from io import BytesIO
 from pathlib import Path
-from unittest.mock import patch
+import sqlite3
+from unittest.mock import MagicMock, patch
 
 from app.services.excel_acta_import import (
+    _PDF_FIRST_PAGE_FIELDS,
+    _SheetIndex,
     _extract_pdf_asistentes_candidates,
     _extract_pdf_participants,
+    parse_acta_excel,
     parse_acta_pdf,
     parse_acta_source,
 )
@@ -53,37 +58,47 @@ class ActaImportTests(unittest.TestCase):
         self.assertEqual(result["nit_empresa"], "900123456")
         mock_parse_pdf.assert_called_once_with(str(temp_path))
 
-    @patch("app.services.excel_acta_import.parse_acta_excel")
-    @patch("app.services.excel_acta_import.export_spreadsheet_to_excel")
+    @patch("app.services.excel_acta_import.read_spreadsheet_matrices")
     @patch("app.services.excel_acta_import.get_drive_file_metadata")
     def test_parse_acta_source_supports_google_sheets_url(
         self,
         mock_get_metadata,
-        mock_export_spreadsheet,
-        mock_parse_excel,
+        mock_read_matrices,
     ) -> None:
         mock_get_metadata.return_value = {
             "id": "sheet-123",
             "name": "Acta marzo",
             "mimeType": "application/vnd.google-apps.spreadsheet",
         }
-        mock_parse_excel.return_value = {"nit_empresa": "900123456"}
+        mock_read_matrices.return_value = [
+            {"title": "Listas", "hidden": True, "values": [["NIT:", "111111111"]]},
+            {
+                "title": "Acta",
+                "hidden": False,
+                "values": [
+                    ["Fecha de la visita:", "05/03/2026"],
+                    ["Nombre de la empresa:", "ACME SAS", "NIT:", "900123456"],
+                ],
+            },
+        ]
 
         result = parse_acta_source("https://docs.google.com/spreadsheets/d/sheet-123/edit#gid=0")
 
         self.assertEqual(result["source_type"], "google_sheets")
         self.assertEqual(result["file_path"], "https://docs.google.com/spreadsheets/d/sheet-123/edit#gid=0")
-        mock_export_spreadsheet.assert_called_once()
-        mock_parse_excel.assert_called_once()
+        self.assertEqual(result["nit_empresa"], "900123456")
+        self.assertEqual(result["nombre_empresa"], "ACME SAS")
+        self.assertEqual(result["fecha_servicio"], "2026-03-05")
+        mock_read_matrices.assert_called_once_with("sheet-123", max_rows=260, max_cols=70)
 
     @patch("app.services.excel_acta_import.parse_acta_excel")
-    @patch("app.services.excel_acta_import.download_drive_file")
-    @patch("app.services.excel_acta_import.export_spreadsheet_to_excel")
+    @patch("app.services.excel_acta_import.download_drive_file_bytes")
+    @patch("app.services.excel_acta_import.read_spreadsheet_matrices")
     @patch("app.services.excel_acta_import.get_drive_file_metadata")
     def test_parse_acta_source_supports_google_spreadsheets_url_backed_by_excel_file(
         self,
         mock_get_metadata,
-        mock_export_spreadsheet,
+        mock_read_matrices,
         mock_download,
         mock_parse_excel,
     ) -> None:
@@ -97,34 +112,32 @@ class ActaImportTests(unittest.TestCase):
         result = parse_acta_source("https://docs.google.com/spreadsheets/d/sheet-123/edit?usp=drivesdk")
 
         self.assertEqual(result["source_type"], "google_drive_file")
-        mock_export_spreadsheet.assert_not_called()
+        mock_read_matrices.assert_not_called()
         mock_download.assert_called_once()
         mock_parse_excel.assert_called_once()
 
-    @patch("app.services.excel_acta_import.parse_acta_excel")
-    @patch("app.services.excel_acta_import.export_spreadsheet_to_excel")
+    @patch("app.services.excel_acta_import.read_spreadsheet_matrices")
     @patch("app.services.excel_acta_import.get_drive_file_metadata")
     def test_parse_acta_source_supports_drive_google_sheet_link(
         self,
         mock_get_metadata,
-        mock_export_spreadsheet,
-        mock_parse_excel,
+        mock_read_matrices,
     ) -> None:
         mock_get_metadata.return_value = {
             "id": "file-123",
             "name": "Acta marzo",
             "mimeType": "application/vnd.google-apps.spreadsheet",
         }
-        mock_parse_excel.return_value = {"nit_empresa": "900123456"}
+        mock_read_matrices.return_value = [{"title": "Acta", "hidden": False, "values": [["NIT:", "900123456"]]}]
 
         result = parse_acta_source("https://drive.google.com/file/d/file-123/view")
 
         self.assertEqual(result["source_type"], "google_sheets")
-        mock_export_spreadsheet.assert_called_once()
-        mock_parse_excel.assert_called_once()
+        self.assertEqual(result["nit_empresa"], "900123456")
+        mock_read_matrices.assert_called_once()
 
     @patch("app.services.excel_acta_import.parse_acta_excel")
-    @patch("app.services.excel_acta_import.download_drive_file")
+    @patch("app.services.excel_acta_import.download_drive_file_bytes")
     @patch("app.services.excel_acta_import.get_drive_file_metadata")
     def test_parse_acta_source_supports_drive_excel_link(
         self,
@@ -146,7 +159,7 @@ class ActaImportTests(unittest.TestCase):
         mock_parse_excel.assert_called_once()
 
     @patch("app.services.excel_acta_import.parse_acta_pdf")
-    @patch("app.services.excel_acta_import.download_drive_file")
+    @patch("app.services.excel_acta_import.download_drive_file_bytes")
     @patch("app.services.excel_acta_import.get_drive_file_metadata")
     def test_parse_acta_source_supports_drive_pdf_link(
         self,
@@ -167,6 +180,63 @@ class ActaImportTests(unittest.TestCase):
         mock_download.assert_called_once()
         mock_parse_pdf.assert_called_once()
 
+    @patch("app.services.excel_acta_import.parse_acta_pdf")
+    @patch("app.services.excel_acta_import.download_drive_file_bytes")
+    @patch("app.services.excel_acta_import.get_drive_file_metadata")
+    def test_parse_acta_source_reuses_cached_drive_file_until_it_changes(
+        self,
+        mock_get_metadata,
+        mock_download,
+        mock_parse_pdf,
+    ) -> None:
+        from app.services.drive_blob_cache import DriveBlobCache
+
+        mock_get_metadata.return_value = {
+            "id": "file-123",
+            "name": "Acta marzo.pdf",
+            "mimeType": "application/pdf",
+            "md5Checksum": "v1",
+        }
+        mock_download.return_value = b"%PDF-1"
+        mock_parse_pdf.return_value = {"nit_empresa": "900123456"}
+        url = "https://drive.google.com/file/d/file-123/view"
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = DriveBlobCache(Path(tmpdir))
+            with patch("app.services.excel_acta_import._drive_blob_cache", return_value=cache):
+                first = parse_acta_source(url)
+                second = parse_acta_source(url)
+                mock_get_metadata.return_value = {**mock_get_metadata.return_value, "md5Checksum": "v2"}
+                parse_acta_source(url)
+
+        self.assertEqual(first, second)
+        self.assertEqual(second["source_type"], "google_drive_file")
+        self.assertEqual(mock_get_metadata.call_count, 3)
+        self.assertEqual(mock_download.call_count, 2)
+        self.assertEqual(mock_parse_pdf.call_count, 2)
+
+    @patch("app.services.excel_acta_import.parse_acta_pdf")
+    @patch("app.services.excel_acta_import.download_drive_file_bytes")
+    @patch("app.services.excel_acta_import.get_drive_file_metadata")
+    def test_parse_acta_source_ignores_sqlite_errors_from_drive_cache(
+        self,
+        mock_get_metadata,
+        mock_download,
+        mock_parse_pdf,
+    ) -> None:
+        mock_get_metadata.return_value = {"id": "file-123", "name": "Acta.pdf", "mimeType": "application/pdf", "md5Checksum": "v1"}
+        mock_download.return_value = b"%PDF-1"
+        mock_parse_pdf.return_value = {"nit_empresa": "900123456"}
+        cache = MagicMock()
+        cache.lookup.side_effect = sqlite3.OperationalError("database is locked")
+        cache.store.side_effect = sqlite3.OperationalError("database is locked")
+
+        with patch("app.services.excel_acta_import._drive_blob_cache", return_value=cache):
+            parsed = parse_acta_source("https://drive.google.com/file/d/file-123/view")
+
+        self.assertEqual(parsed["nit_empresa"], "900123456")
+        cache.store.assert_called_once()
+
     def test_parse_acta_source_rejects_unknown_url(self) -> None:
         with self.assertRaisesRegex(RuntimeError, "No se pudo resolver el acta"):
             parse_acta_source("https://someotherdomain.com/file")
@@ -378,6 +448,120 @@ class ActaImportTests(unittest.TestCase):
             ],
         )
 
+    def test_sheet_index_find_matches_fragments_inside_words(self) -> None:
+        index = _SheetIndex(
+            [
+                ["Dirección de la empresa:", None, "Cra 1"],
+                [None, "C.C", "Razón social / NIT"],
+            ]
+        )
+
+        self.assertEqual(index.find(("cc",)), [(0, 0)])
+        self.assertEqual(index.find(("c.c", "razon social / nit")), [(1, 1), (1, 2)])
+        self.assertEqual(index.first_column(1, ("nit",)), 2)
+        self.assertEqual(index.norm(0, 2), "cra 1")
+        self.assertEqual(index.clean(5, 5), "")
+
+    def test_parse_acta_excel_reads_labels_and_participants(self) -> None:
+        from openpyxl import Workbook
+
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Acta"
+        ws.append(["Fecha de la visita:", None, "05/03/2026", "Modalidad:", "Virtual"])
+        ws.append(["Nombre de la empresa:", None, "ACME SAS", "Número de NIT:", "900.123.456-1"])
+        ws.append([])
+        ws.append(["No", "Nombre vinculado", "Cédula", "Discapacidad", "Género"])
+        ws.append([1, "Ana Ruiz", "1.023.456.789", "Auditiva", "Femenino"])
+        ws.append([2, "Luis Gomez", 52345678, "Física", "Masculino"])
+        ws.append([])
+        ws.append(["6. ASISTENTES"])
+        ws.append(["Nombre completo:", "Maria Lopez Diaz", "Cargo:", "Profesional"])
+
+        with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as tmp:
+            temp_path = Path(tmp.name)
+
+        try:
+            wb.save(temp_path)
+            result = parse_acta_excel(str(temp_path))
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+
+        self.assertEqual(result["nit_empresa"], "900123456-1")
+        self.assertEqual(result["nombre_empresa"], "ACME SAS")
+        self.assertEqual(result["fecha_servicio"], "2026-03-05")
+        self.assertEqual(result["modalidad_servicio"], "Virtual")
+        self.assertEqual(result["nombre_profesional"], "Maria Lopez Diaz")
+        self.assertEqual(
+            [(item["nombre_usuario"], item["cedula_usuario"], item["genero_usuario"]) for item in result["participantes"]],
+            [("Ana Ruiz", "1023456789", "Femenino"), ("Luis Gomez", "52345678", "Masculino")],
+        )
+        self.assertEqual(result["warnings"], [])
+
+    def test_parse_acta_excel_prioritizes_acta_sheet_and_skips_helpers_when_complete(self) -> None:
+        from openpyxl import Workbook
+
+        wb = Workbook()
+        helper = wb.active
+        helper.title = "Listas"
+        helper.sheet_state = "hidden"
+        helper.append(["NIT:", "111111111"])
+        helper.append(["Nombre vinculado", "Cédula"])
+        helper.append(["Oferente Lista", "99999999"])
+        acta = wb.create_sheet("Acta seguimiento")
+        acta.append(["Fecha de la visita:", "05/03/2026", "Modalidad:", "Presencial"])
+        acta.append(["Nombre de la empresa:", "ACME SAS", "NIT:", "900123456"])
+        acta.append(["Profesional asignado RECA:", "Maria Lopez Diaz"])
+        acta.append(["Nombre vinculado", "Cédula"])
+        acta.append(["Ana Ruiz", "1023456789"])
+        anexo = wb.create_sheet("Anexo")
+        anexo.append(["Nombre vinculado", "Cédula"])
+        anexo.append(["Luis Gomez", "52345678"])
+
+        with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as tmp:
+            temp_path = Path(tmp.name)
+
+        try:
+            wb.save(temp_path)
+            result = parse_acta_excel(str(temp_path))
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+
+        self.assertEqual(result["nit_empresa"], "900123456")
+        self.assertEqual(result["nombre_profesional"], "Maria Lopez Diaz")
+        self.assertEqual([item["cedula_usuario"] for item in result["participantes"]], ["1023456789", "52345678"])
+
+    def test_parse_acta_excel_accepts_in_memory_bytes(self) -> None:
+        from openpyxl import Workbook
+
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["Fecha de la visita:", "05/03/2026"])
+        ws.append(["NIT:", "900123456"])
+        buffer = BytesIO()
+        wb.save(buffer)
+
+        result = parse_acta_excel(memoryview(buffer.getvalue()), source_name="Acta marzo.xlsx")
+
+        self.assertEqual(result["file_path"], "Acta marzo.xlsx")
+        self.assertEqual(result["nit_empresa"], "900123456")
+        self.assertEqual(result["fecha_servicio"], "2026-03-05")
+
+    @patch("app.services.excel_acta_import._extract_pdf_text_pages")
+    def test_parse_acta_pdf_accepts_in_memory_bytes(self, mock_extract_pages) -> None:
+        mock_extract_pages.return_value = [
+            "Fecha de la Visita: 03/03/2026 Modalidad:Virtual\nNombre de la Empresa:SIS VIDA SAS Ciudad/Municipio:Bogota"
+        ]
+
+        result = parse_acta_pdf(b"%PDF-1.4", source_name="acta_gmail.pdf")
+
+        self.assertEqual(result["file_path"], "acta_gmail.pdf")
+        self.assertEqual(result["fecha_servicio"], "2026-03-03")
+        self.assertEqual(result["nombre_empresa"], "SIS VIDA SAS")
+        self.assertIsInstance(mock_extract_pages.call_args.args[0], BytesIO)
+
     @patch("app.services.excel_acta_import._extract_pdf_text_pages")
     def test_parse_acta_pdf_supports_layout_with_values_before_labels(self, mock_extract_pages) -> None:
         mock_extract_pages.return_value = [
@@ -1032,6 +1216,22 @@ class ActaImportTests(unittest.TestCase):
         self.assertEqual(result_estefania["participantes"][0]["cedula_usuario"], "1233897064")
         self.assertEqual(result_estefania["participantes"][0]["discapacidad_usuario"], "física")
 
+    def test_pdf_field_grammar_matches_first_occurrence_of_each_field(self) -> None:
+        text = (
+            "ASESOR: Laura Gomez SEDE COMPENSAR: Norte\n"
+            "Numero de NIT: 900.123.456-7 Profesional asignado RECA: Sara Zambrano\n"
+            "Asesor: Otro Asesor\n"
+            "numero de nit: 800999111"
+        )
+
+        fields = _PDF_FIRST_PAGE_FIELDS.extract(text)
+
+        self.assertEqual(
+            fields,
+            {"nit": "900.123.456-7", "profesional_reca": "Sara Zambrano", "asesor": "Laura Gomez"},
+        )
+        self.assertEqual(_PDF_FIRST_PAGE_FIELDS.extract("sin etiquetas"), {"nit": "", "profesional_reca": "", "asesor": ""})
+
 
 if __name__ == "__main__":
     unittest.main()
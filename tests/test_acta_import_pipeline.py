@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import threading
 import unittest
 from unittest.mock import MagicMock, patch
 
 from app.services.acta_import_pipeline import (
+    ImportSession,
     _professional_name_matches,
+    _resolve_or_create_interpreter,
     build_import_result_from_completion_payload,
     build_import_result_from_finalized_record,
     build_import_result_from_parsed,
@@ -167,7 +170,7 @@ class ActaImportPipelineTests(unittest.TestCase):
             result["analysis"]["nombre_profesional"],
             "Leidy Johana Novoa Casasbuenas",
         )
-        mock_users.assert_called_once_with([])
+        mock_users.assert_not_called()
 
     @patch("app.services.acta_import_pipeline._companies")
     @patch("app.services.acta_import_pipeline._users_by_cedula")
@@ -218,6 +221,87 @@ class ActaImportPipelineTests(unittest.TestCase):
 
         mock_users.assert_called_once_with(["123", "456"])
 
+    @patch("app.services.acta_import_pipeline.suggest_service_from_analysis")
+    @patch("app.services.acta_import_pipeline._company_by_nit")
+    @patch("app.services.acta_import_pipeline._companies_by_nit")
+    @patch("app.services.acta_import_pipeline._companies")
+    @patch("app.services.acta_import_pipeline._users_by_cedula")
+    @patch("app.services.acta_import_pipeline._professionals")
+    def test_import_session_loads_catalogs_once_and_prefetches_lookups(
+        self,
+        mock_professionals,
+        mock_users,
+        mock_companies,
+        mock_companies_by_nit,
+        mock_company_by_nit,
+        mock_suggest_service,
+    ) -> None:
+        mock_professionals.return_value = (
+            {"nombre_profesional": "Leidy Johana Novoa Casasbuenas", "correo_profesional": "leidy@demo.co"},
+        )
+        mock_users.return_value = {
+            "123": {"nombre_usuario": "Ana Perez", "cedula_usuario": "123"},
+        }
+        mock_companies.return_value = ()
+        mock_companies_by_nit.return_value = {
+            "890900291-8": {"nit_empresa": "890900291-8", "nombre_empresa": "SOLLA S.A"},
+        }
+        mock_suggest_service.return_value = MagicMock(to_dict=lambda: {})
+        attachment = {
+            "filename": "seleccion.pdf",
+            "document_kind": "inclusive_selection",
+            "document_label": "Seleccion incluyente",
+            "is_ods_candidate": True,
+            "classification_score": 0.9,
+            "classification_reason": "Acta ODS",
+            "process_hint": "",
+            "process_score": 0.0,
+        }
+        documents = [
+            {
+                "nombre_profesional": "Leidy Novoa",
+                "nombre_empresa": "SOLLA S.A",
+                "nit_empresa": "890900291-8",
+                "participantes": [{"nombre_usuario": "Ana", "cedula_usuario": "123"}],
+                "warnings": [],
+            },
+            {
+                "nombre_profesional": "Leidy Novoa",
+                "nombre_empresa": "SOLLA S.A",
+                "nit_empresa": "890900291-8",
+                "participantes": [
+                    {"nombre_usuario": "Ana", "cedula_usuario": "123"},
+                    {"nombre_usuario": "Luis", "cedula_usuario": "456"},
+                ],
+                "warnings": [],
+            },
+        ]
+
+        session = ImportSession()
+        session.prefetch(documents)
+        results = [
+            build_import_result_from_parsed(
+                parsed,
+                source_label="seleccion.pdf",
+                message={"sender_email": "leidy@demo.co"},
+                attachment=attachment,
+                session=session,
+            )
+            for parsed in documents
+        ]
+
+        mock_professionals.assert_called_once_with()
+        mock_users.assert_called_once_with(["123", "456"])
+        mock_companies_by_nit.assert_called_once_with(["890900291-8"])
+        mock_company_by_nit.assert_not_called()
+        mock_companies.assert_not_called()
+        self.assertEqual(results[0]["professional_resolved"], "Leidy Johana Novoa Casasbuenas")
+        self.assertEqual(results[1]["analysis"]["nombre_empresa"], "SOLLA S.A")
+        self.assertEqual(
+            [item["_usuario_accion"] for item in results[1]["participants_prepared"]],
+            ["existente", "crear"],
+        )
+
     @patch("app.services.acta_import_pipeline._companies")
     @patch("app.services.acta_import_pipeline._users_by_cedula")
     @patch("app.services.acta_import_pipeline._professionals")
@@ -410,6 +494,7 @@ class ActaImportPipelineTests(unittest.TestCase):
             mock_find_by_acta_ref.return_value,
             create_missing_interpreter=True,
             allow_source_fallback=False,
+            session=None,
         )
 
     @patch("app.services.acta_import_pipeline.build_import_result_from_parsed")
@@ -526,6 +611,44 @@ class ActaImportPipelineTests(unittest.TestCase):
             parsed_arg["warnings"],
         )
 
+    @patch("app.services.acta_import_pipeline.seccion1.crear_profesional")
+    @patch("app.services.acta_import_pipeline._interpreters")
+    def test_concurrent_imports_create_a_new_interpreter_once(self, mock_interpreters, mock_crear_profesional) -> None:
+        created: list[str] = []
+        both_checked = threading.Barrier(2, timeout=5)
+        mock_interpreters.side_effect = lambda: tuple({"nombre": name} for name in created)
+
+        def _crear(request) -> None:
+            created.append(request.nombre_profesional)
+
+        mock_crear_profesional.side_effect = _crear
+        session = ImportSession()
+        original_create = session.create_interpreter
+
+        def _create_after_both_checked(name, *, candidates):
+            # Los dos hilos ya vieron el catalogo sin el interprete.
+            both_checked.wait()
+            return original_create(name, candidates=candidates)
+
+        session.create_interpreter = _create_after_both_checked
+        results: list[str] = []
+        analysis = {"interpretes": ["MARIA FERNANDA LOPEZ"]}
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    _resolve_or_create_interpreter(analysis, create_missing=True, session=session)
+                )
+            )
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        mock_crear_profesional.assert_called_once()
+        self.assertEqual(results, ["Maria Fernanda Lopez", "Maria Fernanda Lopez"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,12 +1,28 @@
 ﻿from __future__ import annotations
 
+import gzip
+import io
+import json
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+from app.services.acta_llm_cache import LlmExtractionCache
 from app.services.acta_llm_extractor import (
+    LlmExtractionJob,
+    LlmExtractionScheduler,
+    _EdgeSchemaNotCachedError,
+    _EDGE_SCHEMAS_SENT,
+    _TokenBucket,
+    _build_trimmed_pdf,
+    _invoke_edge_extraction,
+    _invoke_edge_function_http,
+    _relevant_page_indexes,
+    extract_structured_actas,
     _prepare_llm_source_text,
     extract_structured_acta_pdf,
     get_acta_llm_schema,
@@ -55,6 +71,28 @@ Nombre completo: Adriana Gonzalez Moreno
         self.assertIn("8.ASISTENTES", prepared)
         self.assertNotIn("Texto muy largo que no deberia enviarse", prepared)
 
+    def test_prepares_multi_page_text_with_priority_lines_and_deduped_headers(self) -> None:
+        pages = [
+            "1. DATOS GENERALES\nFecha de la Visita: 13/03/2026\nObservaciones\nLinea uno\nLinea dos\n\n"
+            "8.ASISTENTES\nNombre completo: Ana Perez",
+            "8.ASISTENTES\nNombre completo: Luis Gomez\n"
+            "6. LA VACANTE ES ACCESIBLE Y COMPATIBLE PARA PERSONAS CON...\nTexto que no va",
+        ]
+
+        prepared = _prepare_llm_source_text(pages, document_kind="vacancy_review")
+
+        self.assertEqual(
+            prepared.splitlines(),
+            [
+                "Fecha de la Visita: 13/03/2026",
+                "8.ASISTENTES",
+                "1. DATOS GENERALES",
+                "Fecha de la Visita: 13/03/2026",
+                "Nombre completo: Ana Perez",
+                "Nombre completo: Luis Gomez",
+            ],
+        )
+
     @patch("app.services.acta_llm_extractor._extract_pdf_text_pages")
     @patch("app.services.acta_llm_extractor._save_llm_json")
     @patch("app.services.acta_llm_extractor._invoke_edge_function_http")
@@ -70,6 +108,7 @@ Nombre completo: Adriana Gonzalez Moreno
     ) -> None:
         mock_get_settings.return_value = SimpleNamespace(
             automation_llm_extraction_enabled=True,
+            automation_llm_cache_enabled=False,
             supabase_edge_acta_extraction_function="extract-acta-ods",
         )
         mock_parse_acta_pdf.return_value = {"warnings": []}
@@ -134,6 +173,7 @@ Nombre completo: Adriana Gonzalez Moreno
     ) -> None:
         mock_get_settings.return_value = SimpleNamespace(
             automation_llm_extraction_enabled=True,
+            automation_llm_cache_enabled=False,
             supabase_edge_acta_extraction_function="extract-acta-ods",
         )
         mock_parse_acta_pdf.return_value = {"warnings": []}
@@ -205,6 +245,7 @@ Nombre completo: Adriana Gonzalez Moreno
     ) -> None:
         mock_get_settings.return_value = SimpleNamespace(
             automation_llm_extraction_enabled=True,
+            automation_llm_cache_enabled=False,
             supabase_edge_acta_extraction_function="extract-acta-ods",
         )
         mock_parse_acta_pdf.return_value = {"warnings": []}
@@ -268,6 +309,7 @@ Nombre completo: Adriana Gonzalez Moreno
     ) -> None:
         mock_get_settings.return_value = SimpleNamespace(
             automation_llm_extraction_enabled=True,
+            automation_llm_cache_enabled=False,
             supabase_edge_acta_extraction_function="extract-acta-ods",
         )
         mock_parse_acta_pdf.return_value = {
@@ -291,6 +333,300 @@ Nombre completo: Adriana Gonzalez Moreno
         self.assertEqual(result["llm_extraction_status"], "fallback_local")
         self.assertIn("No se pudo usar extraccion LLM", " ".join(result["warnings"]))
 
+    @patch("app.services.acta_llm_extractor._llm_cache")
+    @patch("app.services.acta_llm_extractor._extract_pdf_text_pages")
+    @patch("app.services.acta_llm_extractor._save_llm_json")
+    @patch("app.services.acta_llm_extractor._invoke_edge_function_http")
+    @patch("app.services.acta_llm_extractor.parse_acta_pdf")
+    @patch("app.services.acta_llm_extractor.get_settings")
+    def test_reuses_cached_llm_result_unless_bypassed(
+        self,
+        mock_get_settings,
+        mock_parse_acta_pdf,
+        mock_invoke_edge,
+        mock_save_llm_json,
+        mock_extract_pdf_text_pages,
+        mock_llm_cache,
+    ) -> None:
+        mock_get_settings.return_value = SimpleNamespace(
+            automation_llm_extraction_enabled=True,
+            automation_llm_cache_enabled=True,
+            supabase_edge_acta_extraction_function="extract-acta-ods",
+        )
+        mock_parse_acta_pdf.return_value = {"warnings": []}
+        mock_extract_pdf_text_pages.return_value = ["Texto extraido del PDF"]
+        mock_save_llm_json.return_value = "C:/Users/aaron/Desktop/JSONs/demo.json"
+        mock_invoke_edge.return_value = {
+            "data": {
+                "extraction_status": "ok",
+                "nit_empresa": "901024978-1",
+                "nombre_empresa": "GALLAGHER CONSULTING LTDA",
+                "participantes": [],
+                "warnings": [],
+            }
+        }
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mock_llm_cache.return_value = LlmExtractionCache(Path(tmpdir) / "cache.sqlite3")
+            pdf_path = Path(tmpdir) / "demo.pdf"
+            pdf_path.write_bytes(b"%PDF-1.4 demo")
+
+            first = extract_structured_acta_pdf(str(pdf_path), filename="demo.pdf", subject="Correo demo")
+            second = extract_structured_acta_pdf(str(pdf_path), filename="demo.pdf", subject="Correo demo")
+            self.assertEqual(mock_invoke_edge.call_count, 1)
+            self.assertFalse(first["llm_cache_hit"])
+            self.assertTrue(second["llm_cache_hit"])
+            self.assertEqual(second["nombre_empresa"], first["nombre_empresa"])
+
+            renamed = extract_structured_acta_pdf(str(pdf_path), filename="RV demo.pdf", subject="Correo demo")
+            self.assertEqual(mock_invoke_edge.call_count, 1)
+            self.assertTrue(renamed["llm_cache_hit"])
+            self.assertEqual(renamed["file_path"], "RV demo.pdf")
+            self.assertNotIn("llm_json_path", renamed)
+
+            refreshed = extract_structured_acta_pdf(
+                str(pdf_path), filename="demo.pdf", subject="Correo demo", bypass_cache=True
+            )
+            self.assertEqual(mock_invoke_edge.call_count, 2)
+            self.assertFalse(refreshed["llm_cache_hit"])
+
+            extract_structured_acta_pdf(str(pdf_path), filename="demo.pdf", subject="Correo demo", model_override="otro-modelo")
+            self.assertEqual(mock_invoke_edge.call_count, 3)
+
+    @patch("app.services.acta_llm_extractor.extract_structured_acta_pdf")
+    def test_scheduler_runs_jobs_concurrently_and_yields_in_completion_order(self, mock_extract) -> None:
+        delays = {"lento.pdf": 0.3, "rapido.pdf": 0.01}
+        active = {"now": 0, "max": 0}
+        lock = threading.Lock()
+
+        def _fake_extract(file_path, **kwargs):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(delays[kwargs["filename"]])
+            with lock:
+                active["now"] -= 1
+            return {"file_path": file_path, "llm_extraction_used": True}
+
+        mock_extract.side_effect = _fake_extract
+        jobs = [
+            LlmExtractionJob(key="a", file_path="a.pdf", filename="lento.pdf"),
+            LlmExtractionJob(key="b", file_path="b.pdf", filename="rapido.pdf"),
+        ]
+
+        outcomes = list(extract_structured_actas(jobs, max_workers=2, requests_per_minute=0))
+
+        self.assertEqual([outcome.job.key for outcome in outcomes], ["b", "a"])
+        self.assertTrue(all(outcome.status == "ok" for outcome in outcomes))
+        self.assertEqual(active["max"], 2)
+
+    @patch("app.services.acta_llm_extractor.extract_structured_acta_pdf")
+    def test_scheduler_times_out_jobs_waiting_for_rate_limit(self, mock_extract) -> None:
+        mock_extract.return_value = {"llm_extraction_used": True}
+        jobs = [
+            LlmExtractionJob(key="a", file_path="a.pdf", deadline_seconds=0.2),
+            LlmExtractionJob(key="b", file_path="b.pdf", deadline_seconds=0.2),
+        ]
+
+        # Un solo turno por minuto: el segundo trabajo vence esperando.
+        outcomes = {o.job.key: o for o in extract_structured_actas(jobs, max_workers=1, requests_per_minute=1)}
+
+        self.assertEqual(outcomes["a"].status, "ok")
+        self.assertEqual(outcomes["b"].status, "timeout")
+        self.assertEqual(mock_extract.call_count, 1)
+
+    @patch("app.services.acta_llm_extractor.extract_structured_acta_pdf")
+    def test_scheduler_cancel_skips_pending_jobs(self, mock_extract) -> None:
+        started = threading.Event()
+        release = threading.Event()
+
+        def _fake_extract(file_path, **kwargs):
+            started.set()
+            release.wait(2)
+            return {"file_path": file_path}
+
+        mock_extract.side_effect = _fake_extract
+        scheduler = LlmExtractionScheduler(max_workers=1, requests_per_minute=0)
+        for key in ("a", "b", "c"):
+            scheduler.submit(LlmExtractionJob(key=key, file_path=f"{key}.pdf"))
+        started.wait(2)
+        scheduler.cancel()
+        release.set()
+
+        statuses = {outcome.job.key: outcome.status for outcome in scheduler.iter_results()}
+        scheduler.close()
+
+        self.assertEqual(statuses, {"a": "ok", "b": "cancelled", "c": "cancelled"})
+        self.assertEqual(mock_extract.call_count, 1)
+
+    def test_token_bucket_allows_burst_then_waits(self) -> None:
+        bucket = _TokenBucket(rate_per_minute=60, capacity=2)
+        cancel = threading.Event()
+        self.assertTrue(bucket.acquire(deadline=None, cancel_event=cancel))
+        self.assertTrue(bucket.acquire(deadline=None, cancel_event=cancel))
+        self.assertFalse(bucket.acquire(deadline=time.monotonic() + 0.05, cancel_event=cancel))
+
+    def test_relevant_pages_keep_profile_sections_and_trim_pdf(self) -> None:
+        from pypdf import PdfReader, PdfWriter
+
+        pages = [
+            "1. DATOS GENERALES\nFecha de la Visita: 13/03/2026",
+            "6. LA VACANTE ES ACCESIBLE Y COMPATIBLE PARA PERSONAS CON...\nTexto muy largo",
+            "8.ASISTENTES\nNombre completo: Adriana Gonzalez Moreno",
+        ]
+        indexes = _relevant_page_indexes(pages, document_kind="vacancy_review")
+        self.assertEqual(indexes, [0, 2])
+        self.assertEqual(_relevant_page_indexes(pages, document_kind=""), [0, 1, 2])
+
+        writer = PdfWriter()
+        for _ in pages:
+            writer.add_blank_page(width=200, height=200)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        trimmed = _build_trimmed_pdf(buffer.getvalue(), indexes)
+
+        self.assertIsNotNone(trimmed)
+        self.assertEqual(len(PdfReader(io.BytesIO(trimmed)).pages), 2)
+        self.assertIsNone(_build_trimmed_pdf(buffer.getvalue(), [0, 1, 2]))
+        self.assertIsNone(_build_trimmed_pdf(b"no es un pdf", [0]))
+
+    def test_relevant_pages_keep_scanned_pages_without_text(self) -> None:
+        pages = [
+            "1. DATOS GENERALES\nFecha de la Visita: 13/03/2026",
+            "6. LA VACANTE ES ACCESIBLE Y COMPATIBLE PARA PERSONAS CON...\nTexto muy largo",
+            "",
+            "  Firma \n",
+            "8.ASISTENTES\nNombre completo: Adriana Gonzalez Moreno",
+        ]
+
+        self.assertEqual(_relevant_page_indexes(pages, document_kind="vacancy_review"), [0, 2, 3, 4])
+        self.assertEqual(_relevant_page_indexes(pages, document_kind=""), [0, 1, 2, 3, 4])
+
+    @patch("app.services.acta_llm_extractor.urllib.request.urlopen")
+    @patch("app.services.acta_llm_extractor.get_settings")
+    def test_edge_request_body_is_gzip_compressed(self, mock_get_settings, mock_urlopen) -> None:
+        mock_get_settings.return_value = SimpleNamespace(
+            supabase_url="https://demo.supabase.co",
+            supabase_anon_key="anon",
+            supabase_edge_acta_extraction_secret="",
+        )
+        response = MagicMock()
+        response.read.return_value = b'{"data": {}}'
+        mock_urlopen.return_value.__enter__.return_value = response
+
+        _invoke_edge_function_http("extract-acta-ods", {"text": "hola " * 200})
+
+        request = mock_urlopen.call_args.args[0]
+        self.assertEqual(request.get_header("Content-encoding"), "gzip")
+        self.assertEqual(json.loads(gzip.decompress(request.data)), {"text": "hola " * 200})
+
+    @patch("app.services.acta_llm_extractor._invoke_edge_function_http")
+    def test_edge_schema_sent_once_and_resent_when_not_cached(self, mock_invoke) -> None:
+        _EDGE_SCHEMAS_SENT.clear()
+        self.addCleanup(_EDGE_SCHEMAS_SENT.clear)
+        payload = {"schema": {"type": "object"}, "schema_hash": "abc", "text": "demo"}
+        mock_invoke.return_value = {"data": {}}
+
+        _invoke_edge_extraction("extract-acta-ods", payload)
+        _invoke_edge_extraction("extract-acta-ods", payload)
+
+        self.assertIn("schema", mock_invoke.call_args_list[0].args[1])
+        self.assertNotIn("schema", mock_invoke.call_args_list[1].args[1])
+
+        mock_invoke.reset_mock()
+        mock_invoke.side_effect = [_EdgeSchemaNotCachedError("sin schema"), {"data": {}}]
+        _invoke_edge_extraction("extract-acta-ods", payload)
+
+        self.assertEqual(mock_invoke.call_count, 2)
+        self.assertIn("schema", mock_invoke.call_args_list[1].args[1])
+
+    @patch("app.services.acta_llm_extractor._invoke_edge_function_http")
+    @patch("app.services.acta_llm_extractor.parse_acta_pdf")
+    @patch("app.services.acta_llm_extractor.get_settings")
+    def test_skips_llm_when_local_parse_covers_profile_fields(
+        self,
+        mock_get_settings,
+        mock_parse_acta_pdf,
+        mock_invoke_edge,
+    ) -> None:
+        mock_get_settings.return_value = SimpleNamespace(
+            automation_llm_extraction_enabled=True,
+            automation_llm_cache_enabled=False,
+            supabase_edge_acta_extraction_function="extract-acta-ods",
+        )
+        mock_parse_acta_pdf.return_value = {
+            "fecha_servicio": "2026-03-02",
+            "modalidad_servicio": "Virtual",
+            "nombre_profesional": "Leidy Novoa",
+            "cargo_objetivo": "Auxiliar de bodega",
+            "participantes": [{"nombre_usuario": "Ana Perez", "cedula_usuario": "1034657640"}],
+            "warnings": [],
+        }
+
+        result = extract_structured_acta_pdf(
+            "demo.pdf",
+            filename="PROCESO DE SELECCIÓN INCLUYENTE demo.pdf",
+            subject="Proceso de selección incluyente demo",
+        )
+
+        mock_invoke_edge.assert_not_called()
+        self.assertEqual(result["llm_extraction_status"], "skipped_local_complete")
+        self.assertEqual(result["local_extraction_confidence"], 1.0)
+
+    @patch("app.services.acta_llm_extractor._extract_pdf_text_pages")
+    @patch("app.services.acta_llm_extractor._save_llm_json")
+    @patch("app.services.acta_llm_extractor._invoke_edge_function_http")
+    @patch("app.services.acta_llm_extractor.parse_acta_pdf")
+    @patch("app.services.acta_llm_extractor.get_settings")
+    def test_requests_only_missing_fields_with_reduced_schema(
+        self,
+        mock_get_settings,
+        mock_parse_acta_pdf,
+        mock_invoke_edge,
+        mock_save_llm_json,
+        mock_extract_pdf_text_pages,
+    ) -> None:
+        mock_get_settings.return_value = SimpleNamespace(
+            automation_llm_extraction_enabled=True,
+            automation_llm_cache_enabled=False,
+            supabase_edge_acta_extraction_function="extract-acta-ods",
+        )
+        mock_parse_acta_pdf.return_value = {
+            "fecha_servicio": "2026-03-02",
+            "modalidad_servicio": "Virtual",
+            "nombre_profesional": "Leidy Novoa",
+            "cargo_objetivo": "",
+            "nombre_empresa": "GALLAGHER CONSULTING LTDA",
+            "participantes": [{"nombre_usuario": "Ana Perez", "cedula_usuario": "1034657640"}],
+            "warnings": [],
+        }
+        mock_extract_pdf_text_pages.return_value = ["2. DATOS DEL OFERENTE\nCargo: Auxiliar de bodega"]
+        mock_save_llm_json.return_value = "llm.jsonl"
+        mock_invoke_edge.return_value = {
+            "data": {"extraction_status": "ok", "cargo_objetivo": "Auxiliar de bodega", "warnings": []}
+        }
+
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+            temp_path = Path(tmp.name)
+        try:
+            result = extract_structured_acta_pdf(
+                str(temp_path),
+                filename="PROCESO DE SELECCIÓN INCLUYENTE demo.pdf",
+                subject="Proceso de selección incluyente demo",
+            )
+        finally:
+            temp_path.unlink()
+
+        payload = mock_invoke_edge.call_args.args[1]
+        self.assertIn("cargo_objetivo", payload["schema"]["properties"])
+        self.assertNotIn("participantes", payload["schema"]["properties"])
+        self.assertEqual(set(payload["schema"]["required"]), set(payload["schema"]["properties"]))
+        self.assertIn("campos_solicitados: cargo_objetivo", payload["text"])
+        self.assertEqual(result["cargo_objetivo"], "Auxiliar de bodega")
+        self.assertEqual(result["nombre_empresa"], "GALLAGHER CONSULTING LTDA")
+        self.assertEqual(result["participantes"][0]["cedula_usuario"], "1034657640")
+        self.assertEqual(result["llm_requested_fields"], ["cargo_objetivo"])
+
 
 if __name__ == "__main__":
     unittest.main()
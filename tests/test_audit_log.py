@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.automation.orchestrator import _decision_log_record
+from app.services.audit_log import AuditLogSink
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+class AuditLogSinkTests(unittest.TestCase):
+    def test_writes_compact_jsonl_in_background_and_finds_by_message_and_acta(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sink = AuditLogSink(Path(tmpdir), "decisiones", clock=_FakeClock())
+            self.addCleanup(sink.close)
+
+            path = sink.write({"message_id": "m1", "estado": "preview"})
+            sink.write({"message_id": "m2", "acta_ref": "abc123", "estado": "subido"})
+            sink.write({"message_id": "m1", "estado": "subido"})
+            self.assertTrue(sink.flush(timeout=5))
+
+            self.assertEqual(path.name, "decisiones-20260302.jsonl")
+            lines = path.read_text(encoding="utf-8").splitlines()
+            self.assertEqual(len(lines), 3)
+            self.assertNotIn(": ", lines[0])
+            self.assertEqual([item["estado"] for item in sink.find(message_id="m1")], ["preview", "subido"])
+            self.assertEqual(sink.find(acta_ref="ABC123")[0]["message_id"], "m2")
+            self.assertEqual(sink.find(), [])
+
+    def test_rotates_by_size_and_date_into_gzip_segments(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            directory = Path(tmpdir)
+            clock = _FakeClock()
+            sink = AuditLogSink(directory, "llm", max_segment_bytes=120, clock=clock)
+            self.addCleanup(sink.close)
+
+            for index in range(4):
+                sink.write({"message_id": f"m{index}", "texto": "x" * 40})
+            sink.flush(timeout=5)
+            clock.now += timedelta(days=1)
+            sink.write({"message_id": "m-next", "texto": "nuevo dia"})
+            sink.flush(timeout=5)
+
+            names = sorted(path.name for path in directory.glob("llm-*"))
+            self.assertIn("llm-20260302-001.jsonl.gz", names)
+            self.assertIn("llm-20260303.jsonl", names)
+            self.assertNotIn("llm-20260302.jsonl", names)
+            with gzip.open(directory / "llm-20260302-001.jsonl.gz", "rt", encoding="utf-8") as handle:
+                self.assertEqual(json.loads(handle.readline())["message_id"], "m0")
+            for index in range(4):
+                self.assertEqual(sink.find(message_id=f"m{index}")[0]["texto"], "x" * 40)
+            self.assertEqual(sink.find(message_id="m-next")[0]["texto"], "nuevo dia")
+
+    def test_writer_thread_appends_text_lines_to_plain_log(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            text_path = Path(tmpdir) / "Desktop" / "decisiones.txt"
+            sink = AuditLogSink(Path(tmpdir) / "audit", "decisiones", clock=_FakeClock())
+            self.addCleanup(sink.close)
+
+            sink.write({"message_id": "m1"}, text_path=text_path, text_line="estado=subido message_id=m1")
+            sink.write({"message_id": "m2"})
+            sink.write({"message_id": "m3"}, text_path=text_path, text_line="estado=omitido message_id=m3\n")
+            self.assertTrue(sink.flush(timeout=5))
+
+            self.assertEqual(
+                text_path.read_text(encoding="utf-8"),
+                "estado=subido message_id=m1\nestado=omitido message_id=m3\n",
+            )
+            self.assertEqual(len(sink.find(message_id="m2")), 1)
+
+    def test_decision_entries_are_indexed_by_message_id(self) -> None:
+        record = _decision_log_record(
+            "[2026-03-02T12:00:00+00:00] estado=subido message_id=abc subject=Acta de prueba remitente=-"
+        )
+        self.assertEqual(record["estado"], "subido")
+        self.assertEqual(record["message_id"], "abc")
+        self.assertEqual(_decision_log_record("estado=omitido message_id=- subject=x")["message_id"], "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from app.automation.attachment_registry import AttachmentRegistry
+from app.automation.models import AttachmentRef, GmailMessageRef
+from app.automation.orchestrator import _download_and_parse_attachments
+
+
+def _message(message_id: str) -> GmailMessageRef:
+    return GmailMessageRef(
+        message_id=message_id,
+        thread_id=f"thread-{message_id}",
+        subject=f"Acta {message_id}",
+        sender="Ana <ana@recacolombia.org>",
+        sender_email="ana@recacolombia.org",
+        to_address="",
+        received_at="",
+    )
+
+
+def _attachment(filename: str) -> dict:
+    return AttachmentRef(
+        attachment_id=f"att-{filename}",
+        filename=filename,
+        mime_type="application/pdf",
+        size_bytes=10,
+        is_ods_candidate=True,
+    ).to_dict()
+
+
+def _gateway(contents: list[bytes]) -> MagicMock:
+    gateway = MagicMock()
+    gateway.iter_attachment_downloads.side_effect = lambda _message, refs: iter(
+        [(index, contents[index], None) for index in range(len(refs))]
+    )
+    return gateway
+
+
+class AttachmentRegistryTests(unittest.TestCase):
+    @patch("app.automation.orchestrator.parse_acta_pdf")
+    def test_forwarded_pdf_is_short_circuited_and_rescan_reuses_parse(self, mock_parse) -> None:
+        mock_parse.side_effect = lambda content, source_name: {"nombre_empresa": "Empresa Demo", "origen": source_name}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            registry = AttachmentRegistry(Path(tmpdir) / "registry.sqlite3")
+
+            first = list(_download_and_parse_attachments(
+                gateway=_gateway([b"%PDF-acta", b"%PDF-acta"]),
+                message_ref=_message("msg-1"),
+                attachments=[_attachment("acta.pdf"), _attachment("acta (copia).pdf")],
+                registry=registry,
+            ))
+            rescan = list(_download_and_parse_attachments(
+                gateway=_gateway([b"%PDF-acta"]),
+                message_ref=_message("msg-1"),
+                attachments=[_attachment("acta.pdf")],
+                registry=registry,
+            ))
+            forwarded = list(_download_and_parse_attachments(
+                gateway=_gateway([b"%PDF-acta"]),
+                message_ref=_message("msg-2"),
+                attachments=[_attachment("RV acta.pdf")],
+                registry=registry,
+                processed_ids={"msg-1"},
+            ))
+
+        self.assertEqual(mock_parse.call_count, 1)
+        self.assertEqual(first[0][1]["file_path"], "acta.pdf")
+        self.assertEqual(first[1][1]["_attachment_duplicate_of"]["message_id"], "msg-1")
+        self.assertEqual(rescan[0][1]["nombre_empresa"], "Empresa Demo")
+        self.assertNotIn("_attachment_duplicate_of", rescan[0][1])
+        duplicate_of = forwarded[0][1]["_attachment_duplicate_of"]
+        self.assertEqual(duplicate_of["message_id"], "msg-1")
+        self.assertEqual(duplicate_of["filename"], "acta.pdf")
+
+    @patch("app.automation.orchestrator.parse_acta_pdf")
+    def test_forwarded_pdf_of_unconfirmed_message_reuses_parse_and_takes_ownership(self, mock_parse) -> None:
+        mock_parse.side_effect = lambda content, source_name: {"nombre_empresa": "Empresa Demo", "origen": source_name}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            registry = AttachmentRegistry(Path(tmpdir) / "registry.sqlite3")
+
+            list(_download_and_parse_attachments(
+                gateway=_gateway([b"%PDF-acta"]),
+                message_ref=_message("msg-1"),
+                attachments=[_attachment("acta.pdf")],
+                registry=registry,
+            ))
+            forwarded = list(_download_and_parse_attachments(
+                gateway=_gateway([b"%PDF-acta"]),
+                message_ref=_message("msg-2"),
+                attachments=[_attachment("RV acta.pdf")],
+                registry=registry,
+            ))
+            after_confirm = list(_download_and_parse_attachments(
+                gateway=_gateway([b"%PDF-acta"]),
+                message_ref=_message("msg-3"),
+                attachments=[_attachment("RV RV acta.pdf")],
+                registry=registry,
+                processed_ids={"msg-2"},
+            ))
+
+        self.assertEqual(mock_parse.call_count, 1)
+        self.assertNotIn("_attachment_duplicate_of", forwarded[0][1])
+        self.assertEqual(forwarded[0][1]["nombre_empresa"], "Empresa Demo")
+        self.assertEqual(forwarded[0][1]["file_path"], "RV acta.pdf")
+        duplicate_of = after_confirm[0][1]["_attachment_duplicate_of"]
+        self.assertEqual(duplicate_of["message_id"], "msg-2")
+        self.assertEqual(duplicate_of["filename"], "RV acta.pdf")
+
+
+if __name__ == "__main__":
+    unittest.main()
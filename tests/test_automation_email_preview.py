@@ -22,7 +22,7 @@ class _SuggestionStub:
 
 
 class AutomationEmailPreviewTests(unittest.TestCase):
-    @patch("app.automation.orchestrator._download_and_parse_attachment")
+    @patch("app.automation.orchestrator._download_and_parse_attachments")
     @patch("app.automation.orchestrator._company_by_name_strong")
     @patch("app.automation.orchestrator._company_by_nit_details")
     @patch("app.automation.orchestrator.build_import_result_from_parsed")
@@ -73,7 +73,7 @@ class AutomationEmailPreviewTests(unittest.TestCase):
         gateway.list_pdf_attachments.return_value = attachments
         gateway.download_attachment_bytes.return_value = b"%PDF-1.4"
         mock_gateway_factory.return_value = gateway
-        mock_download_and_parse.return_value = {"file_path": "reactivacion.pdf"}
+        mock_download_and_parse.side_effect = lambda **_kwargs: iter([(0, {"file_path": "reactivacion.pdf"}, None)])
         mock_build_import_result.return_value = {
             "analysis": {
                 "nombre_empresa": "Empresa Demo",
@@ -128,7 +128,7 @@ class AutomationEmailPreviewTests(unittest.TestCase):
 
     @patch("app.automation.orchestrator._company_by_name_strong")
     @patch("app.automation.orchestrator._company_by_nit_details")
-    @patch("app.automation.orchestrator._download_and_parse_attachment")
+    @patch("app.automation.orchestrator._download_and_parse_attachments")
     @patch("app.automation.orchestrator.build_import_result_from_parsed")
     @patch("app.automation.orchestrator.suggest_service_from_analysis")
     @patch("app.automation.orchestrator._gmail_gateway")
@@ -167,7 +167,7 @@ class AutomationEmailPreviewTests(unittest.TestCase):
         gateway.list_pdf_attachments.return_value = attachments
         gateway.download_attachment_bytes.return_value = b"%PDF-1.4"
         mock_gateway_factory.return_value = gateway
-        mock_download_and_parse.return_value = {"file_path": "vacante_terpel.pdf"}
+        mock_download_and_parse.side_effect = lambda **_kwargs: iter([(0, {"file_path": "vacante_terpel.pdf"}, None)])
         mock_build_import_result.return_value = {
             "analysis": {
                 "nombre_empresa": "TERPEL SA",
@@ -217,7 +217,7 @@ class AutomationEmailPreviewTests(unittest.TestCase):
 
     @patch("app.automation.orchestrator._company_by_name_strong")
     @patch("app.automation.orchestrator._company_by_nit_details")
-    @patch("app.automation.orchestrator._download_and_parse_attachment")
+    @patch("app.automation.orchestrator._download_and_parse_attachments")
     @patch("app.automation.orchestrator.build_import_result_from_parsed")
     @patch("app.automation.orchestrator.suggest_service_from_analysis")
     @patch("app.automation.orchestrator._gmail_gateway")
@@ -266,10 +266,10 @@ class AutomationEmailPreviewTests(unittest.TestCase):
         gateway.list_pdf_attachments.return_value = attachments
         gateway.download_attachment_bytes.return_value = b"%PDF-1.4"
         mock_gateway_factory.return_value = gateway
-        mock_download_and_parse.side_effect = [
-            {"file_path": "seleccion.pdf"},
-            {"file_path": "interprete.pdf"},
-        ]
+        mock_download_and_parse.side_effect = lambda **_kwargs: iter([
+            (0, {"file_path": "seleccion.pdf"}, None),
+            (1, {"file_path": "interprete.pdf"}, None),
+        ])
         mock_build_import_result.side_effect = [
             {
                 "analysis": {
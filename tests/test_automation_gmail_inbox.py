@@ -1,8 +1,73 @@
 from __future__ import annotations
 
+from pathlib import Path
+import tempfile
+import threading
 import unittest
+from unittest.mock import MagicMock, patch
 
-from app.automation.gmail_inbox import _collect_pdf_parts
+from app.automation.gmail_inbox import GmailInboxGateway, _collect_pdf_parts, _message_ref_from_full
+from app.automation.models import AttachmentRef
+from app.automation.sync_state import GmailSyncState
+
+
+class _FakeHttpError(Exception):
+    def __init__(self, status: int) -> None:
+        super().__init__(f"HTTP {status}")
+        self.resp = MagicMock(status=status)
+
+
+class _FakeBatch:
+    def __init__(self, callback, responder) -> None:
+        self._callback = callback
+        self._responder = responder
+        self.request_ids: list[str] = []
+
+    def add(self, _request, request_id: str) -> None:
+        self.request_ids.append(request_id)
+
+    def execute(self) -> None:
+        for request_id in self.request_ids:
+            response, exception = self._responder(request_id)
+            self._callback(request_id, response, exception)
+
+
+def _full_message(message_id: str) -> dict:
+    return {
+        "id": message_id,
+        "threadId": f"thread-{message_id}",
+        "payload": {
+            "headers": [
+                {"name": "From", "value": "Sara Zambrano <Sara@Reca.co>"},
+                {"name": "Subject", "value": f"Acta {message_id}"},
+            ],
+            "parts": [
+                {
+                    "mimeType": "application/pdf",
+                    "filename": f"{message_id}.pdf",
+                    "body": {"attachmentId": f"att-{message_id}", "size": 10},
+                }
+            ],
+        },
+    }
+
+
+def _gateway_with_batches(message_ids: list[str], responder) -> tuple[GmailInboxGateway, MagicMock, list[_FakeBatch]]:
+    service = MagicMock()
+    service.users.return_value.messages.return_value.list.return_value.execute.return_value = {
+        "messages": [{"id": message_id} for message_id in message_ids]
+    }
+    batches: list[_FakeBatch] = []
+
+    def _new_batch(callback):
+        batch = _FakeBatch(callback, responder)
+        batches.append(batch)
+        return batch
+
+    service.new_batch_http_request.side_effect = _new_batch
+    with patch("app.automation.gmail_inbox.list_process_template_names", return_value=[]):
+        gateway = GmailInboxGateway(delegated_user="aaron@reca.co", to_filter="", max_results=500)
+    return gateway, service, batches
 
 
 class AutomationGmailInboxTests(unittest.TestCase):
@@ -36,6 +101,206 @@ class AutomationGmailInboxTests(unittest.TestCase):
 
         self.assertEqual([item["filename"] for item in parts], ["acta.pdf", "nested.pdf"])
 
+    @patch("app.automation.gmail_inbox.get_google_gmail_service")
+    def test_list_candidate_messages_fetches_details_in_batches_of_100(self, mock_service) -> None:
+        message_ids = [f"m{index}" for index in range(150)]
+        gateway, service, batches = _gateway_with_batches(message_ids, lambda request_id: (_full_message(request_id), None))
+        mock_service.return_value = service
+
+        messages = gateway.list_candidate_messages()
+        attachments = gateway.list_pdf_attachments(messages[10])
+
+        self.assertEqual([len(batch.request_ids) for batch in batches], [100, 50])
+        self.assertEqual([item.message_id for item in messages], message_ids)
+        self.assertEqual(messages[0].sender_email, "sara@reca.co")
+        self.assertEqual(messages[0].thread_id, "thread-m0")
+        self.assertEqual([item.attachment_id for item in attachments], ["att-m10"])
+        service.users.return_value.messages.return_value.get.return_value.execute.assert_not_called()
+
+    @patch("app.automation.gmail_inbox.time.sleep")
+    @patch("app.automation.gmail_inbox.get_google_gmail_service")
+    def test_batch_retries_only_transient_failures(self, mock_service, mock_sleep) -> None:
+        calls: dict[str, int] = {}
+
+        def _responder(request_id: str):
+            calls[request_id] = calls.get(request_id, 0) + 1
+            if request_id == "m2" and calls[request_id] == 1:
+                return None, _FakeHttpError(429)
+            return _full_message(request_id), None
+
+        gateway, service, batches = _gateway_with_batches(["m1", "m2", "m3"], _responder)
+        mock_service.return_value = service
+
+        messages = gateway.list_candidate_messages()
+
+        self.assertEqual([item.message_id for item in messages], ["m1", "m2", "m3"])
+        self.assertEqual([batch.request_ids for batch in batches], [["m1", "m2", "m3"], ["m2"]])
+        mock_sleep.assert_called_once()
+
+    @patch("app.automation.gmail_inbox.get_google_gmail_service")
+    def test_batch_raises_non_retryable_failures(self, mock_service) -> None:
+        def _responder(request_id: str):
+            if request_id == "m2":
+                return None, _FakeHttpError(404)
+            return _full_message(request_id), None
+
+        gateway, service, _batches = _gateway_with_batches(["m1", "m2"], _responder)
+        mock_service.return_value = service
+
+        with self.assertRaises(_FakeHttpError):
+            gateway.list_candidate_messages()
+
+    @patch("app.automation.gmail_inbox.get_google_gmail_service")
+    def test_iter_candidate_messages_follows_pages_and_skips_processed_ids(self, mock_service) -> None:
+        gateway, service, batches = _gateway_with_batches([], lambda request_id: (_full_message(request_id), None))
+        mock_service.return_value = service
+        list_call = service.users.return_value.messages.return_value.list
+        list_call.return_value.execute.side_effect = [
+            {"messages": [{"id": "m1"}, {"id": "done"}], "nextPageToken": "page-2"},
+            {"messages": [{"id": "m2"}, {"id": "m3"}]},
+        ]
+        skipped: list[str] = []
+
+        iterator = gateway.iter_candidate_messages(skip_ids={"done"}, on_skip=skipped.append)
+        first = next(iterator)
+
+        self.assertEqual(first.message_id, "m1")
+        self.assertEqual(list_call.return_value.execute.call_count, 1)
+
+        rest = list(iterator)
+
+        self.assertEqual([item.message_id for item in rest], ["m2", "m3"])
+        self.assertEqual(skipped, ["done"])
+        self.assertEqual([batch.request_ids for batch in batches], [["m1"], ["m2", "m3"]])
+        self.assertEqual(list_call.call_args_list[1].kwargs["pageToken"], "page-2")
+
+    @patch("app.automation.gmail_inbox.get_google_gmail_service")
+    def test_iter_candidate_messages_stops_at_max_results_new_messages(self, mock_service) -> None:
+        gateway, service, batches = _gateway_with_batches([], lambda request_id: (_full_message(request_id), None))
+        gateway.max_results = 2
+        mock_service.return_value = service
+        list_call = service.users.return_value.messages.return_value.list
+        list_call.return_value.execute.side_effect = [
+            {"messages": [{"id": "done"}, {"id": "m1"}], "nextPageToken": "page-2"},
+            {"messages": [{"id": "m2"}, {"id": "m3"}], "nextPageToken": "page-3"},
+        ]
+
+        messages = list(gateway.iter_candidate_messages(skip_ids={"done"}))
+
+        self.assertEqual([item.message_id for item in messages], ["m1", "m2"])
+        self.assertEqual([batch.request_ids for batch in batches], [["m1"], ["m2"]])
+        self.assertEqual(list_call.return_value.execute.call_count, 2)
+
+    @patch("app.automation.gmail_inbox.get_google_gmail_service")
+    def test_iter_incremental_messages_reads_history_and_keeps_unprocessed_pending(self, mock_service) -> None:
+        def _responder(request_id: str):
+            if request_id == "gone":
+                return None, _FakeHttpError(404)
+            full = _full_message(request_id)
+            if request_id == "draft":
+                full["labelIds"] = ["DRAFT"]
+            return full, None
+
+        gateway, service, batches = _gateway_with_batches([], _responder)
+        mock_service.return_value = service
+        users = service.users.return_value
+        users.getProfile.return_value.execute.return_value = {"historyId": "200"}
+        users.history.return_value.list.return_value.execute.side_effect = [
+            {
+                "history": [{"messagesAdded": [{"message": {"id": "m1"}}, {"message": {"id": "draft"}}]}],
+                "nextPageToken": "h-2",
+            },
+            {"history": [{"messagesAdded": [{"message": {"id": "gone"}}, {"message": {"id": "done"}}]}]},
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state = GmailSyncState(Path(tmp_dir) / "sync.json")
+            state.save(gateway.sync_key, history_id="100", pending_ids=["pending-1"])
+
+            messages = list(gateway.iter_incremental_messages(state=state, skip_ids={"done"}))
+
+            checkpoint = state.load(gateway.sync_key)
+
+        self.assertEqual([item.message_id for item in messages], ["pending-1", "m1"])
+        self.assertEqual(users.history.return_value.list.call_args_list[0].kwargs["startHistoryId"], "100")
+        self.assertEqual(users.history.return_value.list.call_args_list[1].kwargs["pageToken"], "h-2")
+        users.messages.return_value.list.assert_not_called()
+        self.assertEqual([batch.request_ids for batch in batches], [["pending-1", "m1", "draft", "gone"]])
+        self.assertEqual(checkpoint["history_id"], "200")
+        self.assertEqual(checkpoint["pending_ids"], ["pending-1", "m1"])
+
+    @patch("app.automation.gmail_inbox.get_google_gmail_service")
+    def test_iter_incremental_messages_falls_back_to_full_query_when_history_expired(self, mock_service) -> None:
+        gateway, service, _batches = _gateway_with_batches(["m1", "m2"], lambda request_id: (_full_message(request_id), None))
+        mock_service.return_value = service
+        users = service.users.return_value
+        users.getProfile.return_value.execute.return_value = {"historyId": "900"}
+        users.history.return_value.list.return_value.execute.side_effect = _FakeHttpError(404)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state = GmailSyncState(Path(tmp_dir) / "sync.json")
+            state.save(gateway.sync_key, history_id="1", pending_ids=[])
+
+            messages = list(gateway.iter_incremental_messages(state=state))
+
+            checkpoint = state.load(gateway.sync_key)
+
+        self.assertEqual([item.message_id for item in messages], ["m1", "m2"])
+        users.messages.return_value.list.assert_called_once()
+        self.assertEqual(checkpoint["history_id"], "900")
+        self.assertEqual(checkpoint["pending_ids"], ["m1", "m2"])
+
+    @patch("app.automation.gmail_inbox.new_google_gmail_service")
+    def test_iter_attachment_downloads_uses_one_service_per_thread_and_yields_as_completed(self, mock_new_service) -> None:
+        gateway, _service, _batches = _gateway_with_batches([], lambda request_id: (None, None))
+        gateway.download_workers = 2
+        release_slow = threading.Event()
+        services: list[MagicMock] = []
+
+        def _build_service(**_kwargs):
+            service = MagicMock()
+            owner = threading.get_ident()
+
+            def _get(*, userId, messageId, id):
+                request = MagicMock()
+
+                def _execute():
+                    self.assertEqual(threading.get_ident(), owner)
+                    if id == "att-slow":
+                        release_slow.wait(timeout=5)
+                    if id == "att-bad":
+                        raise _FakeHttpError(500)
+                    return {"data": "JVBERi0xLjQ="}
+
+                request.execute.side_effect = _execute
+                return request
+
+            service.users.return_value.messages.return_value.attachments.return_value.get.side_effect = _get
+            services.append(service)
+            return service
+
+        mock_new_service.side_effect = _build_service
+        message = _message_ref_from_full(_full_message("m1"), "m1")
+        attachments = [
+            AttachmentRef(attachment_id=attachment_id, filename=f"{attachment_id}.pdf", mime_type="application/pdf", size_bytes=10)
+            for attachment_id in ("att-slow", "att-fast", "att-bad")
+        ]
+
+        completed: list[int] = []
+        errors: dict[int, Exception] = {}
+        for index, content, error in gateway.iter_attachment_downloads(message, attachments):
+            completed.append(index)
+            if error is not None:
+                errors[index] = error
+            else:
+                self.assertEqual(content, b"%PDF-1.4")
+            if len(completed) == 2:
+                release_slow.set()
+        gateway.close()
+
+        self.assertEqual(completed[-1], 0)
+        self.assertEqual(sorted(completed), [0, 1, 2])
+        self.assertEqual(list(errors), [2])
+        self.assertLessEqual(len(services), 2)
+
 
 if __name__ == "__main__":
     unittest.main()
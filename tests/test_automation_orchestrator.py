@@ -1,15 +1,62 @@
 from __future__ import annotations
 
+from pathlib import Path
+import tempfile
+from types import SimpleNamespace
 import unittest
 from unittest.mock import MagicMock, patch
 
+from app.automation.batch_jobs import BatchScanJobStore
+from app.automation.gmail_inbox import GmailInboxGateway
+from app.automation.models import AttachmentRef, GmailMessageRef
 from app.automation.orchestrator import (
+    _append_decision_log,
+    _scan_batch,
+    confirm_batch_eod_upload,
+    get_batch_eod_scan_job,
     get_automation_staging_case,
     get_automation_staging_cases,
     get_automation_test_status,
+    run_batch_eod_scan,
     save_automation_staging_case,
+    start_batch_eod_scan_job,
     update_automation_staging_case,
 )
+from app.automation.sync_state import GmailSyncState
+from app.services.audit_log import get_audit_sink
+
+
+def _full_message(message_id: str) -> dict:
+    return {
+        "id": message_id,
+        "threadId": f"thread-{message_id}",
+        "payload": {
+            "headers": [
+                {"name": "From", "value": "Sara Zambrano <sara@reca.co>"},
+                {"name": "Subject", "value": f"Acta {message_id}"},
+            ],
+            "parts": [
+                {
+                    "mimeType": "application/pdf",
+                    "filename": f"{message_id}.pdf",
+                    "body": {"attachmentId": f"att-{message_id}", "size": 10},
+                }
+            ],
+        },
+    }
+
+
+class _FakeBatch:
+    def __init__(self, callback) -> None:
+        self._callback = callback
+        self._request_ids: list[str] = []
+
+    def add(self, _request, request_id: str) -> None:
+        self._request_ids.append(request_id)
+
+    def execute(self) -> None:
+        for request_id in self._request_ids:
+            self._callback(request_id, _full_message(request_id), None)
 
 
 class AutomationOrchestratorTests(unittest.TestCase):
@@ -48,10 +95,13 @@ class AutomationOrchestratorTests(unittest.TestCase):
         staged_case = MagicMock()
         staged_case.to_dict.return_value = {"case_id": "auto-123", "status": "pending_review"}
         repo.list_cases.return_value = [staged_case]
+        repo.count_cases.return_value = 1
 
         result = get_automation_staging_cases()
 
         self.assertEqual(result["data"]["count"], 1)
+        self.assertFalse(result["data"]["has_more"])
+        repo.list_cases.assert_called_once_with(limit=100, offset=0, include_analysis=False)
         self.assertEqual(result["data"]["cases"][0]["case_id"], "auto-123")
 
     @patch("app.automation.orchestrator.AutomationStagingRepository")
@@ -83,6 +133,308 @@ class AutomationOrchestratorTests(unittest.TestCase):
         self.assertEqual(result["data"]["status"], "approved_for_publish")
         repo.update_case.assert_called_once()
 
+    @patch("app.automation.orchestrator._download_and_parse_attachments")
+    @patch("app.automation.orchestrator._companies")
+    @patch("app.automation.orchestrator._professional_email_map")
+    @patch("app.automation.orchestrator._gmail_gateway")
+    @patch("app.automation.processed_log.ProcessedEmailLog")
+    def test_batch_scan_shares_gateway_and_indexes_across_messages(
+        self,
+        mock_log_cls,
+        mock_gateway_factory,
+        mock_email_map,
+        mock_companies,
+        mock_download_and_parse,
+    ) -> None:
+        mock_log_cls.return_value.get_processed_ids.return_value = {"msg-done"}
+        messages = [
+            GmailMessageRef(
+                message_id=message_id,
+                thread_id=f"thread-{message_id}",
+                subject=f"Acta {message_id}",
+                sender="Ana <ana@recacolombia.org>",
+                sender_email="ana@recacolombia.org",
+                to_address="",
+                received_at="",
+            )
+            for message_id in ("msg-1", "msg-2", "msg-done")
+        ]
+        support = AttachmentRef(
+            attachment_id="att-1",
+            filename="asistencia.pdf",
+            mime_type="application/pdf",
+            size_bytes=10,
+            document_kind="attendance_support",
+            is_ods_candidate=False,
+        )
+        gateway = MagicMock()
+
+        def _iter_candidates(*, skip_ids, on_skip):
+            for message in messages:
+                if message.message_id in skip_ids:
+                    on_skip(message.message_id)
+                    continue
+                yield message
+
+        gateway.iter_candidate_messages.side_effect = _iter_candidates
+        gateway.list_pdf_attachments.return_value = [support]
+        mock_gateway_factory.return_value = gateway
+        mock_email_map.return_value = {"ana@recacolombia.org": "Ana Perez"}
+        mock_companies.return_value = ()
+
+        result = run_batch_eod_scan(limit=10, full_rescan=True)
+
+        stats = result["data"]["stats"]
+        self.assertEqual(stats["total_fetched"], 3)
+        self.assertEqual(stats["already_processed"], 1)
+        self.assertEqual(stats["ignored"], 2)
+        mock_gateway_factory.assert_called_once_with(limit=10)
+        mock_email_map.assert_called_once()
+        mock_companies.assert_called_once()
+        gateway.get_message_ref.assert_not_called()
+        self.assertEqual(gateway.list_pdf_attachments.call_count, 2)
+        mock_download_and_parse.assert_not_called()
+
+    def _confirm_payload(self) -> dict:
+        def _result(message_id: str, status: str, row_ids: list[str]) -> dict:
+            return {
+                "status": status,
+                "message_id": message_id,
+                "subject": f"Acta {message_id}",
+                "message": {"message_id": message_id},
+                "upload_rows": [{"id": row_id, "revisar_flag": ""} for row_id in row_ids],
+                "decision_log_entries": [],
+            }
+
+        return {
+            "results": [
+                _result("msg-1", "ready", ["row-a", "row-existing"]),
+                _result("msg-2", "ready", ["row-a", "row-b"]),
+                _result("msg-3", "ignored", []),
+                _result("msg-4", "error", []),
+            ]
+        }
+
+    @patch("app.automation.orchestrator._append_decision_log")
+    @patch("app.automation.orchestrator.append_sheet_values")
+    @patch("app.automation.orchestrator.read_sheet_values")
+    @patch("app.automation.orchestrator.get_settings")
+    @patch("app.automation.processed_log.ProcessedEmailLog")
+    def test_confirm_batch_appends_all_new_rows_once_then_marks_processed(
+        self,
+        mock_log_cls,
+        mock_get_settings,
+        mock_read_sheet_values,
+        mock_append_sheet_values,
+        mock_append_decision_log,
+    ) -> None:
+        mock_get_settings.return_value = SimpleNamespace(
+            google_sheets_automation_test_spreadsheet_id="spreadsheet-123",
+            google_sheets_automation_test_sheet_name="ODS_INPUT",
+        )
+        mock_read_sheet_values.return_value = [["row-existing"]]
+        mock_append_decision_log.return_value = Path("decisiones.txt")
+        calls: list[str] = []
+        mock_append_sheet_values.side_effect = lambda *_args, **_kwargs: calls.append("append")
+        mock_log_cls.return_value.mark_processed_many.side_effect = lambda _items: calls.append("mark")
+
+        result = confirm_batch_eod_upload(self._confirm_payload())
+
+        data = result["data"]
+        self.assertEqual((data["uploaded"], data["duplicates"], data["ignored"], data["errors"]), (2, 2, 1, 1))
+        mock_read_sheet_values.assert_called_once()
+        mock_append_sheet_values.assert_called_once()
+        self.assertEqual(len(mock_append_sheet_values.call_args.args[2]), 2)
+        self.assertEqual(calls, ["append", "mark"])
+        marked = [message_id for message_id, _subject in mock_log_cls.return_value.mark_processed_many.call_args.args[0]]
+        self.assertEqual(marked, ["msg-1", "msg-2", "msg-3"])
+
+    @patch("app.automation.orchestrator.append_sheet_values")
+    @patch("app.automation.orchestrator.read_sheet_values")
+    @patch("app.automation.orchestrator.get_settings")
+    @patch("app.automation.processed_log.ProcessedEmailLog")
+    def test_confirm_batch_does_not_mark_processed_when_append_fails(
+        self,
+        mock_log_cls,
+        mock_get_settings,
+        mock_read_sheet_values,
+        mock_append_sheet_values,
+    ) -> None:
+        mock_get_settings.return_value = SimpleNamespace(
+            google_sheets_automation_test_spreadsheet_id="spreadsheet-123",
+            google_sheets_automation_test_sheet_name="ODS_INPUT",
+        )
+        mock_read_sheet_values.return_value = []
+        mock_append_sheet_values.side_effect = RuntimeError("quota")
+
+        with self.assertRaises(RuntimeError):
+            confirm_batch_eod_upload(self._confirm_payload())
+
+        mock_log_cls.return_value.mark_processed_many.assert_not_called()
+
+    @patch("app.automation.orchestrator._scan_batch")
+    def test_batch_scan_job_saves_results_and_resumes_after_failure(self, mock_scan_batch) -> None:
+        calls: list[dict] = []
+
+        def _first_run(*, limit, full_rescan, stats, on_result, resumed_ids):
+            calls.append({"limit": limit, "resumed_ids": set(resumed_ids)})
+            stats["total_fetched"] += 1
+            stats["ready"] += 1
+            on_result({"status": "ready", "message_id": "msg-1", "upload_rows": [{"id": "row-1"}]})
+            raise RuntimeError("Token vencido")
+
+        def _resumed_run(*, limit, full_rescan, stats, on_result, resumed_ids):
+            calls.append({"limit": limit, "resumed_ids": set(resumed_ids)})
+            stats["total_fetched"] += 1
+            stats["ignored"] += 1
+            on_result({"status": "ignored", "message_id": "msg-2", "upload_rows": []})
+
+        mock_scan_batch.side_effect = lambda **kwargs: (_first_run if not calls else _resumed_run)(**kwargs)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store_path = Path(tmpdir) / "jobs.sqlite3"
+            with patch("app.automation.orchestrator.BatchScanJobStore", lambda: BatchScanJobStore(store_path)):
+                started = start_batch_eod_scan_job(limit=5, background=False)
+                job_id = started["data"]["job_id"]
+                failed = get_batch_eod_scan_job(job_id)["data"]
+
+                resumed = start_batch_eod_scan_job(resume_job_id=job_id, background=False)["data"]
+                tail = get_batch_eod_scan_job(job_id, since=1)["data"]
+                latest = get_batch_eod_scan_job()["data"]
+
+        self.assertEqual(failed["status"], "failed")
+        self.assertTrue(failed["resumable"])
+        self.assertEqual([item["message_id"] for item in failed["results"]], ["msg-1"])
+        self.assertEqual(calls[1], {"limit": 4, "resumed_ids": {"msg-1"}})
+        self.assertEqual(resumed["status"], "completed")
+        self.assertEqual(resumed["stats"]["total_fetched"], 2)
+        self.assertEqual(resumed["result_count"], 2)
+        self.assertEqual([item["message_id"] for item in tail["results"]], ["msg-2"])
+        self.assertEqual(latest["job_id"], job_id)
+
+    @patch("app.automation.orchestrator._scan_one_message")
+    @patch("app.automation.orchestrator.AttachmentRegistry")
+    @patch("app.automation.orchestrator._professional_email_map", return_value={})
+    @patch("app.automation.orchestrator._gmail_gateway")
+    @patch("app.automation.gmail_inbox.get_google_gmail_service")
+    @patch("app.automation.processed_log.ProcessedEmailLog")
+    def test_scan_batch_keeps_resumed_messages_pending_in_incremental_checkpoint(
+        self,
+        mock_log_cls,
+        mock_service,
+        mock_gateway,
+        _mock_email_map,
+        _mock_registry,
+        mock_scan_one,
+    ) -> None:
+        service = MagicMock()
+        service.new_batch_http_request.side_effect = _FakeBatch
+        users = service.users.return_value
+        users.getProfile.return_value.execute.return_value = {"historyId": "200"}
+        users.history.return_value.list.return_value.execute.return_value = {
+            "history": [{"messagesAdded": [{"message": {"id": "msg-2"}}, {"message": {"id": "done"}}]}]
+        }
+        mock_service.return_value = service
+        with patch("app.automation.gmail_inbox.list_process_template_names", return_value=[]):
+            mock_gateway.return_value = GmailInboxGateway(delegated_user="aaron@reca.co", to_filter="", max_results=50)
+        mock_log_cls.return_value.get_processed_ids.return_value = {"done"}
+        stats = {"total_fetched": 0, "already_processed": 0}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            state = GmailSyncState(Path(tmpdir) / "sync.json")
+            state.save(mock_gateway.return_value.sync_key, history_id="100", pending_ids=["msg-1"])
+            with patch("app.automation.sync_state.GmailSyncState", return_value=state):
+                _scan_batch(limit=None, full_rescan=False, stats=stats, on_result=lambda _item: None, resumed_ids={"msg-1"})
+            checkpoint = state.load(mock_gateway.return_value.sync_key)
+
+        scanned = [call.args[0].message_id for call in mock_scan_one.call_args_list]
+        self.assertEqual(scanned, ["msg-2"])
+        self.assertEqual(checkpoint["history_id"], "200")
+        self.assertEqual(checkpoint["pending_ids"], ["msg-1", "msg-2"])
+        self.assertEqual(stats, {"total_fetched": 1, "already_processed": 1})
+
+    @patch("app.automation.orchestrator._scan_one_message")
+    @patch("app.automation.orchestrator.AttachmentRegistry")
+    @patch("app.automation.orchestrator._professional_email_map", return_value={})
+    @patch("app.automation.orchestrator._gmail_gateway")
+    @patch("app.automation.gmail_inbox.get_google_gmail_service")
+    @patch("app.automation.processed_log.ProcessedEmailLog")
+    def test_resumed_job_fills_its_original_limit_with_new_messages(
+        self,
+        mock_log_cls,
+        mock_service,
+        mock_gateway,
+        _mock_email_map,
+        _mock_registry,
+        mock_scan_one,
+    ) -> None:
+        service = MagicMock()
+        service.new_batch_http_request.side_effect = _FakeBatch
+        users = service.users.return_value
+        users.getProfile.return_value.execute.return_value = {"historyId": "200"}
+        users.history.return_value.list.return_value.execute.return_value = {
+            "history": [{"messagesAdded": [{"message": {"id": f"msg-{index}"}} for index in range(1, 8)]}]
+        }
+        mock_service.return_value = service
+
+        def _gateway(*, limit=None):
+            with patch("app.automation.gmail_inbox.list_process_template_names", return_value=[]):
+                return GmailInboxGateway(delegated_user="aaron@reca.co", to_filter="", max_results=int(limit or 20))
+
+        mock_gateway.side_effect = _gateway
+        mock_log_cls.return_value.get_processed_ids.return_value = set()
+
+        def _scan(message_ref, *, context, stats, on_result):
+            stats["total_fetched"] += 1
+            stats["ready"] += 1
+            on_result({"status": "ready", "message_id": message_ref.message_id, "upload_rows": []})
+
+        mock_scan_one.side_effect = _scan
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = BatchScanJobStore(Path(tmpdir) / "jobs.sqlite3")
+            state = GmailSyncState(Path(tmpdir) / "sync.json")
+            state.save(_gateway().sync_key, history_id="100", pending_ids=[])
+            job = store.create_job(limit=5, full_rescan=False, stats={})
+            store.save_result(
+                job["job_id"],
+                {"status": "ready", "message_id": "msg-1", "upload_rows": []},
+                stats={"total_fetched": 1, "ready": 1},
+            )
+            store.update_job(job["job_id"], status="failed", error="Token vencido")
+            with patch("app.automation.orchestrator.BatchScanJobStore", lambda: store), patch(
+                "app.automation.sync_state.GmailSyncState", return_value=state
+            ):
+                resumed = start_batch_eod_scan_job(resume_job_id=job["job_id"], background=False)["data"]
+                results = get_batch_eod_scan_job(job["job_id"])["data"]["results"]
+            checkpoint = state.load(_gateway().sync_key)
+
+        self.assertEqual(resumed["status"], "completed")
+        self.assertEqual([item["message_id"] for item in results], [f"msg-{index}" for index in range(1, 6)])
+        self.assertEqual(resumed["stats"]["total_fetched"], 5)
+        self.assertEqual(checkpoint["pending_ids"], [f"msg-{index}" for index in range(1, 8)])
+
+    @patch("app.automation.orchestrator.app_data_dir")
+    @patch("app.automation.orchestrator.get_settings")
+    def test_decision_log_appends_text_file_and_indexes_copy_in_app_data(self, mock_get_settings, mock_app_data_dir) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = Path(tmpdir) / "Desktop" / "decisiones.txt"
+            log_path.parent.mkdir()
+            log_path.write_text("linea previa\n", encoding="utf-8")
+            mock_get_settings.return_value = SimpleNamespace(automation_decisions_log_path=str(log_path))
+            mock_app_data_dir.return_value = Path(tmpdir) / "AppData"
+
+            returned = _append_decision_log(["[2026-03-02] estado=subido message_id=msg-1 subject=Acta", "  "])
+            sink = get_audit_sink(Path(tmpdir) / "AppData" / "auditoria_decisiones", "decisiones")
+            self.assertTrue(sink.flush(timeout=5))
+            records = sink.find(message_id="msg-1")
+            sink.close(timeout=5)
+            text = log_path.read_text(encoding="utf-8")
+            desktop_entries = sorted(item.name for item in log_path.parent.iterdir())
+
+        self.assertEqual(returned, log_path)
+        self.assertEqual(text, "linea previa\n[2026-03-02] estado=subido message_id=msg-1 subject=Acta\n")
+        self.assertEqual(desktop_entries, ["decisiones.txt"])
+        self.assertEqual([item["estado"] for item in records], ["subido"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.automation.processed_log import ProcessedEmailLog
+
+
+class ProcessedEmailLogTests(unittest.TestCase):
+    def test_mark_processed_many_is_idempotent_and_keeps_first_date(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = ProcessedEmailLog(Path(tmpdir) / "processed.sqlite3")
+
+            added = log.mark_processed_many([("msg-1", "Uno"), ("msg-2", "Dos")], processed_at="2026-03-01T00:00:00+00:00")
+            added_again = log.mark_processed_many([("msg-2", "Dos"), ("msg-3", "Tres"), ("", "Sin id")], processed_at="2026-03-02T00:00:00+00:00")
+
+            self.assertEqual(added, 2)
+            self.assertEqual(added_again, 1)
+            self.assertTrue(log.is_processed("msg-2"))
+            self.assertFalse(log.is_processed("msg-9"))
+            self.assertEqual(log.get_processed_ids(), {"msg-1", "msg-2", "msg-3"})
+            rows = {row["message_id"]: row for row in log.list_processed()}
+            self.assertEqual(rows["msg-2"]["processed_at"], "2026-03-01T00:00:00+00:00")
+            self.assertEqual(log.list_processed()[0]["message_id"], "msg-3")
+
+    def test_legacy_json_is_migrated_once(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            legacy_path = Path(tmpdir) / "automation_processed_emails.json"
+            legacy_path.write_text(
+                json.dumps([
+                    {"message_id": "old-1", "subject": "Viejo", "processed_at": "2026-01-01T00:00:00+00:00"},
+                    {"message_id": "old-2", "subject": "Viejo 2", "processed_at": "2026-01-02T00:00:00+00:00"},
+                ]),
+                encoding="utf-8",
+            )
+
+            log = ProcessedEmailLog(Path(tmpdir) / "automation_processed_emails.sqlite3")
+
+            self.assertTrue(log.is_processed("old-1"))
+            self.assertFalse(legacy_path.exists())
+            self.assertTrue(legacy_path.with_suffix(".json.migrated").exists())
+
+            # Un JSON que reaparezca despues no se vuelve a importar.
+            legacy_path.write_text(json.dumps([{"message_id": "late", "subject": ""}]), encoding="utf-8")
+            reopened = ProcessedEmailLog(Path(tmpdir) / "automation_processed_emails.sqlite3")
+
+            self.assertEqual(reopened.get_processed_ids(), {"old-1", "old-2"})
+
+
+if __name__ == "__main__":
+    unittest.main()
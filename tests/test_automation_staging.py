@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import tempfile
 import unittest
 from pathlib import Path
@@ -10,7 +11,7 @@ from app.automation.staging import AutomationStagingRepository
 class AutomationStagingRepositoryTests(unittest.TestCase):
     def test_save_and_list_cases(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            repo = AutomationStagingRepository(Path(tmpdir) / "automation_staging.json")
+            repo = AutomationStagingRepository(Path(tmpdir) / "automation_staging.sqlite3")
 
             case = repo.save_case(
                 message={
@@ -39,7 +40,7 @@ class AutomationStagingRepositoryTests(unittest.TestCase):
 
     def test_update_case_changes_suggestion_and_status(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            repo = AutomationStagingRepository(Path(tmpdir) / "automation_staging.json")
+            repo = AutomationStagingRepository(Path(tmpdir) / "automation_staging.sqlite3")
             case = repo.save_case(
                 message={
                     "message_id": "msg-1",
@@ -61,6 +62,57 @@ class AutomationStagingRepositoryTests(unittest.TestCase):
             self.assertEqual(updated.suggestion["codigo_servicio"], "40")
             self.assertEqual(updated.suggestion["observaciones"], "Ajustado manualmente")
 
+    def test_list_cases_pages_by_updated_at_without_analysis(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo = AutomationStagingRepository(Path(tmpdir) / "automation_staging.sqlite3")
+            cases = [
+                repo.save_case(
+                    message={"message_id": f"msg-{index}", "received_at": "", "subject": ""},
+                    attachment={"filename": f"acta-{index}.pdf"},
+                    analysis={"texto": "x" * 1000, "indice": index},
+                    suggestion={"codigo_servicio": "37"},
+                )
+                for index in range(3)
+            ]
+            repo.update_case(case_id=cases[0].case_id, status="approved_for_publish")
+
+            first_page = repo.list_cases(limit=2, include_analysis=False)
+            second_page = repo.list_cases(limit=2, offset=2, include_analysis=False)
+
+            self.assertEqual(repo.count_cases(), 3)
+            self.assertEqual(first_page[0].case_id, cases[0].case_id)
+            self.assertEqual(len(first_page) + len(second_page), 3)
+            self.assertEqual(first_page[0].analysis, {})
+            self.assertEqual(repo.get_case(cases[0].case_id).analysis["indice"], 0)
+            self.assertEqual(repo.list_cases(limit=1)[0].analysis["indice"], 0)
+
+    def test_legacy_json_staging_is_migrated(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            legacy_path = Path(tmpdir) / "automation_staging.json"
+            legacy_path.write_text(
+                json.dumps([
+                    {
+                        "case_id": "auto-legacy",
+                        "status": "pending_review",
+                        "created_at": "2026-03-01T00:00:00+00:00",
+                        "updated_at": "2026-03-02T00:00:00+00:00",
+                        "message": {"message_id": "msg-legacy"},
+                        "attachment": {"filename": "acta.pdf"},
+                        "analysis": {"nombre_empresa": "Empresa Demo"},
+                        "suggestion": {"codigo_servicio": "37"},
+                    }
+                ]),
+                encoding="utf-8",
+            )
+
+            repo = AutomationStagingRepository(Path(tmpdir) / "automation_staging.sqlite3")
+            case = repo.get_case("auto-legacy")
+
+            self.assertIsNotNone(case)
+            self.assertEqual(case.analysis["nombre_empresa"], "Empresa Demo")
+            self.assertEqual(case.updated_at, "2026-03-02T00:00:00+00:00")
+            self.assertFalse(legacy_path.exists())
+
 
 if __name__ == "__main__":
     unittest.main()
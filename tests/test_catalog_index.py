@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -264,6 +265,69 @@ class CatalogIndexTests(unittest.TestCase):
         self.assertTrue(catalog_index.catalog_indexes_ready(catalogs=("empresas",)))
         self.assertEqual(catalog_index.get_indexed_empresas()[0]["nit_empresa"], "9001")
 
+    def test_user_details_are_fetched_in_chunks_and_cached_including_missing(self) -> None:
+        calls: list[list[str]] = []
+
+        def fetch(cedulas: list[str]) -> dict[str, dict[str, str]]:
+            calls.append(list(cedulas))
+            return {cedula: {"cedula_usuario": cedula} for cedula in cedulas if cedula != "104"}
+
+        catalog_index.clear_runtime_caches()
+        self.addCleanup(catalog_index.clear_runtime_caches)
+        with (
+            patch("app.catalog_index._fetch_user_details_chunk", side_effect=fetch),
+            patch.object(catalog_index._USER_DETAILS, "_chunk_size", 2),
+        ):
+            first = catalog_index.get_user_details_by_cedulas(["101", "102", "103", "104", "101", " "])
+            second = catalog_index.get_user_details_by_cedulas(["101", "104", "105"])
+            single = catalog_index.get_user_detail_by_cedula("102")
+
+        self.assertEqual(sorted(first), ["101", "102", "103"])
+        self.assertEqual(sorted(second), ["101", "105"])
+        self.assertEqual(single, {"cedula_usuario": "102"})
+        self.assertEqual(sorted(map(tuple, calls)), [("101", "102"), ("103", "104"), ("105",)])
+
+    def test_bulk_detail_resolver_dedupes_in_flight_keys(self) -> None:
+        started = threading.Event()
+        release = threading.Event()
+        calls: list[list[str]] = []
+
+        def fetch(keys: list[str]) -> dict[str, dict[str, str]]:
+            calls.append(list(keys))
+            started.set()
+            release.wait(5)
+            return {key: {"id": key} for key in keys}
+
+        resolver = catalog_index._BulkDetailResolver(fetch, ttl_seconds=300, chunk_size=10, max_workers=2)
+        results: list[dict] = []
+        first = threading.Thread(target=lambda: results.append(resolver.resolve(["1", "2"])))
+        first.start()
+        self.assertTrue(started.wait(5))
+        second = threading.Thread(target=lambda: results.append(resolver.resolve(["2"])))
+        second.start()
+        release.set()
+        first.join(5)
+        second.join(5)
+
+        self.assertEqual(calls, [["1", "2"]])
+        self.assertIn({"2": {"id": "2"}}, results)
+
+    def test_bulk_detail_resolver_does_not_cache_failed_chunks(self) -> None:
+        attempts: list[list[str]] = []
+
+        def fetch(keys: list[str]) -> dict[str, dict[str, str]]:
+            attempts.append(list(keys))
+            if len(attempts) == 1:
+                raise RuntimeError("timeout")
+            return {key: {"id": key} for key in keys}
+
+        resolver = catalog_index._BulkDetailResolver(fetch, ttl_seconds=300, chunk_size=10, max_workers=2)
+        with self.assertRaises(RuntimeError):
+            resolver.resolve(["1"])
+
+        self.assertEqual(resolver.resolve(["1"]), {"1": {"id": "1"}})
+        self.assertEqual(attempts, [["1"], ["1"]])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from app.services.drive_blob_cache import DriveBlobCache, drive_file_version
+
+
+class DriveBlobCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self._directory = Path(self._tmpdir.name)
+
+    def test_drive_file_version_prefers_md5_over_modified_time(self) -> None:
+        self.assertEqual(drive_file_version({"md5Checksum": "abc", "modifiedTime": "2026-04-01"}), "md5:abc")
+        self.assertEqual(drive_file_version({"modifiedTime": "2026-04-01T10:00:00Z"}), "mtime:2026-04-01T10:00:00Z")
+        self.assertEqual(drive_file_version({"name": "Acta.pdf"}), "")
+
+    def test_lookup_returns_content_and_parse_only_for_same_version(self) -> None:
+        cache = DriveBlobCache(self._directory, max_bytes=1024)
+        cache.store("file-1", "md5:v1", name="Acta.pdf", mime_type="application/pdf", content=b"pdf-1", parsed={"nit_empresa": "9001"})
+
+        entry = cache.lookup("file-1", "md5:v1")
+
+        self.assertIsNotNone(entry)
+        self.assertEqual(entry.content, b"pdf-1")
+        self.assertEqual(entry.parsed, {"nit_empresa": "9001"})
+        self.assertIsNone(cache.lookup("file-1", "md5:v2"))
+
+        cache.store("file-1", "md5:v2", content=b"pdf-2")
+        self.assertIsNone(cache.lookup("file-1", "md5:v1"))
+        self.assertIsNone(cache.lookup("file-1", "md5:v2").parsed)
+        self.assertEqual(len(list((self._directory / "blobs").iterdir())), 1)
+
+    def test_store_evicts_least_recently_used_files_over_size_cap(self) -> None:
+        cache = DriveBlobCache(self._directory, max_bytes=10)
+        cache.store("a", "md5:a", content=b"aaaa")
+        time.sleep(0.01)
+        cache.store("b", "md5:b", content=b"bbbb")
+        time.sleep(0.01)
+        cache.lookup("a", "md5:a")
+        time.sleep(0.01)
+        cache.store("c", "md5:c", content=b"cccc")
+
+        self.assertIsNotNone(cache.lookup("a", "md5:a"))
+        self.assertIsNone(cache.lookup("b", "md5:b"))
+        self.assertIsNotNone(cache.lookup("c", "md5:c"))
+        self.assertEqual(len(list((self._directory / "blobs").iterdir())), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,9 +5,14 @@ import tempfile
 import unittest
 from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
-from app.google_sheets_client import _credentials_path, extract_drive_file_id, normalize_google_file_open_url
+from app.google_sheets_client import (
+    _credentials_path,
+    extract_drive_file_id,
+    normalize_google_file_open_url,
+    read_spreadsheet_matrices,
+)
 
 
 class GoogleSheetsClientTests(unittest.TestCase):
@@ -50,6 +55,31 @@ class GoogleSheetsClientTests(unittest.TestCase):
 
         self.assertEqual(url, "https://drive.google.com/file/d/sheet-123/view")
 
+    @patch("app.google_sheets_client.get_google_sheets_service")
+    @patch("app.google_sheets_client.get_spreadsheet")
+    def test_read_spreadsheet_matrices_uses_single_batch_get(self, mock_get_spreadsheet, mock_service_factory) -> None:
+        mock_get_spreadsheet.return_value = {
+            "spreadsheetId": "sheet-123",
+            "sheets": [
+                {"properties": {"title": "Acta"}},
+                {"properties": {"title": "Datos d'apoyo", "hidden": True}},
+            ],
+        }
+        service = MagicMock()
+        batch_get = service.spreadsheets.return_value.values.return_value.batchGet
+        batch_get.return_value.execute.return_value = {"valueRanges": [{"values": [["NIT:", "900123456"]]}, {}]}
+        mock_service_factory.return_value = service
+
+        sheets = read_spreadsheet_matrices("sheet-123", max_rows=260, max_cols=70)
+
+        batch_get.assert_called_once_with(
+            spreadsheetId="sheet-123",
+            ranges=["'Acta'!A1:BR260", "'Datos d''apoyo'!A1:BR260"],
+        )
+        self.assertEqual(sheets[0], {"title": "Acta", "hidden": False, "values": [["NIT:", "900123456"]]})
+        self.assertEqual(sheets[1]["values"], [])
+        self.assertTrue(sheets[1]["hidden"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.sqlite_store import sqlite_connection
+
+
+def _ensure_schema(connection: sqlite3.Connection) -> None:
+    connection.execute("CREATE TABLE IF NOT EXISTS items (name TEXT PRIMARY KEY)")
+
+
+class SqliteStoreTests(unittest.TestCase):
+    def test_connection_creates_schema_in_wal_mode(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "nested" / "store.sqlite3"
+            with sqlite_connection(path, _ensure_schema, corrupt_message="Almacen corrupto") as connection:
+                with connection:
+                    connection.execute("INSERT INTO items(name) VALUES ('a')")
+                mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+            with sqlite_connection(path, _ensure_schema, corrupt_message="Almacen corrupto") as connection:
+                row = connection.execute("SELECT name FROM items").fetchone()
+
+        self.assertEqual(mode, "wal")
+        self.assertEqual(row["name"], "a")
+
+    def test_corrupt_file_raises_runtime_error_with_message(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "store.sqlite3"
+            path.write_bytes(b"esto no es una base sqlite" * 100)
+
+            with self.assertRaises(RuntimeError) as ctx:
+                with sqlite_connection(path, _ensure_schema, corrupt_message="Almacen corrupto"):
+                    pass
+
+        self.assertTrue(str(ctx.exception).startswith("Almacen corrupto: "))
+
+
+if __name__ == "__main__":
+    unittest.main()
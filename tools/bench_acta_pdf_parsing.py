@@ -0,0 +1,57 @@
+"""Micro-benchmark del parser de actas PDF sobre los fixtures de tests/test_acta_import.py.
+
+Ejecuta una vez los tests del parser PDF para capturar el texto de paginas que
+cada caso entrega a ``_parse_pdf_pages`` y luego mide solo la extraccion por
+regex, sin lectura de PDF ni archivos temporales.
+
+Uso:
+    python tools/bench_acta_pdf_parsing.py [repeticiones]
+"""
+
+from __future__ import annotations
+
+import io
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.services import excel_acta_import  # noqa: E402
+
+
+def _collect_fixtures() -> list[tuple[list[str], Path]]:
+    fixtures: list[tuple[list[str], Path]] = []
+    original = excel_acta_import._parse_pdf_pages
+
+    def _record(pages: list[str], path: Path) -> dict:
+        fixtures.append((list(pages), path))
+        return original(pages, path)
+
+    suite = unittest.defaultTestLoader.loadTestsFromName("tests.test_acta_import")
+    with patch.object(excel_acta_import, "_parse_pdf_pages", side_effect=_record):
+        unittest.TextTestRunner(stream=io.StringIO(), verbosity=0).run(suite)
+    return fixtures
+
+
+def main() -> None:
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    fixtures = _collect_fixtures()
+    if not fixtures:
+        raise SystemExit("No se capturaron fixtures PDF desde tests/test_acta_import.py")
+
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        for pages, path in fixtures:
+            excel_acta_import._parse_pdf_pages(pages, path)
+    elapsed = time.perf_counter() - start
+    per_document_ms = elapsed * 1000 / (repetitions * len(fixtures))
+    print(f"fixtures={len(fixtures)} repeticiones={repetitions} total={elapsed:.3f}s por_documento={per_document_ms:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()